@@ -89,6 +89,24 @@ class BenchmarkBase:
 
         return atomic_data_fname
 
+    @functools.cached_property
+    def nlte_atomic_data_fname(self):
+        atomic_data_fname = (
+            f"{self.tardis_ref_path}/nlte_atom_data/TestNLTE_He_Ti.h5"
+        )
+
+        if not Path(atomic_data_fname).exists():
+            atom_data_missing_str = (
+                f"{atomic_data_fname} atomic datafiles does not seem to exist"
+            )
+            raise Exception(atom_data_missing_str)
+
+        return atomic_data_fname
+
+    @functools.cached_property
+    def nlte_atomic_dataset(self) -> AtomData:
+        return AtomData.from_hdf(self.nlte_atomic_data_fname)
+
     @functools.cached_property
     def example_configuration_dir(self):
         return self.get_absolute_path("tardis/io/configuration/tests/data")
@@ -108,6 +126,12 @@ class BenchmarkBase:
             f"{self.example_configuration_dir}/tardis_configv1_verysimple.yml"
         )
 
+    @functools.cached_property
+    def config_nlte(self):
+        return Configuration.from_yaml(
+            f"{self.example_configuration_dir}/tardis_configv1_nlte.yml"
+        )
+
     @functools.cached_property
     def packet(self):
         return RPacket(
@@ -239,11 +263,10 @@ class BenchmarkBase:
             Edotlu_estimator=np.array(
                 [[0.0, 0.0, 1.0], [0.0, 0.0, 1.0]], dtype=np.float64
             ),
-            photo_ion_estimator=np.empty((0, 0), dtype=np.float64),
-            stim_recomb_estimator=np.empty((0, 0), dtype=np.float64),
-            bf_heating_estimator=np.empty((0, 0), dtype=np.float64),
-            stim_recomb_cooling_estimator=np.empty((0, 0), dtype=np.float64),
-            photo_ion_estimator_statistics=np.empty((0, 0), dtype=np.int64),
+            bound_free_estimator=np.empty(
+                (0, 0, radfield_mc_estimators.NUMBER_OF_BOUND_FREE_FIELDS),
+                dtype=np.float64,
+            ),
         )
 
     @functools.cached_property
@@ -0,0 +1,53 @@
+"""
+Basic TARDIS Benchmark.
+"""
+
+from copy import deepcopy
+
+import pandas as pd
+from asv_runner.benchmarks.mark import parameterize
+
+from benchmarks.benchmark_base import BenchmarkBase
+from tardis.io.atom_data import AtomData
+
+
+class BenchmarkIoAtomDataFromHdf(BenchmarkBase):
+    """
+    Class to benchmark reading the atomic data.
+    """
+
+    repeat = 2
+
+    def time_atom_data_from_hdf(self):
+        AtomData.from_hdf(self.atomic_data_fname)
+
+    def peakmem_atom_data_from_hdf(self):
+        AtomData.from_hdf(self.atomic_data_fname)
+
+
+@parameterize(
+    {"Line interaction type": ["scatter", "downbranch", "macroatom"]}
+)
+class BenchmarkIoAtomDataPrepareAtomData(BenchmarkBase):
+    """
+    Class to benchmark the preparation of the atomic data.
+    """
+
+    repeat = 3
+    # prepare_atom_data can only be called once on the same atomic data
+    number = 1
+    warmup_time = 0
+
+    def setup(self, line_interaction_type):
+        self.atom_data = deepcopy(self.atomic_dataset)
+        self.selected_atomic_numbers = pd.Index([8, 12, 14, 16, 18, 20])
+
+    def time_prepare_atom_data(self, line_interaction_type):
+        self.atom_data.prepare_atom_data(
+            self.selected_atomic_numbers,
+            line_interaction_type=line_interaction_type,
+            nlte_species=[],
+            continuum_interaction_species=pd.MultiIndex.from_tuples(
+                [], names=["atomic_number", "ion_number"]
+            ),
+        )
@@ -0,0 +1,72 @@
+"""
+Basic TARDIS Benchmark.
+"""
+
+from copy import deepcopy
+
+import pandas as pd
+from asv_runner.benchmarks.mark import parameterize
+
+from benchmarks.benchmark_base import BenchmarkBase
+from tardis.model import SimulationState
+from tardis.plasma.assembly.legacy_assembly import assemble_plasma
+from tardis.plasma.radiation_field import DilutePlanckianRadiationField
+
+
+def dilute_planckian_update_properties(plasma, t_radiative, dilution_factor):
+    radiation_field = DilutePlanckianRadiationField(
+        temperature=t_radiative,
+        dilution_factor=dilution_factor,
+    )
+    j_blues = radiation_field.calculate_mean_intensity(
+        plasma.atomic_data.lines.nu.values
+    )
+    return dict(
+        dilute_planckian_radiation_field=radiation_field,
+        j_blues=pd.DataFrame(j_blues, index=plasma.atomic_data.lines.index),
+    )
+
+
+class BenchmarkPlasmaBasePlasmaUpdate(BenchmarkBase):
+    """
+    Class to benchmark the update of the plasma.
+    """
+
+    repeat = 3
+
+    def setup(self):
+        simulation = self.nb_simulation_verysimple
+        self.plasma = simulation.plasma
+        self.update_properties = dilute_planckian_update_properties(
+            self.plasma,
+            simulation.simulation_state.t_radiative * 1.05,
+            simulation.simulation_state.dilution_factor * 0.95,
+        )
+
+    def time_plasma_update(self):
+        self.plasma.update(**self.update_properties)
+
+
+@parameterize({"NLTE solver": ["root", "lu"]})
+class BenchmarkPlasmaNLTEPopulationSolver(BenchmarkBase):
+    """
+    Class to benchmark the plasma update with the NLTE ionization solvers.
+    """
+
+    repeat = 2
+
+    def setup(self, nlte_solver):
+        config = deepcopy(self.config_nlte)
+        config.plasma.nlte_solver = nlte_solver
+        atom_data = deepcopy(self.nlte_atomic_dataset)
+        simulation_state = SimulationState.from_config(config, atom_data)
+        self.plasma = assemble_plasma(config, simulation_state, atom_data)
+        self.update_properties = dilute_planckian_update_properties(
+            self.plasma,
+            simulation_state.t_radiative * 1.05,
+            simulation_state.dilution_factor,
+        )
+
+    def time_nlte_plasma_update(self, nlte_solver):
+        self.plasma.store_previous_properties()
+        self.plasma.update(**self.update_properties)
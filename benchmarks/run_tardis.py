@@ -2,6 +2,11 @@
 Basic TARDIS Benchmark.
 """
 
+from copy import deepcopy
+
+import numba
+from asv_runner.benchmarks.mark import parameterize
+
 from benchmarks.benchmark_base import BenchmarkBase
 from tardis import run_tardis
 from tardis.io.atom_data import AtomData
@@ -30,3 +35,73 @@ class BenchmarkRunTardis(BenchmarkBase):
             atom_data=self.atom_data,
             show_convergence_plots=False,
         )
+
+
+@parameterize(
+    {
+        "Number of packets": [10_000, 40_000, 160_000],
+        "Number of threads": [1, 2, 4],
+    }
+)
+class BenchmarkRunTardisScaling(BenchmarkBase):
+    """
+    Class to benchmark the scaling of the `run tardis` function with the
+    number of packets and threads.
+    """
+
+    repeat = 2
+    number = 1
+    warmup_time = 0
+
+    def setup(self, no_of_packets, nthreads):
+        if nthreads > numba.config.NUMBA_NUM_THREADS:
+            # asv skips benchmarks whose setup raises NotImplementedError
+            raise NotImplementedError(
+                f"Only {numba.config.NUMBA_NUM_THREADS} threads available"
+            )
+        self.config = deepcopy(self.config_verysimple)
+        self.config.montecarlo.iterations = 2
+        self.config.montecarlo.no_of_packets = no_of_packets
+        self.config.montecarlo.last_no_of_packets = -1
+        self.config.montecarlo.nthreads = nthreads
+        self.atom_data = deepcopy(self.atomic_dataset)
+
+    def time_run_tardis(self, no_of_packets, nthreads):
+        run_tardis(
+            self.config,
+            atom_data=self.atom_data,
+            show_convergence_plots=False,
+            show_progress_bars=False,
+        )
+
+    def peakmem_run_tardis(self, no_of_packets, nthreads):
+        run_tardis(
+            self.config,
+            atom_data=self.atom_data,
+            show_convergence_plots=False,
+            show_progress_bars=False,
+        )
+
+
+@parameterize({"Number of virtual packets": [0, 3, 10]})
+class BenchmarkRunTardisVirtualPackets(BenchmarkBase):
+    """
+    Class to benchmark the memory used by the virtual packets of the
+    `run tardis` function.
+    """
+
+    def setup(self, no_of_virtual_packets):
+        self.config = deepcopy(self.config_verysimple)
+        self.config.montecarlo.iterations = 2
+        self.config.montecarlo.no_of_virtual_packets = no_of_virtual_packets
+        self.config.spectrum.virtual.virtual_packet_logging = True
+        self.atom_data = deepcopy(self.atomic_dataset)
+
+    def peakmem_run_tardis_virtual_packets(self, no_of_virtual_packets):
+        run_tardis(
+            self.config,
+            atom_data=self.atom_data,
+            virtual_packet_logging=True,
+            show_convergence_plots=False,
+            show_progress_bars=False,
+        )
@@ -0,0 +1,33 @@
+"""
+Basic TARDIS Benchmark.
+"""
+
+from asv_runner.benchmarks.mark import parameterize
+
+from benchmarks.benchmark_base import BenchmarkBase
+from tardis.transport.montecarlo.estimators.radfield_mc_estimators import (
+    initialize_estimator_statistics,
+)
+
+
+@parameterize(
+    {"Number of shells": [20, 200, 2000], "Number of threads": [1, 8]}
+)
+class BenchmarkTransportMontecarloEstimatorsRadfieldMCEstimators(
+    BenchmarkBase
+):
+    """
+    Class to benchmark the memory used by the radiation field estimators,
+    including the copies of the estimators held by the threads.
+    """
+
+    def setup(self, no_of_shells, n_threads):
+        no_of_lines = self.transport_state.opacity_state.tau_sobolev.shape[0]
+        self.tau_sobolev_shape = (no_of_lines, no_of_shells)
+        self.gamma_shape = (0, no_of_shells)
+
+    def peakmem_initialize_estimator_statistics(self, no_of_shells, n_threads):
+        estimators = initialize_estimator_statistics(
+            self.tau_sobolev_shape, self.gamma_shape
+        )
+        estimators.create_estimator_list(n_threads)
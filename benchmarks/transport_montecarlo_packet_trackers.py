@@ -21,13 +21,18 @@ class BenchmarkTransportMontecarloPacketTrackers(BenchmarkBase):
         sim = self.simulation_rpacket_tracking_enabled
         self.TransportState = sim.transport.transport_state
 
-    def time_rpacket_trackers_to_dataframe(self):
-        packet_trackers.rpacket_trackers_to_dataframe(
+    def time_rpacket_event_logs_to_dataframe(self):
+        packet_trackers.rpacket_event_logs_to_dataframe(
             self.TransportState.rpacket_tracker
         )
 
     def time_generate_rpacket_tracker_list(self):
         packet_trackers.generate_rpacket_tracker_list(50, 10)
 
+    def time_generate_rpacket_event_log_list(self):
+        packet_trackers.generate_rpacket_event_log_list(
+            4, 500, packet_trackers.RPacketTrackingFilter()
+        )
+
     def time_generate_rpacket_last_interaction_tracker_list(self):
         packet_trackers.generate_rpacket_last_interaction_tracker_list(50)
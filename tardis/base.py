@@ -62,7 +62,9 @@ def run_tardis(
         If False, logs will be printed normally instead.
     **kwargs : dict, optional
         Optional keyword arguments including those
-        supported by :obj:`tardis.visualization.tools.convergence_plot.ConvergencePlots`.
+        supported by :obj:`tardis.visualization.tools.convergence_plot.ConvergencePlots`
+        and the `checkpoint_path` and `resume_from` options of
+        :meth:`tardis.simulation.Simulation.from_config`.
 
 
     Returns
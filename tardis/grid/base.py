@@ -1,12 +1,39 @@
 import copy
+import logging
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
+from astropy import units as u
 
 import tardis
 from tardis.io.configuration.config_reader import Configuration
+from tardis.io.model.parse_atom_data import parse_atom_data
 from tardis.model import SimulationState
 
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "DEFAULT_GRID_SUMMARY_QUANTITIES",
+    "TardisGrid",
+    "read_grid_results",
+]
+
+GRID_SUMMARY_KEY = "summary"
+GRID_SPECTRA_KEY = "spectra"
+
+# name -> attribute path on the finished Simulation, or a callable taking it
+DEFAULT_GRID_SUMMARY_QUANTITIES = {
+    "t_inner": "simulation_state.t_inner",
+    "iterations_executed": "iterations_executed",
+    "converged": "converged",
+}
+
+# per process state of the grid workers, see `_initialize_grid_worker`
+_GRID_WORKER_STATE = {}
+
 
 def _set_tardis_config_property(tardis_config, key, value):
     """
@@ -32,6 +59,137 @@ def _set_tardis_config_property(tardis_config, key, value):
     setattr(tmp_dict, keyitems[-1], value)
 
 
+def _initialize_grid_worker(base_config, atom_data):
+    """
+    Load the atomic data of a grid worker process once.
+
+    Parameters
+    ----------
+    base_config : tardis.io.config_reader.Configuration
+        Configuration the grid rows modify.
+    atom_data : str, pathlib.Path, tardis.io.atom_data.AtomData or None
+        Atomic data file or object, read from the configuration if None.
+    """
+    if atom_data is None or isinstance(atom_data, (str, Path)):
+        if atom_data is not None:
+            base_config = copy.deepcopy(base_config)
+            base_config.atom_data = str(atom_data)
+        atom_data = parse_atom_data(base_config)
+    _GRID_WORKER_STATE["config"] = base_config
+    _GRID_WORKER_STATE["atom_data"] = atom_data
+
+
+def _get_summary_quantity(sim, quantity):
+    """
+    Evaluate a summary quantity of a finished simulation.
+
+    Parameters
+    ----------
+    sim : tardis.simulation.base.Simulation
+    quantity : str or callable
+        Dotted attribute path on the simulation, or a callable taking it.
+
+    Returns
+    -------
+    object
+        The quantity, astropy quantities are converted to their cgs value.
+    """
+    if callable(quantity):
+        value = quantity(sim)
+    else:
+        value = sim
+        for name in quantity.split("."):
+            value = getattr(value, name)
+    if isinstance(value, u.Quantity):
+        value = value.cgs.value
+    return value
+
+
+def _run_grid_row(
+    row_index, row_parameters, spectrum, summary_quantities, tardiskwargs
+):
+    """
+    Run the simulation of one grid row in a grid worker.
+
+    Parameters
+    ----------
+    row_index : int
+        Row index in grid.
+    row_parameters : dict
+        Config keys and values of the row.
+    spectrum : str
+        Name of the spectrum of the spectrum solver to store.
+    summary_quantities : dict
+        Names and quantities passed to `_get_summary_quantity`.
+    tardiskwargs : dict
+        Keyword arguments for `tardis.run_tardis`.
+
+    Returns
+    -------
+    row_index : int
+    spectrum_frame : pandas.DataFrame
+        Wavelength and luminosity density of the spectrum in cgs units.
+    summary : dict
+        Values of the summary quantities.
+    """
+    tardis_config = copy.deepcopy(_GRID_WORKER_STATE["config"])
+    for key, value in row_parameters.items():
+        _set_tardis_config_property(tardis_config, key, value)
+
+    # the atomic data is prepared for the species of a run and can not be
+    # reused, copying it in memory is much cheaper than reading the file
+    sim = tardis.run_tardis(
+        tardis_config,
+        atom_data=copy.deepcopy(_GRID_WORKER_STATE["atom_data"]),
+        **tardiskwargs,
+    )
+
+    tardis_spectrum = getattr(sim.spectrum_solver, spectrum)
+    spectrum_frame = pd.DataFrame(
+        {
+            "wavelength": tardis_spectrum.wavelength.cgs.value,
+            "luminosity_density_lambda": (
+                tardis_spectrum.luminosity_density_lambda.cgs.value
+            ),
+        }
+    )
+    summary = {
+        name: _get_summary_quantity(sim, quantity)
+        for name, quantity in summary_quantities.items()
+    }
+    return row_index, spectrum_frame, summary
+
+
+def read_grid_results(result_path):
+    """
+    Read the results of `TardisGrid.run_grid`.
+
+    Parameters
+    ----------
+    result_path : str or pathlib.Path
+        Result store written by `TardisGrid.run_grid`.
+
+    Returns
+    -------
+    summary : pandas.DataFrame
+        Grid parameters and summary quantities of the completed rows,
+        indexed by row index.
+    spectra : dict
+        Spectrum DataFrames keyed by row index.
+    """
+    with pd.HDFStore(result_path, "r") as store:
+        summary = store[GRID_SUMMARY_KEY].sort_index()
+        spectra = {
+            row_index: store[_spectrum_key(row_index)]
+            for row_index in summary.index
+        }
+    return summary, spectra
+
+
+def _spectrum_key(row_index):
+    return f"{GRID_SPECTRA_KEY}/row_{row_index:06d}"
+
+
 class TardisGrid:
     """
     A class that stores a grid of TARDIS parameters and
@@ -169,3 +327,140 @@ class TardisGrid:
         gridpoints = tmp.reshape((dim, len(axes)), order="F")
         df = pd.DataFrame(data=gridpoints, columns=axesdict.keys())
         return cls(configFile=configFile, gridFrame=df)
+
+    def run_grid(
+        self,
+        result_path,
+        n_workers=None,
+        atom_data=None,
+        spectrum="spectrum_real_packets",
+        summary_quantities=None,
+        resume=True,
+        mp_context="spawn",
+        **tardiskwargs,
+    ):
+        """
+        Runs the simulations of all grid rows in a pool of processes.
+
+        Every worker process loads the atomic data once and receives only
+        the parameters of the rows it runs. The spectrum and summary
+        quantities of each finished row are written to a single HDF result
+        store by the calling process. A row counts as completed once its
+        summary is stored, so a rerun with `resume` only runs the rows
+        missing after an interruption.
+
+        Parameters
+        ----------
+        result_path : str or pathlib.Path
+            HDF file collecting the results, see `read_grid_results`.
+        n_workers : int, optional
+            Number of worker processes, by default the number of CPUs.
+        atom_data : str, pathlib.Path or tardis.io.atom_data.AtomData, optional
+            Atomic data file or object, by default read from the config.
+        spectrum : str, optional
+            Spectrum of the spectrum solver to store, by default
+            "spectrum_real_packets".
+        summary_quantities : dict, optional
+            Names mapped to dotted attribute paths on the finished
+            simulation or to callables taking it. By default
+            `DEFAULT_GRID_SUMMARY_QUANTITIES`.
+        resume : bool, optional
+            Skip rows already completed in `result_path`, by default True.
+            If False an existing result store is replaced.
+        mp_context : str, optional
+            Multiprocessing start method of the pool, by default "spawn".
+        **tardiskwargs
+            Keyword arguments passed to `tardis.run_tardis` for every row.
+
+        Returns
+        -------
+        list of int
+            Row indices completed by this call.
+        """
+        result_path = Path(result_path)
+        if summary_quantities is None:
+            summary_quantities = DEFAULT_GRID_SUMMARY_QUANTITIES
+        if n_workers is None:
+            n_workers = multiprocessing.cpu_count()
+
+        completed_rows = set()
+        if result_path.exists():
+            if resume:
+                with pd.HDFStore(result_path, "r") as store:
+                    if GRID_SUMMARY_KEY in store:
+                        completed_rows = set(store[GRID_SUMMARY_KEY].index)
+            else:
+                result_path.unlink()
+        pending_rows = [
+            row_index
+            for row_index in range(len(self.grid))
+            if row_index not in completed_rows
+        ]
+        logger.info(
+            f"Running {len(pending_rows)} of {len(self.grid)} grid rows "
+            f"on {n_workers} workers"
+        )
+
+        def store_row(store, row_index, spectrum_frame, summary):
+            grid_row = self.grid.iloc[[row_index]].reset_index(drop=True)
+            summary_frame = pd.concat(
+                [grid_row, pd.DataFrame([summary])], axis=1
+            )
+            summary_frame.index = pd.Index([row_index], name="row_index")
+            store.put(_spectrum_key(row_index), spectrum_frame)
+            # appended last, it marks the row as completed
+            store.append(GRID_SUMMARY_KEY, summary_frame, format="table")
+            store.flush()
+
+        def submit(executor, row_index):
+            grid_row = self.grid.iloc[row_index]
+            return executor.submit(
+                _run_grid_row,
+                row_index,
+                dict(zip(self.grid.columns, grid_row.values)),
+                spectrum,
+                summary_quantities,
+                tardiskwargs,
+            )
+
+        completed_by_run = []
+        failed_rows = []
+        with pd.HDFStore(result_path, "a") as store:
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context(mp_context),
+                initializer=_initialize_grid_worker,
+                initargs=(self.config, atom_data),
+            ) as executor:
+                rows = iter(pending_rows)
+                # keep a bounded number of rows in flight
+                running = {
+                    submit(executor, row_index): row_index
+                    for _, row_index in zip(range(2 * n_workers), rows)
+                }
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        row_index = running.pop(future)
+                        try:
+                            _, spectrum_frame, summary = future.result()
+                        except Exception:
+                            # not stored, the row is run again on resume
+                            logger.exception(f"Grid row {row_index} failed")
+                            failed_rows.append(row_index)
+                        else:
+                            store_row(
+                                store, row_index, spectrum_frame, summary
+                            )
+                            completed_by_run.append(row_index)
+                            logger.info(f"Completed grid row {row_index}")
+                        next_row = next(rows, None)
+                        if next_row is not None:
+                            running[submit(executor, next_row)] = next_row
+
+        if failed_rows:
+            logger.warning(
+                f"{len(failed_rows)} grid rows failed and are run again "
+                f"when resuming: {sorted(failed_rows)}"
+            )
+        return completed_by_run
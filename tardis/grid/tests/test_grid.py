@@ -42,3 +42,29 @@ def test_grid(atomic_dataset):
         simulation_state.velocity[0].to("km/s").value
         == df.iloc[0]["model.structure.velocity.start"]
     )
+
+
+def test_run_grid_resume(atomic_dataset, tmp_path):
+    """Tests running the grid in worker processes and resuming it."""
+    ymlpath = DATA_PATH / "example.yml"
+    df = pd.read_csv(DATA_PATH / "example_grid.txt").iloc[:2]
+    g = grid.TardisGrid(configFile=ymlpath, gridFrame=df)
+    result_path = tmp_path / "grid_results.h5"
+
+    completed_rows = g.run_grid(
+        result_path, n_workers=2, atom_data=atomic_dataset
+    )
+    assert sorted(completed_rows) == [0, 1]
+
+    # all rows are stored, resuming has nothing left to run
+    assert g.run_grid(result_path, n_workers=2, atom_data=atomic_dataset) == []
+
+    summary, spectra = grid.read_grid_results(result_path)
+    assert list(summary.index) == [0, 1]
+    assert set(grid.DEFAULT_GRID_SUMMARY_QUANTITIES) <= set(summary.columns)
+    np.testing.assert_array_equal(
+        summary["model.structure.velocity.start"],
+        df["model.structure.velocity.start"],
+    )
+    assert set(spectra) == {0, 1}
+    assert (spectra[0]["luminosity_density_lambda"] >= 0).all()
@@ -0,0 +1,603 @@
+"""
+Columnar, chunked HDF5 output for TARDIS objects.
+
+The writer stores every array of an object as its own chunked and
+compressed h5py dataset instead of wrapping it into pandas objects written
+through ``pd.HDFStore``. Node paths are the same as the ones produced by
+:meth:`tardis.io.hdf_writer_mixin.HDFWriterMixin.to_hdf`, and
+:class:`ColumnarHDFStore` returns the same pandas objects for them, so code
+reading simulation output only needs to open the file with
+:func:`open_simulation_store`.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import h5py
+import numpy as np
+import pandas as pd
+
+from tardis import __version__
+from tardis.io.util import logger
+
+COLUMNAR_FORMAT_ATTR = "tardis_columnar_format"
+COLUMNAR_FORMAT_VERSION = 1
+
+# target size of a single uncompressed chunk
+DEFAULT_CHUNK_NBYTES = 2**20
+
+SERIES = "series"
+FRAME = "frame"
+SCALARS = "scalars"
+
+
+def resolve_compression(compression: Optional[str]) -> Optional[str]:
+    """
+    Resolve the "auto" compressor to LZ4 if `hdf5plugin` is installed and
+    to LZF, which ships with h5py, otherwise.
+
+    LZF compresses less than LZ4 but still much faster than gzip, which is
+    considerably slower than writing through ``pd.HDFStore`` for
+    incompressible arrays like packet frequencies and therefore only used
+    when requested explicitly.
+
+    Parameters
+    ----------
+    compression : str or None
+
+    Returns
+    -------
+    str or None
+    """
+    if compression != "auto":
+        return compression
+    try:
+        import hdf5plugin  # noqa: F401
+    except ModuleNotFoundError:
+        logger.info(
+            "hdf5plugin is not installed, compressing the columnar store "
+            "with lzf instead of lz4"
+        )
+        return "lzf"
+    logger.info("Compressing the columnar store with lz4")
+    return "lz4"
+
+
+def get_compression_kwargs(
+    compression: Optional[str], compression_level: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Get the h5py dataset creation arguments for a compressor name.
+
+    Parameters
+    ----------
+    compression : str or None
+        One of None, "gzip", "lzf", "lz4", "zstd" or "blosc". LZ4, Zstd and
+        Blosc need the optional `hdf5plugin` package.
+    compression_level : int, optional
+        Compression level passed to the compressor if it supports one.
+
+    Returns
+    -------
+    dict
+        Keyword arguments for `h5py.Group.create_dataset`.
+
+    Raises
+    ------
+    ValueError
+        If the compressor is unknown.
+    """
+    if compression is None:
+        return {}
+    if compression == "gzip":
+        return {
+            "compression": "gzip",
+            "compression_opts": 4 if compression_level is None else compression_level,
+        }
+    if compression == "lzf":
+        return {"compression": "lzf"}
+    if compression in ("lz4", "zstd", "blosc"):
+        try:
+            import hdf5plugin
+        except ModuleNotFoundError:
+            raise ImportError(
+                f"Please install hdf5plugin to use the {compression} compressor."
+            )
+        if compression == "lz4":
+            return dict(hdf5plugin.LZ4())
+        if compression == "zstd":
+            if compression_level is None:
+                return dict(hdf5plugin.Zstd())
+            return dict(hdf5plugin.Zstd(clevel=compression_level))
+        # blosc compresses the blocks of a chunk in parallel,
+        # the number of threads is set with the BLOSC_NTHREADS variable
+        return dict(
+            hdf5plugin.Blosc(
+                cname="zstd",
+                clevel=5 if compression_level is None else compression_level,
+                shuffle=hdf5plugin.Blosc.SHUFFLE,
+            )
+        )
+    raise ValueError(
+        f"Unknown compression {compression}, expected one of "
+        "None, 'gzip', 'lzf', 'lz4', 'zstd' or 'blosc'"
+    )
+
+
+def _is_string_array(array: np.ndarray) -> bool:
+    return array.dtype.kind in ("O", "U", "S")
+
+
+def _encode_labels(labels: pd.Index) -> np.ndarray:
+    values = labels.to_numpy()
+    if _is_string_array(values):
+        return values.astype(str).astype(object)
+    return values
+
+
+class ColumnarWriter:
+    """
+    Writer storing TARDIS objects as chunked, compressed h5py datasets.
+
+    Instances can be passed everywhere a `pandas.HDFStore` is accepted by
+    `to_hdf`, nested TARDIS objects are written through the same writer.
+
+    Parameters
+    ----------
+    file_path : str or pathlib.Path
+        Path of the HDF5 file.
+    overwrite : bool, optional
+        Whether an existing file may be overwritten, by default False.
+    compression : str or None, optional
+        Compressor, see `get_compression_kwargs` and `resolve_compression`,
+        by default "auto".
+    compression_level : int, optional
+        Compression level of the compressor.
+    shuffle : bool, optional
+        Apply the HDF5 byte shuffle filter before compressing, by default True.
+    chunk_nbytes : int, optional
+        Target size of an uncompressed chunk in bytes.
+    n_threads : int, optional
+        Number of threads compressing gzip chunks in parallel, by default 1.
+        Chunks are compressed with zlib in a thread pool and written with
+        `write_direct_chunk`, other compressors go through the HDF5 filter
+        pipeline.
+
+    Raises
+    ------
+    FileExistsError
+        If the file already exists and overwrite is False.
+    """
+
+    def __init__(
+        self,
+        file_path: Union[str, Path],
+        overwrite: bool = False,
+        compression: Optional[str] = "auto",
+        compression_level: Optional[int] = None,
+        shuffle: bool = True,
+        chunk_nbytes: int = DEFAULT_CHUNK_NBYTES,
+        n_threads: int = 1,
+    ) -> None:
+        if Path(file_path).exists() and not overwrite:
+            raise FileExistsError(
+                "The specified HDF file already exists. If you still want "
+                "to overwrite it, set function parameter overwrite=True"
+            )
+        compression = resolve_compression(compression)
+        self.compression = compression
+        self.compression_level = compression_level
+        self.compression_kwargs = get_compression_kwargs(
+            compression, compression_level
+        )
+        self.shuffle = shuffle
+        self.chunk_nbytes = chunk_nbytes
+        self.n_threads = n_threads
+        self.file = h5py.File(file_path, "w")
+        self.file.attrs[COLUMNAR_FORMAT_ATTR] = COLUMNAR_FORMAT_VERSION
+        self._executor = (
+            ThreadPoolExecutor(max_workers=n_threads) if n_threads > 1 else None
+        )
+
+    def __enter__(self) -> ColumnarWriter:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def is_open(self) -> bool:
+        return bool(self.file.id.valid)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self.is_open:
+            self.file.close()
+
+    def _create_group(self, key: str) -> h5py.Group:
+        if key in self.file:
+            del self.file[key]
+        return self.file.create_group(key)
+
+    def write_array(
+        self, group: h5py.Group, name: str, array: np.ndarray
+    ) -> h5py.Dataset:
+        """
+        Write a numpy array as a chunked, compressed dataset.
+
+        Parameters
+        ----------
+        group : h5py.Group
+            Group to create the dataset in.
+        name : str
+            Name of the dataset.
+        array : numpy.ndarray
+            One or two dimensional array. Object and unicode arrays are
+            stored as variable length strings.
+
+        Returns
+        -------
+        h5py.Dataset
+        """
+        array = np.asarray(array)
+        if _is_string_array(array):
+            return group.create_dataset(
+                name,
+                data=array.astype(str).astype(object),
+                dtype=h5py.string_dtype(),
+            )
+        if array.dtype.byteorder == ">":
+            array = array.astype(array.dtype.newbyteorder("="))
+        if array.size == 0 or array.ndim == 0 or self.compression is None:
+            return group.create_dataset(name, data=array)
+
+        row_nbytes = array.itemsize * int(np.prod(array.shape[1:]))
+        chunk_rows = int(
+            min(array.shape[0], max(1, self.chunk_nbytes // max(row_nbytes, 1)))
+        )
+        chunks = (chunk_rows,) + array.shape[1:]
+        dataset = group.create_dataset(
+            name,
+            shape=array.shape,
+            dtype=array.dtype,
+            chunks=chunks,
+            shuffle=self.shuffle,
+            **self.compression_kwargs,
+        )
+        if self._executor is not None and self.compression == "gzip":
+            self._write_gzip_chunks(dataset, array, chunk_rows)
+        else:
+            dataset[...] = array
+        return dataset
+
+    def _write_gzip_chunks(
+        self, dataset: h5py.Dataset, array: np.ndarray, chunk_rows: int
+    ) -> None:
+        """
+        Compress the chunks of `array` in parallel and write them directly,
+        reproducing the shuffle and deflate filters of `dataset`.
+        """
+        level = self.compression_kwargs["compression_opts"]
+        itemsize = array.itemsize
+        shuffle = self.shuffle
+        chunk_shape = (chunk_rows,) + array.shape[1:]
+
+        def compress_chunk(start: int) -> bytes:
+            chunk = array[start : start + chunk_rows]
+            if chunk.shape[0] < chunk_rows:
+                # HDF5 stores edge chunks with their full extent
+                padded = np.zeros(chunk_shape, dtype=array.dtype)
+                padded[: chunk.shape[0]] = chunk
+                chunk = padded
+            data = np.ascontiguousarray(chunk).view(np.uint8)
+            if shuffle and itemsize > 1:
+                data = data.reshape(-1, itemsize).T
+            return zlib.compress(data.tobytes(), level)
+
+        starts = range(0, array.shape[0], chunk_rows)
+        for start, compressed in zip(
+            starts, self._executor.map(compress_chunk, starts)
+        ):
+            offset = (start,) + (0,) * (array.ndim - 1)
+            dataset.id.write_direct_chunk(offset, compressed)
+
+    def _write_index(
+        self, group: h5py.Group, prefix: str, index: pd.Index
+    ) -> None:
+        group.attrs[f"{prefix}_names"] = json.dumps(
+            [None if name is None else str(name) for name in index.names]
+        )
+        if isinstance(index, pd.RangeIndex):
+            group.attrs[f"{prefix}_range"] = (
+                index.start,
+                index.stop,
+                index.step,
+            )
+            return
+        for level in range(index.nlevels):
+            self.write_array(
+                group,
+                f"{prefix}_level_{level}",
+                _encode_labels(index.get_level_values(level)),
+            )
+
+    def write_pandas(
+        self, key: str, value: Union[pd.Series, pd.DataFrame]
+    ) -> None:
+        """
+        Write a Series or DataFrame column by column under `key`.
+
+        Homogeneous numeric DataFrames are stored as a single two
+        dimensional dataset.
+
+        Parameters
+        ----------
+        key : str
+            Path of the node inside the file.
+        value : pandas.Series or pandas.DataFrame
+        """
+        group = self._create_group(key)
+        self._write_index(group, "index", value.index)
+        if isinstance(value, pd.Series):
+            group.attrs["tardis_type"] = SERIES
+            group.attrs["name"] = json.dumps(
+                None if value.name is None else str(value.name)
+            )
+            self.write_array(group, "values", value.to_numpy())
+            return
+
+        group.attrs["tardis_type"] = FRAME
+        self._write_index(group, "columns", value.columns)
+        if len(set(value.dtypes)) == 1 and value.dtypes.iloc[0].kind in "biuf":
+            group.attrs["block"] = True
+            self.write_array(group, "values", value.to_numpy())
+        else:
+            group.attrs["block"] = False
+            for i in range(value.shape[1]):
+                self.write_array(
+                    group, f"column_{i}", value.iloc[:, i].to_numpy()
+                )
+
+    def write_scalars(self, key: str, scalars: Dict[str, Any]) -> None:
+        """
+        Write scalars as attributes of the group `key`.
+
+        Parameters
+        ----------
+        key : str
+            Path of the node inside the file.
+        scalars : dict
+            Property names and their scalar values.
+        """
+        group = self._create_group(key)
+        group.attrs["tardis_type"] = SCALARS
+        for name, value in scalars.items():
+            group.attrs[name] = value
+
+    def write_elements(
+        self, path: str, elements: Dict[str, Any], overwrite: bool
+    ) -> None:
+        """
+        Store TARDIS data under `path`, mirroring
+        `HDFWriterMixin.to_hdf_util`.
+
+        Scalars are stored under path/scalars, arrays, Series and DataFrames
+        under path/property_name. Units are stored as their CGS value.
+
+        Parameters
+        ----------
+        path : str
+            Path inside the file to store the `elements`.
+        elements : dict
+            A dict of property names and their values to be stored.
+        overwrite : bool
+            Passed on to the `to_hdf` method of nested TARDIS objects.
+        """
+        scalars = {}
+        for key, value in elements.items():
+            node = str(Path(path) / key)
+            if value is None:
+                value = "none"
+            if hasattr(value, "cgs"):
+                value = value.cgs.value
+            if np.isscalar(value):
+                scalars[key] = value
+            elif isinstance(value, (pd.Series, pd.DataFrame)):
+                self.write_pandas(node, value)
+            elif isinstance(value, pd.Index):
+                self.write_pandas(node, pd.DataFrame(value))
+            elif hasattr(value, "shape"):
+                if value.ndim <= 2:
+                    group = self._create_group(node)
+                    self.write_array(group, "values", value)
+                else:
+                    self.write_pandas(node, pd.DataFrame(value))
+            else:  # value is a TARDIS object like model, transport or plasma
+                try:
+                    value.to_hdf(self, path, name=key, overwrite=overwrite)
+                except AttributeError:
+                    logger.debug(
+                        "Could not convert VALUE to HDF. Converting DATA (Dataframe) to HDF"
+                    )
+                    self.write_pandas(node, pd.DataFrame([value]))
+
+        self.write_scalars(
+            str(Path(path) / "metadata"), {"tardis_version": __version__}
+        )
+        if scalars:
+            self.write_scalars(str(Path(path) / "scalars"), scalars)
+
+
+def _read_labels(dataset: h5py.Dataset) -> np.ndarray:
+    if h5py.check_string_dtype(dataset.dtype) is not None:
+        return dataset.asstr()[()].astype(object)
+    return dataset[()]
+
+
+def _read_index(group: h5py.Group, prefix: str) -> pd.Index:
+    names = json.loads(group.attrs[f"{prefix}_names"])
+    if f"{prefix}_range" in group.attrs:
+        start, stop, step = group.attrs[f"{prefix}_range"]
+        return pd.RangeIndex(start, stop, step, name=names[0])
+    levels = [
+        _read_labels(group[f"{prefix}_level_{level}"])
+        for level in range(len(names))
+    ]
+    if len(levels) == 1:
+        return pd.Index(levels[0], name=names[0])
+    return pd.MultiIndex.from_arrays(levels, names=names)
+
+
+class ColumnarHDFStore:
+    """
+    Read-only, dict-like access to a file written by `ColumnarWriter`.
+
+    Indexing with a node path returns the same pandas objects as
+    `pandas.HDFStore` does for files written by `to_hdf`. `read_array`
+    reads only the requested rows of a dataset.
+
+    Parameters
+    ----------
+    file_path : str or pathlib.Path
+        Path of the HDF5 file.
+    """
+
+    def __init__(self, file_path: Union[str, Path]) -> None:
+        self.file = h5py.File(file_path, "r")
+
+    def __enter__(self) -> ColumnarHDFStore:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.file
+
+    def keys(self) -> list:
+        """
+        Paths of all stored nodes.
+        """
+        keys = []
+
+        def visit(name: str, obj: Any) -> None:
+            if isinstance(obj, h5py.Group) and (
+                "tardis_type" in obj.attrs or "values" in obj
+            ):
+                keys.append(f"/{name}")
+
+        self.file.visititems(visit)
+        return keys
+
+    def read_array(self, key: str, selection: Any = ()) -> np.ndarray:
+        """
+        Read (part of) the values of a node as a numpy array.
+
+        Parameters
+        ----------
+        key : str
+            Path of the node.
+        selection : slice, tuple or array, optional
+            Selection applied to the dataset, only the chunks it touches
+            are read and decompressed.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        group = self.file[key]
+        if "values" in group:
+            dataset = group["values"]
+        else:
+            dataset = group["column_0"]
+        if h5py.check_string_dtype(dataset.dtype) is not None:
+            return dataset.asstr()[selection]
+        return dataset[selection]
+
+    def __getitem__(self, key: str) -> Union[pd.Series, pd.DataFrame]:
+        group = self.file[key]
+        tardis_type = group.attrs.get("tardis_type", None)
+        if tardis_type == SCALARS:
+            return pd.Series(
+                {
+                    name: value.item() if isinstance(value, np.generic) else value
+                    for name, value in group.attrs.items()
+                    if name != "tardis_type"
+                }
+            )
+        if tardis_type is None:  # plain numpy array
+            values = _read_labels(group["values"])
+            if values.ndim == 1:
+                return pd.Series(values)
+            return pd.DataFrame(values)
+
+        if tardis_type == SERIES:
+            values = _read_labels(group["values"])
+            return pd.Series(
+                values,
+                index=_read_index(group, "index"),
+                name=json.loads(group.attrs["name"]),
+            )
+
+        columns = _read_index(group, "columns")
+        if group.attrs["block"]:
+            return pd.DataFrame(
+                group["values"][()],
+                index=_read_index(group, "index"),
+                columns=columns,
+            )
+        data = {
+            i: _read_labels(group[f"column_{i}"]) for i in range(len(columns))
+        }
+        frame = pd.DataFrame(data, index=_read_index(group, "index"))
+        frame.columns = columns
+        return frame
+
+
+def is_columnar_file(file_path: Union[str, Path]) -> bool:
+    """
+    Check whether a file was written by `ColumnarWriter`.
+
+    Parameters
+    ----------
+    file_path : str or pathlib.Path
+
+    Returns
+    -------
+    bool
+    """
+    try:
+        with h5py.File(file_path, "r") as f:
+            return COLUMNAR_FORMAT_ATTR in f.attrs
+    except OSError:
+        return False
+
+
+def open_simulation_store(
+    file_path: Union[str, Path],
+) -> Union[ColumnarHDFStore, pd.HDFStore]:
+    """
+    Open simulation output written either by `to_hdf` or `ColumnarWriter`.
+
+    Parameters
+    ----------
+    file_path : str or pathlib.Path
+
+    Returns
+    -------
+    ColumnarHDFStore or pandas.HDFStore
+        Read-only store usable as a context manager.
+    """
+    if is_columnar_file(file_path):
+        return ColumnarHDFStore(file_path)
+    return pd.HDFStore(file_path, "r")
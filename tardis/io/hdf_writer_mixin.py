@@ -8,6 +8,7 @@ import numpy as np
 import pandas as pd
 
 from tardis import __version__
+from tardis.io.columnar_store import ColumnarWriter
 from tardis.io.util import logger
 
 
@@ -39,7 +40,7 @@ class HDFWriterMixin:
 
     @staticmethod
     def to_hdf_util(
-        path_or_buf: Union[str, pd.HDFStore],
+        path_or_buf: Union[str, pd.HDFStore, ColumnarWriter],
         path: str,
         elements: Dict[str, Any],
         overwrite: bool,
@@ -58,8 +59,9 @@ class HDFWriterMixin:
 
         Parameters
         ----------
-        path_or_buf : str or pandas.HDFStore
-            Path or buffer to the HDF file.
+        path_or_buf : str, pandas.HDFStore or ColumnarWriter
+            Path or buffer to the HDF file. A ColumnarWriter stores the
+            `elements` as chunked, compressed h5py datasets instead.
         path : str
             Path inside the HDF file to store the `elements`.
         elements : dict
@@ -82,6 +84,10 @@ class HDFWriterMixin:
         FileExistsError
             If the HDF file already exists and overwrite is False.
         """
+        if isinstance(path_or_buf, ColumnarWriter):
+            path_or_buf.write_elements(path, elements, overwrite=overwrite)
+            return
+
         if (
             isinstance(path_or_buf, str)
             and Path(path_or_buf).exists()
@@ -206,7 +212,7 @@ class HDFWriterMixin:
 
     def to_hdf(
         self,
-        file_path_or_buf: Union[str, pd.HDFStore],
+        file_path_or_buf: Union[str, pd.HDFStore, ColumnarWriter],
         path: str = "",
         name: Optional[str] = None,
         overwrite: bool = False,
@@ -217,7 +223,7 @@ class HDFWriterMixin:
 
         Parameters
         ----------
-        file_path_or_buf : str or pandas.HDFStore
+        file_path_or_buf : str, pandas.HDFStore or ColumnarWriter
             Path or buffer to the HDF file.
         path : str, optional
             Path inside the HDF file to store the `elements`, by default "".
@@ -243,6 +249,41 @@ class HDFWriterMixin:
             file_path_or_buf, buff_path, data, overwrite=overwrite, format=format
         )
 
+    def to_columnar(
+        self,
+        file_path: Union[str, Path],
+        path: str = "",
+        name: Optional[str] = None,
+        overwrite: bool = False,
+        **writer_kwargs: Any,
+    ) -> None:
+        """
+        Save the object as chunked, compressed h5py datasets.
+
+        The node layout matches `to_hdf`, the file can be read with
+        `tardis.io.columnar_store.open_simulation_store`.
+
+        Parameters
+        ----------
+        file_path : str or pathlib.Path
+            Path to the HDF file.
+        path : str, optional
+            Path inside the HDF file to store the `elements`, by default "".
+        name : str, optional
+            Group inside the HDF file to which the `elements` need to be saved.
+            If None, will use the class name converted to snake_case.
+        overwrite : bool, optional
+            If the HDF file path already exists, whether to overwrite it or not,
+            by default False.
+        **writer_kwargs
+            Compression, chunking and threading options passed to
+            `tardis.io.columnar_store.ColumnarWriter`.
+        """
+        with ColumnarWriter(
+            file_path, overwrite=overwrite, **writer_kwargs
+        ) as writer:
+            self.to_hdf(writer, path=path, name=name, overwrite=overwrite)
+
 
 class PlasmaWriterMixin(HDFWriterMixin):
     """
@@ -280,7 +321,7 @@ class PlasmaWriterMixin(HDFWriterMixin):
 
     def to_hdf(
         self,
-        file_path_or_buf: Union[str, pd.HDFStore],
+        file_path_or_buf: Union[str, pd.HDFStore, ColumnarWriter],
         path: str = "",
         name: Optional[str] = None,
         collection: Any = None,
@@ -292,7 +333,7 @@ class PlasmaWriterMixin(HDFWriterMixin):
 
         Parameters
         ----------
-        file_path_or_buf : str or pandas.HDFStore
+        file_path_or_buf : str, pandas.HDFStore or ColumnarWriter
             Path or buffer to the HDF file.
         path : str, optional
             Path inside the HDF file to store the `elements`, by default "".
@@ -3,7 +3,6 @@ from pathlib import Path
 
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy import stats
 from tardis.configuration.sorting_globals import SORTING_ALGORITHM
 
 
@@ -119,6 +118,74 @@ class ArepoSnapshot:
         return self.pos, self.vel, self.rho, self.mass, self.nuc_dict, self.time
 
 
+def bin_cells(radius, quantities, bin_edges):
+    """
+    Sums quantities of cells in radial bins. The bins follow
+    scipy.stats.binned_statistic, i.e. the last bin includes its outer
+    edge. Cells outside the bins are ignored.
+
+    Parameters
+    ----------
+    radius : numpy.ndarray
+        Radial position of the cells.
+    quantities : numpy.ndarray
+        Quantities of shape (number of quantities, number of cells).
+    bin_edges : numpy.ndarray
+        Increasing edges of the radial bins.
+
+    Returns
+    -------
+    sums : numpy.ndarray
+        Sums of shape (number of quantities, number of bins).
+    counts : numpy.ndarray
+        Number of cells in each bin.
+    """
+    nbins = len(bin_edges) - 1
+    bin_ids = np.searchsorted(bin_edges, radius, side="right") - 1
+    bin_ids[radius == bin_edges[-1]] = nbins - 1
+    inside = (bin_ids >= 0) & (bin_ids < nbins)
+    bin_ids = bin_ids[inside]
+
+    counts = np.bincount(bin_ids, minlength=nbins)
+    # bin all quantities together by offsetting the bins of each quantity
+    flat_ids = (
+        np.arange(len(quantities))[:, np.newaxis] * nbins + bin_ids
+    ).ravel()
+    sums = np.bincount(
+        flat_ids,
+        weights=quantities[:, inside].ravel(),
+        minlength=len(quantities) * nbins,
+    ).reshape(len(quantities), nbins)
+
+    return sums, counts
+
+
+def get_cone_masks(pos, opening_angle):
+    """
+    Masks of the cells inside a cone around the positive and the negative
+    x-axis.
+
+    Parameters
+    ----------
+    pos : numpy.ndarray
+        Cartesian positions of shape (3, number of cells).
+    opening_angle : float
+        Total opening angle of the cone.
+
+    Returns
+    -------
+    cmask_p, cmask_n : numpy.ndarray
+        Masks of the positive and the negative direction.
+    """
+    # Get maximum allowed r of points to still be in cone
+    dist = np.tan(opening_angle / 2) * np.abs(pos[0])
+    in_cone = np.sqrt(pos[1] ** 2 + pos[2] ** 2) <= dist
+
+    return np.logical_and(pos[0] > 0, in_cone), np.logical_and(
+        pos[0] < 0, in_cone
+    )
+
+
 class Profile:
     """
     Parent class of all Profiles. Contains general function,
@@ -262,11 +329,64 @@ class Profile:
 
         return fig
 
+    def _sort_cells(self, cell_mask, inner_radius, outer_radius):
+        """
+        Sorts the cells in cell_mask by radius with a single permutation
+        and cuts them to the given radii.
+
+        Parameters
+        ----------
+        cell_mask : numpy.ndarray or slice
+            Cells of the profile.
+        inner_radius : float
+            Inner radius where the profile will be cut off.
+        outer_radius : float
+            Outer radius where the profile will be cut off.
+
+        Returns
+        -------
+        pos, vol, mass, rho, vel : numpy.ndarray
+            Sorted profiles.
+        xnuc : dict
+            Sorted profiles of the species.
+        """
+        pos = np.asarray(self.pos).reshape(3, -1)[:, cell_mask]
+        vel = np.asarray(self.vel).reshape(3, -1)[:, cell_mask]
+        radius = np.sqrt(pos[0] ** 2 + pos[1] ** 2 + pos[2] ** 2)
+
+        order = np.argsort(radius, kind=SORTING_ALGORITHM)
+        radius = radius[order]
+
+        if outer_radius is None:
+            outer_radius = radius.max()
+        if inner_radius is None:
+            inner_radius = radius.min()
+
+        mask = np.logical_and(radius >= inner_radius, radius <= outer_radius)
+        if not mask.any():
+            raise ValueError("No points left between inner and outer radius.")
+        cells = order[mask]
+
+        vel = np.sqrt(vel[0] ** 2 + vel[1] ** 2 + vel[2] ** 2)
+        xnuc = {
+            spec: self.xnuc[spec].ravel()[cell_mask][cells]
+            for spec in self.species
+        }
+
+        return (
+            radius[mask],
+            self.vol.ravel()[cell_mask][cells],
+            self.mass.ravel()[cell_mask][cells],
+            self.rho.ravel()[cell_mask][cells],
+            vel[cells],
+            xnuc,
+        )
+
     def rebin(self, nshells):
         """
-        Rebins the data to nshells. Uses the scipy.stats.binned_statistic
-        to bin the data. The standard deviation of each bin can be obtained
-        by passing the statistics="std" keyword.
+        Rebins the data to nshells. The bins follow
+        scipy.stats.binned_statistic and all quantities are binned
+        together with bin_cells.
 
         Parameters
         ----------
@@ -278,98 +398,80 @@ class Profile:
         self : Profile object
 
         """
-        self.vel_prof_p, bins_p = stats.binned_statistic(
+        (
             self.pos_prof_p,
-            self.vel_prof_p * self.mass_prof_p,
-            statistic="mean",
-            bins=nshells,
-        )[:2]
-        self.vel_prof_p /= stats.binned_statistic(
+            self.vel_prof_p,
+            self.xnuc_prof_p,
+            self.mass_prof_p,
+            self.vol_prof_p,
+        ) = self._rebin_direction(
+            nshells,
             self.pos_prof_p,
+            self.vel_prof_p,
             self.mass_prof_p,
-            statistic="mean",
-            bins=nshells,
-        )[0]
-        self.vel_prof_n, bins_n = stats.binned_statistic(
-            self.pos_prof_n,
-            self.vel_prof_n * self.mass_prof_n,
-            statistic="mean",
-            bins=nshells,
-        )[:2]
-        self.vel_prof_n /= stats.binned_statistic(
+            self.xnuc_prof_p,
+        )
+        (
             self.pos_prof_n,
+            self.vel_prof_n,
+            self.xnuc_prof_n,
             self.mass_prof_n,
-            statistic="mean",
-            bins=nshells,
-        )[0]
-
-        for spec in self.species:
-            self.xnuc_prof_p[spec] = (
-                stats.binned_statistic(
-                    self.pos_prof_p,
-                    self.xnuc_prof_p[spec] * self.mass_prof_p,
-                    statistic="mean",
-                    bins=nshells,
-                )[0]
-                / stats.binned_statistic(
-                    self.pos_prof_p,
-                    self.mass_prof_p,
-                    statistic="mean",
-                    bins=nshells,
-                )[0]
-            )
-            self.xnuc_prof_n[spec] = (
-                stats.binned_statistic(
-                    self.pos_prof_n,
-                    self.xnuc_prof_n[spec] * self.mass_prof_n,
-                    statistic="mean",
-                    bins=nshells,
-                )[0]
-                / stats.binned_statistic(
-                    self.pos_prof_n,
-                    self.mass_prof_n,
-                    statistic="mean",
-                    bins=nshells,
-                )[0]
-            )
-
-        self.vol_prof_p = np.array(
-            [
-                4 / 3 * np.pi * (bins_p[i + 1] ** 3 - bins_p[i] ** 3)
-                for i in range(len(bins_p) - 1)
-            ]
-        )
-        self.vol_prof_n = np.array(
-            [
-                4 / 3 * np.pi * (bins_n[i + 1] ** 3 - bins_n[i] ** 3)
-                for i in range(len(bins_n) - 1)
-            ]
-        )
-
-        self.mass_prof_p = stats.binned_statistic(
-            self.pos_prof_p,
-            self.mass_prof_p,
-            statistic="sum",
-            bins=nshells,
-        )[0]
-        self.mass_prof_n = stats.binned_statistic(
+            self.vol_prof_n,
+        ) = self._rebin_direction(
+            nshells,
             self.pos_prof_n,
+            self.vel_prof_n,
             self.mass_prof_n,
-            statistic="sum",
-            bins=nshells,
-        )[0]
+            self.xnuc_prof_n,
+        )
 
         self.rho_prof_p = self.mass_prof_p / self.vol_prof_p
         self.rho_prof_n = self.mass_prof_n / self.vol_prof_n
 
-        self.pos_prof_p = np.array(
-            [(bins_p[i] + bins_p[i + 1]) / 2 for i in range(len(bins_p) - 1)]
-        )
-        self.pos_prof_n = np.array(
-            [(bins_n[i] + bins_n[i + 1]) / 2 for i in range(len(bins_n) - 1)]
+        return self
+
+    def _rebin_direction(self, nshells, pos, vel, mass, xnuc):
+        """
+        Rebins the profile of one direction, see rebin.
+
+        Returns
+        -------
+        pos, vel : numpy.ndarray
+            Bin centres and mass weighted velocities.
+        xnuc : dict
+            Mass weighted species fractions.
+        mass, vol : numpy.ndarray
+            Mass and volume of the bins.
+        """
+        pos_min, pos_max = float(pos.min()), float(pos.max())
+        if pos_min == pos_max:
+            pos_min, pos_max = pos_min - 0.5, pos_max + 0.5
+        bins = np.linspace(pos_min, pos_max, nshells + 1)
+
+        sums, counts = bin_cells(
+            pos,
+            np.vstack(
+                [mass, vel * mass]
+                + [xnuc[spec] * mass for spec in self.species]
+            ),
+            bins,
         )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = sums / counts
 
-        return self
+        xnuc = {
+            spec: means[2 + i] / means[0]
+            for i, spec in enumerate(self.species)
+        }
+        vol = 4 / 3 * np.pi * (bins[1:] ** 3 - bins[:-1] ** 3)
+
+        return (
+            (bins[:-1] + bins[1:]) / 2,
+            means[1] / means[0],
+            xnuc,
+            sums[0],
+            vol,
+        )
 
     def export(
         self,
@@ -537,137 +639,26 @@ class ConeProfile(Profile):
         profile : ConeProfile object
 
         """
-        # Convert Cartesian coordinates into cylindrical coordinates
-        # P(x,y,z) -> P(x,r,theta)
-        cyl = np.array(
-            [
-                self.pos[0],
-                np.sqrt(self.pos[1] ** 2 + self.pos[2] ** 2),
-                np.arctan(self.pos[2] / self.pos[1]),
-            ]
-        )
-
-        # Get maximum allowed r of points to still be in cone
-        dist = np.tan(opening_angle / 2) * np.abs(cyl[0])
-
-        # Create masks
-        cmask_p = np.logical_and(cyl[0] > 0, cyl[1] <= dist)
-        cmask_n = np.logical_and(cyl[0] < 0, cyl[1] <= dist)
-
-        # Apply mask to data
-        pos_p = np.sqrt(
-            (self.pos[0][cmask_p]) ** 2
-            + (self.pos[1][cmask_p]) ** 2
-            + (self.pos[2][cmask_p]) ** 2
-        )
-        pos_n = np.sqrt(
-            self.pos[0][cmask_n] ** 2
-            + self.pos[1][cmask_n] ** 2
-            + self.pos[2][cmask_n] ** 2
+        cmask_p, cmask_n = get_cone_masks(
+            np.asarray(self.pos).reshape(3, -1), opening_angle
         )
 
-        vel_p = np.sqrt(
-            self.vel[0][cmask_p] ** 2
-            + self.vel[1][cmask_p] ** 2
-            + self.vel[2][cmask_p] ** 2
-        )
-        vel_n = np.sqrt(
-            self.vel[0][cmask_n] ** 2
-            + self.vel[1][cmask_n] ** 2
-            + self.vel[2][cmask_n] ** 2
-        )
-
-        vol_p = self.vol[cmask_p]
-        vol_n = self.vol[cmask_n]
-
-        mass_p = self.mass[cmask_p]
-        mass_n = self.mass[cmask_n]
-
-        rho_p = self.rho[cmask_p]
-        rho_n = self.rho[cmask_n]
-
-        spec_p = {}
-        spec_n = {}
-
-        for spec in self.species:
-            spec_p[spec] = self.xnuc[spec][cmask_p]
-            spec_n[spec] = self.xnuc[spec][cmask_n]
-
-        self.pos_prof_p = np.sort(pos_p, kind=SORTING_ALGORITHM)
-        self.pos_prof_n = np.sort(pos_n, kind=SORTING_ALGORITHM)
-
-        if outer_radius is None:
-            maxradius_p = max(self.pos_prof_p)
-            maxradius_n = max(self.pos_prof_n)
-        else:
-            maxradius_p = outer_radius
-            maxradius_n = outer_radius
-
-        if inner_radius is None:
-            minradius_p = min(self.pos_prof_p)
-            minradius_n = min(self.pos_prof_n)
-        else:
-            minradius_p = inner_radius
-            minradius_n = inner_radius
-
-        mask_p = np.logical_and(
-            self.pos_prof_p >= minradius_p, self.pos_prof_p <= maxradius_p
-        )
-        mask_n = np.logical_and(
-            self.pos_prof_n >= minradius_n, self.pos_prof_n <= maxradius_n
-        )
-
-        if not mask_p.any() or not mask_n.any():
-            raise ValueError("No points left between inner and outer radius.")
-
-        self.vol_prof_p = np.array(
-            [x for _, x in sorted(zip(pos_p, vol_p), key=lambda pair: pair[0])]
-        )[mask_p]
-        self.vol_prof_n = np.array(
-            [x for _, x in sorted(zip(pos_n, vol_n), key=lambda pair: pair[0])]
-        )[mask_n]
-
-        self.mass_prof_p = np.array(
-            [x for _, x in sorted(zip(pos_p, mass_p), key=lambda pair: pair[0])]
-        )[mask_p]
-        self.mass_prof_n = np.array(
-            [x for _, x in sorted(zip(pos_n, mass_n), key=lambda pair: pair[0])]
-        )[mask_n]
-
-        self.rho_prof_p = np.array(
-            [x for _, x in sorted(zip(pos_p, rho_p), key=lambda pair: pair[0])]
-        )[mask_p]
-        self.rho_prof_n = np.array(
-            [x for _, x in sorted(zip(pos_n, rho_n), key=lambda pair: pair[0])]
-        )[mask_n]
-
-        self.vel_prof_p = np.array(
-            [x for _, x in sorted(zip(pos_p, vel_p), key=lambda pair: pair[0])]
-        )[mask_p]
-        self.vel_prof_n = np.array(
-            [x for _, x in sorted(zip(pos_n, vel_n), key=lambda pair: pair[0])]
-        )[mask_n]
-
-        for spec in self.species:
-            self.xnuc_prof_p[spec] = np.array(
-                [
-                    x
-                    for _, x in sorted(
-                        zip(pos_p, spec_p[spec]), key=lambda pair: pair[0]
-                    )
-                ]
-            )[mask_p]
-            self.xnuc_prof_n[spec] = np.array(
-                [
-                    x
-                    for _, x in sorted(
-                        zip(pos_n, spec_n[spec]), key=lambda pair: pair[0]
-                    )
-                ]
-            )[mask_n]
-
-        self.pos_prof_p = self.pos_prof_p[mask_p]
-        self.pos_prof_n = self.pos_prof_n[mask_n]
+        (
+            self.pos_prof_p,
+            self.vol_prof_p,
+            self.mass_prof_p,
+            self.rho_prof_p,
+            self.vel_prof_p,
+            self.xnuc_prof_p,
+        ) = self._sort_cells(cmask_p, inner_radius, outer_radius)
+        (
+            self.pos_prof_n,
+            self.vol_prof_n,
+            self.mass_prof_n,
+            self.rho_prof_n,
+            self.vel_prof_n,
+            self.xnuc_prof_n,
+        ) = self._sort_cells(cmask_n, inner_radius, outer_radius)
 
         return self
 
@@ -703,115 +694,163 @@ class FullProfile(Profile):
         profile : FullProfile object
 
         """
-        pos_p = np.sqrt(
-            (self.pos[0]) ** 2 + (self.pos[1]) ** 2 + (self.pos[2]) ** 2
-        ).flatten()
-        pos_n = np.sqrt(
-            self.pos[0] ** 2 + self.pos[1] ** 2 + self.pos[2] ** 2
-        ).flatten()
+        (
+            self.pos_prof_p,
+            self.vol_prof_p,
+            self.mass_prof_p,
+            self.rho_prof_p,
+            self.vel_prof_p,
+            self.xnuc_prof_p,
+        ) = self._sort_cells(slice(None), inner_radius, outer_radius)
 
-        vel_p = np.sqrt(
-            self.vel[0] ** 2 + self.vel[1] ** 2 + self.vel[2] ** 2
-        ).flatten()
-        vel_n = np.sqrt(
-            self.vel[0] ** 2 + self.vel[1] ** 2 + self.vel[2] ** 2
-        ).flatten()
+        # Both directions share the sorted cells
+        self.pos_prof_n = self.pos_prof_p
+        self.vol_prof_n = self.vol_prof_p
+        self.mass_prof_n = self.mass_prof_p
+        self.rho_prof_n = self.rho_prof_p
+        self.vel_prof_n = self.vel_prof_p
+        self.xnuc_prof_n = dict(self.xnuc_prof_p)
 
-        vol_p = self.vol.flatten()
-        vol_n = self.vol.flatten()
+        return self
 
-        mass_p = self.mass.flatten()
-        mass_n = self.mass.flatten()
 
-        rho_p = self.rho.flatten()
-        rho_n = self.rho.flatten()
+class BinnedProfile(Profile):
+    """
+    Class for mass weighted profiles binned directly from the cells of a
+    snapshot. The cells can be added in chunks, so that the profile of a
+    large snapshot can be built without loading all of it into memory.
+    Inside a cone around the x-axis if an opening angle is given, angle
+    averaged otherwise. Extends Profile.
+    """
 
-        spec_p = {}
-        spec_n = {}
+    def __init__(
+        self,
+        species,
+        nshells,
+        inner_radius,
+        outer_radius,
+        time,
+        opening_angle=None,
+    ):
+        """
+        Parameters
+        ----------
+        species : list of str
+            Names of the species of the profile.
+        nshells : int
+            Number of shells between inner and outer radius.
+        inner_radius : float
+            Inner radius of the profile.
+        outer_radius : float
+            Outer radius of the profile.
+        time : float
+            Time of the data
+        opening_angle : float
+            Opening angle of the cone from which the data is extracted,
+            see ConeProfile.create_profile. Default: None
+        """
+        self.species = list(species)
+        self.time = time
+        self.opening_angle = opening_angle
+        self.bin_edges = np.linspace(inner_radius, outer_radius, nshells + 1)
+
+        # Binned mass, velocity times mass and species fractions times mass
+        self.sums_p = np.zeros((2 + len(self.species), nshells))
+        self.sums_n = np.zeros((2 + len(self.species), nshells))
+
+        self.pos_prof_p = self.pos_prof_n = (
+            self.bin_edges[:-1] + self.bin_edges[1:]
+        ) / 2
+        self.vol_prof_p = self.vol_prof_n = (
+            4
+            / 3
+            * np.pi
+            * (self.bin_edges[1:] ** 3 - self.bin_edges[:-1] ** 3)
+        )
+        self._update_profiles()
 
-        for spec in self.species:
-            spec_p[spec] = self.xnuc[spec].flatten()
-            spec_n[spec] = self.xnuc[spec].flatten()
+    def add_cells(self, pos, vel, mass, xnuc):
+        """
+        Adds a chunk of cells to the profile.
 
-        self.pos_prof_p = np.sort(pos_p, kind=SORTING_ALGORITHM)
-        self.pos_prof_n = np.sort(pos_n, kind=SORTING_ALGORITHM)
+        Parameters
+        ----------
+        pos : numpy.ndarray
+            Positions in the center of mass frame of shape
+            (3, number of cells).
+        vel : numpy.ndarray
+            Velocity vectors of shape (3, number of cells).
+        mass : numpy.ndarray
+            Masses of the cells.
+        xnuc : dict
+            Nuclear fractions of the cells for every species of the
+            profile.
 
-        if outer_radius is None:
-            maxradius_p = max(self.pos_prof_p)
-            maxradius_n = max(self.pos_prof_n)
-        else:
-            maxradius_p = outer_radius
-            maxradius_n = outer_radius
+        Returns
+        -------
+        self : BinnedProfile object
+        """
+        radius = np.sqrt(pos[0] ** 2 + pos[1] ** 2 + pos[2] ** 2)
+        vel = np.sqrt(vel[0] ** 2 + vel[1] ** 2 + vel[2] ** 2)
+        quantities = np.vstack(
+            [mass, vel * mass] + [xnuc[spec] * mass for spec in self.species]
+        )
 
-        if inner_radius is None:
-            minradius_p = min(self.pos_prof_p)
-            minradius_n = min(self.pos_prof_n)
+        if self.opening_angle is None:
+            sums = bin_cells(radius, quantities, self.bin_edges)[0]
+            self.sums_p += sums
+            self.sums_n += sums
         else:
-            minradius_p = inner_radius
-            minradius_n = inner_radius
+            cmask_p, cmask_n = get_cone_masks(pos, self.opening_angle)
+            self.sums_p += bin_cells(
+                radius[cmask_p], quantities[:, cmask_p], self.bin_edges
+            )[0]
+            self.sums_n += bin_cells(
+                radius[cmask_n], quantities[:, cmask_n], self.bin_edges
+            )[0]
 
-        mask_p = np.logical_and(
-            self.pos_prof_p >= minradius_p, self.pos_prof_p <= maxradius_p
-        )
-        mask_n = np.logical_and(
-            self.pos_prof_n >= minradius_n, self.pos_prof_n <= maxradius_n
-        )
+        self._update_profiles()
 
-        if not mask_p.any() or not mask_n.any():
-            raise ValueError("No points left between inner and outer radius.")
+        return self
 
-        self.vol_prof_p = np.array(
-            [x for _, x in sorted(zip(pos_p, vol_p), key=lambda pair: pair[0])]
-        )[mask_p]
-        self.vol_prof_n = np.array(
-            [x for _, x in sorted(zip(pos_n, vol_n), key=lambda pair: pair[0])]
-        )[mask_n]
-
-        self.mass_prof_p = np.array(
-            [x for _, x in sorted(zip(pos_p, mass_p), key=lambda pair: pair[0])]
-        )[mask_p]
-        self.mass_prof_n = np.array(
-            [x for _, x in sorted(zip(pos_n, mass_n), key=lambda pair: pair[0])]
-        )[mask_n]
-
-        self.rho_prof_p = np.array(
-            [x for _, x in sorted(zip(pos_p, rho_p), key=lambda pair: pair[0])]
-        )[mask_p]
-        self.rho_prof_n = np.array(
-            [x for _, x in sorted(zip(pos_n, rho_n), key=lambda pair: pair[0])]
-        )[mask_n]
-
-        self.vel_prof_p = np.array(
-            [x for _, x in sorted(zip(pos_p, vel_p), key=lambda pair: pair[0])]
-        )[mask_p]
-        self.vel_prof_n = np.array(
-            [x for _, x in sorted(zip(pos_n, vel_n), key=lambda pair: pair[0])]
-        )[mask_n]
+    def _update_profiles(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.mass_prof_p = self.sums_p[0]
+            self.vel_prof_p = self.sums_p[1] / self.sums_p[0]
+            self.rho_prof_p = self.mass_prof_p / self.vol_prof_p
+            self.xnuc_prof_p = {
+                spec: self.sums_p[2 + i] / self.sums_p[0]
+                for i, spec in enumerate(self.species)
+            }
+            self.mass_prof_n = self.sums_n[0]
+            self.vel_prof_n = self.sums_n[1] / self.sums_n[0]
+            self.rho_prof_n = self.mass_prof_n / self.vol_prof_n
+            self.xnuc_prof_n = {
+                spec: self.sums_n[2 + i] / self.sums_n[0]
+                for i, spec in enumerate(self.species)
+            }
 
-        for spec in self.species:
-            self.xnuc_prof_p[spec] = np.array(
-                [
-                    x
-                    for _, x in sorted(
-                        zip(pos_p, spec_p[spec]), key=lambda pair: pair[0]
-                    )
-                ]
-            )[mask_p]
-            self.xnuc_prof_n[spec] = np.array(
-                [
-                    x
-                    for _, x in sorted(
-                        zip(pos_n, spec_n[spec]), key=lambda pair: pair[0]
-                    )
-                ]
-            )[mask_n]
+    def rebin(self, nshells):
+        """
+        The profile is binned when the cells are added, so it can only
+        be exported with its own number of shells.
 
-        self.pos_prof_p = self.pos_prof_p[mask_p]
-        self.pos_prof_n = self.pos_prof_n[mask_n]
+        Parameters
+        ----------
+        nshells : int
+            Number of shells, has to be the one of the profile.
 
+        Returns
+        -------
+        self : BinnedProfile object
+        """
+        if nshells != len(self.pos_prof_p):
+            raise ValueError(
+                f"BinnedProfile has {len(self.pos_prof_p):d} shells, "
+                f"can not rebin to {nshells:d}"
+            )
         return self
 
-
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
 
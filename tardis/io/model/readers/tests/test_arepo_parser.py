@@ -124,3 +124,48 @@ def test_cone_profile(get_cone_csvy_model, get_cone_reference_data):
 @pytest.mark.ignore_generate
 def test_full_profile(get_full_csvy_model, get_full_reference_data):
     assert get_full_csvy_model == get_full_reference_data
+
+
+@pytest.mark.parametrize("opening_angle", [None, 40])
+def test_binned_profile_chunks(opening_angle):
+    rng = np.random.default_rng(1872)
+    pos = rng.normal(0, 1e11, (3, 5000))
+    vel = pos * 1e-2
+    mass = rng.uniform(1.0, 3.0, 5000)
+    xnuc = {"ni56": rng.uniform(size=5000), "si28": rng.uniform(size=5000)}
+
+    profile = arepo.BinnedProfile(
+        ["ni56", "si28"], 20, 1e10, 2e11, 1.0, opening_angle=opening_angle
+    )
+    for chunk in np.array_split(np.arange(5000), 7):
+        profile.add_cells(
+            pos[:, chunk],
+            vel[:, chunk],
+            mass[chunk],
+            {spec: fractions[chunk] for spec, fractions in xnuc.items()},
+        )
+
+    if opening_angle is None:
+        reference = arepo.FullProfile(pos, vel, mass, mass, xnuc, 1.0)
+        reference.create_profile()
+    else:
+        reference = arepo.ConeProfile(pos, vel, mass, mass, xnuc, 1.0)
+        reference.create_profile(opening_angle=opening_angle)
+
+    sums, counts = arepo.bin_cells(
+        reference.pos_prof_n,
+        np.vstack(
+            [
+                reference.mass_prof_n,
+                reference.xnuc_prof_n["si28"] * reference.mass_prof_n,
+            ]
+        ),
+        profile.bin_edges,
+    )
+    np.testing.assert_allclose(profile.mass_prof_n, sums[0], rtol=1e-13)
+    np.testing.assert_allclose(
+        profile.xnuc_prof_n["si28"], sums[1] / sums[0], rtol=1e-13
+    )
+    assert counts.sum() < 5000
+    with pytest.raises(ValueError):
+        profile.rebin(10)
@@ -0,0 +1,142 @@
+import logging
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from astropy import units as u
+from numpy.testing import assert_array_equal
+
+from tardis import __version__
+from tardis.io.columnar_store import (
+    ColumnarHDFStore,
+    ColumnarWriter,
+    open_simulation_store,
+    resolve_compression,
+)
+from tardis.io.hdf_writer_mixin import HDFWriterMixin
+
+
+class MockHDF(HDFWriterMixin):
+    hdf_properties = ["property"]
+
+    def __init__(self, property):
+        self.property = property
+
+
+class MockNestedHDF(HDFWriterMixin):
+    hdf_properties = ["inner", "packet_nus", "t_inner"]
+    hdf_name = "simulation"
+
+    def __init__(self, inner, packet_nus, t_inner):
+        self.inner = inner
+        self.packet_nus = packet_nus
+        self.t_inner = t_inner
+
+
+mock_df = pd.DataFrame(
+    {
+        "one": pd.Series([1.0, 2.0, 3.0], index=["a", "b", "c"]),
+        "two": pd.Series([1.0, 2.0, 3.0, 4.0], index=["a", "b", "c", "d"]),
+    }
+)
+mock_mixed_df = pd.DataFrame(
+    {"line_id": [10, 11, 12], "species": ["H I", "He II", "Si II"]},
+    index=pd.MultiIndex.from_tuples(
+        [(1, 0, 0), (2, 1, 0), (14, 1, 3)],
+        names=["atomic_number", "ion_number", "level_number"],
+    ),
+)
+complex_objects = [
+    np.array([4.0e14, 2, 2e14, 27.5]),
+    pd.Series([1.0, 2.0, 3.0], index=[3, 4, 5], name="w"),
+    mock_df,
+    mock_mixed_df,
+    pd.DataFrame(np.arange(12.0).reshape(3, 4)),
+]
+
+
+@pytest.mark.parametrize("attr", complex_objects)
+def test_complex_obj_roundtrip(tmpdir, attr):
+    fname = str(tmpdir.mkdir("data").join("test.h5"))
+    actual = MockHDF(attr)
+    actual.to_columnar(fname, path="test")
+    with ColumnarHDFStore(fname) as store:
+        expected = store["/test/mock_hdf/property"]
+        assert __version__ == store["/test/mock_hdf/metadata"]["tardis_version"]
+
+    if isinstance(attr, np.ndarray):
+        assert_array_equal(expected.to_numpy(), attr)
+    elif isinstance(attr, pd.Series):
+        pd.testing.assert_series_equal(expected, attr)
+    else:
+        pd.testing.assert_frame_equal(expected, attr)
+
+
+@pytest.mark.parametrize("n_threads", [1, 3])
+@pytest.mark.parametrize("shape", [(1000,), (257, 3)])
+def test_chunked_write_partial_read(tmpdir, n_threads, shape):
+    fname = str(tmpdir.mkdir("data").join("test.h5"))
+    values = np.random.default_rng(0).random(shape)
+    with ColumnarWriter(
+        fname, compression="gzip", chunk_nbytes=800, n_threads=n_threads
+    ) as writer:
+        MockHDF(values).to_hdf(writer, path="test")
+
+    with ColumnarHDFStore(fname) as store:
+        assert store.file["/test/mock_hdf/property/values"].chunks[0] < shape[0]
+        assert_array_equal(store["/test/mock_hdf/property"].to_numpy(), values)
+        assert_array_equal(
+            store.read_array("/test/mock_hdf/property", slice(90, 110)),
+            values[90:110],
+        )
+
+
+def test_nested_write_matches_hdfstore_layout(tmpdir):
+    data_dir = tmpdir.mkdir("data")
+    nested = MockNestedHDF(
+        MockHDF(pd.Series([1.0, 2.0])),
+        np.array([1e14, 2e14]) * u.Hz,
+        10000 * u.K,
+    )
+    nested.to_hdf(str(data_dir.join("pandas.h5")))
+    nested.to_columnar(str(data_dir.join("columnar.h5")), compression="lzf")
+
+    with open_simulation_store(str(data_dir.join("pandas.h5"))) as pandas_store:
+        with open_simulation_store(
+            str(data_dir.join("columnar.h5"))
+        ) as columnar_store:
+            assert isinstance(columnar_store, ColumnarHDFStore)
+            for key in [
+                "/simulation/packet_nus",
+                "/simulation/inner/property",
+            ]:
+                assert_array_equal(
+                    columnar_store[key].to_numpy(),
+                    pandas_store[key].to_numpy(),
+                )
+            assert (
+                columnar_store["/simulation/scalars"].t_inner
+                == pandas_store["/simulation/scalars"].t_inner
+            )
+
+
+def test_columnar_overwrite(tmpdir):
+    fname = str(tmpdir.mkdir("data").join("test.h5"))
+    MockHDF(np.arange(3)).to_columnar(fname)
+    with pytest.raises(FileExistsError):
+        MockHDF(np.arange(3)).to_columnar(fname)
+    MockHDF(np.arange(3)).to_columnar(fname, overwrite=True)
+
+
+def test_auto_compression_without_hdf5plugin(tmpdir, monkeypatch, caplog):
+    monkeypatch.setitem(sys.modules, "hdf5plugin", None)
+    fname = str(tmpdir.mkdir("data").join("test.h5"))
+    with caplog.at_level(logging.INFO, logger="tardis.io.util"):
+        assert resolve_compression("auto") == "lzf"
+    assert "lzf" in caplog.text
+    assert resolve_compression(None) is None
+
+    MockHDF(np.arange(3.0)).to_columnar(fname)
+    with ColumnarHDFStore(fname) as store:
+        assert store.file["/mock_hdf/property/values"].compression == "lzf"
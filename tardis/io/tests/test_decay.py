@@ -1,9 +1,11 @@
+import numpy as np
 import pandas as pd
 import pytest
 from astropy import units as u
+from radioactivedecay import Inventory
 from numpy.testing import assert_almost_equal
 
-from tardis.model.matter.decay import IsotopicMassFraction
+from tardis.model.matter.decay import IsotopeDecaySolver, IsotopicMassFraction
 
 
 @pytest.fixture
@@ -50,3 +52,110 @@ def test_abundance_merge(
     )
     assert_almost_equal(combined_df.loc[30][1], raw_abundance_simple.loc[30][1])
     assert_almost_equal(combined_df.loc[26][0], isotope_df.loc[26][0])
+
+
+def test_decay_solver_matches_inventories(
+    simple_abundance_model: IsotopicMassFraction,
+) -> None:
+    decay_times = np.array([1.0, 10.0, 100.0])
+    shell_masses = np.array([1.0, 2.0]) * u.g
+    isotope_masses = simple_abundance_model._get_isotope_masses(shell_masses)
+    decay_solver = IsotopeDecaySolver(simple_abundance_model.index)
+
+    decayed_masses = decay_solver.decay(isotope_masses, decay_times, "d")
+    cumulative_decays = decay_solver.cumulative_decays(
+        isotope_masses, decay_times, "d"
+    )
+
+    inventories = simple_abundance_model.to_inventories(shell_masses)
+    for time_index, decay_time in enumerate(decay_times):
+        for shell, inventory in enumerate(inventories):
+            expected_masses = inventory.decay(decay_time, "d").masses("g")
+            expected_decays = inventory.cumulative_decays(decay_time, "d")
+            for progeny_index, nuclide in enumerate(
+                decay_solver.progeny_nuclides
+            ):
+                assert (
+                    decayed_masses[time_index, progeny_index, shell]
+                    == expected_masses[nuclide]
+                )
+                assert cumulative_decays[
+                    time_index, progeny_index, shell
+                ] == expected_decays.get(nuclide, 0.0)
+
+
+def test_ni56_co56_fe56_chain_matches_inventory_decay() -> None:
+    index = pd.MultiIndex.from_tuples(
+        [(26, 56), (27, 56), (28, 56)], names=["atomic_number", "mass_number"]
+    )
+    mass_fractions = IsotopicMassFraction(
+        [[0.0, 0.1, 0.2], [0.0, 0.3, 0.3], [1.0, 0.6, 0.5]], index=index
+    )
+
+    decayed_mass_fractions = mass_fractions.calculate_decayed_mass_fractions(
+        50 * u.day
+    )
+    number_of_decays = mass_fractions.calculate_number_of_decays(
+        50 * u.day, np.array([1.0, 2.0, 3.0]) * u.g
+    )
+
+    nuclides = ["Fe-56", "Co-56", "Ni-56"]
+    for shell in range(3):
+        shell_mass_fractions = mass_fractions[shell].to_numpy()
+        expected_masses = (
+            Inventory(dict(zip(nuclides, shell_mass_fractions)), "g")
+            .decay(50, "d")
+            .masses("g")
+        )
+        expected_decays = Inventory(
+            dict(zip(nuclides, shell_mass_fractions * (shell + 1.0))), "g"
+        ).cumulative_decays(50, "d")
+
+        for isotope, nuclide in zip(index, nuclides):
+            assert (
+                decayed_mass_fractions.loc[isotope, shell]
+                == expected_masses[nuclide]
+            )
+        for isotope, nuclide in zip(index[1:], nuclides[1:]):
+            assert (
+                number_of_decays.loc[isotope, shell] == expected_decays[nuclide]
+            )
+    # Fe-56 is stable
+    assert (26, 56) not in number_of_decays.index
+
+
+def test_metastable_progeny_are_summed() -> None:
+    # Fe-52 decays to Mn-52m, which decays to Mn-52 and Cr-52
+    index = pd.MultiIndex.from_tuples(
+        [(26, 52)], names=["atomic_number", "mass_number"]
+    )
+    mass_fractions = IsotopicMassFraction([[1.0, 0.5]], index=index)
+    shell_masses = np.array([1.0, 2.0]) * u.g
+
+    decayed_mass_fractions = mass_fractions.calculate_decayed_mass_fractions(
+        1 * u.day
+    )
+    number_of_decays = mass_fractions.calculate_number_of_decays(
+        1 * u.day, shell_masses
+    )
+
+    for shell in range(2):
+        fe52_mass = mass_fractions.loc[(26, 52), shell]
+        expected_masses = (
+            Inventory({"Fe52": fe52_mass}, "g").decay(1, "d").masses("g")
+        )
+        expected_decays = Inventory(
+            {"Fe52": fe52_mass * (shell + 1.0)}, "g"
+        ).cumulative_decays(1, "d")
+
+        assert decayed_mass_fractions.loc[(25, 52), shell] == pytest.approx(
+            expected_masses["Mn-52"] + expected_masses["Mn-52m"], rel=1e-14
+        )
+        assert number_of_decays.loc[(25, 52), shell] == pytest.approx(
+            expected_decays["Mn-52"] + expected_decays["Mn-52m"], rel=1e-14
+        )
+        assert number_of_decays.loc[(26, 52), shell] == pytest.approx(
+            expected_decays["Fe-52"], rel=1e-14
+        )
+    # the metastable state dominates the decays after one day
+    assert number_of_decays.loc[(25, 52), 0] > 1e21
@@ -1,14 +1,269 @@
 import logging
 
+import numpy as np
 import pandas as pd
 from astropy import units as u
-from radioactivedecay import Inventory, Nuclide
-from radioactivedecay.utils import Z_to_elem, elem_to_Z
+from radioactivedecay import DEFAULTDATA, Inventory, Nuclide
+from radioactivedecay.converters import (
+    QuantityConverterFloat,
+    UnitConverterFloat,
+)
+from radioactivedecay.utils import Z_to_elem, parse_nuclide
+from scipy import sparse
+
 from tardis.configuration.sorting_globals import SORTING_ALGORITHM
 
 logger = logging.getLogger(__name__)
 
 
+class _RadioactiveDecayData:
+    """
+    Decay-chain matrices of a radioactivedecay dataset.
+
+    All access to radioactivedecay internals (the SciPy decay data and
+    the float converters) is kept here, so that changes of those internals
+    between radioactivedecay versions only affect this adapter.
+
+    Parameters
+    ----------
+    decay_data : radioactivedecay.DecayData
+        Decay dataset.
+    """
+
+    def __init__(self, decay_data):
+        self.decay_data = decay_data
+        scipy_data = decay_data.scipy_data
+        self.matrix_c = scipy_data.matrix_c
+        self.matrix_c_inv = scipy_data.matrix_c_inv
+        self.matrix_e = scipy_data.matrix_e
+        self.atomic_masses = scipy_data.atomic_masses
+        self.decay_constants = scipy_data.decay_consts
+        self.nuclides = decay_data.nuclides
+
+    def nuclide_id(self, atomic_number, mass_number):
+        """
+        Index of the nuclide in the dataset, by atomic and mass number.
+        """
+        nuclide = parse_nuclide(
+            f"{Z_to_elem(atomic_number)}{mass_number}",
+            self.decay_data.nuclides,
+            self.decay_data.dataset_name,
+        )
+        return self.decay_data.nuclide_dict[nuclide]
+
+    def progeny_ids(self, nuclide_id):
+        """
+        Indices of the nuclide and of all nuclides in its decay chain.
+        """
+        return self.matrix_c[:, nuclide_id].nonzero()[0]
+
+    def bateman_matrix(self, nuclide_ids, diagonal):
+        """
+        C E C^-1 with the diagonal entries of E of the nuclides replaced.
+
+        Parameters
+        ----------
+        nuclide_ids : numpy.ndarray
+            Indices of the nuclides whose diagonal entries are set.
+        diagonal : numpy.ndarray
+            Diagonal entries of E of these nuclides.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+        """
+        matrix_e = self.matrix_e.copy()
+        matrix_e.data[nuclide_ids] = diagonal
+        return self.matrix_c @ matrix_e @ self.matrix_c_inv
+
+    @staticmethod
+    def mass_to_number(masses, atomic_masses):
+        return QuantityConverterFloat.mass_to_number(masses, atomic_masses)
+
+    @staticmethod
+    def number_to_mass(numbers, atomic_masses):
+        return QuantityConverterFloat.number_to_mass(numbers, atomic_masses)
+
+    def to_seconds(self, times, units):
+        return UnitConverterFloat.time_unit_conv(
+            times, units, "s", self.decay_data.float_year_conv
+        )
+
+
+class IsotopeDecaySolver:
+    """
+    Decay of the isotopes of all shells with one decay-chain matrix.
+
+    The Bateman solution of radioactivedecay, N(t) = C E(t) C^-1 N(0), is
+    reduced once to the isotopes present (columns) and their progeny
+    (rows). Each decay time then needs a single sparse matrix product
+    applied to the (isotope x shell) array, instead of one
+    `radioactivedecay.Inventory` per shell. The matrices and the order of
+    the arithmetic are those of `Inventory.decay` and
+    `Inventory.cumulative_decays`, so the results are identical.
+
+    Parameters
+    ----------
+    isotope_index : pandas.MultiIndex
+        Atomic and mass numbers of the isotopes present.
+    decay_data : radioactivedecay.DecayData, optional
+        Decay dataset, by default the radioactivedecay default dataset.
+    """
+
+    def __init__(self, isotope_index, decay_data=DEFAULTDATA):
+        self.isotope_index = isotope_index
+        self.decay_data = _RadioactiveDecayData(decay_data)
+
+        self.isotope_ids = np.array(
+            [
+                self.decay_data.nuclide_id(atomic_number, mass_number)
+                for atomic_number, mass_number in isotope_index
+            ],
+            dtype=np.int64,
+        )
+
+        self.progeny_ids = np.unique(
+            np.concatenate(
+                [
+                    self.decay_data.progeny_ids(isotope_id)
+                    for isotope_id in self.isotope_ids
+                ]
+            )
+        ).astype(np.int64)
+        self.progeny_nuclides = self.decay_data.nuclides[self.progeny_ids]
+        self.progeny_decay_constants = self.decay_data.decay_constants[
+            self.progeny_ids
+        ]
+
+        self._column_map = np.full(
+            self.decay_data.matrix_c.shape[1], -1, dtype=np.int64
+        )
+        self._column_map[self.isotope_ids] = np.arange(len(self.isotope_ids))
+
+    def _decay_matrix(self, nuclide_ids, diagonal):
+        """
+        Reduce C E C^-1 to the rows of the progeny and the isotope columns.
+
+        Entries of other columns multiply zero initial abundances, so
+        dropping them, while keeping the order of the remaining entries,
+        leaves the products with the initial abundances unchanged.
+        """
+        decay_matrix = self.decay_data.bateman_matrix(nuclide_ids, diagonal)[
+            self.progeny_ids
+        ]
+        number_of_progeny = len(self.progeny_ids)
+        columns = self._column_map[decay_matrix.indices]
+        is_isotope = columns >= 0
+        rows = np.repeat(
+            np.arange(number_of_progeny), np.diff(decay_matrix.indptr)
+        )
+        row_lengths = np.bincount(
+            rows[is_isotope], minlength=number_of_progeny
+        )
+
+        return sparse.csr_matrix(
+            (
+                decay_matrix.data[is_isotope],
+                columns[is_isotope],
+                np.append(0, np.cumsum(row_lengths)),
+            ),
+            shape=(number_of_progeny, len(self.isotope_ids)),
+        )
+
+    def _to_number(self, isotope_masses):
+        atomic_masses = self.decay_data.atomic_masses[self.isotope_ids]
+        return self.decay_data.mass_to_number(
+            np.asarray(isotope_masses, dtype=np.float64),
+            atomic_masses[:, np.newaxis],
+        )
+
+    def _decay_times(self, decay_times, units):
+        return self.decay_data.to_seconds(
+            np.atleast_1d(np.asarray(decay_times, dtype=np.float64)), units
+        )
+
+    def decay(self, isotope_masses, decay_times, units="s"):
+        """
+        Decay the isotope masses of all shells for every decay time.
+
+        Parameters
+        ----------
+        isotope_masses : numpy.ndarray
+            Masses in g (or mass fractions) of the isotopes, of shape
+            (number of isotopes, number of shells).
+        decay_times : float or numpy.ndarray
+            Decay time or times.
+        units : str, optional
+            Units of the decay times, by default seconds.
+
+        Returns
+        -------
+        numpy.ndarray
+            Masses of the progeny (`progeny_nuclides`), of shape
+            (number of decay times, number of progeny, number of shells).
+        """
+        number_of_atoms = self._to_number(isotope_masses)
+        progeny_atomic_masses = self.decay_data.atomic_masses[
+            self.progeny_ids
+        ]
+
+        decayed_masses = []
+        for decay_time in self._decay_times(decay_times, units):
+            decay_matrix = self._decay_matrix(
+                self.progeny_ids,
+                np.exp(-decay_time * self.progeny_decay_constants),
+            )
+            decayed_masses.append(
+                self.decay_data.number_to_mass(
+                    decay_matrix @ number_of_atoms,
+                    progeny_atomic_masses[:, np.newaxis],
+                )
+            )
+
+        return np.array(decayed_masses)
+
+    def cumulative_decays(self, isotope_masses, decay_times, units="s"):
+        """
+        Number of decays of every unstable progeny since the initial time.
+
+        Parameters
+        ----------
+        isotope_masses : numpy.ndarray
+            Masses in g of the isotopes, of shape
+            (number of isotopes, number of shells).
+        decay_times : float or numpy.ndarray
+            Decay time or times.
+        units : str, optional
+            Units of the decay times, by default seconds.
+
+        Returns
+        -------
+        numpy.ndarray
+            Number of decays of the progeny (`progeny_nuclides`), of shape
+            (number of decay times, number of progeny, number of shells).
+            Stable progeny have no decays.
+        """
+        number_of_atoms = self._to_number(isotope_masses)
+        decay_constants = self.progeny_decay_constants
+        is_unstable = decay_constants > 0.0
+        unstable_ids = self.progeny_ids[is_unstable]
+
+        cumulative_decays = []
+        for decay_time in self._decay_times(decay_times, units):
+            decay_matrix = self._decay_matrix(
+                unstable_ids,
+                (1.0 - np.exp(-decay_time * decay_constants[is_unstable]))
+                / decay_constants[is_unstable],
+            )
+            decays = decay_constants[:, np.newaxis] * (
+                decay_matrix @ number_of_atoms
+            )
+            decays[~is_unstable] = 0.0
+            cumulative_decays.append(decays)
+
+        return np.array(cumulative_decays)
+
+
 class IsotopicMassFraction(pd.DataFrame):
     _metadata = ["time_0"]
 
@@ -59,6 +314,23 @@ class IsotopicMassFraction(pd.DataFrame):
         nuclide = Nuclide(atomic_id)
         return nuclide.Z, nuclide.A
 
+    @classmethod
+    def _from_progeny(cls, nuclides, values):
+        """
+        Index the values of decay progeny by atomic and mass number.
+
+        The values of nuclides sharing the atomic and mass number (ground
+        and metastable states) are summed.
+        """
+        index = pd.MultiIndex.from_tuples(
+            [cls.id_to_tuple(nuclide) for nuclide in nuclides],
+            names=["atomic_number", "mass_number"],
+        )
+        progeny = pd.DataFrame(
+            values, index=index, columns=range(values.shape[1])
+        )
+        return progeny.groupby(level=[0, 1], sort=True).sum()
+
     def to_inventories(self, shell_masses=None):
         """
         Convert DataFrame to a list of inventories interpreting the MultiIndex as
@@ -69,22 +341,32 @@ class IsotopicMassFraction(pd.DataFrame):
         list
             list of radioactivedecay Inventories
         """
-        comp_dicts = [{} for i in range(len(self.columns))]
-        for (atomic_number, mass_number), abundances in self.iterrows():
-            nuclear_symbol = f"{Z_to_elem(atomic_number)}{mass_number}"
-            for i in range(len(self.columns)):
-                if shell_masses is None:
-                    comp_dicts[i][nuclear_symbol] = abundances[i]
-                else:
-                    comp_dicts[i][nuclear_symbol] = (
-                        abundances[i] * shell_masses[i].to(u.g).value
-                    )
-        return [Inventory(comp_dict, "g") for comp_dict in comp_dicts]
+        nuclear_symbols = [
+            f"{Z_to_elem(atomic_number)}{mass_number}"
+            for atomic_number, mass_number in self.index
+        ]
+        masses = self._get_isotope_masses(shell_masses)
+        return [
+            Inventory(dict(zip(nuclear_symbols, shell_masses_g)), "g")
+            for shell_masses_g in masses.T
+        ]
+
+    def _get_isotope_masses(self, shell_masses=None):
+        """
+        Isotope mass fractions, or masses in g if shell_masses is given,
+        as an array of shape (number of isotopes, number of shells).
+        """
+        masses = self.to_numpy(dtype=np.float64)
+        if shell_masses is not None:
+            masses = masses * u.Quantity(shell_masses).to(u.g).value
+        return masses
 
     def calculate_decayed_mass_fractions(self, time_decay):
         """
         Decay the Model
 
+        All shells are decayed at once with an `IsotopeDecaySolver`.
+
         Parameters
         ----------
         t : float or astropy.units.Quantity
@@ -95,7 +377,6 @@ class IsotopicMassFraction(pd.DataFrame):
         pandas.DataFrame
             Decayed abundances
         """
-        inventories = self.to_inventories()
         t_second = (
             u.Quantity(time_decay, u.day).to(u.s).value
             - self.time_0.to(u.s).value
@@ -107,10 +388,14 @@ class IsotopicMassFraction(pd.DataFrame):
                 " A negative decay time can potentially lead to negative abundances.",
                 t_second,
             )
-        decayed_inventories = [
-            item.decay(t_second, "s") for item in inventories
-        ]
-        df = IsotopicMassFraction.from_inventories(decayed_inventories)
+        decay_solver = IsotopeDecaySolver(self.index)
+        decayed_masses = decay_solver.decay(
+            self._get_isotope_masses(), t_second, "s"
+        )[0]
+
+        df = IsotopicMassFraction(
+            self._from_progeny(decay_solver.progeny_nuclides, decayed_masses)
+        )
         df = df.sort_index(kind=SORTING_ALGORITHM)
         assert df.ge(0.0).all().all(), (
             "Negative abundances detected. Please make sure your input abundances are correct."
@@ -121,6 +406,8 @@ class IsotopicMassFraction(pd.DataFrame):
         """
         Calculate the number of decays over a given time period for each shell.
 
+        All shells are decayed at once with an `IsotopeDecaySolver`.
+
         Parameters
         ----------
         time_decay : astropy.units.Quantity
@@ -133,34 +420,26 @@ class IsotopicMassFraction(pd.DataFrame):
         -------
         pandas.DataFrame
             A DataFrame of decays indexed by (atomic_number, mass_number),
-            with columns representing the decays in each shell.
+            with columns representing the decays in each shell. The decays
+            of the ground and metastable states of a nuclide are summed.
         """
         # Convert the time to days for radioactivedecay
         t_days = u.Quantity(time_decay, u.day).value
 
-        # Get inventories for each shell. If shell_masses is provided,
-        # each inventory is in grams of isotopes.
-        inventories = self.to_inventories(shell_masses)
-
-        decays_dict = {}
-        for shell_index, inventory in enumerate(inventories):
-            shell_decays = inventory.cumulative_decays(t_days, "d")
-            for isotope, dec_count in shell_decays.items():
-                element_symbol, massno_str = isotope.split("-")
-                atomic_number = elem_to_Z(element_symbol)
-                mass_number = int(massno_str)
-                decays_dict[(atomic_number, mass_number, shell_index)] = (
-                    dec_count
-                )
+        # If shell_masses is provided, the isotopes are in grams.
+        decay_solver = IsotopeDecaySolver(self.index)
+        decays = decay_solver.cumulative_decays(
+            self._get_isotope_masses(shell_masses), t_days, "d"
+        )[0]
 
-        # Build a decays DataFrame
-        decays_df = pd.DataFrame.from_dict(
-            decays_dict, orient="index", columns=["decays"]
+        # Stable progeny have no decays
+        is_unstable = decay_solver.progeny_decay_constants > 0.0
+        decays_df = self._from_progeny(
+            decay_solver.progeny_nuclides[is_unstable], decays[is_unstable]
         )
-        decays_df.index = pd.MultiIndex.from_tuples(
-            decays_df.index, names=["atomic_number", "mass_number", "cell_id"]
+        decays_df = decays_df.rename_axis(columns="cell_id").sort_index(
+            kind=SORTING_ALGORITHM
         )
-        decays_df = decays_df["decays"].unstack(level="cell_id").fillna(0)
 
         return decays_df
 
@@ -122,7 +122,7 @@ class IonPopulationSolver:
         new_electron_energy_distribution = thermal_electron_energy_distribution
 
         for iteration in range(self.max_solver_iterations):
-            self.rates_matrices = self.rate_matrix_solver.solve(
+            self.rates_matrices = self.rate_matrix_solver.solve_stacked(
                 radiation_field,
                 new_electron_energy_distribution,
                 lte_level_population.loc[lower_ion_level_index],
@@ -133,25 +133,29 @@ class IonPopulationSolver:
                 boltzmann_factor,
                 charge_conservation,
             )
-            solved_matrices = pd.DataFrame(
-                index=self.rates_matrices.index,
-                columns=self.rates_matrices.columns,
+            rate_matrix_index = pd.Index(
+                list(self.rates_matrices.keys()), name="atomic_number"
             )
-            for cell in elemental_number_density.columns:
-                balance_vector = self.__calculate_balance_vector(
-                    elemental_number_density[cell],
-                    self.rates_matrices.index,
-                    charge_conservation,
-                )
-                solved_matrix = self.rates_matrices[cell].apply(
-                    np.linalg.solve, args=(balance_vector,)
-                )
-                solved_matrices[cell] = solved_matrix
+            balance_vectors = np.stack(
+                [
+                    self.__calculate_balance_vector(
+                        elemental_number_density[cell],
+                        rate_matrix_index,
+                        charge_conservation,
+                    )
+                    for cell in elemental_number_density.columns
+                ]
+            )
+            # batched solve over all cells of the first element
+            rates_matrices = next(iter(self.rates_matrices.values()))
+            solved_matrices = np.linalg.solve(
+                rates_matrices, balance_vectors[..., np.newaxis]
+            )[..., 0]
 
             ion_population_solution = pd.DataFrame(
-                np.vstack(solved_matrices.values[0]).T,
+                solved_matrices.T,
                 index=estimated_ion_population.index,
-                columns=self.rates_matrices.columns,
+                columns=elemental_number_density.columns,
             )
 
             if (ion_population_solution < 0).any().any():
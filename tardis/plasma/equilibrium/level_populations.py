@@ -3,14 +3,18 @@ import pandas as pd
 
 
 class LevelPopulationSolver:
-    def __init__(self, rates_matrices: pd.DataFrame, levels: pd.DataFrame):
+    def __init__(
+        self, rates_matrices: pd.DataFrame | dict, levels: pd.DataFrame
+    ):
         """Solve the normalized level population values from the rate matrices.
 
         Parameters
         ----------
-        rates_matrices : pd.DataFrame
+        rates_matrices : pd.DataFrame or dict
             DataFrame of rate matrices indexed by atomic number and ion number,
-            with each column being a cell.
+            with each column being a cell, or rate matrices of shape
+            (n_cells, n_levels, n_levels) keyed by (atomic_number, ion_number)
+            as returned by `RateMatrix.solve_stacked`.
         levels : pd.DataFrame
             DataFrame of energy levels.
         """
@@ -23,19 +27,42 @@ class LevelPopulationSolver:
         Parameters
         ----------
         rates_matrix : np.ndarray
-            The rate matrix for a given species and cell.
+            The rate matrix for a given species and cell, or a stack of rate
+            matrices of shape (n_cells, n_levels, n_levels).
 
         Returns
         -------
         np.ndarray
-            The normalized, per-level population.
+            The normalized, per-level population, of shape (n_cells, n_levels)
+            for stacked rate matrices.
         """
-        normalized_ion_population = np.zeros(rates_matrix.shape[0])
-        normalized_ion_population[0] = 1.0
+        normalized_ion_population = np.zeros(rates_matrix.shape[:-1] + (1,))
+        normalized_ion_population[..., 0, 0] = 1.0
         normalized_level_population = np.linalg.solve(
             rates_matrix, normalized_ion_population
         )
-        return normalized_level_population
+        return normalized_level_population[..., 0]
+
+    def __stacked_rates_matrices(self):
+        """Rate matrices of every species stacked over the cells.
+
+        Returns
+        -------
+        dict
+            Rate matrices of shape (n_cells, n_levels, n_levels) keyed by
+            (atomic_number, ion_number).
+        pd.Index
+            Cell labels.
+        """
+        if isinstance(self.rates_matrices, pd.DataFrame):
+            stacked_rates_matrices = {
+                species_id: np.stack(matrices.values).astype(np.float64)
+                for species_id, matrices in self.rates_matrices.iterrows()
+            }
+            return stacked_rates_matrices, self.rates_matrices.columns
+
+        number_of_cells = len(next(iter(self.rates_matrices.values())))
+        return self.rates_matrices, pd.RangeIndex(number_of_cells)
 
     def solve(self):
         """Solves the normalized level population values from the rate matrices.
@@ -46,22 +73,17 @@ class LevelPopulationSolver:
             Normalized level population values indexed by atomic number, ion
             number and level number. Columns are cells.
         """
+        stacked_rates_matrices, columns = self.__stacked_rates_matrices()
         normalized_level_populations = pd.DataFrame(
             index=self.levels.index,
-            columns=self.rates_matrices.columns,
+            columns=columns,
             dtype=np.float64,
         )
 
-        # try converting the set of vectors into a single 2D array and then applying index
-        for species_id in self.rates_matrices.index:
-            # TODO: resolve the chained assignment here. Maybe an intermediate df
-            # is needed
-
-            solved_matrices = self.rates_matrices.loc[species_id].apply(
-                self.__calculate_level_population
+        # one batched solve per species covers all cells
+        for species_id, rates_matrices in stacked_rates_matrices.items():
+            normalized_level_populations.loc[species_id, :] = (
+                self.__calculate_level_population(rates_matrices).T
             )
-            normalized_level_populations.loc[species_id, :] = np.vstack(
-                solved_matrices.values
-            ).T
 
         return normalized_level_populations
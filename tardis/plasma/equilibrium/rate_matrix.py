@@ -1,6 +1,81 @@
 import numpy as np
 import pandas as pd
-from scipy.sparse import coo_matrix
+
+
+def assemble_rate_matrices(rates, destination, source, number_of_states):
+    """Scatter rate coefficients of all cells into stacked rate matrices.
+
+    Rates sharing a (destination, source) pair are summed. The diagonal is
+    set to the negative total rate out of each state.
+
+    Parameters
+    ----------
+    rates : np.ndarray
+        Rate coefficients of shape (n_rates, n_cells).
+    destination : np.ndarray
+        Destination state index of each rate.
+    source : np.ndarray
+        Source state index of each rate.
+    number_of_states : int
+        Number of states of the species.
+
+    Returns
+    -------
+    np.ndarray
+        Rate matrices of shape (n_cells, number_of_states, number_of_states).
+    """
+    rates = np.asarray(rates, dtype=np.float64)
+    number_of_cells = rates.shape[1]
+    matrix_size = number_of_states * number_of_states
+    flat_index = (
+        np.asarray(destination, dtype=np.int64) * number_of_states
+        + np.asarray(source, dtype=np.int64)
+    )
+    # one bincount over all cells, rates are offset by one matrix per cell
+    stacked_index = (
+        np.arange(number_of_cells, dtype=np.int64)[:, np.newaxis] * matrix_size
+        + flat_index[np.newaxis, :]
+    )
+    rate_matrices = np.bincount(
+        stacked_index.ravel(),
+        weights=rates.T.ravel(),
+        minlength=number_of_cells * matrix_size,
+    ).reshape(number_of_cells, number_of_states, number_of_states)
+
+    diagonal = np.arange(number_of_states)
+    rate_matrices[:, diagonal, diagonal] = -rate_matrices.sum(axis=1)
+    return rate_matrices
+
+
+def stacked_to_dataframe(stacked_rate_matrices, columns, index_names):
+    """Convert stacked rate matrices to a DataFrame of per-cell matrices.
+
+    Parameters
+    ----------
+    stacked_rate_matrices : dict
+        Rate matrices of shape (n_cells, n, n) keyed by species.
+    columns : pd.Index
+        Cell labels.
+    index_names : list
+        Names of the species index levels.
+
+    Returns
+    -------
+    pd.DataFrame
+        A DataFrame of rate matrices indexed by species, with each column
+        being a cell. Each entry is a numpy array.
+    """
+    species_ids = list(stacked_rate_matrices.keys())
+    if len(index_names) > 1:
+        index = pd.MultiIndex.from_tuples(species_ids, names=index_names)
+    else:
+        index = pd.Index(species_ids, name=index_names[0])
+
+    data = np.empty((len(species_ids), len(columns)), dtype=object)
+    for row, matrices in enumerate(stacked_rate_matrices.values()):
+        for shell in range(len(columns)):
+            data[row, shell] = matrices[shell]
+    return pd.DataFrame(data, index=index, columns=columns)
 
 
 class RateMatrix:
@@ -21,12 +96,12 @@ class RateMatrix:
         self.rate_solvers = rate_solvers
         self.levels = levels
 
-    def solve(
+    def _assemble(
         self,
         radiation_field,
         thermal_electron_energy_distribution,
     ):
-        """Construct the compiled rate matrix dataframe.
+        """Construct the rate matrices of all cells as stacked arrays.
 
         Parameters
         ----------
@@ -38,9 +113,11 @@ class RateMatrix:
 
         Returns
         -------
-        pd.DataFrame
-            A DataFrame of rate matrices indexed by atomic number and ion number,
-            with each column being a cell.
+        dict
+            Rate matrices of shape (n_cells, n_levels, n_levels) keyed by
+            (atomic_number, ion_number).
+        pd.Index
+            Cell labels.
         """
         required_arg = {
             "radiative": radiation_field,
@@ -75,37 +152,86 @@ class RateMatrix:
 
         rates_df = sum(rates_df_list)
 
+        rates = rates_df.to_numpy(dtype=np.float64)
+        destination = rates_df.index.get_level_values(
+            "level_number_destination"
+        ).to_numpy()
+        source = rates_df.index.get_level_values("level_number_source").to_numpy()
+        number_of_levels = self.levels.energy.groupby(
+            level=("atomic_number", "ion_number")
+        ).count()
+
+        stacked_rate_matrices = {}
         grouped_rates_df = rates_df.groupby(
             level=("atomic_number", "ion_number")
         )
+        for species_id, positions in grouped_rates_df.indices.items():
+            rate_matrices = assemble_rate_matrices(
+                rates[positions],
+                destination[positions],
+                source[positions],
+                number_of_levels.loc[species_id],
+            )
+            rate_matrices[:, 0, :] = 1
+            stacked_rate_matrices[species_id] = rate_matrices
 
-        rate_matrices = pd.DataFrame(
-            index=grouped_rates_df.groups.keys(), columns=rates_df.columns
-        )
+        return stacked_rate_matrices, rates_df.columns
 
-        for species_id, rates in grouped_rates_df:
-            number_of_levels = self.levels.energy.loc[species_id].count()
-            for shell in range(len(rates.columns)):
-                matrix = coo_matrix(
-                    (
-                        rates[shell],
-                        (
-                            rates.index.get_level_values(
-                                "level_number_destination"
-                            ),
-                            rates.index.get_level_values("level_number_source"),
-                        ),
-                    ),
-                    shape=(number_of_levels, number_of_levels),
-                )
-                matrix_array = matrix.toarray()
-                np.fill_diagonal(matrix_array, -np.sum(matrix_array, axis=0))
-                matrix_array[0, :] = 1
-                rate_matrices.loc[species_id, shell] = matrix_array
+    def solve_stacked(
+        self,
+        radiation_field,
+        thermal_electron_energy_distribution,
+    ):
+        """Construct the rate matrices of all cells as stacked arrays.
 
-        rate_matrices.index.names = ["atomic_number", "ion_number"]
+        The result can be passed to `LevelPopulationSolver` in place of the
+        rate matrix dataframe returned by `solve`.
 
-        return rate_matrices
+        Parameters
+        ----------
+        radiation_field : RadiationField
+            Radiation field containing radiative temperature.
+        thermal_electron_energy_distribution : ThermalElectronEnergyDistribution
+            Distribution of electrons in the plasma, containing electron energies,
+            temperatures and number densities.
+
+        Returns
+        -------
+        dict
+            Rate matrices of shape (n_cells, n_levels, n_levels) keyed by
+            (atomic_number, ion_number).
+        """
+        return self._assemble(
+            radiation_field, thermal_electron_energy_distribution
+        )[0]
+
+    def solve(
+        self,
+        radiation_field,
+        thermal_electron_energy_distribution,
+    ):
+        """Construct the compiled rate matrix dataframe.
+
+        Parameters
+        ----------
+        radiation_field : RadiationField
+            Radiation field containing radiative temperature.
+        thermal_electron_energy_distribution : ThermalElectronEnergyDistribution
+            Distribution of electrons in the plasma, containing electron energies,
+            temperatures and number densities.
+
+        Returns
+        -------
+        pd.DataFrame
+            A DataFrame of rate matrices indexed by atomic number and ion number,
+            with each column being a cell.
+        """
+        stacked_rate_matrices, columns = self._assemble(
+            radiation_field, thermal_electron_energy_distribution
+        )
+        return stacked_to_dataframe(
+            stacked_rate_matrices, columns, ["atomic_number", "ion_number"]
+        )
 
 
 class IonRateMatrix:
@@ -129,7 +255,7 @@ class IonRateMatrix:
             collisional_ionization_rate_solver
         )
 
-    def __calculate_total_grouped_rates(self, rates_df):
+    def __calculate_total_rates(self, rates_df):
         """Helper function to calculate the total rates from the
         photoionization and recombination rates.
 
@@ -142,51 +268,20 @@ class IonRateMatrix:
         Returns
         -------
         pd.DataFrame
-            A DataFrame of grouped total rates indexed by atomic number and ion number,
-            with each column being a cell.
+            A DataFrame of total rates indexed by atomic number, ion number,
+            source ion number and destination ion number, with each column
+            being a cell.
         """
-        return (
-            rates_df.groupby(
-                level=(
-                    "atomic_number",
-                    "ion_number",
-                    "ion_number_source",
-                    "ion_number_destination",
-                )
+        return rates_df.groupby(
+            level=(
+                "atomic_number",
+                "ion_number",
+                "ion_number_source",
+                "ion_number_destination",
             )
-            .sum()
-            .groupby(level=("atomic_number"))
-        )
-
-    def __construct_rate_matrix(self, rate, cell, ion_states):
-        """Construct a sparse rate matrix from the rates.
-
-        Parameters
-        ----------
-        rate : pd.DataFrame
-            Rate DataFrame indexed by atomic number and ion number
-        cell : int
-            Cell index
-        ion_states : int
-            Number of ion states for the atomic number
-
-        Returns
-        -------
-        coo_matrix
-            A sparse matrix representing the ionization rate for the given cell.
-        """
-        return coo_matrix(
-            (
-                rate[cell],
-                (
-                    rate.index.get_level_values("ion_number_destination"),
-                    rate.index.get_level_values("ion_number_source"),
-                ),
-            ),
-            shape=(ion_states, ion_states),
-        )
+        ).sum()
 
-    def solve(
+    def _assemble(
         self,
         radiation_field,
         thermal_electron_energy_distribution,
@@ -198,7 +293,7 @@ class IonRateMatrix:
         boltzmann_factor,
         charge_conservation=False,
     ):
-        """Compute the ionization rate matrix.
+        """Compute the ionization rate matrices of all cells as stacked arrays.
 
         Parameters
         ----------
@@ -219,9 +314,12 @@ class IonRateMatrix:
 
         Returns
         -------
-        pd.DataFrame
-            A DataFrame of rate matrices indexed by atomic number and ion number,
-            with each column being a cell. Each entry is a numpy array.
+        dict
+            Rate matrices of shape (n_cells, n_ion_states, n_ion_states) keyed
+            by atomic number. With charge conservation each matrix has an
+            additional leading row and trailing column.
+        pd.Index
+            Cell labels.
         """
         photoion_rates_df, recomb_rates_df = (
             self.radiative_ionization_rate_solver.solve(
@@ -251,73 +349,108 @@ class IonRateMatrix:
             )
         )
 
-        grouped_photoion_rates_df = self.__calculate_total_grouped_rates(
-            photoion_rates_df
-        )
-        grouped_recomb_rates_df = self.__calculate_total_grouped_rates(
-            recomb_rates_df
-        )
-
-        grouped_collisional_ionization_rates_df = (
-            self.__calculate_total_grouped_rates(
-                collisional_ionization_rates_df
-            )
+        # rates sharing a transition are summed when scattered, so all
+        # processes can be assembled in one pass
+        rates_df = pd.concat(
+            [
+                self.__calculate_total_rates(rates_df)
+                for rates_df in (
+                    photoion_rates_df,
+                    recomb_rates_df,
+                    collisional_ionization_rates_df,
+                    collision_recombination_rates_df,
+                )
+            ]
         )
-        grouped_collisional_recombination_rates_df = (
-            self.__calculate_total_grouped_rates(
-                collision_recombination_rates_df
+        rates = rates_df.to_numpy(dtype=np.float64)
+        destination = rates_df.index.get_level_values(
+            "ion_number_destination"
+        ).to_numpy()
+        source = rates_df.index.get_level_values("ion_number_source").to_numpy()
+
+        stacked_rate_matrices = {}
+        for atomic_number, positions in sorted(
+            rates_df.groupby(level="atomic_number").indices.items()
+        ):
+            ion_states = atomic_number + 1
+            rate_matrices = assemble_rate_matrices(
+                rates[positions],
+                destination[positions],
+                source[positions],
+                ion_states,
             )
-        )
+            rate_matrices[:, 1, :] = 1
+            if charge_conservation:
+                charge_conservation_row = np.hstack(
+                    (np.arange(0, ion_states), -1)
+                )
+                rate_matrices = np.pad(rate_matrices, ((0, 0), (1, 0), (0, 1)))
+                rate_matrices[:, 0, :] = charge_conservation_row
+            stacked_rate_matrices[atomic_number] = rate_matrices
 
-        rate_matrices = pd.DataFrame(
-            index=grouped_photoion_rates_df.groups.keys(),
-            columns=photoion_rates_df.columns,
-        )
+        return stacked_rate_matrices, photoion_rates_df.columns
 
-        for atomic_number in grouped_photoion_rates_df.groups.keys():
-            photoion_rates = grouped_photoion_rates_df.get_group(atomic_number)
-            recomb_rates = grouped_recomb_rates_df.get_group(atomic_number)
-            coll_ion_rates = grouped_collisional_ionization_rates_df.get_group(
-                atomic_number
-            )
-            recomb_ion_rates = (
-                grouped_collisional_recombination_rates_df.get_group(
-                    atomic_number
-                )
-            )
-            ion_states = atomic_number + 1
-            for shell in range(len(photoion_rates.columns)):
-                photoion_matrix = self.__construct_rate_matrix(
-                    photoion_rates, shell, ion_states
-                )
-                recomb_matrix = self.__construct_rate_matrix(
-                    recomb_rates, shell, ion_states
-                )
-                coll_ion_matrix = self.__construct_rate_matrix(
-                    coll_ion_rates, shell, ion_states
-                )
-                coll_recomb_matrix = self.__construct_rate_matrix(
-                    recomb_ion_rates, shell, ion_states
-                )
+    def solve_stacked(self, *args, **kwargs):
+        """Compute the ionization rate matrices of all cells as stacked arrays.
+
+        Takes the same arguments as `solve`.
+
+        Returns
+        -------
+        dict
+            Rate matrices of shape (n_cells, n_ion_states, n_ion_states) keyed
+            by atomic number.
+        """
+        return self._assemble(*args, **kwargs)[0]
+
+    def solve(
+        self,
+        radiation_field,
+        thermal_electron_energy_distribution,
+        lte_level_population,
+        level_population,
+        lte_ion_population,
+        ion_population,
+        partition_function,
+        boltzmann_factor,
+        charge_conservation=False,
+    ):
+        """Compute the ionization rate matrix.
+
+        Parameters
+        ----------
+        radiation_field : RadiationField
+            A radiation field that can compute its mean intensity.
+        thermal_electron_energy_distribution : ThermalElectronEnergyDistribution
+            Electron properties.
+        lte_level_population : pd.DataFrame
+            LTE level number density. Columns are cells.
+        level_population : pd.DataFrame
+            Estimated level number density. Columns are cells.
+        lte_ion_population : pd.DataFrame
+            LTE ion number density. Columns are cells.
+        ion_population : pd.DataFrame
+            Estimated ion number density. Columns are cells.
+        charge_conservation : bool, optional
+            Whether to include a charge conservation row in the rate matrix.
 
-                matrix_array = (
-                    photoion_matrix
-                    + recomb_matrix
-                    + coll_ion_matrix
-                    + coll_recomb_matrix
-                ).toarray()
-                np.fill_diagonal(matrix_array, -np.sum(matrix_array, axis=0))
-                matrix_array[1, :] = 1
-                if charge_conservation:
-                    charge_conservation_row = np.hstack(
-                        (np.arange(0, ion_states), -1)
-                    )
-                    matrix_array = np.pad(matrix_array, ((0, 0), (0, 1)))
-                    matrix_array = np.vstack(
-                        (charge_conservation_row, matrix_array)
-                    )
-                rate_matrices.loc[atomic_number, shell] = matrix_array
-
-        rate_matrices.index.names = ["atomic_number"]
-
-        return rate_matrices
+        Returns
+        -------
+        pd.DataFrame
+            A DataFrame of rate matrices indexed by atomic number and ion number,
+            with each column being a cell. Each entry is a numpy array.
+        """
+        stacked_rate_matrices, columns = self._assemble(
+            radiation_field,
+            thermal_electron_energy_distribution,
+            lte_level_population,
+            level_population,
+            lte_ion_population,
+            ion_population,
+            partition_function,
+            boltzmann_factor,
+            charge_conservation,
+        )
+        return stacked_to_dataframe(
+            stacked_rate_matrices, columns, ["atomic_number"]
+        )
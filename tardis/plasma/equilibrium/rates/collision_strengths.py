@@ -1,7 +1,13 @@
 import numpy as np
 import pandas as pd
 from astropy import units as u
-from scipy.interpolate import PchipInterpolator, splev, splrep
+from scipy.interpolate import (
+    BSpline,
+    PchipInterpolator,
+    make_interp_spline,
+    splev,
+    splrep,
+)
 from scipy.special import exp1
 from tardis.configuration.sorting_globals import SORTING_ALGORITHM
 
@@ -134,10 +140,83 @@ class UpsilonChiantiSolver:
     ):
         self.upsilon_lu_data = upsilon_data
 
+        scaling_types = upsilon_data["ttype"].to_numpy(dtype=np.int64).copy()
+        scaling_types[scaling_types > 5] -= 5
+        if np.any(scaling_types > 4):
+            raise ValueError(
+                "Not sure what to do with scaling type greater than 4"
+            )
+        self.scaling_types = scaling_types
+        self.scaling_constants = upsilon_data["cups"].to_numpy(dtype=float)
+        self.delta_energies = upsilon_data["delta_e"].to_numpy(dtype=float)
+        self.g_lower = upsilon_data["g_l"].to_numpy(dtype=float)
+
+        # The interpolating splines of all transitions with the same number
+        # of knots share their knot vector, so their coefficients are
+        # computed once per group and only the basis is evaluated in solve.
+        y_knots = upsilon_data["bscups"].to_numpy()
+        no_of_knots = np.array([len(knots) for knots in y_knots])
+        self.spline_groups = []
+        for group_no_of_knots in np.unique(no_of_knots):
+            positions = np.flatnonzero(no_of_knots == group_no_of_knots)
+            spline = make_interp_spline(
+                np.linspace(0, 1, group_no_of_knots),
+                np.stack(y_knots[positions], axis=1).astype(float),
+                k=3,
+            )
+            self.spline_groups.append((positions, spline.t, spline.c))
+
+    def scaled_coordinates(self, t_electrons):
+        """Burgess & Tully 1992 reduced temperatures and the factors that
+        turn the interpolated reduced collision strengths into Upsilon.
+
+        Parameters
+        ----------
+        t_electrons : np.ndarray
+            1D array of electron temperatures
+
+        Returns
+        -------
+        x : np.ndarray
+            Reduced temperatures, shape (no_of_transitions, no_of_temperatures)
+        upsilon_factor : np.ndarray
+            Factors of the same shape
+        """
+        kt = K_B_EV * np.atleast_1d(t_electrons)
+        energy_ratio = kt[np.newaxis, :] / self.delta_energies[:, np.newaxis]
+        scaling_constants = np.broadcast_to(
+            self.scaling_constants[:, np.newaxis], energy_ratio.shape
+        )
+
+        x = np.empty_like(energy_ratio)
+        upsilon_factor = np.ones_like(energy_ratio)
+
+        log_scaled = np.isin(self.scaling_types, (1, 4))
+        x[log_scaled] = 1 - np.log(scaling_constants[log_scaled]) / np.log(
+            energy_ratio[log_scaled] + scaling_constants[log_scaled]
+        )
+        x[~log_scaled] = energy_ratio[~log_scaled] / (
+            energy_ratio[~log_scaled] + scaling_constants[~log_scaled]
+        )
+
+        type_1 = self.scaling_types == 1
+        upsilon_factor[type_1] = np.log(energy_ratio[type_1] + np.exp(1))
+        type_3 = self.scaling_types == 3
+        upsilon_factor[type_3] = 1 / (energy_ratio[type_3] + 1)
+        type_4 = self.scaling_types == 4
+        upsilon_factor[type_4] = np.log(
+            energy_ratio[type_4] + scaling_constants[type_4]
+        )
+
+        return x, upsilon_factor
+
     def upsilon_scaling(self, row, t_electrons):
         """Scales Upsilon from Chianti data using equations
         23-38 from Burgess & Tully 1992 - A&A 254, 436B.
 
+        Evaluates a single transition, `solve` evaluates all transitions
+        at once with the cached spline coefficients.
+
         Parameters
         ----------
         row : pd.Series
@@ -214,10 +293,19 @@ class UpsilonChiantiSolver:
         pd.DataFrame
             DataFrame with columns of Upsilon / g_lower per transition and temperature.
         """
-        upsilon_g_lu = self.upsilon_lu_data.apply(
-            self.upsilon_scaling,
-            axis=1,
-            args=(t_electrons.value,),
+        x, upsilon_factor = self.scaled_coordinates(t_electrons.value)
+        reduced_upsilon = np.empty_like(x)
+        for positions, knots, coefficients in self.spline_groups:
+            no_of_coefficients = coefficients.shape[0]
+            basis = BSpline(knots, np.eye(no_of_coefficients), 3)(
+                x[positions].ravel()
+            ).reshape(len(positions), x.shape[1], no_of_coefficients)
+            reduced_upsilon[positions] = np.einsum(
+                "tjk,kt->tj", basis, coefficients
+            )
+
+        upsilon_g_lu = (
+            reduced_upsilon * upsilon_factor / self.g_lower[:, np.newaxis]
         )
         return pd.DataFrame(
             upsilon_g_lu,
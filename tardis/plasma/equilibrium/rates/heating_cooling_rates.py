@@ -8,7 +8,7 @@ from tardis.plasma.electron_energy_distribution import (
 )
 from tardis.plasma.radiation_field import DilutePlanckianRadiationField
 from tardis.transport.montecarlo.estimators.util import (
-    integrate_array_by_blocks,
+    BlockIntegrationOperator,
 )
 
 
@@ -37,50 +37,55 @@ class BoundFreeThermalRates:
         self.photoionization_index = (
             self.photoionization_cross_sections.index.unique()
         )
+        self.integration_operator = BlockIntegrationOperator(
+            self.nu, self.photoionization_block_references
+        )
 
-    def solve(
+        # the frequency dependent factors do not change between calls
+        nu_i = self.photoionization_cross_sections.nu.groupby(
+            level=[0, 1, 2]
+        ).first()
+        self.nu_is = nu_i.loc[
+            self.photoionization_cross_sections.index
+        ].to_numpy()
+        x_sect = self.photoionization_cross_sections["x_sect"].to_numpy()
+        # Lucy 03 eq 58
+        self.heating_coefficient_factor = (
+            4 * np.pi * x_sect * self.nu**3 * const.h.cgs.value
+            / const.c.cgs.value**2
+        ) * (1 - self.nu_is / self.nu)
+        # Lucy 03 eq 59
+        self.cooling_coefficient_factor = (
+            8 * np.pi * x_sect * (self.nu**3) * const.h.cgs.value
+            / const.c.cgs.value**2
+        ) * (1 - self.nu_is / self.nu)
+        # Lymann continuum handling
+        self.lyman_continuum_mask = self.photoionization_index.isin(
+            [(1, 0, 0)]
+        )
+
+    def heating_rate(
         self,
         level_population: pd.DataFrame,
-        ion_population: pd.DataFrame,
-        thermal_electron_distribution: ThermalElectronEnergyDistribution,
-        level_population_ratio: pd.DataFrame,
         radiation_field: DilutePlanckianRadiationField | None = None,
         bound_free_heating_estimator: pd.DataFrame | None = None,
-        stimulated_recombination_estimator: pd.DataFrame | None = None,
-    ) -> tuple[pd.Series, pd.Series]:
-        """Compute the bound-free heating and cooling rates.
+    ) -> pd.Series:
+        """Compute the bound-free heating rate, Lucy 03 eq 58.
 
         Parameters
         ----------
         level_population : pd.DataFrame
             Estimated level number density. Columns represent cells.
-        ion_population : pd.DataFrame
-            Estimated ion number density. Columns represent cells.
-        thermal_electron_distribution : ThermalElectronEnergyDistribution
-            Electron energy distribution containing the number density, temperature and energy.
-        level_population_ratio : pd.DataFrame
-            Saha factor for the ion populations as defined in Lucy 03 equation 14. Columns represent cells.
         radiation_field : RadiationField, optional
             A radiation field that can compute its mean intensity.
         bound_free_heating_estimator : pd.DataFrame, optional
             Montecarlo bound free heating estimator. Columns represent cells, by default None
-        stimulated_recombination_estimator : pd.DataFrame, optional
-            Montecarlo stimulated recombination estimator. Columns represent cells, by default None
 
         Returns
         -------
-        tuple[pd.Series, pd.Series]
-            Heating and cooling rates for the bound-free process for all cells.
+        pd.Series
+            Bound-free heating rate for all cells.
         """
-        nu_i = self.photoionization_cross_sections.nu.groupby(
-            level=[0, 1, 2]
-        ).first()
-        nu_is = nu_i.loc[self.photoionization_cross_sections.index].to_numpy()
-        n_cells = level_population.columns
-
-        ### HEATING
-        # Lucy 03 eq 58
-
         if bound_free_heating_estimator is not None:
             # TODO: check if this is correct
             integrated_heating_coefficient = bound_free_heating_estimator
@@ -89,26 +94,13 @@ class BoundFreeThermalRates:
                 self.nu * u.Hz
             )
 
-            # Makes broadcasting easier
-            one_dimensional_coefficient = (
-                4
-                * np.pi
-                * self.photoionization_cross_sections["x_sect"].to_numpy()
-                * self.nu**3
-                * const.h.cgs.value
-                / const.c.cgs.value**2
-            ) * (1 - nu_is / self.nu)
-
             heating_coefficient = (
-                one_dimensional_coefficient[:, np.newaxis] * mean_intensities
+                self.heating_coefficient_factor[:, np.newaxis]
+                * mean_intensities
             )
 
             integrated_heating_coefficient = pd.DataFrame(
-                integrate_array_by_blocks(
-                    heating_coefficient,
-                    self.nu,
-                    self.photoionization_block_references,
-                ),
+                self.integration_operator.integrate(heating_coefficient),
                 index=self.photoionization_index,
             )
         else:
@@ -116,83 +108,210 @@ class BoundFreeThermalRates:
                 "Either bound_free_heating_estimator or radiation_field must be provided."
             )
 
-        heating_rate = (
+        return (
             integrated_heating_coefficient
             * level_population.loc[integrated_heating_coefficient.index]
         ).sum()
 
-        ### COOLING
-        # Lucy 03 eq 59
+    def integrated_cooling_coefficient(
+        self, electron_temperature: np.ndarray, temperature_derivative=False
+    ) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+        """Compute the spontaneous recombination cooling coefficient
+        integrated over each photoionization edge, Lucy 03 eq 59.
 
-        # Calculate Boltzmann factor
-        boltzmann_factor = np.exp(
+        Parameters
+        ----------
+        electron_temperature : np.ndarray
+            Electron temperature in K for all cells.
+        temperature_derivative : bool, optional
+            Also return the derivative of the coefficient with respect to the
+            electron temperature, by default False
+
+        Returns
+        -------
+        np.ndarray or tuple[np.ndarray, np.ndarray]
+            Integrated cooling coefficient of shape (n_levels, n_cells), and
+            its temperature derivative if requested. The Lyman continuum
+            coefficient is zero.
+        """
+        electron_temperature = np.asarray(electron_temperature)
+        h_nu_over_k_t = (
             -self.nu[:, np.newaxis]
-            * u.Hz
-            / thermal_electron_distribution.temperature[np.newaxis, :]
-            * (const.h.cgs / const.k_B.cgs)
+            / electron_temperature[np.newaxis, :]
+            * (const.h.cgs.value / const.k_B.cgs.value)
         )
+        cooling_coefficient = self.cooling_coefficient_factor[
+            :, np.newaxis
+        ] * np.exp(h_nu_over_k_t)
 
-        spontaneous_recombination_cooling_coefficient = pd.DataFrame(
-            (
-                8
-                * np.pi
-                * self.photoionization_cross_sections["x_sect"].to_numpy()[
-                    :, np.newaxis
-                ]
-                * (self.nu[:, np.newaxis] ** 3)
-                * const.h.cgs.value
-                / const.c.cgs.value**2
-            )
-            * (1 - nu_is[:, np.newaxis] / self.nu[:, np.newaxis])
-            * boltzmann_factor
+        integrated_cooling_coefficient = self.integration_operator.integrate(
+            cooling_coefficient
+        )
+        integrated_cooling_coefficient[self.lyman_continuum_mask] = 0.0
+        if not temperature_derivative:
+            return integrated_cooling_coefficient
+
+        # d/dT exp(-h nu / k T) = h nu / (k T^2) exp(-h nu / k T)
+        integrated_cooling_derivative = self.integration_operator.integrate(
+            cooling_coefficient
+            * (-h_nu_over_k_t / electron_temperature[np.newaxis, :])
+        )
+        integrated_cooling_derivative[self.lyman_continuum_mask] = 0.0
+        return integrated_cooling_coefficient, integrated_cooling_derivative
+
+    def solve(
+        self,
+        level_population: pd.DataFrame,
+        ion_population: pd.DataFrame,
+        thermal_electron_distribution: ThermalElectronEnergyDistribution,
+        level_population_ratio: pd.DataFrame,
+        radiation_field: DilutePlanckianRadiationField | None = None,
+        bound_free_heating_estimator: pd.DataFrame | None = None,
+        stimulated_recombination_estimator: pd.DataFrame | None = None,
+    ) -> tuple[pd.Series, pd.Series]:
+        """Compute the bound-free heating and cooling rates.
+
+        Parameters
+        ----------
+        level_population : pd.DataFrame
+            Estimated level number density. Columns represent cells.
+        ion_population : pd.DataFrame
+            Estimated ion number density. Columns represent cells.
+        thermal_electron_distribution : ThermalElectronEnergyDistribution
+            Electron energy distribution containing the number density, temperature and energy.
+        level_population_ratio : pd.DataFrame
+            Saha factor for the ion populations as defined in Lucy 03 equation 14. Columns represent cells.
+        radiation_field : RadiationField, optional
+            A radiation field that can compute its mean intensity.
+        bound_free_heating_estimator : pd.DataFrame, optional
+            Montecarlo bound free heating estimator. Columns represent cells, by default None
+        stimulated_recombination_estimator : pd.DataFrame, optional
+            Montecarlo stimulated recombination estimator. Columns represent cells, by default None
+
+        Returns
+        -------
+        tuple[pd.Series, pd.Series]
+            Heating and cooling rates for the bound-free process for all cells.
+        """
+        ### HEATING
+        heating_rate = self.heating_rate(
+            level_population, radiation_field, bound_free_heating_estimator
         )
 
-        integrated_cooling_coefficient = pd.DataFrame(
-            integrate_array_by_blocks(
-                spontaneous_recombination_cooling_coefficient.values,
-                self.nu,
-                self.photoionization_block_references,
+        ### COOLING
+        integrated_cooling_coefficient = self.integrated_cooling_coefficient(
+            thermal_electron_distribution.temperature.cgs.value
+        )
+        cooling_rate = pd.Series(
+            self.recombination_cooling_rate(
+                integrated_cooling_coefficient,
+                *self.recombination_cooling_factors(
+                    ion_population,
+                    thermal_electron_distribution,
+                    level_population_ratio,
+                    stimulated_recombination_estimator,
+                ),
             ),
-            index=self.photoionization_index,
+            index=level_population.columns,
         )
 
-        # Lymann continuum handling
-        integrated_cooling_coefficient.loc[(1, 0, 0)] = 0.0
+        return heating_rate, cooling_rate
 
+    def recombination_cooling_factors(
+        self,
+        ion_population: pd.DataFrame,
+        thermal_electron_distribution: ThermalElectronEnergyDistribution,
+        level_population_ratio: pd.DataFrame,
+        stimulated_recombination_estimator: pd.DataFrame | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Compute the temperature independent factors of the free-bound
+        cooling rate.
+
+        Parameters
+        ----------
+        ion_population : pd.DataFrame
+            Estimated ion number density. Columns represent cells.
+        thermal_electron_distribution : ThermalElectronEnergyDistribution
+            Electron energy distribution containing the number density, temperature and energy.
+        level_population_ratio : pd.DataFrame
+            Saha factor for the ion populations as defined in Lucy 03 equation 14. Columns represent cells.
+        stimulated_recombination_estimator : pd.DataFrame, optional
+            Montecarlo stimulated recombination estimator. Columns represent cells, by default None
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]
+            Level population ratio of shape (n_levels, n_cells), ion cooling
+            factor for all cells and stimulated recombination cooling rate of
+            shape (n_levels, n_cells).
+        """
         ion_cooling_factor = (
             thermal_electron_distribution.number_density.value
             * ion_population.loc[(1, 1)]
-        )  # Hydrogen ion population
+        ).to_numpy()  # Hydrogen ion population
 
-        spontaneous_recombination_cooling_rate = (
-            integrated_cooling_coefficient
-            * level_population_ratio.loc[integrated_cooling_coefficient.index]
-            * ion_cooling_factor  # Hydrogen ion population
-        )
+        photoionization_level_population_ratio = level_population_ratio.loc[
+            self.photoionization_index
+        ].to_numpy()
 
         if stimulated_recombination_estimator is not None:
             stimulated_recombination_cooling_rate = (
-                stimulated_recombination_estimator
-                * level_population_ratio.loc[
-                    stimulated_recombination_estimator.index
-                ]
-                * ion_cooling_factor
+                (
+                    stimulated_recombination_estimator
+                    * level_population_ratio.loc[
+                        stimulated_recombination_estimator.index
+                    ]
+                    * ion_cooling_factor
+                )
+                .reindex(self.photoionization_index, fill_value=0.0)
+                .to_numpy()
             )
         else:
-            stimulated_recombination_cooling_rate = pd.DataFrame(
-                np.zeros(
-                    (len(spontaneous_recombination_cooling_rate), len(n_cells))
-                ),
-                index=spontaneous_recombination_cooling_rate.index,
-                columns=n_cells,
+            stimulated_recombination_cooling_rate = np.zeros_like(
+                photoionization_level_population_ratio
             )
 
-        cooling_rate = (
+        return (
+            photoionization_level_population_ratio,
+            ion_cooling_factor,
+            stimulated_recombination_cooling_rate,
+        )
+
+    @staticmethod
+    def recombination_cooling_rate(
+        integrated_cooling_coefficient: np.ndarray,
+        level_population_ratio: np.ndarray,
+        ion_cooling_factor: np.ndarray,
+        stimulated_recombination_cooling_rate: np.ndarray,
+    ) -> np.ndarray:
+        """Combine the free-bound cooling rate from its factors.
+
+        Parameters
+        ----------
+        integrated_cooling_coefficient : np.ndarray
+            Integrated spontaneous recombination cooling coefficient of shape
+            (n_levels, n_cells), or its temperature derivative.
+        level_population_ratio : np.ndarray
+            Level population ratio of shape (n_levels, n_cells).
+        ion_cooling_factor : np.ndarray
+            Product of electron and hydrogen ion number density for all cells.
+        stimulated_recombination_cooling_rate : np.ndarray
+            Stimulated recombination cooling rate of shape (n_levels, n_cells).
+
+        Returns
+        -------
+        np.ndarray
+            Free-bound cooling rate for all cells.
+        """
+        spontaneous_recombination_cooling_rate = (
+            integrated_cooling_coefficient
+            * level_population_ratio
+            * ion_cooling_factor
+        )
+        return (
             spontaneous_recombination_cooling_rate
             + stimulated_recombination_cooling_rate
-        ).sum()
-
-        return heating_rate, cooling_rate
+        ).sum(axis=0)
 
 
 class FreeFreeThermalRates:
@@ -324,6 +443,45 @@ class CollisionalIonizationThermalRates:
         tuple[pd.Series, pd.Series]
             Heating and cooling rates for the collisional ionization process for all cells.
         """
+        heating_rate, cooling_rate = self.level_rates(
+            electron_density,
+            ion_population,
+            level_population,
+            collisional_ionization_rate_coefficient,
+            level_population_ratio,
+        )
+        return heating_rate.sum(), cooling_rate.sum()
+
+    def level_rates(
+        self,
+        electron_density: u.Quantity,
+        ion_population: pd.DataFrame,
+        level_population: pd.DataFrame,
+        collisional_ionization_rate_coefficient: pd.DataFrame,
+        level_population_ratio: pd.DataFrame,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Compute the collisional ionization heating and cooling rates of
+        each level.
+
+        Parameters
+        ----------
+        electron_density : u.Quantity
+            Electron number density with units.
+        ion_population : pd.DataFrame
+            Ion number density. Columns represent cells.
+        level_population : pd.DataFrame
+            Level number density. Columns represent cells.
+        collisional_ionization_rate_coefficient : pd.DataFrame
+            Collisional ionization rate coefficients. Columns represent cells.
+        level_population_ratio : pd.DataFrame
+            Saha factor for the ion populations as defined in Lucy 03 equation 14. Columns represent cells.
+
+        Returns
+        -------
+        tuple[pd.DataFrame, pd.DataFrame]
+            Heating and cooling rates of the levels of the rate coefficient
+            index for all cells.
+        """
         rate_factor = (
             electron_density.cgs.value
             * collisional_ionization_rate_coefficient.multiply(
@@ -337,12 +495,12 @@ class CollisionalIonizationThermalRates:
             * ion_population.loc[(1, 1)]
             * level_population_ratio
             * rate_factor
-        ).sum()
+        )
 
         cooling_rate = (
             level_population.loc[collisional_ionization_rate_coefficient.index]
             * rate_factor
-        ).sum()
+        )
 
         return heating_rate, cooling_rate
 
@@ -387,6 +545,49 @@ class CollisionalBoundThermalRates:
         tuple[pd.Series, pd.Series]
             Heating and cooling rates for the collisional bound process for all cells.
         """
+        heating_rate, cooling_rate = self.line_rates(
+            electron_density,
+            collisional_deexcitation_rate_coefficient,
+            collisional_excitation_rate_coefficient,
+            level_population,
+        )
+
+        # Convert to Series with proper index
+        heating_rate = pd.Series(
+            heating_rate.sum(axis=0), index=level_population.columns
+        )
+        cooling_rate = pd.Series(
+            cooling_rate.sum(axis=0), index=level_population.columns
+        )
+
+        return heating_rate, cooling_rate
+
+    def line_rates(
+        self,
+        electron_density: u.Quantity,
+        collisional_deexcitation_rate_coefficient: pd.DataFrame,
+        collisional_excitation_rate_coefficient: pd.DataFrame,
+        level_population: pd.DataFrame,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Compute the collisional bound heating and cooling rates of each
+        line.
+
+        Parameters
+        ----------
+        electron_density : u.Quantity
+            Electron number density with units.
+        collisional_deexcitation_rate_coefficient : pd.DataFrame
+            Collisional deexcitation rate coefficients. Columns represent cells.
+        collisional_excitation_rate_coefficient : pd.DataFrame
+            Collisional excitation rate coefficients. Columns represent cells.
+        level_population : pd.DataFrame
+            Level number density. Columns represent cells.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            Heating and cooling rates of shape (n_lines, n_cells).
+        """
         lower_index = collisional_excitation_rate_coefficient.index.droplevel(
             "level_number_upper"
         )
@@ -400,32 +601,22 @@ class CollisionalBoundThermalRates:
         ### HEATING
         # Lucy 03 eq 33 "similar"
 
-        heating_rate = (
-            electron_density.cgs.value
-            * (
-                collisional_deexcitation_rate_coefficient.values
-                * upper_level_number_density.values
-                * self.nu.reshape(-1, 1)  # handle broadcasting
-                * const.h.cgs.value
-            )
-        ).sum(axis=0)
+        heating_rate = electron_density.cgs.value * (
+            collisional_deexcitation_rate_coefficient.values
+            * upper_level_number_density.values
+            * self.nu.reshape(-1, 1)  # handle broadcasting
+            * const.h.cgs.value
+        )
 
         ### COOLING
         # Lucy 03 eq 33 "similar"
 
-        cooling_rate = (
-            electron_density.cgs.value
-            * (
-                collisional_excitation_rate_coefficient.values
-                * lower_level_number_density.values
-                * self.nu.reshape(-1, 1)  # handle broadcasting
-                * const.h.cgs.value
-            )
-        ).sum(axis=0)
-
-        # Convert to Series with proper index
-        heating_rate = pd.Series(heating_rate, index=level_population.columns)
-        cooling_rate = pd.Series(cooling_rate, index=level_population.columns)
+        cooling_rate = electron_density.cgs.value * (
+            collisional_excitation_rate_coefficient.values
+            * lower_level_number_density.values
+            * self.nu.reshape(-1, 1)  # handle broadcasting
+            * const.h.cgs.value
+        )
 
         return heating_rate, cooling_rate
 
@@ -1,11 +1,13 @@
+from functools import cached_property
+
 import astropy.units as u
 import numpy as np
 import pandas as pd
 
 from tardis import constants as const
 from tardis.transport.montecarlo.estimators.util import (
+    BlockIntegrationOperator,
     bound_free_estimator_array2frame,
-    integrate_array_by_blocks,
 )
 
 C = const.c.cgs
@@ -31,8 +33,11 @@ class SpontaneousRecombinationCoeffSolver:
         self.photoionization_index = (
             self.photoionization_cross_sections.index.unique()
         )
+        self.integration_operator = BlockIntegrationOperator(
+            self.nu.value, self.photoionization_block_references
+        )
 
-    @property
+    @cached_property
     def common_prefactor(self):
         """Used to multiply with both spontaneous recombination and
         photoionization coefficients. Lucy 2003 Eq 13, 15, 16.
@@ -96,10 +101,8 @@ class SpontaneousRecombinationCoeffSolver:
             )
         )
         spontaneous_recombination_rate_coeff_integrated = (
-            integrate_array_by_blocks(
-                spontaneous_recombination_rate_coeff.to_numpy(),
-                self.nu.value,
-                self.photoionization_block_references,
+            self.integration_operator.integrate(
+                spontaneous_recombination_rate_coeff.to_numpy()
             )
         )
 
@@ -185,10 +188,10 @@ class AnalyticPhotoionizationCoeffSolver(SpontaneousRecombinationCoeffSolver):
                 axis=0,
             )
         )
-        stimulated_recombination_rate_coeff = integrate_array_by_blocks(
-            stimulated_recombination_rate_coeff.values,
-            self.nu.value,
-            self.photoionization_block_references,
+        stimulated_recombination_rate_coeff = (
+            self.integration_operator.integrate(
+                stimulated_recombination_rate_coeff.values
+            )
         )
         stimulated_recombination_rate_coeff = pd.DataFrame(
             stimulated_recombination_rate_coeff,
@@ -221,10 +224,8 @@ class AnalyticPhotoionizationCoeffSolver(SpontaneousRecombinationCoeffSolver):
             self.common_prefactor,
             axis=0,
         )
-        photoionization_rate_coeff = integrate_array_by_blocks(
-            photoionization_rate_coeff.values,
-            self.nu.value,
-            self.photoionization_block_references,
+        photoionization_rate_coeff = self.integration_operator.integrate(
+            photoionization_rate_coeff.values
         )
         photoionization_rate_coeff = pd.DataFrame(
             photoionization_rate_coeff,
@@ -364,10 +365,10 @@ class AnalyticCorrectedPhotoionizationCoeffSolver(
             photoionization_rate_coeff.multiply(correction_factor, axis=0)
         )
 
-        corrected_photoionization_rate_coeff = integrate_array_by_blocks(
-            corrected_photoionization_rate_coeff.values,
-            self.nu.value,
-            self.photoionization_block_references,
+        corrected_photoionization_rate_coeff = (
+            self.integration_operator.integrate(
+                corrected_photoionization_rate_coeff.values
+            )
         )
         corrected_photoionization_rate_coeff = pd.DataFrame(
             corrected_photoionization_rate_coeff,
@@ -18,6 +18,9 @@ from tardis.plasma.equilibrium.rates import (
     #    RadiativeRatesSolver,
     UpsilonRegemorterSolver,
 )
+from tardis.plasma.equilibrium.rates.collision_strengths import (
+    UpsilonChiantiSolver,
+)
 from tardis.plasma.properties.atomic import YgData, YgInterpolator
 from tardis.plasma.properties.continuum_processes import (
     CollDeexcRateCoeff,
@@ -159,3 +162,43 @@ def test_thermal_collision_rates(
         atol=0,
         rtol=1e-8,
     )
+
+
+def test_chianti_upsilon_solver_matches_row_scaling():
+    rng = np.random.default_rng(42)
+    no_of_transitions = 40
+    no_of_knots = np.where(np.arange(no_of_transitions) % 3, 5, 9)
+    upsilon_data = pd.DataFrame(
+        {
+            "btemp": [np.linspace(0, 1, n) for n in no_of_knots],
+            "bscups": [rng.random(n) for n in no_of_knots],
+            "cups": rng.uniform(0.5, 5, no_of_transitions),
+            "delta_e": rng.uniform(1, 20, no_of_transitions),
+            "g_l": rng.integers(1, 10, no_of_transitions),
+            "ttype": np.tile([1, 2, 3, 4, 6, 7, 8, 9], 5),
+        },
+        index=pd.MultiIndex.from_arrays(
+            [
+                np.ones(no_of_transitions, dtype=int),
+                np.zeros(no_of_transitions, dtype=int),
+                np.arange(no_of_transitions),
+                np.arange(no_of_transitions) + 1,
+            ],
+            names=[
+                "atomic_number",
+                "ion_number",
+                "level_number_lower",
+                "level_number_upper",
+            ],
+        ),
+    )
+    t_electrons = np.linspace(3000, 30000, 7) * u.K
+    solver = UpsilonChiantiSolver(upsilon_data)
+
+    expected = pd.DataFrame(
+        upsilon_data.apply(
+            solver.upsilon_scaling, axis=1, args=(t_electrons.value,)
+        ),
+        index=upsilon_data.index,
+    )
+    pdt.assert_frame_equal(solver.solve(t_electrons), expected, rtol=1e-10)
@@ -7,10 +7,16 @@ from astropy.tests.helper import assert_quantity_allclose
 from numpy.testing import (
     assert_almost_equal,
 )
+from scipy.optimize import brentq
+
+from tardis import constants as const
 
 from tardis.plasma.electron_energy_distribution import (
     ThermalElectronEnergyDistribution,
 )
+from tardis.plasma.equilibrium.rates.collisional_ionization_strengths import (
+    CollisionalIonizationSeaton,
+)
 from tardis.plasma.equilibrium.rates.heating_cooling_rates import (
     AdiabaticThermalRates,
     BoundFreeThermalRates,
@@ -512,3 +518,204 @@ def test_thermal_balance_solver(
         atol=0,
         rtol=1e-15,
     )
+
+
+@pytest.fixture
+def synthetic_thermal_balance_inputs():
+    rng = np.random.default_rng(2003)
+    number_of_cells = 4
+    level_index = pd.MultiIndex.from_tuples(
+        [(1, 0, 0), (1, 0, 1), (1, 0, 2)],
+        names=["atomic_number", "ion_number", "level_number"],
+    )
+    threshold_frequencies = [3.288e15, 8.22e14, 3.65e14]
+    nu = np.concatenate(
+        [nu_i * np.linspace(1, 5, 40) for nu_i in threshold_frequencies]
+    )
+    photoionization_cross_sections = pd.DataFrame(
+        {
+            "nu": nu,
+            "x_sect": 6e-18
+            * (np.repeat(threshold_frequencies, 40) / nu) ** 3,
+        },
+        index=level_index.repeat(40),
+    )
+    collision_index = pd.MultiIndex.from_tuples(
+        [(1, 0, 0, 1), (1, 0, 1, 2)],
+        names=[
+            "atomic_number",
+            "ion_number",
+            "level_number_lower",
+            "level_number_upper",
+        ],
+    )
+    deexcitation_rate_coefficient = pd.DataFrame(
+        rng.uniform(1, 2, (2, number_of_cells)) * 1e-9, index=collision_index
+    )
+
+    solver = ThermalBalanceSolver(
+        BoundFreeThermalRates(photoionization_cross_sections),
+        FreeFreeThermalRates(),
+        CollisionalIonizationThermalRates(photoionization_cross_sections),
+        CollisionalBoundThermalRates(pd.DataFrame({"nu": [2.46e15, 4.57e14]})),
+    )
+    electron_distribution = ThermalElectronEnergyDistribution(
+        0 * u.erg,
+        np.ones(number_of_cells) * 9000 * u.K,
+        np.ones(number_of_cells) * 1e8 * u.cm**-3,
+    )
+    rate_inputs = (
+        pd.DataFrame(
+            rng.uniform(1, 2, (3, number_of_cells)) * 1e4, index=level_index
+        ),
+        pd.DataFrame(
+            rng.uniform(1, 2, (2, number_of_cells)) * 1e8,
+            index=pd.MultiIndex.from_tuples([(1, 0), (1, 1)]),
+        ),
+        pd.DataFrame(
+            rng.uniform(1, 2, (3, number_of_cells)) * 1e-12, index=level_index
+        ),
+        deexcitation_rate_coefficient,
+        deexcitation_rate_coefficient * 1e-3,
+        4.89e-24,
+        pd.DataFrame(
+            rng.uniform(1, 2, (3, number_of_cells)) * 1e-12, index=level_index
+        ),
+        DilutePlanckianRadiationField(
+            np.ones(number_of_cells) * 10000 * u.K,
+            np.ones(number_of_cells) * 0.5,
+        ),
+        None,
+        pd.DataFrame(
+            rng.uniform(1, 2, (3, number_of_cells)) * 1e-25, index=level_index
+        ),
+    )
+    return solver, electron_distribution, rate_inputs
+
+
+def test_bound_free_cooling_temperature_derivative(
+    synthetic_thermal_balance_inputs,
+):
+    solver, _, _ = synthetic_thermal_balance_inputs
+    temperature = np.array([4000.0, 8000.0, 16000.0])
+    _, derivative = (
+        solver.bound_free_solver.integrated_cooling_coefficient(
+            temperature, temperature_derivative=True
+        )
+    )
+    delta = 1e-4 * temperature
+    finite_difference = (
+        solver.bound_free_solver.integrated_cooling_coefficient(
+            temperature + delta
+        )
+        - solver.bound_free_solver.integrated_cooling_coefficient(
+            temperature - delta
+        )
+    ) / (2 * delta)
+
+    np.testing.assert_allclose(derivative, finite_difference, rtol=1e-6)
+
+
+def test_thermal_balance_solver_electron_temperature(
+    synthetic_thermal_balance_inputs,
+):
+    solver, electron_distribution, rate_inputs = (
+        synthetic_thermal_balance_inputs
+    )
+    (
+        level_population,
+        ion_population,
+        _,
+        deexcitation_rate_coefficient,
+        _,
+        free_free_heating_estimator,
+        _,
+        _,
+        bound_free_heating_estimator,
+        stimulated_recombination_estimator,
+    ) = rate_inputs
+    number_of_cells = len(electron_distribution.temperature)
+    # weak radiation field, so that the balance lies close to the guess
+    radiation_field = DilutePlanckianRadiationField(
+        np.ones(number_of_cells) * 10000 * u.K,
+        np.ones(number_of_cells) * 1e-4,
+    )
+    photoionization_cross_sections = (
+        solver.bound_free_solver.photoionization_cross_sections
+    )
+    threshold_nu = (
+        photoionization_cross_sections.nu.groupby(level=[0, 1, 2])
+        .first()
+        .to_numpy()
+    )
+    line_nu = solver.collisional_bound_solver.nu
+    h_over_k = (const.h / const.k_B).cgs.value
+    initial_temperature = electron_distribution.temperature.value
+
+    def temperature_dependent_inputs(temperature):
+        # LTE level population ratio, Lucy 03 eq 14
+        saha_factor = (
+            const.h.cgs.value**2
+            / (2 * np.pi * const.m_e.cgs.value * const.k_B.cgs.value)
+            / temperature
+        ) ** 1.5
+        level_population_ratio = pd.DataFrame(
+            np.array([1.0, 4.0, 9.0])[:, np.newaxis]
+            * saha_factor
+            * np.exp(threshold_nu[:, np.newaxis] * h_over_k / temperature),
+            index=level_population.index,
+        )
+        collisional_ionization_rate_coefficient = CollisionalIonizationSeaton(
+            photoionization_cross_sections
+        ).solve(temperature * u.K)
+        collisional_ionization_rate_coefficient.columns = range(
+            number_of_cells
+        )
+        # constant effective collision strengths
+        deexcitation = deexcitation_rate_coefficient * np.sqrt(
+            initial_temperature / temperature
+        )
+        excitation = deexcitation * (
+            3.0 * np.exp(-line_nu[:, np.newaxis] * h_over_k / temperature)
+        )
+        return (
+            level_population,
+            ion_population,
+            collisional_ionization_rate_coefficient,
+            deexcitation,
+            excitation,
+            free_free_heating_estimator,
+            level_population_ratio,
+            radiation_field,
+            bound_free_heating_estimator,
+            stimulated_recombination_estimator,
+        )
+
+    def net_heating_rate(temperature, cell):
+        temperature = np.full(number_of_cells, temperature)
+        total_heating_rate, _ = solver.solve(
+            ThermalElectronEnergyDistribution(
+                0 * u.erg,
+                temperature * u.K,
+                electron_distribution.number_density,
+            ),
+            *temperature_dependent_inputs(temperature),
+        )
+        return total_heating_rate.iloc[cell]
+
+    expected_temperature = [
+        brentq(net_heating_rate, 4000, 50000, args=(cell,), xtol=1e-8)
+        for cell in range(number_of_cells)
+    ]
+
+    electron_temperature = solver.solve_electron_temperature(
+        electron_distribution,
+        *temperature_dependent_inputs(initial_temperature),
+        tolerance=1e-12,
+    )
+
+    # the rates depend on temperature, the root is not the initial guess
+    assert np.all(np.abs(electron_temperature.value - 9000) > 100)
+    np.testing.assert_allclose(
+        electron_temperature.value, expected_temperature, rtol=1e-9
+    )
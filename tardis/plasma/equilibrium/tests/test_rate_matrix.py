@@ -1,12 +1,15 @@
 import astropy.units as u
 import numpy as np
+import numpy.testing as npt
 import pandas as pd
 import pandas.testing as pdt
 import pytest
+from scipy.sparse import coo_matrix
 
 from tardis.plasma.electron_energy_distribution import (
     ThermalElectronEnergyDistribution,
 )
+from tardis.plasma.equilibrium.level_populations import LevelPopulationSolver
 from tardis.plasma.equilibrium.rate_matrix import IonRateMatrix, RateMatrix
 from tardis.plasma.radiation_field import (
     DilutePlanckianRadiationField,
@@ -93,3 +96,86 @@ def test_ion_rate_matrix_solver(
     expected = regression_data.sync_dataframe(actual)
 
     pdt.assert_frame_equal(actual, expected, atol=0, rtol=1e-15)
+
+
+class MockRateSolver:
+    def __init__(self, rates_df):
+        self.rates_df = rates_df
+
+    def solve(self, radiation_field):
+        return self.rates_df
+
+
+def test_rate_matrix_stacked_matches_sparse_assembly():
+    rng = np.random.default_rng(1963)
+    number_of_cells = 5
+    levels = pd.DataFrame(
+        {"energy": np.arange(7, dtype=np.float64)},
+        index=pd.MultiIndex.from_tuples(
+            [(1, 0, level) for level in range(3)]
+            + [(2, 0, level) for level in range(4)],
+            names=["atomic_number", "ion_number", "level_number"],
+        ),
+    )
+    transitions = [
+        (species[0], species[1], species[1], species[1], source, destination)
+        for species, number_of_levels in (((1, 0), 3), ((2, 0), 4))
+        for source in range(number_of_levels)
+        for destination in range(number_of_levels)
+        if source != destination
+    ]
+    rates_df = pd.DataFrame(
+        rng.uniform(size=(len(transitions), number_of_cells)),
+        index=pd.MultiIndex.from_tuples(
+            transitions,
+            names=[
+                "atomic_number",
+                "ion_number",
+                "ion_number_source",
+                "ion_number_destination",
+                "level_number_source",
+                "level_number_destination",
+            ],
+        ),
+    )
+    rate_matrix_solver = RateMatrix(
+        [(MockRateSolver(rates_df), "radiative")], levels
+    )
+    electron_dist = ThermalElectronEnergyDistribution(
+        0, np.ones(number_of_cells) * u.K, 1e6 * u.g / u.cm**3
+    )
+
+    stacked = rate_matrix_solver.solve_stacked(None, electron_dist)
+    actual = rate_matrix_solver.solve(None, electron_dist)
+
+    for species_id, rates in rates_df.groupby(
+        level=("atomic_number", "ion_number")
+    ):
+        number_of_levels = levels.energy.loc[species_id].count()
+        assert stacked[species_id].shape == (
+            number_of_cells,
+            number_of_levels,
+            number_of_levels,
+        )
+        for shell in range(number_of_cells):
+            expected = coo_matrix(
+                (
+                    rates[shell],
+                    (
+                        rates.index.get_level_values(
+                            "level_number_destination"
+                        ),
+                        rates.index.get_level_values("level_number_source"),
+                    ),
+                ),
+                shape=(number_of_levels, number_of_levels),
+            ).toarray()
+            np.fill_diagonal(expected, -np.sum(expected, axis=0))
+            expected[0, :] = 1
+            npt.assert_allclose(stacked[species_id][shell], expected)
+            npt.assert_allclose(actual.loc[species_id, shell], expected)
+
+    pdt.assert_frame_equal(
+        LevelPopulationSolver(stacked, levels).solve(),
+        LevelPopulationSolver(actual, levels).solve(),
+    )
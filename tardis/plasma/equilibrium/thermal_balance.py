@@ -1,5 +1,10 @@
+import logging
+
+import astropy.units as u
+import numpy as np
 import pandas as pd
 
+from tardis import constants as const
 from tardis.plasma.electron_energy_distribution import (
     ThermalElectronEnergyDistribution,
 )
@@ -11,6 +16,8 @@ from tardis.plasma.equilibrium.rates.heating_cooling_rates import (
 )
 from tardis.plasma.radiation_field import DilutePlanckianRadiationField
 
+logger = logging.getLogger(__name__)
+
 
 class ThermalBalanceSolver:
     """Class to solve the thermal balance equation using all available
@@ -146,3 +153,318 @@ class ThermalBalanceSolver:
         ) / total_cooling
 
         return total_heating_rate, fractional_heating_rate
+
+    def solve_electron_temperature(
+        self,
+        thermal_electron_distribution: ThermalElectronEnergyDistribution,
+        level_population: pd.DataFrame,
+        ion_population: pd.DataFrame,
+        collisional_ionization_rate_coefficient: pd.DataFrame,
+        collisional_deexcitation_rate_coefficient: pd.DataFrame,
+        collisional_excitation_rate_coefficient: pd.DataFrame,
+        free_free_heating_estimator: pd.DataFrame,
+        level_population_ratio: pd.DataFrame,
+        radiation_field: DilutePlanckianRadiationField | None = None,
+        bound_free_heating_estimator: pd.DataFrame | None = None,
+        stimulated_recombination_estimator: pd.DataFrame | None = None,
+        tolerance: float = 1e-8,
+        max_iterations: int = 50,
+        max_fractional_step: float = 0.5,
+    ) -> u.Quantity:
+        """Find the electron temperature of thermal balance in all cells.
+
+        The net heating rate is driven to zero with Newton steps taken in all
+        cells at once. Level populations, the electron density and the Monte
+        Carlo estimators are held at their input values. The LTE level
+        population ratio and the collisional rate coefficients are given at
+        the input temperature T0 and are rescaled to the temperature T of
+        each step with their analytic temperature dependence:
+
+        - level population ratio (Lucy 03 eq 14), T^(-3/2) exp(h nu_i / kT)
+        - collisional ionization (Seaton), T^(1/2) exp(-h nu_i / kT)
+        - collisional excitation, T^(-1/2) exp(-h nu / kT)
+        - collisional deexcitation, T^(-1/2)
+
+        where the effective collision strengths are taken to be temperature
+        independent. The same dependences give the analytic Jacobian,
+        together with those of the free-bound and free-free rates. All
+        temperature independent rates and factors are computed once and
+        reused between the steps.
+
+        Parameters
+        ----------
+        thermal_electron_distribution : ThermalElectronEnergyDistribution
+            Electron energy, temperature, and density. The temperature is the
+            initial guess.
+        level_population : pd.DataFrame
+            Level number density.
+        ion_population : pd.DataFrame
+            Ion number density.
+        collisional_ionization_rate_coefficient : pd.DataFrame
+            Collisional ionization rate coefficient.
+        collisional_deexcitation_rate_coefficient : pd.DataFrame
+            Collisional deexcitation rate coefficient.
+        collisional_excitation_rate_coefficient : pd.DataFrame
+            Collisional excitation rate coefficient.
+        free_free_heating_estimator : pd.DataFrame
+            Montecarlo estimator for free-free heating.
+        level_population_ratio : pd.DataFrame
+            Level population to ion population ratio. Lucy 03, equation 14.
+        radiation_field : RadiationField, optional
+            Radiation field for mean intensity calculation.
+        bound_free_heating_estimator : pd.DataFrame, optional
+            Bound-free heating estimator.
+        stimulated_recombination_estimator : pd.DataFrame, optional
+            Stimulated recombination estimator.
+        tolerance : float, optional
+            Convergence threshold on the fractional heating rate.
+        max_iterations : int, optional
+            Maximum number of Newton steps.
+        max_fractional_step : float, optional
+            Largest temperature change of a single step relative to the
+            current temperature.
+
+        Returns
+        -------
+        astropy.units.Quantity
+            Electron temperature for each cell.
+        """
+        electron_density = thermal_electron_distribution.number_density
+        temperature = np.array(
+            thermal_electron_distribution.temperature.to(u.K).value,
+            dtype=np.float64,
+        )
+        initial_temperature = temperature.copy()
+        number_of_cells = len(temperature)
+        h_over_k = const.h.cgs.value / const.k_B.cgs.value
+
+        # temperature independent rates
+        fixed_heating = self.bound_free_solver.heating_rate(
+            level_population, radiation_field, bound_free_heating_estimator
+        ).to_numpy()
+        (
+            level_population_ratio_array,
+            ion_cooling_factor,
+            stimulated_recombination_cooling_rate,
+        ) = self.bound_free_solver.recombination_cooling_factors(
+            ion_population,
+            thermal_electron_distribution,
+            level_population_ratio,
+            stimulated_recombination_estimator,
+        )
+        # h nu_i / k of the photoionization edges
+        photoionization_threshold = (
+            self.collisional_ionization_solver.nu_i.loc[
+                self.bound_free_solver.photoionization_index
+            ].to_numpy()
+            * h_over_k
+        )
+
+        (
+            collisional_ionization_heating,
+            collisional_ionization_cooling,
+        ) = self.collisional_ionization_solver.level_rates(
+            electron_density,
+            ion_population,
+            level_population,
+            collisional_ionization_rate_coefficient,
+            level_population_ratio,
+        )
+        # three-body recombination scales with Phi * C_ik, i.e. with 1 / T
+        collisional_ionization_heating = (
+            collisional_ionization_heating.sum().to_numpy()
+        )
+        collisional_ionization_threshold = (
+            self.collisional_ionization_solver.nu_i.loc[
+                collisional_ionization_cooling.index
+            ].to_numpy()
+            * h_over_k
+        )
+        collisional_ionization_cooling = (
+            collisional_ionization_cooling.to_numpy()
+        )
+
+        collisional_bound_heating, collisional_bound_cooling = (
+            self.collisional_bound_solver.line_rates(
+                electron_density,
+                collisional_deexcitation_rate_coefficient,
+                collisional_excitation_rate_coefficient,
+                level_population,
+            )
+        )
+        collisional_bound_heating = collisional_bound_heating.sum(axis=0)
+        line_threshold = self.collisional_bound_solver.nu * h_over_k
+
+        free_free_factor = np.asarray(
+            self.free_free_solver.heating_factor(
+                ion_population, electron_density.cgs.value
+            ),
+            dtype=np.float64,
+        )
+        free_free_heating_estimator = np.broadcast_to(
+            np.asarray(free_free_heating_estimator, dtype=np.float64).ravel(),
+            number_of_cells,
+        )
+        free_free_cooling_constant = self.free_free_solver.cooling_constant
+
+        active_cells = np.arange(number_of_cells)
+        for iteration in range(max_iterations):
+            cell_temperature = temperature[active_cells]
+            sqrt_temperature = np.sqrt(cell_temperature)
+            temperature_ratio = (
+                cell_temperature / initial_temperature[active_cells]
+            )
+            inverse_temperature_change = (
+                1.0 / cell_temperature - 1.0 / initial_temperature[active_cells]
+            )
+
+            # LTE level population ratio at the current temperature and
+            # its logarithmic temperature derivative
+            photoionization_boltzmann_factor = np.exp(
+                photoionization_threshold[:, np.newaxis]
+                * inverse_temperature_change
+            )
+            level_population_ratio_scale = (
+                temperature_ratio**-1.5 * photoionization_boltzmann_factor
+            )
+            level_population_ratio_log_derivative = (
+                -1.5 / cell_temperature
+                - photoionization_threshold[:, np.newaxis]
+                / cell_temperature**2
+            )
+
+            cooling_coefficient, cooling_coefficient_derivative = (
+                self.bound_free_solver.integrated_cooling_coefficient(
+                    cell_temperature, temperature_derivative=True
+                )
+            )
+            cell_level_population_ratio = (
+                level_population_ratio_array[:, active_cells]
+                * level_population_ratio_scale
+            )
+            cell_ion_cooling_factor = ion_cooling_factor[active_cells]
+            spontaneous_recombination_cooling = (
+                cooling_coefficient
+                * cell_level_population_ratio
+                * cell_ion_cooling_factor
+            )
+            stimulated_recombination_cooling = (
+                stimulated_recombination_cooling_rate[:, active_cells]
+                * level_population_ratio_scale
+            )
+
+            cell_collisional_ionization_heating = (
+                collisional_ionization_heating[active_cells] / temperature_ratio
+            )
+            cell_collisional_ionization_cooling = (
+                collisional_ionization_cooling[:, active_cells]
+                * np.sqrt(temperature_ratio)
+                / np.exp(
+                    collisional_ionization_threshold[:, np.newaxis]
+                    * inverse_temperature_change
+                )
+            )
+            cell_collisional_bound_heating = collisional_bound_heating[
+                active_cells
+            ] / np.sqrt(temperature_ratio)
+            cell_collisional_bound_cooling = collisional_bound_cooling[
+                :, active_cells
+            ] / (
+                np.sqrt(temperature_ratio)
+                * np.exp(line_threshold[:, np.newaxis] * inverse_temperature_change)
+            )
+
+            cell_free_free_factor = free_free_factor[active_cells]
+            cell_free_free_heating = (
+                free_free_heating_estimator[active_cells]
+                / sqrt_temperature
+                * cell_free_free_factor
+            )
+            cell_free_free_cooling = (
+                free_free_cooling_constant
+                * sqrt_temperature
+                * cell_free_free_factor
+            )
+
+            heating = (
+                fixed_heating[active_cells]
+                + cell_collisional_ionization_heating
+                + cell_collisional_bound_heating
+                + cell_free_free_heating
+            )
+            cooling = (
+                spontaneous_recombination_cooling.sum(axis=0)
+                + stimulated_recombination_cooling.sum(axis=0)
+                + cell_collisional_ionization_cooling.sum(axis=0)
+                + cell_collisional_bound_cooling.sum(axis=0)
+                + cell_free_free_cooling
+            )
+            net_heating = heating - cooling
+
+            # d(net heating)/dT from the logarithmic derivatives of the
+            # temperature dependences of the rates
+            heating_derivative = (
+                -cell_collisional_ionization_heating / cell_temperature
+                - 0.5 * cell_collisional_bound_heating / cell_temperature
+                - 0.5 * cell_free_free_heating / cell_temperature
+            )
+            cooling_derivative = (
+                (
+                    cooling_coefficient_derivative
+                    * cell_level_population_ratio
+                    * cell_ion_cooling_factor
+                ).sum(axis=0)
+                + (
+                    (
+                        spontaneous_recombination_cooling
+                        + stimulated_recombination_cooling
+                    )
+                    * level_population_ratio_log_derivative
+                ).sum(axis=0)
+                + (
+                    cell_collisional_ionization_cooling
+                    * (
+                        0.5 / cell_temperature
+                        + collisional_ionization_threshold[:, np.newaxis]
+                        / cell_temperature**2
+                    )
+                ).sum(axis=0)
+                + (
+                    cell_collisional_bound_cooling
+                    * (
+                        -0.5 / cell_temperature
+                        + line_threshold[:, np.newaxis] / cell_temperature**2
+                    )
+                ).sum(axis=0)
+                + 0.5 * cell_free_free_cooling / cell_temperature
+            )
+            net_heating_derivative = heating_derivative - cooling_derivative
+
+            converged = np.abs(net_heating) <= tolerance * np.abs(cooling)
+            converged |= net_heating_derivative == 0.0
+            step = np.zeros_like(cell_temperature)
+            np.divide(
+                -net_heating,
+                net_heating_derivative,
+                out=step,
+                where=~converged,
+            )
+            max_step = max_fractional_step * cell_temperature
+            step = np.clip(step, -max_step, max_step)
+            temperature[active_cells] = cell_temperature + step
+
+            active_cells = active_cells[~converged]
+            if len(active_cells) == 0:
+                logger.info(
+                    "Thermal balance solver converged after %d iterations.",
+                    iteration + 1,
+                )
+                break
+        else:
+            logger.warning(
+                "Thermal balance solver did not converge in %d cells after %d iterations.",
+                len(active_cells),
+                max_iterations,
+            )
+
+        return temperature * u.K
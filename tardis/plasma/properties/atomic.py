@@ -21,6 +21,9 @@ from tardis.plasma.properties.continuum_processes.rates import (
     H,
     get_ground_state_multi_index,
 )
+from tardis.transport.montecarlo.estimators.util import (
+    BlockIntegrationOperator,
+)
 from tardis.configuration.sorting_globals import SORTING_ALGORITHM
 
 logger = logging.getLogger(__name__)
@@ -150,6 +153,10 @@ class PhotoIonizationData(ProcessingPlasmaProperty):
         sorted by decreasing frequency).
     level_idxs2continuum_idx : pandas.DataFrame, dtype int
         Maps a source_level_idx destination_level_idx pair to a continuum_idx.
+    photo_ion_integration_operator : BlockIntegrationOperator
+        Trapezoidal quadrature over the frequency grid of each bound-free
+        continuum. Built once here so that the rate coefficients depending
+        on the radiation field and the temperatures reuse it.
     """
 
     outputs = (
@@ -161,6 +168,7 @@ class PhotoIonizationData(ProcessingPlasmaProperty):
         "photo_ion_idx",
         "level2continuum_idx",
         "level_idxs2continuum_idx",
+        "photo_ion_integration_operator",
     )
     latex_name = (
         r"\xi_{\textrm{i}}(\nu)",
@@ -170,6 +178,8 @@ class PhotoIonizationData(ProcessingPlasmaProperty):
         r"\epsilon_i",
         "",
         "",
+        "",
+        "",
     )
 
     def calculate(self, atomic_data, continuum_interaction_species):
@@ -223,6 +233,7 @@ class PhotoIonizationData(ProcessingPlasmaProperty):
             photo_ion_idx,
             level2continuum_edge_idx,
             level_idxs2continuum_idx,
+            BlockIntegrationOperator(phot_nus.values, block_references),
         )
 
 
@@ -15,9 +15,6 @@ from tardis.plasma.properties.continuum_processes.fast_array_util import (
     cumulative_integrate_array_by_blocks,
     numba_cumulative_trapezoid,
 )
-from tardis.transport.montecarlo.estimators.util import (
-    integrate_array_by_blocks,
-)
 from tardis.configuration.sorting_globals import SORTING_ALGORITHM
 
 __all__ = [
@@ -179,7 +176,7 @@ class SpontRecombCoolingRateCoeff(ProcessingPlasmaProperty):
         self,
         photo_ion_cross_sections,
         t_electrons,
-        photo_ion_block_references,
+        photo_ion_integration_operator,
         photo_ion_index,
         phi_ik,
         nu_i,
@@ -191,9 +188,7 @@ class SpontRecombCoolingRateCoeff(ProcessingPlasmaProperty):
         alpha_sp = (8 * np.pi * x_sect * factor * nu**3 / C**2) * H
         alpha_sp = alpha_sp[:, np.newaxis]
         alpha_sp = alpha_sp * boltzmann_factor_photo_ion
-        alpha_sp = integrate_array_by_blocks(
-            alpha_sp, nu, photo_ion_block_references
-        )
+        alpha_sp = photo_ion_integration_operator.integrate(alpha_sp)
         alpha_sp = pd.DataFrame(alpha_sp, index=photo_ion_index)
         return alpha_sp * phi_ik.loc[alpha_sp.index]
 
@@ -3,9 +3,6 @@ import pandas as pd
 
 import tardis.constants as const
 from tardis.plasma.properties.base import Input, ProcessingPlasmaProperty
-from tardis.transport.montecarlo.estimators.util import (
-    integrate_array_by_blocks,
-)
 
 C = const.c.cgs.value
 
@@ -56,7 +53,7 @@ class SpontRecombRateCoeff(ProcessingPlasmaProperty):
     def calculate(
         self,
         photo_ion_cross_sections,
-        photo_ion_block_references,
+        photo_ion_integration_operator,
         photo_ion_index,
         phi_ik,
         boltzmann_factor_photo_ion,
@@ -67,8 +64,6 @@ class SpontRecombRateCoeff(ProcessingPlasmaProperty):
         alpha_sp = 8 * np.pi * cross_section * nu**2 / C**2
         alpha_sp = alpha_sp[:, np.newaxis]
         alpha_sp = alpha_sp * boltzmann_factor_photo_ion
-        alpha_sp = integrate_array_by_blocks(
-            alpha_sp, nu, photo_ion_block_references
-        )
+        alpha_sp = photo_ion_integration_operator.integrate(alpha_sp)
         alpha_sp = pd.DataFrame(alpha_sp, index=photo_ion_index)
         return alpha_sp * phi_ik.loc[alpha_sp.index]
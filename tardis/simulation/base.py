@@ -22,7 +22,12 @@ from tardis.opacities.macro_atom.macroatom_state import LegacyMacroAtomState
 from tardis.opacities.opacity_solver import OpacitySolver
 from tardis.plasma.assembly.legacy_assembly import assemble_plasma
 from tardis.plasma.radiation_field import DilutePlanckianRadiationField
-from tardis.simulation.convergence import ConvergenceSolver
+from tardis.simulation.checkpoint import read_checkpoint, write_checkpoint
+from tardis.simulation.convergence import (
+    AdaptivePacketSchedule,
+    ConvergenceSolver,
+    estimate_monte_carlo_noise,
+)
 from tardis.spectrum.base import SpectrumSolver
 from tardis.spectrum.formal_integral.formal_integral_solver import (
     FormalIntegralSolver,
@@ -123,6 +128,11 @@ class Simulation(PlasmaStateStorerMixin, HDFWriterMixin):
     luminosity_nu_end : astropy.units.Quantity
     luminosity_requested : astropy.units.Quantity
     convergence_plots_kwargs: dict
+    checkpoint_path : str or None
+        File the state is checkpointed to after every iteration
+    packet_schedule : tardis.simulation.convergence.AdaptivePacketSchedule or None
+        Adapts the number of packets of the convergence iterations. If None,
+        every iteration runs `no_of_packets` packets.
     """
 
     hdf_properties = [
@@ -156,6 +166,8 @@ class Simulation(PlasmaStateStorerMixin, HDFWriterMixin):
         convergence_plots_kwargs,
         show_progress_bars,
         spectrum_solver,
+        checkpoint_path=None,
+        packet_schedule=None,
     ):
         super().__init__(iterations, simulation_state.no_of_shells)
 
@@ -175,6 +187,8 @@ class Simulation(PlasmaStateStorerMixin, HDFWriterMixin):
         self.luminosity_requested = luminosity_requested
         self.spectrum_solver = spectrum_solver
         self.show_progress_bars = show_progress_bars
+        self.checkpoint_path = checkpoint_path
+        self.packet_schedule = packet_schedule
         self.version = tardis.__version__
 
         # Convergence
@@ -272,6 +286,37 @@ class Simulation(PlasmaStateStorerMixin, HDFWriterMixin):
         self.consecutive_converges_count = 0
         return False
 
+    @property
+    def current_no_of_packets(self):
+        """Number of packets of the next convergence iteration."""
+        if self.packet_schedule is None:
+            return self.no_of_packets
+        return self.packet_schedule.no_of_packets
+
+    def _update_packet_schedule(
+        self, estimated_t_rad, estimated_w, estimated_t_inner
+    ):
+        fractional_changes = {
+            "t_radiative": self.t_rad_convergence_solver.get_fractional_change(
+                self.simulation_state.t_radiative.value, estimated_t_rad.value
+            ),
+            "dilution_factor": self.w_convergence_solver.get_fractional_change(
+                self.simulation_state.dilution_factor, estimated_w
+            ),
+            "t_inner": self.t_inner_convergence_solver.get_fractional_change(
+                self.simulation_state.t_inner.value, estimated_t_inner.value
+            ),
+        }
+        noise = estimate_monte_carlo_noise(self.transport.transport_state)
+        no_of_packets = self.packet_schedule.update(fractional_changes, noise)
+        logger.info(
+            "\n\tMonte Carlo noise (largest of the shells): "
+            f"t_rad {np.max(noise['t_radiative']):.2e}, "
+            f"w {np.max(noise['dilution_factor']):.2e}, "
+            f"t_inner {noise['t_inner']:.2e}"
+            f"\n\tPackets in the next iteration: {no_of_packets:d}"
+        )
+
     def advance_state(self, emitted_luminosity):
         """
         Advances the state of the model and the plasma for the next
@@ -302,6 +347,11 @@ class Simulation(PlasmaStateStorerMixin, HDFWriterMixin):
             t_inner_update_exponent=self.convergence_strategy.t_inner_update_exponent,
         )
 
+        if self.packet_schedule is not None:
+            self._update_packet_schedule(
+                estimated_t_rad, estimated_dilution_factor, estimated_t_inner
+            )
+
         converged = self._get_convergence_status(
             self.simulation_state.t_radiative,
             self.simulation_state.dilution_factor,
@@ -530,7 +580,9 @@ class Simulation(PlasmaStateStorerMixin, HDFWriterMixin):
             initialize_iterations_pbar(self.iterations)
 
         start_time = time.time()
-        while self.iterations_executed < self.iterations - 1:
+        while self.iterations_executed < self.iterations - 1 and not (
+            self.converged and self.convergence_strategy.stop_if_converged
+        ):
             self.store_plasma_state(
                 self.iterations_executed,
                 self.simulation_state.dilution_factor,
@@ -539,9 +591,18 @@ class Simulation(PlasmaStateStorerMixin, HDFWriterMixin):
                 self.simulation_state.t_inner,
             )
             emitted_luminosity, v_packets_energy_hist = self.iterate(
-                self.no_of_packets
+                self.current_no_of_packets
             )
             self.converged = self.advance_state(emitted_luminosity)
+            write_checkpoint(
+                self.checkpoint_path,
+                self.iterations_executed,
+                self.consecutive_converges_count,
+                self.converged,
+                self.simulation_state,
+                self.plasma,
+                plasma_state_storer=self,
+            )
             if hasattr(self, "convergence_plots"):
                 self.convergence_plots.update()
             self._call_back()
@@ -554,6 +615,31 @@ class Simulation(PlasmaStateStorerMixin, HDFWriterMixin):
             f"\n\tSimulation took {(time.time() - start_time):.2f} s\n"
         )
 
+    def resume_from_checkpoint(self, checkpoint_path):
+        """
+        Restore the state of an interrupted run so that `run_convergence`
+        continues with the next iteration.
+
+        Parameters
+        ----------
+        checkpoint_path : str or pathlib.Path
+            Checkpoint written by a run with `checkpoint_path` set
+        """
+        checkpoint = read_checkpoint(checkpoint_path)
+        if checkpoint.completed_iterations >= self.iterations:
+            raise ValueError(
+                f"Checkpoint has {checkpoint.completed_iterations:d} completed "
+                f"iterations, the simulation only runs {self.iterations:d}"
+            )
+        checkpoint.restore_simulation_state(self.simulation_state)
+        checkpoint.restore_plasma(self.plasma)
+        checkpoint.restore_plasma_state_history(self)
+        self.iterations_executed = checkpoint.completed_iterations
+        self.consecutive_converges_count = (
+            checkpoint.consecutive_converges_count
+        )
+        self.converged = checkpoint.converged
+
     def run_final(self):
         """
         run the last iteration of the simulation
@@ -576,6 +662,10 @@ class Simulation(PlasmaStateStorerMixin, HDFWriterMixin):
             integrator_settings.points,
             integrator_settings.interpolate_shells,
             getattr(integrator_settings, "method", None),
+            getattr(integrator_settings, "refinement_points", 0),
+            getattr(integrator_settings, "refinement_tolerance", 1e-2),
+            getattr(integrator_settings, "tau_threshold", 0.0),
+            getattr(integrator_settings, "single_precision", False),
         )
 
         self.spectrum_solver.setup_optional_spectra(
@@ -718,6 +808,8 @@ class Simulation(PlasmaStateStorerMixin, HDFWriterMixin):
         transport=None,
         opacity=None,
         macro_atom=None,
+        checkpoint_path=None,
+        resume_from=None,
         **kwargs,
     ):
         """
@@ -743,6 +835,12 @@ class Simulation(PlasmaStateStorerMixin, HDFWriterMixin):
             The plasma object for the simulation.
         transport : object, optional
             The transport solver for the simulation.
+        checkpoint_path : str, optional
+            File the state is checkpointed to after every iteration. The
+            plasma state history is appended to the file with the
+            additional suffix ``.history``.
+        resume_from : str, optional
+            Checkpoint of an interrupted run to continue from.
         **kwargs
             Additional keyword arguments.
 
@@ -824,7 +922,7 @@ class Simulation(PlasmaStateStorerMixin, HDFWriterMixin):
 
         spectrum_solver = SpectrumSolver.from_config(config)
 
-        return cls(
+        simulation = cls(
             iterations=config.montecarlo.iterations,
             simulation_state=simulation_state,
             plasma=plasma,
@@ -842,4 +940,11 @@ class Simulation(PlasmaStateStorerMixin, HDFWriterMixin):
             convergence_plots_kwargs=convergence_plots_kwargs,
             show_progress_bars=show_progress_bars,
             spectrum_solver=spectrum_solver,
-        )
+            checkpoint_path=checkpoint_path,
+            packet_schedule=AdaptivePacketSchedule.from_config(
+                config.montecarlo
+            ),
+        )
+        if resume_from is not None:
+            simulation.resume_from_checkpoint(resume_from)
+        return simulation
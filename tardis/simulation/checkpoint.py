@@ -0,0 +1,454 @@
+"""
+Per-iteration checkpoints of the iterative TARDIS solution.
+
+After every completed iteration the compact state needed to continue the
+run is written to a checkpoint file: the radiation field and inner boundary
+temperature the next iteration starts from, the convergence counters, the
+packet seeds and the estimator based inputs of the last plasma update. The
+file is replaced atomically, its size does not depend on the number of
+iterations.
+
+The plasma state history of the `PlasmaStateStorerMixin` grows with every
+iteration. Its rows are appended to a separate history file, see
+`get_history_path`, so every iteration only writes its own row. Rows of
+iterations that are not completed in the checkpoint file are ignored.
+
+The packets of an iteration are created with the seed
+``base_seed + seed_offset`` of the packet source, where the seed offset is
+the iteration index. The checkpoint stores the base seed and the seed
+offset of the next iteration, so a resumed run continues the random
+number streams of the interrupted run.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+from astropy import units as u
+
+from tardis import __version__
+from tardis.io.hdf_writer_mixin import HDFWriterMixin
+from tardis.plasma.radiation_field import DilutePlanckianRadiationField
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_PATH = "checkpoint"
+PLASMA_INPUTS_PATH = f"{CHECKPOINT_PATH}/plasma_inputs"
+HISTORY_SUFFIX = ".history"
+
+# plasma inputs computed from the Monte Carlo estimators, these can not be
+# recomputed from the radiation temperature and dilution factor alone
+PLASMA_CHECKPOINT_INPUTS = (
+    "j_blues",
+    "gamma",
+    "alpha_stim_factor",
+    "bf_heating_coeff_estimator",
+    "stim_recomb_cooling_coeff_estimator",
+)
+
+PLASMA_STATE_HISTORY = (
+    "iterations_w",
+    "iterations_t_rad",
+    "iterations_electron_densities",
+    "iterations_t_inner",
+)
+
+
+def get_plasma_checkpoint_inputs(plasma) -> Dict[str, Any]:
+    """
+    Collect the estimator based inputs of the last plasma update.
+
+    Parameters
+    ----------
+    plasma : tardis.plasma.BasePlasma
+
+    Returns
+    -------
+    dict
+        Input names and their current values.
+    """
+    plasma_inputs = {}
+    for name in PLASMA_CHECKPOINT_INPUTS:
+        if name not in plasma.outputs_dict:
+            continue
+        value = getattr(plasma, name)
+        if value is not None:
+            plasma_inputs[name] = value
+    return plasma_inputs
+
+
+def get_history_path(file_path: Union[str, Path]) -> Path:
+    """
+    File the plasma state history of a checkpoint is appended to.
+
+    Parameters
+    ----------
+    file_path : str or pathlib.Path
+        Checkpoint file.
+
+    Returns
+    -------
+    pathlib.Path
+    """
+    file_path = Path(file_path)
+    return file_path.with_name(f"{file_path.name}{HISTORY_SUFFIX}")
+
+
+def append_plasma_state_history(
+    file_path: Union[str, Path], completed_iterations: int, plasma_state_storer
+) -> None:
+    """
+    Append the rows of the `PlasmaStateStorerMixin` arrays that are missing
+    from the history file of a checkpoint.
+
+    Only the row of the last completed iteration is written, unless the
+    history file is new, e.g. for a run resumed into another checkpoint
+    file. The row of an iteration that is written again after a resume
+    replaces the earlier one when the history is read.
+
+    Parameters
+    ----------
+    file_path : str or pathlib.Path
+        Checkpoint file.
+    completed_iterations : int
+    plasma_state_storer : tardis.simulation.base.PlasmaStateStorerMixin
+    """
+    with pd.HDFStore(get_history_path(file_path), "a") as store:
+        for name in PLASMA_STATE_HISTORY:
+            key = f"{CHECKPOINT_PATH}/{name}"
+            stored_rows = store.get_storer(key).nrows if key in store else 0
+            first_row = min(stored_rows, completed_iterations - 1)
+            history = np.asarray(getattr(plasma_state_storer, name))
+            rows = history[first_row:completed_iterations]
+            store.append(
+                key,
+                pd.DataFrame(
+                    rows.reshape(len(rows), -1),
+                    index=np.arange(first_row, completed_iterations),
+                ).rename(columns=str),
+                index=False,
+            )
+
+
+def read_plasma_state_history(
+    file_path: Union[str, Path], completed_iterations: int
+) -> Dict[str, Any]:
+    """
+    Read the rows of the completed iterations from the history file of a
+    checkpoint.
+
+    Parameters
+    ----------
+    file_path : str or pathlib.Path
+        Checkpoint file.
+    completed_iterations : int
+
+    Returns
+    -------
+    dict
+        History names and their rows, empty if there is no history file.
+    """
+    history_path = get_history_path(file_path)
+    plasma_state_history = {}
+    if not history_path.exists():
+        return plasma_state_history
+    with pd.HDFStore(history_path, "r") as store:
+        for name in PLASMA_STATE_HISTORY:
+            key = f"{CHECKPOINT_PATH}/{name}"
+            if key not in store:
+                continue
+            rows = store[key]
+            rows = rows[~rows.index.duplicated(keep="last")].sort_index()
+            rows = rows[rows.index < completed_iterations].to_numpy()
+            if name == "iterations_t_inner":
+                rows = rows[:, 0]
+            plasma_state_history[name] = rows
+    for name in ("iterations_t_rad", "iterations_t_inner"):
+        if name in plasma_state_history:
+            plasma_state_history[name] = u.Quantity(
+                plasma_state_history[name], u.K
+            )
+    return plasma_state_history
+
+
+@dataclass
+class IterationCheckpoint:
+    """
+    State of an iterative TARDIS run after `completed_iterations` iterations.
+
+    Parameters
+    ----------
+    completed_iterations : int
+        Number of completed iterations, the index of the next iteration.
+    consecutive_converges_count : int
+    converged : bool
+    t_radiative : astropy.units.Quantity
+        Radiation temperature the next iteration starts from.
+    dilution_factor : numpy.ndarray
+        Dilution factor the next iteration starts from.
+    t_inner : astropy.units.Quantity
+        Inner boundary temperature the next iteration starts from.
+    packet_base_seed : int or None
+        Base seed of the packet source.
+    packet_seed_offset : int
+        Seed offset of the packets of the next iteration, the packet seeds
+        are drawn from ``packet_base_seed + packet_seed_offset``.
+    plasma_inputs : dict
+        Estimator based inputs of the last plasma update, see
+        `PLASMA_CHECKPOINT_INPUTS`.
+    plasma_state_history : dict
+        Rows of the `PlasmaStateStorerMixin` arrays of the completed
+        iterations read from the history file, empty if the run does not
+        store them. Not written by `to_hdf`, see
+        `append_plasma_state_history`.
+    """
+
+    completed_iterations: int
+    consecutive_converges_count: int
+    converged: bool
+    t_radiative: u.Quantity
+    dilution_factor: np.ndarray
+    t_inner: u.Quantity
+    packet_base_seed: Optional[int] = None
+    packet_seed_offset: int = 0
+    plasma_inputs: Dict[str, Any] = field(default_factory=dict)
+    plasma_state_history: Dict[str, Any] = field(default_factory=dict)
+
+    def to_hdf(self, file_path: Union[str, Path]) -> None:
+        """
+        Write the checkpoint, replacing an existing checkpoint file.
+
+        The checkpoint is first written to a temporary file which is then
+        renamed, so an interrupted write leaves the previous checkpoint
+        intact.
+
+        Parameters
+        ----------
+        file_path : str or pathlib.Path
+        """
+        file_path = Path(file_path)
+        tmp_path = file_path.with_name(f"{file_path.name}.tmp")
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+        # the scalars are all stored as one float64 Series, the packet seeds
+        # are below 2**32 and represented exactly
+        elements = {
+            "completed_iterations": self.completed_iterations,
+            "consecutive_converges_count": self.consecutive_converges_count,
+            "converged": int(self.converged),
+            "t_radiative": self.t_radiative,
+            "dilution_factor": self.dilution_factor,
+            "t_inner": self.t_inner,
+            # -1 stands for a packet source without a base seed
+            "packet_base_seed": (
+                -1 if self.packet_base_seed is None else self.packet_base_seed
+            ),
+            "packet_seed_offset": self.packet_seed_offset,
+            # plain arrays come back as DataFrames, remember which ones
+            "array_plasma_inputs": pd.Series(
+                {
+                    name: isinstance(value, np.ndarray)
+                    for name, value in self.plasma_inputs.items()
+                },
+                dtype=bool,
+            ),
+        }
+        HDFWriterMixin.to_hdf_util(
+            str(tmp_path), CHECKPOINT_PATH, elements, overwrite=True
+        )
+        if self.plasma_inputs:
+            HDFWriterMixin.to_hdf_util(
+                str(tmp_path),
+                PLASMA_INPUTS_PATH,
+                self.plasma_inputs,
+                overwrite=True,
+            )
+        os.replace(tmp_path, file_path)
+
+    @classmethod
+    def from_hdf(cls, file_path: Union[str, Path]) -> IterationCheckpoint:
+        """
+        Read a checkpoint written by `to_hdf` and the rows of its completed
+        iterations from the history file.
+
+        Parameters
+        ----------
+        file_path : str or pathlib.Path
+
+        Returns
+        -------
+        IterationCheckpoint
+        """
+        with pd.HDFStore(file_path, "r") as store:
+            scalars = store[f"{CHECKPOINT_PATH}/scalars"]
+            is_array_plasma_input = store[
+                f"{CHECKPOINT_PATH}/array_plasma_inputs"
+            ]
+            array_plasma_inputs = is_array_plasma_input.index[
+                is_array_plasma_input
+            ]
+            plasma_inputs = {}
+            for name in PLASMA_CHECKPOINT_INPUTS:
+                key = f"{PLASMA_INPUTS_PATH}/{name}"
+                if key not in store:
+                    continue
+                value = store[key]
+                if name in array_plasma_inputs:
+                    value = value.to_numpy()
+                plasma_inputs[name] = value
+
+            completed_iterations = int(scalars["completed_iterations"])
+            packet_base_seed = int(scalars["packet_base_seed"])
+            return cls(
+                completed_iterations=completed_iterations,
+                consecutive_converges_count=int(
+                    scalars["consecutive_converges_count"]
+                ),
+                converged=bool(scalars["converged"]),
+                t_radiative=store[f"{CHECKPOINT_PATH}/t_radiative"].to_numpy()
+                * u.K,
+                dilution_factor=store[
+                    f"{CHECKPOINT_PATH}/dilution_factor"
+                ].to_numpy(),
+                t_inner=scalars["t_inner"] * u.K,
+                packet_base_seed=(
+                    None if packet_base_seed == -1 else packet_base_seed
+                ),
+                packet_seed_offset=int(scalars["packet_seed_offset"]),
+                plasma_inputs=plasma_inputs,
+                plasma_state_history=read_plasma_state_history(
+                    file_path, completed_iterations
+                ),
+            )
+
+    def restore_simulation_state(self, simulation_state) -> None:
+        """
+        Set the radiation field, the inner boundary temperature and the
+        packet base seed of a simulation state to the checkpointed values.
+
+        Parameters
+        ----------
+        simulation_state : tardis.model.SimulationState
+        """
+        simulation_state.t_radiative = self.t_radiative
+        simulation_state.dilution_factor = self.dilution_factor
+        simulation_state.blackbody_packet_source.temperature = self.t_inner
+        if self.packet_base_seed is not None:
+            simulation_state.packet_source.base_seed = self.packet_base_seed
+
+    def restore_plasma(self, plasma) -> None:
+        """
+        Rebuild the plasma from the checkpointed radiation field and
+        estimator based inputs.
+
+        Parameters
+        ----------
+        plasma : tardis.plasma.BasePlasma
+        """
+        radiation_field = DilutePlanckianRadiationField(
+            temperature=self.t_radiative,
+            dilution_factor=self.dilution_factor,
+        )
+        plasma.update(
+            dilute_planckian_radiation_field=radiation_field,
+            **self.plasma_inputs,
+        )
+
+    def restore_plasma_state_history(self, plasma_state_storer) -> None:
+        """
+        Fill the `PlasmaStateStorerMixin` arrays with the rows of the
+        completed iterations.
+
+        Parameters
+        ----------
+        plasma_state_storer : tardis.simulation.base.PlasmaStateStorerMixin
+        """
+        for name, history in self.plasma_state_history.items():
+            getattr(plasma_state_storer, name)[: len(history)] = history
+
+
+def write_checkpoint(
+    file_path: Optional[Union[str, Path]],
+    completed_iterations: int,
+    consecutive_converges_count: int,
+    converged: bool,
+    simulation_state,
+    plasma,
+    plasma_state_storer=None,
+) -> None:
+    """
+    Checkpoint a run after `completed_iterations` iterations.
+
+    The row of the last completed iteration is appended to the history file
+    before the checkpoint file is replaced, so the checkpoint never refers
+    to a missing row.
+
+    Parameters
+    ----------
+    file_path : str, pathlib.Path or None
+        Checkpoint file, nothing is written if None.
+    completed_iterations : int
+    consecutive_converges_count : int
+    converged : bool
+    simulation_state : tardis.model.SimulationState
+        Simulation state updated for the next iteration.
+    plasma : tardis.plasma.BasePlasma
+        Plasma updated for the next iteration.
+    plasma_state_storer : PlasmaStateStorerMixin, optional
+        Object storing the plasma state of every iteration.
+    """
+    if file_path is None:
+        return
+    if plasma_state_storer is not None:
+        append_plasma_state_history(
+            file_path, completed_iterations, plasma_state_storer
+        )
+    IterationCheckpoint(
+        completed_iterations=completed_iterations,
+        consecutive_converges_count=consecutive_converges_count,
+        converged=converged,
+        t_radiative=simulation_state.t_radiative,
+        dilution_factor=simulation_state.dilution_factor,
+        t_inner=simulation_state.t_inner,
+        packet_base_seed=simulation_state.packet_source.base_seed,
+        # the packets of iteration i are created with seed offset i
+        packet_seed_offset=completed_iterations,
+        plasma_inputs=get_plasma_checkpoint_inputs(plasma),
+    ).to_hdf(file_path)
+    logger.debug(
+        f"Wrote checkpoint after iteration {completed_iterations:d} to {file_path}"
+    )
+
+
+def read_checkpoint(file_path: Union[str, Path]) -> IterationCheckpoint:
+    """
+    Read a checkpoint to resume a run from.
+
+    Parameters
+    ----------
+    file_path : str or pathlib.Path
+
+    Returns
+    -------
+    IterationCheckpoint
+    """
+    with pd.HDFStore(file_path, "r") as store:
+        version = store[f"{CHECKPOINT_PATH}/metadata"]["tardis_version"]
+    if version != __version__:
+        logger.warning(
+            f"Checkpoint {file_path} was written by TARDIS {version}, "
+            f"resuming with TARDIS {__version__}"
+        )
+    checkpoint = IterationCheckpoint.from_hdf(file_path)
+    logger.info(
+        f"\n\tResuming from checkpoint {file_path} after "
+        f"{checkpoint.completed_iterations:d} completed iterations"
+    )
+    return checkpoint
@@ -1,5 +1,9 @@
+import logging
+
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 
 class ConvergenceSolver:
     def __init__(self, strategy):
@@ -53,6 +57,24 @@ class ConvergenceSolver:
         """
         return value + self.damping_factor * (estimated_value - value)
 
+    def get_fractional_change(self, value, estimated_value):
+        """Get the fractional change between the current and the estimated
+        value of the physical property
+
+        Parameters
+        ----------
+        value : np.float64, Quantity
+            The current value of the physical property
+        estimated_value : np.float64, Quantity
+            The estimated value of the physical property
+
+        Returns
+        -------
+        np.float64 or np.ndarray
+            Fractional change, measured against the estimated value
+        """
+        return abs(value - estimated_value) / estimated_value
+
     def get_convergence_status(self, value, estimated_value, no_of_cells):
         """Get the status of convergence for the physical property
 
@@ -70,9 +92,217 @@ class ConvergenceSolver:
         bool
             True if convergence is reached
         """
-        convergence = abs(value - estimated_value) / estimated_value
+        convergence = self.get_fractional_change(value, estimated_value)
 
         fraction_converged = (
             np.count_nonzero(convergence < self.threshold) / no_of_cells
         )
         return fraction_converged > self.threshold
+
+
+def estimate_monte_carlo_noise(transport_state):
+    """Estimate the relative Monte Carlo noise of the quantities the
+    convergence criterion is evaluated on.
+
+    The radiative temperature and the dilution factor are estimated per
+    shell, from the number of packet paths through every shell. This number
+    follows from the path length estimator J, the mean packet energy and the
+    mean chord length 4 V / S of the shell (Cauchy's formula). The radiative
+    temperature follows the mean frequency of these paths, whose relative
+    spread is taken from the escaping packets, and the dilution factor
+    combines the noise of the path count with the 4th power of the
+    radiative temperature. The escaping packets are treated as a binomial
+    sample of the packet collection, so the emitted luminosity (and hence
+    t_inner, which scales with its -1/2 power) carries the binomial noise of
+    the escaped fraction.
+
+    Parameters
+    ----------
+    transport_state : tardis.transport.montecarlo.montecarlo_transport_state.MonteCarloTransportState
+        Transport state of the last Monte Carlo run
+
+    Returns
+    -------
+    dict
+        Relative noise with the keys t_radiative and dilution_factor (one
+        value per shell) and t_inner
+    """
+    packet_collection = transport_state.packet_collection
+    geometry_state = transport_state.geometry_state
+    j_estimator = transport_state.radfield_mc_estimators.j_estimator
+    emitted_packet_mask = packet_collection.output_energies >= 0
+    no_of_packets = emitted_packet_mask.size
+    no_of_emitted_packets = np.count_nonzero(emitted_packet_mask)
+
+    if no_of_emitted_packets == 0:
+        return {
+            "t_radiative": np.full(len(j_estimator), np.inf),
+            "dilution_factor": np.full(len(j_estimator), np.inf),
+            "t_inner": np.inf,
+        }
+
+    escape_fraction = no_of_emitted_packets / no_of_packets
+    emitted_nus = packet_collection.output_nus[emitted_packet_mask]
+
+    r_inner = geometry_state.r_inner
+    r_outer = geometry_state.r_outer
+    shell_volume = 4 / 3 * np.pi * (r_outer**3 - r_inner**3)
+    shell_surface = 4 * np.pi * (r_outer**2 + r_inner**2)
+    no_of_shell_paths = (
+        j_estimator
+        * shell_surface
+        / (4 * shell_volume * np.mean(packet_collection.initial_energies))
+    )
+    with np.errstate(divide="ignore"):
+        path_count_noise = 1 / np.sqrt(no_of_shell_paths)
+
+    t_inner_noise = 0.5 * np.sqrt((1 - escape_fraction) / no_of_emitted_packets)
+    t_rad_noise = np.std(emitted_nus) / np.mean(emitted_nus) * path_count_noise
+    w_noise = np.sqrt(path_count_noise**2 + (4 * t_rad_noise) ** 2)
+
+    return {
+        "t_radiative": t_rad_noise,
+        "dilution_factor": w_noise,
+        "t_inner": t_inner_noise,
+    }
+
+
+class AdaptivePacketSchedule:
+    """Number of packets of the convergence iterations, driven by the
+    convergence statistics.
+
+    The schedule starts with `min_no_of_packets` and raises the packet count
+    whenever the Monte Carlo noise is no longer small against the fractional
+    changes of the converging quantities. As the noise scales with the
+    inverse square root of the number of packets, the count needed for a
+    noise of `noise_fraction` times the change is estimated in every cell
+    from the noise of the last iteration. The fractional changes are never
+    taken below the convergence threshold, and the packet count resolves
+    the changes of the `fraction` of cells the convergence criterion is
+    evaluated on, so that it always resolves the criterion in poorly
+    sampled cells as well. The packet count never decreases.
+
+    Parameters
+    ----------
+    min_no_of_packets : int
+        Number of packets of the first iteration
+    max_no_of_packets : int
+        Upper limit of the number of packets
+    thresholds : dict
+        Convergence threshold of every converging quantity
+    fraction : float
+        Fraction of the cells whose fractional changes the packet count has
+        to resolve
+    noise_fraction : float, optional
+        Targeted ratio of the Monte Carlo noise and the fractional change,
+        by default 0.5
+    """
+
+    def __init__(
+        self,
+        min_no_of_packets,
+        max_no_of_packets,
+        thresholds,
+        fraction,
+        noise_fraction=0.5,
+    ):
+        if not 0 < min_no_of_packets <= max_no_of_packets:
+            raise ValueError(
+                f"min_no_of_packets ({min_no_of_packets}) has to be positive "
+                f"and not larger than max_no_of_packets ({max_no_of_packets})"
+            )
+        self.min_no_of_packets = int(min_no_of_packets)
+        self.max_no_of_packets = int(max_no_of_packets)
+        self.thresholds = thresholds
+        self.fraction = fraction
+        self.noise_fraction = noise_fraction
+        self.no_of_packets = self.min_no_of_packets
+        self.noise = None
+        self.noise_limited = False
+
+    @classmethod
+    def from_config(cls, montecarlo_config):
+        """Create the schedule from the montecarlo section of the config.
+
+        Parameters
+        ----------
+        montecarlo_config : tardis.io.configuration.config_reader.ConfigurationNameSpace
+            The montecarlo section of the configuration
+
+        Returns
+        -------
+        AdaptivePacketSchedule or None
+            None if adaptive packet counts are disabled
+        """
+        adaptive_config = montecarlo_config.adaptive_packets
+        if not adaptive_config.enabled:
+            return None
+
+        convergence_strategy = montecarlo_config.convergence_strategy
+        no_of_packets = int(montecarlo_config.no_of_packets)
+        return cls(
+            min(int(adaptive_config.min_no_of_packets), no_of_packets),
+            no_of_packets,
+            thresholds={
+                "t_radiative": convergence_strategy.t_rad.threshold,
+                "dilution_factor": convergence_strategy.w.threshold,
+                "t_inner": convergence_strategy.t_inner.threshold,
+            },
+            fraction=convergence_strategy.fraction,
+            noise_fraction=adaptive_config.noise_fraction,
+        )
+
+    def update(self, fractional_changes, noise):
+        """Update the number of packets of the next iteration.
+
+        Parameters
+        ----------
+        fractional_changes : dict
+            Fractional change of every converging quantity in the last
+            iteration (scalar or per cell), keyed like `thresholds`
+        noise : dict
+            Relative Monte Carlo noise of every converging quantity in the
+            last iteration (scalar or per cell), see
+            `estimate_monte_carlo_noise`
+
+        Returns
+        -------
+        int
+            Number of packets of the next iteration
+        """
+        required_no_of_packets = self.no_of_packets
+        for key, threshold in self.thresholds.items():
+            resolved_change = np.maximum(
+                np.asarray(fractional_changes[key]), threshold
+            )
+            cell_no_of_packets = (
+                self.no_of_packets
+                * (
+                    np.asarray(noise[key])
+                    / (self.noise_fraction * resolved_change)
+                )
+                ** 2
+            )
+            # no interpolation towards cells without paths (infinite noise)
+            required_no_of_packets = max(
+                required_no_of_packets,
+                np.quantile(cell_no_of_packets, self.fraction, method="higher"),
+            )
+
+        if (
+            required_no_of_packets > self.max_no_of_packets
+            and not self.noise_limited
+        ):
+            self.noise_limited = True
+            logger.warning(
+                f"\n\t{self.max_no_of_packets:d} packets do not resolve the "
+                f"convergence threshold, Monte Carlo noise: "
+                + ", ".join(
+                    f"{key} {np.max(value):.2e}" for key, value in noise.items()
+                )
+            )
+        self.no_of_packets = int(
+            min(np.ceil(required_no_of_packets), self.max_no_of_packets)
+        )
+        self.noise = noise
+        return self.no_of_packets
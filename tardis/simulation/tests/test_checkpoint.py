@@ -0,0 +1,207 @@
+import warnings
+from types import SimpleNamespace
+
+import astropy.units as u
+import numpy as np
+import pandas as pd
+
+from tardis.simulation.base import PlasmaStateStorerMixin
+from tardis.simulation.checkpoint import (
+    IterationCheckpoint,
+    append_plasma_state_history,
+    get_history_path,
+    read_checkpoint,
+    write_checkpoint,
+)
+
+
+class MockPlasma:
+    def __init__(self, no_of_shells):
+        self.j_blues = pd.DataFrame(
+            np.random.default_rng(1).random((4, no_of_shells)),
+            index=pd.MultiIndex.from_tuples(
+                [(1, 0, 0, 1), (1, 0, 0, 2), (2, 1, 0, 3), (2, 1, 1, 3)]
+            ),
+        )
+        self.bf_heating_coeff_estimator = np.ones((2, no_of_shells))
+        self.gamma = None
+        self.outputs_dict = {
+            "j_blues": None,
+            "gamma": None,
+            "bf_heating_coeff_estimator": None,
+        }
+        self.updates = []
+
+    def update(self, **kwargs):
+        self.updates.append(kwargs)
+
+
+def mock_simulation_state(
+    t_radiative, dilution_factor, t_inner, base_seed=None
+):
+    packet_source = SimpleNamespace(temperature=t_inner, base_seed=base_seed)
+    return SimpleNamespace(
+        t_radiative=t_radiative,
+        dilution_factor=dilution_factor,
+        t_inner=t_inner,
+        blackbody_packet_source=packet_source,
+        packet_source=packet_source,
+    )
+
+
+def test_checkpoint_roundtrip(tmp_path):
+    no_of_shells = 5
+    checkpoint_path = tmp_path / "checkpoint.h5"
+    plasma = MockPlasma(no_of_shells)
+    simulation_state = mock_simulation_state(
+        np.linspace(11000, 9000, no_of_shells) * u.K,
+        np.linspace(0.5, 0.1, no_of_shells),
+        10500 * u.K,
+        base_seed=23111963,
+    )
+    storer = PlasmaStateStorerMixin(4, no_of_shells)
+    for i in range(2):
+        storer.store_plasma_state(
+            i,
+            simulation_state.dilution_factor * (i + 1),
+            simulation_state.t_radiative,
+            pd.Series(np.full(no_of_shells, 1e8 * (i + 1))),
+            simulation_state.t_inner,
+        )
+
+    with warnings.catch_warnings():
+        # the scalars must not be pickled as an object Series
+        warnings.simplefilter("error", pd.errors.PerformanceWarning)
+        write_checkpoint(
+            checkpoint_path, 2, 1, False, simulation_state, plasma, storer
+        )
+    assert pd.read_hdf(checkpoint_path, "checkpoint/scalars").dtype == (
+        np.float64
+    )
+    checkpoint = read_checkpoint(checkpoint_path)
+
+    assert checkpoint.completed_iterations == 2
+    assert checkpoint.consecutive_converges_count == 1
+    assert not checkpoint.converged
+    assert checkpoint.packet_base_seed == 23111963
+    assert checkpoint.packet_seed_offset == 2
+    np.testing.assert_allclose(checkpoint.t_inner, 10500 * u.K)
+    assert set(checkpoint.plasma_inputs) == {
+        "j_blues",
+        "bf_heating_coeff_estimator",
+    }
+    pd.testing.assert_frame_equal(
+        checkpoint.plasma_inputs["j_blues"], plasma.j_blues
+    )
+    assert isinstance(
+        checkpoint.plasma_inputs["bf_heating_coeff_estimator"], np.ndarray
+    )
+
+    resumed_state = mock_simulation_state(
+        np.zeros(no_of_shells) * u.K, np.zeros(no_of_shells), 0 * u.K
+    )
+    resumed_plasma = MockPlasma(no_of_shells)
+    resumed_storer = PlasmaStateStorerMixin(4, no_of_shells)
+    checkpoint.restore_simulation_state(resumed_state)
+    checkpoint.restore_plasma(resumed_plasma)
+    checkpoint.restore_plasma_state_history(resumed_storer)
+
+    np.testing.assert_allclose(
+        resumed_state.t_radiative, simulation_state.t_radiative
+    )
+    np.testing.assert_allclose(
+        resumed_state.blackbody_packet_source.temperature, 10500 * u.K
+    )
+    assert resumed_state.packet_source.base_seed == 23111963
+    (update,) = resumed_plasma.updates
+    np.testing.assert_allclose(
+        update["dilute_planckian_radiation_field"].dilution_factor,
+        simulation_state.dilution_factor,
+    )
+    np.testing.assert_allclose(
+        resumed_storer.iterations_w[:2], storer.iterations_w[:2]
+    )
+    np.testing.assert_allclose(
+        resumed_storer.iterations_t_inner[:2], storer.iterations_t_inner[:2]
+    )
+    assert np.all(resumed_storer.iterations_w[2:] == 0)
+
+
+def test_checkpoint_replaced_atomically(tmp_path):
+    checkpoint_path = tmp_path / "checkpoint.h5"
+    for completed_iterations in (1, 2):
+        IterationCheckpoint(
+            completed_iterations=completed_iterations,
+            consecutive_converges_count=0,
+            converged=False,
+            t_radiative=np.ones(3) * u.K,
+            dilution_factor=np.ones(3),
+            t_inner=1 * u.K,
+        ).to_hdf(checkpoint_path)
+
+    assert (
+        IterationCheckpoint.from_hdf(checkpoint_path).completed_iterations == 2
+    )
+    assert list(tmp_path.iterdir()) == [checkpoint_path]
+
+
+def test_checkpoint_history_appended(tmp_path):
+    no_of_shells = 3
+    checkpoint_path = tmp_path / "checkpoint.h5"
+    plasma = MockPlasma(no_of_shells)
+    simulation_state = mock_simulation_state(
+        np.ones(no_of_shells) * u.K, np.ones(no_of_shells), 1 * u.K
+    )
+    storer = PlasmaStateStorerMixin(5, no_of_shells)
+    for i in range(4):
+        storer.store_plasma_state(
+            i,
+            np.full(no_of_shells, i),
+            np.full(no_of_shells, 1000 * i) * u.K,
+            pd.Series(np.full(no_of_shells, 1e8 * i)),
+            100 * i * u.K,
+        )
+        write_checkpoint(
+            checkpoint_path, i + 1, 0, False, simulation_state, plasma, storer
+        )
+        with pd.HDFStore(get_history_path(checkpoint_path), "r") as store:
+            # every checkpoint appends only the row of its iteration
+            assert len(store["checkpoint/iterations_w"]) == i + 1
+
+    # a row appended by an iteration that is not in the checkpoint file
+    stale_storer = PlasmaStateStorerMixin(5, no_of_shells)
+    stale_storer.iterations_w[:] = -1
+    append_plasma_state_history(checkpoint_path, 5, stale_storer)
+
+    checkpoint = read_checkpoint(checkpoint_path)
+    np.testing.assert_array_equal(
+        checkpoint.plasma_state_history["iterations_w"], storer.iterations_w[:4]
+    )
+    np.testing.assert_allclose(
+        checkpoint.plasma_state_history["iterations_t_inner"],
+        [0, 100, 200, 300] * u.K,
+    )
+
+    # resuming after the crash writes the row of the fifth iteration again
+    storer.store_plasma_state(
+        4,
+        np.full(no_of_shells, 4),
+        np.full(no_of_shells, 4000) * u.K,
+        pd.Series(np.full(no_of_shells, 4e8)),
+        400 * u.K,
+    )
+    write_checkpoint(
+        checkpoint_path, 5, 0, False, simulation_state, plasma, storer
+    )
+    checkpoint = read_checkpoint(checkpoint_path)
+    np.testing.assert_array_equal(
+        checkpoint.plasma_state_history["iterations_w"], storer.iterations_w
+    )
+
+    # a new checkpoint file receives the rows of all completed iterations
+    other_path = tmp_path / "other.h5"
+    write_checkpoint(other_path, 5, 0, False, simulation_state, plasma, storer)
+    np.testing.assert_allclose(
+        read_checkpoint(other_path).plasma_state_history["iterations_t_rad"],
+        storer.iterations_t_rad,
+    )
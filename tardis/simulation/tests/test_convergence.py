@@ -1,11 +1,16 @@
 from pathlib import Path
+from types import SimpleNamespace
 
 import numpy as np
 import numpy.testing as npt
 import pytest
 
 from tardis.io.configuration.config_reader import Configuration
-from tardis.simulation.convergence import ConvergenceSolver
+from tardis.simulation.convergence import (
+    AdaptivePacketSchedule,
+    ConvergenceSolver,
+    estimate_monte_carlo_noise,
+)
 
 
 @pytest.fixture(scope="function")
@@ -63,3 +68,110 @@ def test_get_convergence_status(strategy):
         value, estimated_value, no_of_cells
     )
     assert not is_converged
+
+
+def test_adaptive_packet_schedule_from_config(config):
+    assert AdaptivePacketSchedule.from_config(config.montecarlo) is None
+
+    config.montecarlo.adaptive_packets.enabled = True
+    config.montecarlo.adaptive_packets.min_no_of_packets = 1e2
+    schedule = AdaptivePacketSchedule.from_config(config.montecarlo)
+    assert schedule.no_of_packets == 100
+    assert schedule.max_no_of_packets == int(config.montecarlo.no_of_packets)
+
+
+def test_adaptive_packet_schedule_update():
+    schedule = AdaptivePacketSchedule(
+        1000,
+        100000,
+        thresholds={"t_radiative": 0.05, "t_inner": 0.05},
+        fraction=0.8,
+    )
+    converged_changes = {"t_radiative": np.full(5, 1e-4), "t_inner": 1e-4}
+
+    # changes well above the noise keep the packet count
+    noise = {"t_radiative": 0.05, "t_inner": 0.01}
+    assert (
+        schedule.update({"t_radiative": np.full(5, 0.5), "t_inner": 0.5}, noise)
+        == 1000
+    )
+    # the change resolved is limited by the threshold
+    assert schedule.update(converged_changes, noise) == 4000
+    # the packet count never decreases
+    assert (
+        schedule.update(converged_changes, {"t_radiative": 0.0, "t_inner": 0.0})
+        == 4000
+    )
+    # and is capped at the maximum number of packets
+    noise = {"t_radiative": 0.5, "t_inner": 0.01}
+    assert schedule.update(converged_changes, noise) == 100000
+    assert schedule.noise_limited
+
+
+def test_adaptive_packet_schedule_per_cell_noise():
+    schedule = AdaptivePacketSchedule(
+        1000,
+        100000,
+        thresholds={"t_radiative": 0.05},
+        fraction=0.8,
+    )
+    changes = {"t_radiative": np.full(10, 0.5)}
+    noise = {"t_radiative": np.full(10, 0.05)}
+
+    # one poorly sampled cell out of ten is within the allowed fraction
+    noise["t_radiative"][-1] = 1.0
+    assert schedule.update(changes, noise) == 1000
+    # two are not, the packet count has to resolve the better of them
+    noise["t_radiative"][-2] = 0.5
+    assert schedule.update(changes, noise) == 4000
+    # cells without packet paths cap the packet count
+    noise["t_radiative"][-2:] = np.inf
+    assert schedule.update(changes, noise) == 100000
+
+
+def test_estimate_monte_carlo_noise():
+    rng = np.random.default_rng(1963)
+    no_of_packets = 10000
+    output_energies = np.where(
+        rng.uniform(size=no_of_packets) < 0.75, 1.0, -1.0
+    )
+    output_nus = rng.uniform(1.0, 2.0, size=no_of_packets)
+    r_inner = np.array([1.0, 2.0, 3.0])
+    r_outer = np.array([2.0, 3.0, 4.0])
+    shell_volume = 4 / 3 * np.pi * (r_outer**3 - r_inner**3)
+    shell_surface = 4 * np.pi * (r_outer**2 + r_inner**2)
+    packet_energy = 1 / no_of_packets
+    # J of 10000, 100 and no packet paths of mean chord length 4 V / S
+    no_of_shell_paths = np.array([1e4, 1e2, 0.0])
+    j_estimator = (
+        no_of_shell_paths * packet_energy * 4 * shell_volume / shell_surface
+    )
+    transport_state = SimpleNamespace(
+        packet_collection=SimpleNamespace(
+            output_energies=output_energies,
+            output_nus=output_nus,
+            initial_energies=np.full(no_of_packets, packet_energy),
+        ),
+        geometry_state=SimpleNamespace(r_inner=r_inner, r_outer=r_outer),
+        radfield_mc_estimators=SimpleNamespace(j_estimator=j_estimator),
+    )
+
+    noise = estimate_monte_carlo_noise(transport_state)
+
+    no_of_emitted_packets = np.count_nonzero(output_energies >= 0)
+    escape_fraction = no_of_emitted_packets / output_energies.size
+    npt.assert_allclose(
+        noise["t_inner"],
+        0.5 * np.sqrt((1 - escape_fraction) / no_of_emitted_packets),
+    )
+    # uniform frequencies in [1, 2]: std / mean = 1 / (sqrt(12) * 1.5)
+    npt.assert_allclose(
+        noise["t_radiative"][:2] * np.sqrt(no_of_shell_paths[:2]),
+        1 / (np.sqrt(12) * 1.5),
+        rtol=2e-2,
+    )
+    # the noise grows in poorly sampled shells
+    npt.assert_allclose(noise["t_radiative"][1] / noise["t_radiative"][0], 10.0)
+    assert np.all(noise["dilution_factor"][:2] > 4 * noise["t_radiative"][:2])
+    assert np.isinf(noise["t_radiative"][2])
+    assert np.isinf(noise["dilution_factor"][2])
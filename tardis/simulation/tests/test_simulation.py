@@ -119,3 +119,36 @@ def test_plasma_state_storer_reshape(
 
 def test_version_tag(simulation_without_loop):
     assert simulation_without_loop.version == tardis.__version__
+
+
+def test_resume_from_checkpoint(
+    config_verysimple_for_simulation_one_loop, tmp_path
+):
+    checkpoint_path = tmp_path / "checkpoint.h5"
+    config = deepcopy(config_verysimple_for_simulation_one_loop)
+    config.montecarlo.iterations = 3
+    interrupted = Simulation.from_config(
+        config, checkpoint_path=checkpoint_path
+    )
+    interrupted.run_convergence()
+
+    resumed = Simulation.from_config(config, resume_from=checkpoint_path)
+
+    assert resumed.iterations_executed == interrupted.iterations_executed
+    assert resumed.converged == interrupted.converged
+    np.testing.assert_allclose(
+        resumed.simulation_state.t_radiative,
+        interrupted.simulation_state.t_radiative,
+    )
+    np.testing.assert_allclose(
+        resumed.simulation_state.t_inner, interrupted.simulation_state.t_inner
+    )
+    np.testing.assert_allclose(
+        resumed.plasma.electron_densities,
+        interrupted.plasma.electron_densities,
+        rtol=1e-6,
+    )
+    n = resumed.iterations_executed
+    np.testing.assert_allclose(
+        resumed.iterations_t_rad[:n], interrupted.iterations_t_rad[:n]
+    )
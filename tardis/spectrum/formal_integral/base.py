@@ -118,3 +118,49 @@ def intensity_black_body(frequency, temperature):
     beta_rad = 1 / (KB_CGS * temperature)
     coefficient = 2 * H_CGS * C_INV * C_INV
     return coefficient * frequency * frequency * frequency / (np.exp(H_CGS * frequency * beta_rad) - 1)
+
+
+def calculate_shell_interpolation_indices(r_middle, r_middle_interpolated):
+    """
+    Calculate the shells neighbouring every interpolated shell, as used by
+    the linear and nearest interpolation of `scipy.interpolate.interp1d`
+    with extrapolation.
+
+    Parameters
+    ----------
+    r_middle : np.ndarray
+        Increasing middle radii of the shells
+    r_middle_interpolated : np.ndarray
+        Middle radii of the interpolated shells
+
+    Returns
+    -------
+    lower_shell_ids : np.ndarray
+        Shell below every interpolated shell for the linear interpolation
+    upper_shell_ids : np.ndarray
+        Shell above every interpolated shell for the linear interpolation
+    shell_widths : np.ndarray
+        Distance between the middle radii of the lower and upper shells
+    shell_offsets : np.ndarray
+        Distance of the interpolated shells from their lower shells
+    nearest_shell_ids : np.ndarray
+        Shell nearest to every interpolated shell, ties going to the lower
+    """
+    upper_shell_ids = np.searchsorted(r_middle, r_middle_interpolated).clip(
+        1, len(r_middle) - 1
+    )
+    lower_shell_ids = upper_shell_ids - 1
+    shell_widths = r_middle[upper_shell_ids] - r_middle[lower_shell_ids]
+    shell_offsets = r_middle_interpolated - r_middle[lower_shell_ids]
+
+    shell_boundaries = r_middle[1:] / 2.0 + r_middle[:-1] / 2.0
+    nearest_shell_ids = np.searchsorted(
+        shell_boundaries, r_middle_interpolated, side="left"
+    ).clip(0, len(r_middle) - 1)
+    return (
+        lower_shell_ids,
+        upper_shell_ids,
+        shell_widths,
+        shell_offsets,
+        nearest_shell_ids,
+    )
@@ -1,5 +1,6 @@
 import numpy as np
-from numba import njit, prange
+from numba import float64, njit, prange
+from numba.experimental import jitclass
 from typing import Tuple
 from numpy.typing import NDArray
 
@@ -13,6 +14,25 @@ from tardis.model.geometry.radial1d import NumbaRadial1DGeometry
 from tardis.transport.montecarlo import njit_dict, njit_dict_no_parallel
 from tardis.transport.montecarlo.configuration.constants import SIGMA_THOMSON
 
+numba_line_list_spec = [
+    ("line_list_nu", float64[:]),
+]
+
+
+@jitclass(numba_line_list_spec)
+class NumbaLineList:
+    def __init__(self, line_list_nu):
+        """
+        Line list of the formal integral, for integrating a subset of the
+        lines of the opacity state.
+
+        Parameters
+        ----------
+        line_list_nu : numpy.ndarray
+            Decreasing frequencies of the lines in Hz
+        """
+        self.line_list_nu = line_list_nu
+
 
 @njit(**njit_dict_no_parallel)
 def calculate_intersection_point(
@@ -193,6 +213,7 @@ def initialize_formal_integral_inputs(
     geometry: NumbaRadial1DGeometry,
     time_explosion: float,
     tau_sobolev: NDArray[np.float64],
+    line_list_nu: NDArray[np.float64],
 ) -> Tuple[
     NDArray[np.float64],  # intensities_nu_p
     NDArray[np.float64],  # impact_parameters
@@ -200,6 +221,7 @@ def initialize_formal_integral_inputs(
     NDArray[np.int64],  # shell_ids
     NDArray[np.int64],  # n_intersections
     NDArray[np.float64],  # exp_tau_sobolev
+    NDArray[np.int64],  # line_start_idx
 ]:
     """
     Prepare all arrays and values needed for the loops inside the formal integral.
@@ -218,6 +240,8 @@ def initialize_formal_integral_inputs(
         Time since explosion (seconds).
     tau_sobolev : ndarray
         Sobolev optical depths for each line and shell.
+    line_list_nu : ndarray
+        Line frequencies sorted by decreasing frequency.
 
     Returns
     -------
@@ -233,9 +257,13 @@ def initialize_formal_integral_inputs(
         Number of intersections for each impact parameter.
     exp_tau_sobolev : ndarray
         Exponential of negative Sobolev optical depths (flattened).
+    line_start_idx : ndarray
+        Index of the first line to the red of the start of the ray, for each
+        frequency and impact parameter.
     """
 
     n_frequencies = len(frequencies)
+    n_lines = len(line_list_nu)
     _, size_shell = tau_sobolev.shape
     exp_tau_sobolev = np.exp(-tau_sobolev.T.ravel())
     radius_max = geometry.r_outer[size_shell - 1]
@@ -256,32 +284,49 @@ def initialize_formal_integral_inputs(
     shell_ids = np.zeros((n_impact_parameters, 2 * size_shell), dtype=np.int64)
     n_intersections = np.zeros(n_impact_parameters, dtype=np.int64)
 
-    # loop over frequencies and impact parameters
-    for nu_idx in prange(n_frequencies):
-        intensities_nu = intensities_nu_p[nu_idx]
-        nu = frequencies[nu_idx]
-        for impact_parameter_idx in range(1, n_impact_parameters):
-            impact_parameter = impact_parameters[impact_parameter_idx]
+    # the shell intersections only depend on the impact parameter
+    for impact_parameter_idx in prange(1, n_impact_parameters):
+        n_intersections[impact_parameter_idx] = populate_intersection_points(
+            geometry,
+            time_explosion,
+            impact_parameters[impact_parameter_idx],
+            intersection_points[impact_parameter_idx],
+            shell_ids[impact_parameter_idx],
+        )
 
-            # get shell intersections
-            n_intersections_p = populate_intersection_points(
-                geometry,
-                time_explosion,
-                impact_parameter,
-                intersection_points[impact_parameter_idx],
-                shell_ids[impact_parameter_idx],
-            )
-            n_intersections[impact_parameter_idx] = n_intersections_p
-            intersection_point = intersection_points[impact_parameter_idx]
-
-            # if inside the photosphere, set to black body intensity
-            # otherwise zero
-            if impact_parameter <= radius_photosphere:
-                intensities_nu[impact_parameter_idx] = intensity_black_body(
-                    nu * intersection_point[0], inner_temperature
+    # first line to the red of the start of every ray. The comoving
+    # frequencies at the start of the rays of one impact parameter are
+    # ordered like the frequency grid, so a single merge with the line list
+    # per impact parameter replaces a binary search per ray.
+    line_start_idx = np.zeros(
+        (n_frequencies, n_impact_parameters), dtype=np.int64
+    )
+    frequency_order = np.argsort(frequencies)
+    for impact_parameter_idx in prange(1, n_impact_parameters):
+        start_point = intersection_points[impact_parameter_idx, 0]
+        line_idx = line_search(
+            line_list_nu, frequencies[frequency_order[0]] * start_point, n_lines
+        )
+        for nu_idx in frequency_order:
+            nu_start = frequencies[nu_idx] * start_point
+            while line_idx > 0 and line_list_nu[line_idx - 1] <= nu_start:
+                line_idx -= 1
+            line_start_idx[nu_idx, impact_parameter_idx] = line_idx
+
+    # if inside the photosphere, set to black body intensity
+    # otherwise zero
+    n_rays = n_impact_parameters - 1
+    for ray_idx in prange(n_frequencies * n_rays):
+        nu_idx = ray_idx // n_rays
+        impact_parameter_idx = ray_idx % n_rays + 1
+        if impact_parameters[impact_parameter_idx] <= radius_photosphere:
+            intensities_nu_p[nu_idx, impact_parameter_idx] = (
+                intensity_black_body(
+                    frequencies[nu_idx]
+                    * intersection_points[impact_parameter_idx, 0],
+                    inner_temperature,
                 )
-            else:
-                intensities_nu[impact_parameter_idx] = 0
+            )
 
     return (
         intensities_nu_p,
@@ -290,6 +335,7 @@ def initialize_formal_integral_inputs(
         shell_ids,
         n_intersections,
         exp_tau_sobolev,
+        line_start_idx,
     )
 
 
@@ -370,6 +416,302 @@ def get_electron_scattering_optical_depth(
     )
 
 
+@njit(**njit_dict_no_parallel)
+def calculate_ray_intensity(
+    nu: float,
+    impact_parameter: float,
+    intensity: float,
+    intersection_points: NDArray[np.float64],
+    shell_ids: NDArray[np.int64],
+    n_intersections: int,
+    idx_nu_start: int,
+    time_explosion: float,
+    line_list_nu: NDArray[np.float64],
+    att_S_ul: NDArray[np.float64],
+    mean_intensity_red_lu: NDArray[np.float64],
+    mean_intensity_blue_lu: NDArray[np.float64],
+    exp_tau_sobolev: NDArray[np.float64],
+    electron_densities: NDArray[np.float64],
+) -> float:
+    """
+    Integrate the intensity along a single ray of frequency and impact parameter.
+
+    Parameters
+    ----------
+    nu : float
+        Frequency of the ray.
+    impact_parameter : float
+        Impact parameter of the ray.
+    intensity : float
+        Intensity at the start of the ray (black body or zero).
+    intersection_points : ndarray
+        Intersection points of the impact parameter with the shells.
+    shell_ids : ndarray
+        Shell IDs of the intersection points.
+    n_intersections : int
+        Number of intersection points.
+    idx_nu_start : int
+        Index of the first line to the red of the start of the ray.
+    time_explosion : float
+        Time since explosion (seconds).
+    line_list_nu : ndarray
+        Line frequencies sorted by decreasing frequency.
+    att_S_ul : ndarray
+        Attenuated source function (flattened, shell-major).
+    mean_intensity_red_lu : ndarray
+        mean intensity on the red side of the lines (flattened, shell-major).
+    mean_intensity_blue_lu : ndarray
+        mean intensity on the blue side of the lines (flattened, shell-major).
+    exp_tau_sobolev : ndarray
+        Exponential of negative Sobolev optical depths (flattened, shell-major).
+    electron_densities : ndarray
+        Electron densities per shell.
+
+    Returns
+    -------
+    float
+        Emerging intensity multiplied by the impact parameter.
+    """
+    n_lines = len(line_list_nu)
+
+    # the comoving frequency decreases along the ray, so the lines of
+    # every segment follow the ones of the previous segment
+    intersection_start = time_explosion / C_INV * (1.0 - intersection_points[0])
+    offset = shell_ids[0] * n_lines
+
+    # Initialize "pointers"
+    line_idx = int(idx_nu_start)
+    line_idx_offset = int(idx_nu_start + offset)
+    line_Jred_lu_idx = int(line_idx_offset)
+
+    # flag for first contribution to integration on current impact_parameter
+    first_contribution_flag = 1
+    escat_optical_depth = 0
+    for i in range(n_intersections - 1):
+        escat_opacity = electron_densities[int(shell_ids[i])] * SIGMA_THOMSON
+        nu_end = nu * intersection_points[i + 1]
+        while line_idx < n_lines and line_list_nu[line_idx] > nu_end:
+            # calculate e-scattering optical depth to next resonance point
+            intersection_end = (
+                time_explosion / C_INV * (1.0 - line_list_nu[line_idx] / nu)
+            )
+
+            (
+                escat_optical_depth,
+                first_contribution_flag,
+                line_Jred_lu_idx,
+            ) = get_electron_scattering_optical_depth(
+                escat_optical_depth,
+                first_contribution_flag,
+                line_Jred_lu_idx,
+                intersection_end,
+                intersection_start,
+                escat_opacity,
+                mean_intensity_blue_lu[line_idx_offset],
+                mean_intensity_red_lu[line_Jred_lu_idx],
+                intensity,
+            )
+
+            intensity += escat_optical_depth
+            # Lucy 1999, Eq 26
+            intensity *= exp_tau_sobolev[line_idx_offset]
+            intensity += att_S_ul[line_idx_offset]
+
+            # reset e-scattering opacity
+            escat_optical_depth = 0
+            intersection_start = intersection_end
+
+            line_idx += 1
+            line_idx_offset += 1
+
+        # calculate e-scattering optical depth to grid cell boundary
+        avg_mean_intensity_lu = 0.5 * (
+            mean_intensity_red_lu[line_Jred_lu_idx]
+            + mean_intensity_blue_lu[line_idx_offset]
+        )
+        intersection_end = time_explosion / C_INV * (1.0 - nu_end / nu)
+        escat_optical_depth += (
+            (intersection_end - intersection_start)
+            * escat_opacity
+            * (avg_mean_intensity_lu - intensity)
+        )
+        intersection_start = intersection_end
+
+        # advance "pointers" - compute direction on-the-fly
+        direction = int((shell_ids[i + 1] - shell_ids[i]) * n_lines)
+        line_idx_offset += direction
+        line_Jred_lu_idx += direction
+    return intensity * impact_parameter
+
+
+@njit(**njit_dict)
+def refine_luminosity_densities(
+    luminosity_densities: NDArray[np.float64],
+    intensities_nu_p: NDArray[np.float64],
+    impact_parameters: NDArray[np.float64],
+    geometry: NumbaRadial1DGeometry,
+    time_explosion: float,
+    line_list_nu: NDArray[np.float64],
+    inner_temperature: float,
+    frequencies: NDArray[np.float64],
+    att_S_ul: NDArray[np.float64],
+    mean_intensity_red_lu: NDArray[np.float64],
+    mean_intensity_blue_lu: NDArray[np.float64],
+    exp_tau_sobolev: NDArray[np.float64],
+    electron_densities: NDArray[np.float64],
+    refinement_points: int,
+    refinement_tolerance: float,
+) -> int:
+    """
+    Refine the impact parameter integration where the intensity varies strongly.
+
+    Intervals of the impact parameter grid over which the integrand changes
+    by more than `refinement_tolerance` times its maximum at that frequency
+    get `refinement_points` additional equally spaced impact parameters.
+    Their trapezoidal contribution replaces the one of the coarse interval
+    in `luminosity_densities`, which is updated in place.
+
+    Parameters
+    ----------
+    luminosity_densities : ndarray
+        Luminosity densities of the coarse grid, updated in place.
+    intensities_nu_p : ndarray
+        Intensities times impact parameter on the coarse grid.
+    impact_parameters : ndarray
+        Coarse impact parameter grid.
+    geometry : object
+        Geometry object containing shell radii.
+    time_explosion : float
+        Time since explosion (seconds).
+    line_list_nu : ndarray
+        Line frequencies sorted by decreasing frequency.
+    inner_temperature : float
+        Inner boundary temperature.
+    frequencies : ndarray
+        Array of frequencies.
+    att_S_ul, mean_intensity_red_lu, mean_intensity_blue_lu : ndarray
+        Flattened line quantities, as in `numba_formal_integral`.
+    exp_tau_sobolev : ndarray
+        Exponential of negative Sobolev optical depths (flattened).
+    electron_densities : ndarray
+        Electron densities per shell.
+    refinement_points : int
+        Number of impact parameters added to every refined interval.
+    refinement_tolerance : float
+        Relative change of the integrand above which an interval is refined.
+
+    Returns
+    -------
+    int
+        Number of refined intervals.
+    """
+    n_frequencies, n_impact_parameters = intensities_nu_p.shape
+    n_intervals = n_impact_parameters - 1
+    n_shells = len(geometry.r_inner)
+    radius_photosphere = geometry.r_inner[0]
+
+    # flag the intervals per frequency
+    refine = np.zeros((n_frequencies, n_intervals), dtype=np.bool_)
+    n_refined = np.zeros(n_frequencies + 1, dtype=np.int64)
+    for nu_idx in prange(n_frequencies):
+        intensities_nu = intensities_nu_p[nu_idx]
+        threshold = refinement_tolerance * np.max(intensities_nu)
+        for interval_idx in range(n_intervals):
+            if (
+                np.abs(
+                    intensities_nu[interval_idx + 1]
+                    - intensities_nu[interval_idx]
+                )
+                > threshold
+            ):
+                refine[nu_idx, interval_idx] = True
+                n_refined[nu_idx + 1] += 1
+    refined_offsets = np.cumsum(n_refined)
+    n_refined_intervals = refined_offsets[-1]
+
+    refined_nu_idx = np.empty(n_refined_intervals, dtype=np.int64)
+    refined_interval_idx = np.empty(n_refined_intervals, dtype=np.int64)
+    for nu_idx in prange(n_frequencies):
+        refined_idx = refined_offsets[nu_idx]
+        for interval_idx in range(n_intervals):
+            if refine[nu_idx, interval_idx]:
+                refined_nu_idx[refined_idx] = nu_idx
+                refined_interval_idx[refined_idx] = interval_idx
+                refined_idx += 1
+
+    # all additional rays of all frequencies form one work index
+    refined_intensities = np.zeros(n_refined_intervals * refinement_points)
+    for ray_idx in prange(n_refined_intervals * refinement_points):
+        refined_idx = ray_idx // refinement_points
+        nu = frequencies[refined_nu_idx[refined_idx]]
+        interval_idx = refined_interval_idx[refined_idx]
+        impact_parameter = impact_parameters[interval_idx] + (
+            ray_idx % refinement_points + 1
+        ) * (
+            impact_parameters[interval_idx + 1]
+            - impact_parameters[interval_idx]
+        ) / (refinement_points + 1)
+
+        intersection_points = np.zeros(2 * n_shells, dtype=np.float64)
+        shell_ids = np.zeros(2 * n_shells, dtype=np.int64)
+        n_intersections = populate_intersection_points(
+            geometry,
+            time_explosion,
+            impact_parameter,
+            intersection_points,
+            shell_ids,
+        )
+        idx_nu_start = line_search(
+            line_list_nu, nu * intersection_points[0], len(line_list_nu)
+        )
+        intensity = 0.0
+        if impact_parameter <= radius_photosphere:
+            intensity = intensity_black_body(
+                nu * intersection_points[0], inner_temperature
+            )
+        refined_intensities[ray_idx] = calculate_ray_intensity(
+            nu,
+            impact_parameter,
+            intensity,
+            intersection_points,
+            shell_ids,
+            n_intersections,
+            idx_nu_start,
+            time_explosion,
+            line_list_nu,
+            att_S_ul,
+            mean_intensity_red_lu,
+            mean_intensity_blue_lu,
+            exp_tau_sobolev,
+            electron_densities,
+        )
+
+    # replace the coarse trapezoids of the refined intervals, with the
+    # interval width of the coarse integration
+    dx = geometry.r_outer[-1] / n_impact_parameters
+    for nu_idx in prange(n_frequencies):
+        intensities_nu = intensities_nu_p[nu_idx]
+        correction = 0.0
+        for refined_idx in range(
+            refined_offsets[nu_idx], refined_offsets[nu_idx + 1]
+        ):
+            interval_idx = refined_interval_idx[refined_idx]
+            coarse = 0.5 * (
+                intensities_nu[interval_idx]
+                + intensities_nu[interval_idx + 1]
+            )
+            fine = coarse
+            for point_idx in range(
+                refined_idx * refinement_points,
+                (refined_idx + 1) * refinement_points,
+            ):
+                fine += refined_intensities[point_idx]
+            correction += fine / (refinement_points + 1) - coarse
+        luminosity_densities[nu_idx] += 8 * np.pi * np.pi * dx * correction
+
+    return n_refined_intervals
+
+
 @njit(**njit_dict)
 def numba_formal_integral(
     geometry: NumbaRadial1DGeometry,
@@ -383,10 +725,17 @@ def numba_formal_integral(
     tau_sobolev: NDArray[np.float64],
     electron_densities: NDArray[np.float64],
     n_impact_parameters: int,
+    refinement_points: int = 0,
+    refinement_tolerance: float = 1e-2,
 ) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
     """
     Compute the formal integral.
 
+    The rays of all frequencies and impact parameters form one parallel work
+    index, followed by a reduction over the impact parameters per frequency,
+    so that both narrow frequency grids and many impact parameters use all
+    threads.
+
     Parameters
     ----------
     geometry : object
@@ -411,6 +760,12 @@ def numba_formal_integral(
         Electron densities per shell.
     n_impact_parameters : int
         Number of impact parameters.
+    refinement_points : int, optional
+        Number of impact parameters added to intervals where the intensity
+        varies strongly, see `refine_luminosity_densities`. No refinement
+        for 0 (default).
+    refinement_tolerance : float, optional
+        Relative change of the intensity above which an interval is refined.
 
     Returns
     -------
@@ -425,7 +780,6 @@ def numba_formal_integral(
 
     radius_max = geometry.r_outer[-1]
     line_list_nu = plasma.line_list_nu
-    n_lines = len(line_list_nu)
 
     # prepare some of the formal integral arrays
     # Inup, p, zs, shell ids, and size of z
@@ -436,6 +790,7 @@ def numba_formal_integral(
         shell_ids,
         n_intersections,
         exp_tau_sobolev,
+        line_start_idx,
     ) = initialize_formal_integral_inputs(
         frequencies,
         inner_temperature,
@@ -443,120 +798,333 @@ def numba_formal_integral(
         geometry,
         time_explosion,
         tau_sobolev,
+        line_list_nu,
     )
 
-    # loop per frequency
-    for nu_idx in prange(n_frequencies):
-        intensities_nu = intensities_nu_p[nu_idx]
-        nu = frequencies[nu_idx]
-
-        # loop per impact parameter
-        for impact_parameter_idx in range(1, n_impact_parameters):
-            # get values for this impact parameter
-            impact_parameter = impact_parameters[impact_parameter_idx]
-            n_intersections_p = n_intersections[impact_parameter_idx]
-            intersection_points_p = intersection_points[impact_parameter_idx]
-            shell_ids_p = shell_ids[impact_parameter_idx]
-
-            # get the intersection points in frequency space
-            # and the corresponding position in the line list
-            nu_start = nu * intersection_points_p[0]
-            intersection_start = (
-                time_explosion / C_INV * (1.0 - intersection_points_p[0])
+    # loop over all rays, impact parameter 0 does not contribute
+    n_rays = n_impact_parameters - 1
+    for ray_idx in prange(n_frequencies * n_rays):
+        nu_idx = ray_idx // n_rays
+        impact_parameter_idx = ray_idx % n_rays + 1
+        intensities_nu_p[nu_idx, impact_parameter_idx] = (
+            calculate_ray_intensity(
+                frequencies[nu_idx],
+                impact_parameters[impact_parameter_idx],
+                intensities_nu_p[nu_idx, impact_parameter_idx],
+                intersection_points[impact_parameter_idx],
+                shell_ids[impact_parameter_idx],
+                n_intersections[impact_parameter_idx],
+                line_start_idx[nu_idx, impact_parameter_idx],
+                time_explosion,
+                line_list_nu,
+                att_S_ul,
+                mean_intensity_red_lu,
+                mean_intensity_blue_lu,
+                exp_tau_sobolev,
+                electron_densities,
             )
-            idx_nu_start = line_search(line_list_nu, nu_start, n_lines)
-            offset = shell_ids_p[0] * n_lines
+        )
 
-            nu_ends = nu * intersection_points_p[1:]
-            nu_ends_idxs = n_lines - np.searchsorted(
-                line_list_nu[::-1], nu_ends, side="right"
+    # reduce over the impact parameters per frequency
+    for nu_idx in prange(n_frequencies):
+        luminosity_densities[nu_idx] = (
+            8
+            * np.pi
+            * np.pi
+            * np.trapezoid(
+                intensities_nu_p[nu_idx], dx=radius_max / n_impact_parameters
             )
+        )
 
-            # Initialize "pointers"
-            line_idx = int(idx_nu_start)
-            line_idx_offset = int(idx_nu_start + offset)
-            line_Jred_lu_idx = int(line_idx_offset)
+    if refinement_points > 0:
+        refine_luminosity_densities(
+            luminosity_densities,
+            intensities_nu_p,
+            impact_parameters,
+            geometry,
+            time_explosion,
+            line_list_nu,
+            inner_temperature,
+            frequencies,
+            att_S_ul,
+            mean_intensity_red_lu,
+            mean_intensity_blue_lu,
+            exp_tau_sobolev,
+            electron_densities,
+            refinement_points,
+            refinement_tolerance,
+        )
 
-            # flag for first contribution to integration on current impact_parameter
-            first_contribution_flag = 1
-            escat_optical_depth = 0
-            for i in range(n_intersections_p - 1):
-                escat_opacity = (
-                    electron_densities[int(shell_ids_p[i])] * SIGMA_THOMSON
-                )
-                nu_end = nu_ends[i]
-                nu_end_idx = nu_ends_idxs[i]
-                for _ in range(max(nu_end_idx - line_idx, 0)):
-                    # calculate e-scattering optical depth to next resonance point
-                    intersection_end = (
-                        time_explosion
-                        / C_INV
-                        * (1.0 - line_list_nu[line_idx] / nu)
-                    )
-
-                    (
-                        escat_optical_depth,
-                        first_contribution_flag,
-                        line_Jred_lu_idx,
-                    ) = get_electron_scattering_optical_depth(
-                        escat_optical_depth,
-                        first_contribution_flag,
-                        line_Jred_lu_idx,
-                        intersection_end,
-                        intersection_start,
-                        escat_opacity,
-                        mean_intensity_blue_lu[line_idx_offset],
-                        mean_intensity_red_lu[line_Jred_lu_idx],
-                        intensities_nu[impact_parameter_idx],
-                    )
-
-                    intensities_nu[impact_parameter_idx] += escat_optical_depth
-                    # Lucy 1999, Eq 26
-                    intensities_nu[impact_parameter_idx] *= exp_tau_sobolev[
-                        line_idx_offset
-                    ]
-                    intensities_nu[impact_parameter_idx] += att_S_ul[
-                        line_idx_offset
-                    ]
-
-                    # reset e-scattering opacity
-                    escat_optical_depth = 0
-                    intersection_start = intersection_end
-
-                    line_idx += 1
-                    line_idx_offset += 1
-
-                # calculate e-scattering optical depth to grid cell boundary
-                avg_mean_intensity_lu = 0.5 * (
-                    mean_intensity_red_lu[line_Jred_lu_idx]
-                    + mean_intensity_blue_lu[line_idx_offset]
-                )
-                intersection_end = time_explosion / C_INV * (1.0 - nu_end / nu)
-                escat_optical_depth += (
-                    (intersection_end - intersection_start)
-                    * escat_opacity
-                    * (
-                        avg_mean_intensity_lu
-                        - intensities_nu[impact_parameter_idx]
-                    )
-                )
-                intersection_start = intersection_end
+    return luminosity_densities, intensities_nu_p
 
-                # advance "pointers" - compute direction on-the-fly
-                direction = int((shell_ids_p[i + 1] - shell_ids_p[i]) * n_lines)
-                line_idx_offset += direction
-                line_Jred_lu_idx += direction
-            intensities_nu[impact_parameter_idx] *= impact_parameter
-        luminosity_densities[nu_idx] = (
+
+@njit(**njit_dict)
+def numba_formal_integral_epochs(
+    r_inner: NDArray[np.float64],
+    r_outer: NDArray[np.float64],
+    time_explosions: NDArray[np.float64],
+    line_list_nu: NDArray[np.float64],
+    inner_temperatures: NDArray[np.float64],
+    frequencies: NDArray[np.float64],
+    att_S_ul: NDArray[np.float64],
+    mean_intensity_red_lu: NDArray[np.float64],
+    mean_intensity_blue_lu: NDArray[np.float64],
+    tau_sobolev: NDArray[np.float64],
+    electron_densities: NDArray[np.float64],
+    n_impact_parameters: int,
+    refinement_points: int = 0,
+    refinement_tolerance: float = 1e-2,
+) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Compute the formal integral of several epochs sharing one line list.
+
+    The rays of all epochs, frequencies and impact parameters form one
+    parallel work index. The epochs must have the same number of shells
+    and of frequencies.
+
+    Parameters
+    ----------
+    r_inner : ndarray
+        Inner shell radii of shape (number of epochs, number of shells).
+    r_outer : ndarray
+        Outer shell radii of shape (number of epochs, number of shells).
+    time_explosions : ndarray
+        Time since explosion (seconds) of each epoch.
+    line_list_nu : ndarray
+        Line frequencies sorted by decreasing frequency.
+    inner_temperatures : ndarray
+        Inner boundary temperature of each epoch.
+    frequencies : ndarray
+        Frequencies of shape (number of epochs, number of frequencies).
+    att_S_ul : ndarray
+        Attenuated source function of each epoch, flattened as in
+        `numba_formal_integral`.
+    mean_intensity_red_lu : ndarray
+        mean intensity on the red side of the lines of each epoch, flattened.
+    mean_intensity_blue_lu : ndarray
+        mean intensity on the blue side of the lines of each epoch, flattened.
+    tau_sobolev : ndarray
+        Sobolev optical depths of shape
+        (number of epochs, number of lines, number of shells).
+    electron_densities : ndarray
+        Electron densities of shape (number of epochs, number of shells).
+    n_impact_parameters : int
+        Number of impact parameters.
+    refinement_points : int, optional
+        Number of impact parameters added to intervals where the intensity
+        varies strongly. No refinement for 0 (default).
+    refinement_tolerance : float, optional
+        Relative change of the intensity above which an interval is refined.
+
+    Returns
+    -------
+    luminosity_densities : ndarray
+        Integrated luminosities of shape (number of epochs, number of frequencies).
+    intensities_nu_p : ndarray
+        Intensities per epoch, frequency and impact parameter.
+    """
+    n_epochs, n_frequencies = frequencies.shape
+    n_shells = r_inner.shape[1]
+    n_lines = len(line_list_nu)
+
+    intensities_nu_p = np.zeros(
+        (n_epochs, n_frequencies, n_impact_parameters), dtype=np.float64
+    )
+    impact_parameters = np.zeros(
+        (n_epochs, n_impact_parameters), dtype=np.float64
+    )
+    intersection_points = np.zeros(
+        (n_epochs, n_impact_parameters, 2 * n_shells), dtype=np.float64
+    )
+    shell_ids = np.zeros(
+        (n_epochs, n_impact_parameters, 2 * n_shells), dtype=np.int64
+    )
+    n_intersections = np.zeros((n_epochs, n_impact_parameters), dtype=np.int64)
+    exp_tau_sobolev = np.zeros((n_epochs, n_lines * n_shells), dtype=np.float64)
+    line_start_idx = np.zeros(
+        (n_epochs, n_frequencies, n_impact_parameters), dtype=np.int64
+    )
+    for epoch_idx in range(n_epochs):
+        geometry = NumbaRadial1DGeometry(
+            r_inner[epoch_idx],
+            r_outer[epoch_idx],
+            r_inner[epoch_idx] / time_explosions[epoch_idx],
+            r_outer[epoch_idx] / time_explosions[epoch_idx],
+        )
+        inputs = initialize_formal_integral_inputs(
+            frequencies[epoch_idx],
+            inner_temperatures[epoch_idx],
+            n_impact_parameters,
+            geometry,
+            time_explosions[epoch_idx],
+            tau_sobolev[epoch_idx],
+            line_list_nu,
+        )
+        intensities_nu_p[epoch_idx] = inputs[0]
+        impact_parameters[epoch_idx] = inputs[1]
+        intersection_points[epoch_idx] = inputs[2]
+        shell_ids[epoch_idx] = inputs[3]
+        n_intersections[epoch_idx] = inputs[4]
+        exp_tau_sobolev[epoch_idx] = inputs[5]
+        line_start_idx[epoch_idx] = inputs[6]
+
+    # loop over all rays of all epochs
+    n_rays = n_impact_parameters - 1
+    n_epoch_rays = n_frequencies * n_rays
+    for ray_idx in prange(n_epochs * n_epoch_rays):
+        epoch_idx = ray_idx // n_epoch_rays
+        nu_idx = ray_idx % n_epoch_rays // n_rays
+        impact_parameter_idx = ray_idx % n_rays + 1
+        intensities_nu_p[epoch_idx, nu_idx, impact_parameter_idx] = (
+            calculate_ray_intensity(
+                frequencies[epoch_idx, nu_idx],
+                impact_parameters[epoch_idx, impact_parameter_idx],
+                intensities_nu_p[epoch_idx, nu_idx, impact_parameter_idx],
+                intersection_points[epoch_idx, impact_parameter_idx],
+                shell_ids[epoch_idx, impact_parameter_idx],
+                n_intersections[epoch_idx, impact_parameter_idx],
+                line_start_idx[epoch_idx, nu_idx, impact_parameter_idx],
+                time_explosions[epoch_idx],
+                line_list_nu,
+                att_S_ul[epoch_idx],
+                mean_intensity_red_lu[epoch_idx],
+                mean_intensity_blue_lu[epoch_idx],
+                exp_tau_sobolev[epoch_idx],
+                electron_densities[epoch_idx],
+            )
+        )
+
+    # reduce over the impact parameters per epoch and frequency
+    luminosity_densities = np.zeros((n_epochs, n_frequencies), dtype=np.float64)
+    for spectrum_idx in prange(n_epochs * n_frequencies):
+        epoch_idx = spectrum_idx // n_frequencies
+        nu_idx = spectrum_idx % n_frequencies
+        luminosity_densities[epoch_idx, nu_idx] = (
             8
             * np.pi
             * np.pi
-            * np.trapezoid(intensities_nu, dx=radius_max / n_impact_parameters)
+            * np.trapezoid(
+                intensities_nu_p[epoch_idx, nu_idx],
+                dx=r_outer[epoch_idx, -1] / n_impact_parameters,
+            )
         )
 
+    if refinement_points > 0:
+        for epoch_idx in range(n_epochs):
+            geometry = NumbaRadial1DGeometry(
+                r_inner[epoch_idx],
+                r_outer[epoch_idx],
+                r_inner[epoch_idx] / time_explosions[epoch_idx],
+                r_outer[epoch_idx] / time_explosions[epoch_idx],
+            )
+            refine_luminosity_densities(
+                luminosity_densities[epoch_idx],
+                intensities_nu_p[epoch_idx],
+                impact_parameters[epoch_idx],
+                geometry,
+                time_explosions[epoch_idx],
+                line_list_nu,
+                inner_temperatures[epoch_idx],
+                frequencies[epoch_idx],
+                att_S_ul[epoch_idx],
+                mean_intensity_red_lu[epoch_idx],
+                mean_intensity_blue_lu[epoch_idx],
+                exp_tau_sobolev[epoch_idx],
+                electron_densities[epoch_idx],
+                refinement_points,
+                refinement_tolerance,
+            )
+
     return luminosity_densities, intensities_nu_p
 
 
+# The interpolation kernels do not use fastmath, such that they reproduce
+# the linear and nearest interpolation of scipy.interpolate.interp1d bitwise.
+
+
+@njit(parallel=True, error_model="numpy")
+def interpolate_line_quantity(
+    values: NDArray[np.float64],
+    line_ids: NDArray[np.int64],
+    lower_shell_ids: NDArray[np.int64],
+    upper_shell_ids: NDArray[np.int64],
+    shell_widths: NDArray[np.float64],
+    shell_offsets: NDArray[np.float64],
+    interpolated: NDArray[np.float64],
+) -> None:
+    """
+    Linearly interpolate a line quantity to new shells, setting negative
+    values from the extrapolation to zero.
+
+    The result is written shell by shell in the flattened layout of the
+    integrator, such that the value of line i in shell j is at
+    j * len(line_ids) + i.
+
+    Parameters
+    ----------
+    values : ndarray
+        Line quantity of shape (number of lines, number of shells)
+    line_ids : ndarray
+        Lines to interpolate, in the order of the integrator line list
+    lower_shell_ids : ndarray
+        Shell below every new shell
+    upper_shell_ids : ndarray
+        Shell above every new shell
+    shell_widths : ndarray
+        Distance between the middle radii of the lower and upper shells
+    shell_offsets : ndarray
+        Distance of the new shells from their lower shells
+    interpolated : ndarray
+        Output of size (number of new shells * number of interpolated
+        lines), filled in place. Its dtype sets the output precision.
+    """
+    n_lines = len(line_ids)
+    for shell_idx in prange(len(lower_shell_ids)):
+        lower_shell_id = lower_shell_ids[shell_idx]
+        upper_shell_id = upper_shell_ids[shell_idx]
+        shell_width = shell_widths[shell_idx]
+        shell_offset = shell_offsets[shell_idx]
+        block_start = shell_idx * n_lines
+        for idx in range(n_lines):
+            line_id = line_ids[idx]
+            lower_value = values[line_id, lower_shell_id]
+            value = (
+                values[line_id, upper_shell_id] - lower_value
+            ) / shell_width * shell_offset + lower_value
+            if value < 0.0:
+                value = 0.0
+            interpolated[block_start + idx] = value
+
+
+@njit(parallel=True, error_model="numpy")
+def select_nearest_shells(
+    values: NDArray[np.float64],
+    line_ids: NDArray[np.int64],
+    nearest_shell_ids: NDArray[np.int64],
+    selected: NDArray[np.float64],
+) -> None:
+    """
+    Copy a line quantity, constant within the shells, to new shells.
+
+    Parameters
+    ----------
+    values : ndarray
+        Line quantity of shape (number of lines, number of shells)
+    line_ids : ndarray
+        Lines to copy, in the order of the integrator line list
+    nearest_shell_ids : ndarray
+        Shell nearest to every new shell
+    selected : ndarray
+        Output of shape (number of copied lines, number of new shells),
+        filled in place. Its dtype sets the output precision.
+    """
+    n_lines = len(line_ids)
+    for shell_idx in prange(len(nearest_shell_ids)):
+        shell_id = nearest_shell_ids[shell_idx]
+        for idx in range(n_lines):
+            selected[idx, shell_idx] = values[line_ids[idx], shell_id]
+
+
 class NumbaFormalIntegrator:
     """
     Helper class for performing the formal integral with Numba.
@@ -571,6 +1139,11 @@ class NumbaFormalIntegrator:
         Plasma object containing line list frequencies.
     n_impact_parameters : int, optional
         Number of impact parameters
+    refinement_points : int, optional
+        Number of impact parameters added to intervals where the intensity
+        varies strongly. No refinement for 0 (default).
+    refinement_tolerance : float, optional
+        Relative change of the intensity above which an interval is refined.
     """
 
     def __init__(
@@ -579,11 +1152,15 @@ class NumbaFormalIntegrator:
         time_explosion: float,
         plasma,
         n_impact_parameters: int = 1000,
+        refinement_points: int = 0,
+        refinement_tolerance: float = 1e-2,
     ):
         self.geometry = geometry
         self.time_explosion = time_explosion
         self.plasma = plasma
         self.n_impact_parameters = n_impact_parameters
+        self.refinement_points = refinement_points
+        self.refinement_tolerance = refinement_tolerance
 
     def formal_integral(
         self,
@@ -637,4 +1214,6 @@ class NumbaFormalIntegrator:
             tau_sobolev,
             electron_densities,
             n_impact_parameters,
+            self.refinement_points,
+            self.refinement_tolerance,
         )
@@ -1,17 +1,25 @@
 import logging
+from functools import reduce
 
 import numpy as np
 from astropy import units as u
-from scipy.interpolate import interp1d
 
 from tardis.model.geometry.radial1d import NumbaRadial1DGeometry
+from tardis.opacities.opacity_state_numba import OpacityStateNumba
 from tardis.spectrum.base import TARDISSpectrum
-from tardis.spectrum.formal_integral.base import check_formal_integral_requirements
+from tardis.spectrum.formal_integral.base import (
+    calculate_shell_interpolation_indices,
+    check_formal_integral_requirements,
+)
 from tardis.spectrum.formal_integral.formal_integral_cuda import (
     CudaFormalIntegrator,
 )
 from tardis.spectrum.formal_integral.formal_integral_numba import (
     NumbaFormalIntegrator,
+    NumbaLineList,
+    interpolate_line_quantity,
+    numba_formal_integral_epochs,
+    select_nearest_shells,
 )
 from tardis.spectrum.formal_integral.source_function import SourceFunctionSolver
 
@@ -32,14 +40,35 @@ class FormalIntegralSolver:
         and original shell structure is used.
     method : str or None
         Method to use for the formal integral solver ('numba' or 'cuda')
+    refinement_points : int
+        Number of impact parameters added to intervals where the intensity
+        varies strongly. No refinement for 0.
+    refinement_tolerance : float
+        Relative change of the intensity above which an interval is refined.
+    tau_threshold : float
+        Sobolev optical depth that a line has to exceed in at least one
+        shell to be integrated. All lines are integrated for 0.
+    single_precision : bool
+        Whether the interpolated line quantities are stored as float32.
     """
 
     points: int
     interpolate_shells: int
     method: str | None
+    refinement_points: int
+    refinement_tolerance: float
+    tau_threshold: float
+    single_precision: bool
 
     def __init__(
-        self, points: int, interpolate_shells: int, method: str | None = None
+        self,
+        points: int,
+        interpolate_shells: int,
+        method: str | None = None,
+        refinement_points: int = 0,
+        refinement_tolerance: float = 1e-2,
+        tau_threshold: float = 0.0,
+        single_precision: bool = False,
     ) -> None:
         """
         Initialize the formal integral solver.
@@ -55,10 +84,28 @@ class FormalIntegralSolver:
         method : str, optional
             Method to use for the formal integral solver ('numba' or 'cuda').
             If None, will be determined based on GPU availability.
+        refinement_points : int, optional
+            Number of impact parameters added to intervals where the intensity
+            varies strongly. Only used by the numba integrator. No refinement
+            for 0 (default).
+        refinement_tolerance : float, optional
+            Relative change of the intensity above which an interval is
+            refined. Default 1e-2.
+        tau_threshold : float, optional
+            Sobolev optical depth that a line has to exceed in at least one
+            shell to be integrated. All lines are integrated for 0 (default).
+        single_precision : bool, optional
+            Whether the interpolated line quantities are stored as float32,
+            halving their memory. Default False.
         """
         self.points = points
         self.interpolate_shells = interpolate_shells
         self.method = method
+        self.refinement_points = int(refinement_points)
+        self.refinement_tolerance = refinement_tolerance
+        self.tau_threshold = tau_threshold
+        self.single_precision = single_precision
+        self.source_function_solver = None
 
     def setup(
         self,
@@ -149,6 +196,11 @@ class FormalIntegralSolver:
         )
 
         if self.method == "cuda":
+            if self.refinement_points > 0:
+                logger.warning(
+                    "Impact parameter refinement is not available for the "
+                    "cuda formal integral and is ignored."
+                )
             self.integrator = CudaFormalIntegrator(
                 numba_radial_1d_geometry,
                 time_explosion.cgs.value,
@@ -161,6 +213,8 @@ class FormalIntegralSolver:
                 time_explosion.cgs.value,
                 opacity_state_numba,
                 self.points,
+                self.refinement_points,
+                self.refinement_tolerance,
             )
 
     def solve(
@@ -198,16 +252,350 @@ class FormalIntegralSolver:
         TARDISSpectrum
             The formal integral spectrum
         """
-        # check objects and configs
-        check_formal_integral_requirements(simulation_state, opacity_state, transport_solver)
+        (
+            opacity_state_numba,
+            r_inner_interpolated,
+            r_outer_interpolated,
+            att_S_ul_interpolated,
+            Jred_lu_interpolated,
+            Jblue_lu_interpolated,
+            tau_sobolevs_interpolated,
+            electron_densities_interpolated,
+        ) = self.prepare_integrator_inputs(
+            simulation_state,
+            transport_solver,
+            opacity_state,
+            atomic_data,
+            electron_densities,
+            macro_atom_state,
+        )
+
+        self.setup_integrator(
+            opacity_state_numba,
+            simulation_state.time_explosion,
+            r_inner_interpolated,
+            r_outer_interpolated,
+        )
+
+        luminosity_densities, intensities_nu_p = self.integrator.formal_integral(
+            simulation_state.t_inner,
+            frequencies,
+            att_S_ul_interpolated,
+            Jred_lu_interpolated,
+            Jblue_lu_interpolated,
+            tau_sobolevs_interpolated,
+            electron_densities_interpolated,
+            self.points,
+        )
+
+        luminosity_densities = np.array(luminosity_densities, dtype=np.float64)
+        delta_frequency = frequencies[1] - frequencies[0]
+
+        assert np.allclose(
+            frequencies.diff(), delta_frequency, atol=0, rtol=1e-12
+        ), "Frequency grid must be uniform"
+
+        luminosity = (
+            u.Quantity(luminosity_densities, "erg/s/Hz") * delta_frequency
+        )
+
+        frequencies = frequencies.to("Hz", u.spectral())
+
+        # Ugly hack to convert to 'bin edges'
+        frequencies = u.Quantity(
+            np.concatenate(
+                [
+                    frequencies.value,
+                    [frequencies.value[-1] + np.diff(frequencies.value)[-1]],
+                ]
+            ),
+            frequencies.unit,
+        )
+
+        return TARDISSpectrum(frequencies, luminosity)
+
+    def solve_epochs(
+        self,
+        frequencies,
+        simulation_states,
+        transport_solvers,
+        opacity_states,
+        atomic_data,
+        electron_densities,
+        macro_atom_states,
+    ) -> u.Quantity:
+        """
+        Solve the formal integral for several epochs in one parallel pass.
+
+        The states share the atomic data and the line interaction type, so
+        the formal integral requirements are checked and the numba opacity
+        state is converted once, from the first epoch. The other epochs
+        reuse its arrays with their own Sobolev optical depths and macro
+        atom transition probabilities. The source function index maps are
+        also built once. The shell quantities are prepared per epoch, and
+        all rays of all epochs are integrated together by
+        `numba_formal_integral_epochs`.
+
+        Parameters
+        ----------
+        frequencies : u.Quantity or list of u.Quantity
+            The frequency grid of every epoch, or one grid for all epochs.
+            All grids must be uniform and of the same length.
+        simulation_states : list of tardis.model.SimulationState
+        transport_solvers : list of tardis.transport.montecarlo.MonteCarloTransportSolver
+        opacity_states : list of tardis.opacities.opacity_state.OpacityState
+        atomic_data : tardis.atomic.AtomicData
+            Atomic data shared by all epochs
+        electron_densities : list of pd.Series
+        macro_atom_states : list of tardis.opacities.macro_atom.macroatom_state.MacroAtomState
+
+        Returns
+        -------
+        u.Quantity
+            Luminosity of shape (number of epochs, number of frequencies),
+            as in the spectra of `solve`
+
+        Raises
+        ------
+        ValueError
+            If the frequency grids differ in length, the epochs use
+            different line interaction types or, without shell
+            interpolation, different numbers of shells.
+        """
+        n_epochs = len(simulation_states)
+        if isinstance(frequencies, u.Quantity):
+            frequencies = [frequencies] * n_epochs
+        frequencies = [
+            frequency.to_value(u.Hz, u.spectral()) for frequency in frequencies
+        ]
+        if len({len(frequency) for frequency in frequencies}) > 1:
+            raise ValueError(
+                "The frequency grids of all epochs need the same length."
+            )
+        frequencies = np.array(frequencies)
+        if (
+            len(
+                {
+                    transport_solver.line_interaction_type
+                    for transport_solver in transport_solvers
+                }
+            )
+            > 1
+        ):
+            raise ValueError("All epochs need the same line interaction type.")
+        if self.method == "cuda":
+            logger.warning(
+                "The formal integral of several epochs is only implemented "
+                "with numba, the numba implementation is used."
+            )
+        # the epochs share the line list, so the lines selected in any epoch
+        # are integrated in all of them
+        line_ids = None
+        if self.tau_threshold > 0:
+            line_ids = reduce(
+                np.union1d,
+                [
+                    self.select_integrator_lines(simulation_state, opacity_state)
+                    for simulation_state, opacity_state in zip(
+                        simulation_states, opacity_states
+                    )
+                ],
+            )
+
+        check_formal_integral_requirements(
+            simulation_states[0], opacity_states[0], transport_solvers[0]
+        )
+        shared_opacity_state_numba = self.setup(
+            transport_solvers[0], opacity_states[0], macro_atom_states[0]
+        )
+
+        (
+            opacity_states_numba,
+            r_inner,
+            r_outer,
+            att_S_ul,
+            Jred_lu,
+            Jblue_lu,
+            tau_sobolevs,
+            epoch_electron_densities,
+        ) = zip(
+            *[
+                self.prepare_integrator_inputs(
+                    *epoch,
+                    line_ids=line_ids,
+                    opacity_state_numba=self.epoch_opacity_state_numba(
+                        shared_opacity_state_numba,
+                        epoch[2],
+                        epoch[5],
+                    ),
+                )
+                for epoch in zip(
+                    simulation_states,
+                    transport_solvers,
+                    opacity_states,
+                    [atomic_data] * n_epochs,
+                    electron_densities,
+                    macro_atom_states,
+                )
+            ]
+        )
+        if len({len(epoch_r_inner) for epoch_r_inner in r_inner}) > 1:
+            raise ValueError(
+                "All epochs need the same number of shells, "
+                "use a positive interpolate_shells."
+            )
+
+        luminosity_densities, _ = numba_formal_integral_epochs(
+            np.array(r_inner),
+            np.array(r_outer),
+            np.array(
+                [
+                    state.time_explosion.to_value(u.s)
+                    for state in simulation_states
+                ]
+            ),
+            # the line list only depends on the atomic data
+            opacity_states_numba[0].line_list_nu,
+            np.array(
+                [state.t_inner.to_value(u.K) for state in simulation_states]
+            ),
+            frequencies,
+            np.array(att_S_ul),
+            np.array(Jred_lu),
+            np.array(Jblue_lu),
+            np.array(tau_sobolevs),
+            np.array(epoch_electron_densities),
+            self.points,
+            self.refinement_points,
+            self.refinement_tolerance,
+        )
+
+        delta_frequency = frequencies[:, 1] - frequencies[:, 0]
+        assert np.allclose(
+            np.diff(frequencies, axis=1),
+            delta_frequency[:, np.newaxis],
+            atol=0,
+            rtol=1e-12,
+        ), "Frequency grids must be uniform"
+
+        return u.Quantity(
+            luminosity_densities * delta_frequency[:, np.newaxis], "erg/s"
+        )
+
+    @staticmethod
+    def epoch_opacity_state_numba(
+        opacity_state_numba, opacity_state, macro_atom_state
+    ) -> OpacityStateNumba:
+        """
+        Numba opacity state of an epoch that shares the atomic data.
+
+        Parameters
+        ----------
+        opacity_state_numba : tardis.opacities.opacity_state_numba.OpacityStateNumba
+            Converted opacity state of another epoch with the same atomic
+            data and line interaction type
+        opacity_state : tardis.opacities.opacity_state.OpacityState
+            Regular (non-numba) opacity state of the epoch
+        macro_atom_state : tardis.opacities.macro_atom.macroatom_state.MacroAtomState
+            State of the macro atom of the epoch
 
-        # Convert to numba opacity state for source function and integrator
-        opacity_state_numba = self.setup(
-            transport_solver, opacity_state, macro_atom_state
+        Returns
+        -------
+        tardis.opacities.opacity_state_numba.OpacityStateNumba
+            Opacity state with the shell quantities, Sobolev optical depths
+            and transition probabilities of the epoch and the arrays of
+            `opacity_state_numba` otherwise, without copies.
+        """
+        return OpacityStateNumba(
+            np.ascontiguousarray(
+                opacity_state.electron_density.values, dtype=np.float64
+            ),
+            np.ascontiguousarray(opacity_state.t_electrons, dtype=np.float64),
+            opacity_state_numba.line_list_nu,
+            np.ascontiguousarray(opacity_state.tau_sobolev, dtype=np.float64),
+            np.ascontiguousarray(
+                macro_atom_state.transition_probabilities.values,
+                dtype=np.float64,
+            ),
+            opacity_state_numba.line2macro_level_upper,
+            opacity_state_numba.macro_block_references,
+            opacity_state_numba.transition_type,
+            opacity_state_numba.destination_level_id,
+            opacity_state_numba.transition_line_id,
+            opacity_state_numba.bf_threshold_list_nu,
+            opacity_state_numba.p_fb_deactivation,
+            opacity_state_numba.photo_ion_nu_threshold_mins,
+            opacity_state_numba.photo_ion_nu_threshold_maxs,
+            opacity_state_numba.photo_ion_block_references,
+            opacity_state_numba.chi_bf,
+            opacity_state_numba.x_sect,
+            opacity_state_numba.phot_nus,
+            opacity_state_numba.ff_opacity_factor,
+            opacity_state_numba.emissivities,
+            opacity_state_numba.photo_ion_activation_idx,
+            opacity_state_numba.k_packet_idx,
         )
+
+    def prepare_integrator_inputs(
+        self,
+        simulation_state,
+        transport_solver,
+        opacity_state,
+        atomic_data,
+        electron_densities,
+        macro_atom_state=None,
+        line_ids=None,
+        opacity_state_numba=None,
+    ) -> tuple:
+        """
+        Prepare the shell quantities of one state for the integrator.
+
+        Solves the source function and interpolates the line quantities to
+        `interpolate_shells`, flattened in the layout of the integrator.
+        With a positive `tau_threshold`, only the lines selected by
+        `select_integrator_lines` are integrated.
+
+        Parameters
+        ----------
+        simulation_state : tardis.model.SimulationState
+            State which holds information about each shell
+        transport_solver : tardis.transport.montecarlo.MonteCarloTransportSolver
+            The transport solver
+        opacity_state : tardis.opacities.opacity_state.OpacityState
+            Regular (non-numba) opacity state; will be converted to numba via `setup`
+        atomic_data : tardis.atomic.AtomicData
+            Atomic data containing atomic properties
+        electron_densities : pd.Series
+            Electron densities for each shell
+        macro_atom_state : tardis.opacities.macro_atom.macroatom_state.MacroAtomState, optional
+            State of the macro atom (required for converting opacity_state to numba)
+        line_ids : np.ndarray, optional
+            Increasing indices of the lines to integrate. If None, they are
+            selected with `select_integrator_lines`.
+        opacity_state_numba : tardis.opacities.opacity_state_numba.OpacityStateNumba, optional
+            The opacity state already converted to numba. If None, the
+            formal integral requirements are checked and `opacity_state`
+            is converted with `setup`.
+
+        Returns
+        -------
+        tuple
+            The numba opacity state, or the line list of the integrated
+            lines if not all lines are integrated, r_inner_interpolated,
+            r_outer_interpolated, the flattened att_S_ul_interpolated,
+            Jred_lu_interpolated and Jblue_lu_interpolated,
+            tau_sobolevs_interpolated and electron_densities_interpolated
+        """
+        if opacity_state_numba is None:
+            # check objects and configs
+            check_formal_integral_requirements(simulation_state, opacity_state, transport_solver)
+
+            # Convert to numba opacity state for source function and integrator
+            opacity_state_numba = self.setup(
+                transport_solver, opacity_state, macro_atom_state
+            )
         transport_state = transport_solver.transport_state
 
-        points = self.points
         interpolate_shells = self.interpolate_shells
         line_interaction_type = transport_solver.line_interaction_type
 
@@ -220,8 +608,16 @@ class FormalIntegralSolver:
             )
         self.interpolate_shells = interpolate_shells
 
-        source_function_solver = SourceFunctionSolver(line_interaction_type)
-        source_function_state = source_function_solver.solve(
+        # keep the solver so that its index maps are reused between calls
+        if (
+            self.source_function_solver is None
+            or self.source_function_solver.line_interaction_type
+            != line_interaction_type
+        ):
+            self.source_function_solver = SourceFunctionSolver(
+                line_interaction_type
+            )
+        source_function_state = self.source_function_solver.solve(
             simulation_state,
             opacity_state_numba,
             transport_state,
@@ -229,6 +625,11 @@ class FormalIntegralSolver:
             macro_atom_state,
         )
 
+        if line_ids is None:
+            line_ids = self.select_integrator_lines(
+                simulation_state, opacity_state
+            )
+
         # Generate interpolated radii if needed
         mct_state = transport_solver.transport_state
         if interpolate_shells > 0:
@@ -261,55 +662,60 @@ class FormalIntegralSolver:
             simulation_state,
             opacity_state,
             electron_densities,
+            line_ids,
         )
+        if line_ids is not None:
+            opacity_state_numba = NumbaLineList(
+                opacity_state_numba.line_list_nu[line_ids]
+            )
 
-        att_S_ul_interpolated = att_S_ul_interpolated.flatten(order="F")
-        Jred_lu_interpolated = Jred_lu_interpolated.flatten(order="F")
-        Jblue_lu_interpolated = Jblue_lu_interpolated.flatten(order="F")
-
-        self.setup_integrator(
+        return (
             opacity_state_numba,
-            simulation_state.time_explosion,
             r_inner_interpolated,
             r_outer_interpolated,
-        )
-
-        luminosity_densities, intensities_nu_p = self.integrator.formal_integral(
-            simulation_state.t_inner,
-            frequencies,
             att_S_ul_interpolated,
             Jred_lu_interpolated,
             Jblue_lu_interpolated,
             tau_sobolevs_interpolated,
             electron_densities_interpolated,
-            points,
         )
 
-        luminosity_densities = np.array(luminosity_densities, dtype=np.float64)
-        delta_frequency = frequencies[1] - frequencies[0]
+    def select_integrator_lines(
+        self, simulation_state, opacity_state
+    ) -> np.ndarray | None:
+        """
+        Select the lines whose Sobolev optical depth exceeds `tau_threshold`
+        in at least one active shell.
 
-        assert np.allclose(
-            frequencies.diff(), delta_frequency, atol=0, rtol=1e-12
-        ), "Frequency grid must be uniform"
+        Parameters
+        ----------
+        simulation_state : tardis.model.SimulationState
+            The simulation state object
+        opacity_state : tardis.opacities.opacity_state.OpacityState
+            The opacity state object (regular, non-numba)
 
-        luminosity = (
-            u.Quantity(luminosity_densities, "erg/s/Hz") * delta_frequency
+        Returns
+        -------
+        np.ndarray or None
+            Increasing indices of the selected lines, None if all lines are
+            integrated
+        """
+        if self.tau_threshold <= 0:
+            return None
+        tau_sobolevs = opacity_state.tau_sobolev.values[
+            :,
+            simulation_state.geometry.v_inner_boundary_index : simulation_state.geometry.v_outer_boundary_index,
+        ]
+        line_ids = np.flatnonzero(
+            (tau_sobolevs > self.tau_threshold).any(axis=1)
         )
-
-        frequencies = frequencies.to("Hz", u.spectral())
-
-        # Ugly hack to convert to 'bin edges'
-        frequencies = u.Quantity(
-            np.concatenate(
-                [
-                    frequencies.value,
-                    [frequencies.value[-1] + np.diff(frequencies.value)[-1]],
-                ]
-            ),
-            frequencies.unit,
+        logger.info(
+            "Integrating %d of %d lines with a Sobolev optical depth above %g.",
+            len(line_ids),
+            len(tau_sobolevs),
+            self.tau_threshold,
         )
-
-        return TARDISSpectrum(frequencies, luminosity)
+        return line_ids
 
     def interpolate_integrator_quantities(
         self,
@@ -321,6 +727,7 @@ class FormalIntegralSolver:
         simulation_state,
         opacity_state,
         electron_densities,
+        line_ids=None,
     ) -> tuple[
         np.ndarray,
         np.ndarray,
@@ -333,6 +740,12 @@ class FormalIntegralSolver:
         """
         Interpolate the integrator quantities to interpolate_shells.
 
+        The line quantities are interpolated linearly and the optical depths
+        and electron densities are taken from the nearest shell, as with
+        `scipy.interpolate.interp1d`, by compiled kernels that write the
+        integrator layout directly, in single precision if
+        `single_precision` is set.
+
         Parameters
         ----------
         r_inner_original : np.ndarray
@@ -351,16 +764,29 @@ class FormalIntegralSolver:
             The opacity state object (regular, non-numba)
         electron_densities : pd.Series
             Electron densities for each shell
+        line_ids : np.ndarray, optional
+            Increasing indices of the lines to interpolate. All lines if None.
 
         Returns
         -------
         tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
-            Interpolated values of att_S_ul_interpolated, Jred_lu_interpolated, Jblue_lu_interpolated, r_inner_interpolated, r_outer_interpolated, tau_sobolevs_interpolated, and electron_densities_interpolated
+            Interpolated values of att_S_ul_interpolated, Jred_lu_interpolated, Jblue_lu_interpolated, r_inner_interpolated, r_outer_interpolated, tau_sobolevs_interpolated, and electron_densities_interpolated.
+            The line quantities are flattened shell by shell, as used by the integrator.
         """
-        # Extract values from source function state
-        att_S_ul = source_function_state.att_S_ul
-        Jred_lu = source_function_state.Jred_lu
-        Jblue_lu = source_function_state.Jblue_lu
+        v_inner_boundary_index = (
+            simulation_state.geometry.v_inner_boundary_index
+        )
+        v_outer_boundary_index = (
+            simulation_state.geometry.v_outer_boundary_index
+        )
+        # Assume tau_sobolevs to be constant within a shell
+        # (as in the MC simulation)
+        tau_sobolevs = opacity_state.tau_sobolev.values[
+            :, v_inner_boundary_index:v_outer_boundary_index
+        ]
+        if line_ids is None:
+            line_ids = np.arange(len(tau_sobolevs))
+        dtype = np.float32 if self.single_precision else np.float64
 
         r_middle_original = (r_inner_original + r_outer_original) / 2.0
 
@@ -368,50 +794,49 @@ class FormalIntegralSolver:
             r_inner_interpolated + r_outer_interpolated
         ) / 2.0
 
-        electron_densities_interpolated = interp1d(
-            r_middle_original,
-            electron_densities.iloc[
-                simulation_state.geometry.v_inner_boundary_index : simulation_state.geometry.v_outer_boundary_index
-            ],
-            fill_value="extrapolate",  # type: ignore[arg-type]
-            kind="nearest",
-        )(r_middle_interpolated)
-        # Assume tau_sobolevs to be constant within a shell
-        # (as in the MC simulation)
-        v_inner_boundary_index = (
-            simulation_state.geometry.v_inner_boundary_index
+        (
+            lower_shell_ids,
+            upper_shell_ids,
+            shell_widths,
+            shell_offsets,
+            nearest_shell_ids,
+        ) = calculate_shell_interpolation_indices(
+            r_middle_original, r_middle_interpolated
         )
-        v_outer_boundary_index = (
-            simulation_state.geometry.v_outer_boundary_index
+
+        electron_densities_interpolated = electron_densities.values[
+            v_inner_boundary_index:v_outer_boundary_index
+        ][nearest_shell_ids]
+        tau_sobolevs_interpolated = np.empty(
+            (len(line_ids), len(r_middle_interpolated)), dtype=dtype, order="F"
+        )
+        select_nearest_shells(
+            tau_sobolevs,
+            line_ids,
+            nearest_shell_ids,
+            tau_sobolevs_interpolated,
         )
-        tau_sobolevs_interpolated = interp1d(
-            r_middle_original,
-            opacity_state.tau_sobolev.values[
-                :, v_inner_boundary_index:v_outer_boundary_index
-            ],
-            fill_value="extrapolate",  # type: ignore[arg-type]
-            kind="nearest",
-        )(r_middle_interpolated)
-        att_S_ul_interpolated = interp1d(
-            r_middle_original,
-            att_S_ul,
-            fill_value="extrapolate",  # type: ignore[arg-type]
-        )(r_middle_interpolated)
-        Jred_lu_interpolated = interp1d(
-            r_middle_original,
-            Jred_lu,
-            fill_value="extrapolate",  # type: ignore[arg-type]
-        )(r_middle_interpolated)
-        Jblue_lu_interpolated = interp1d(
-            r_middle_original,
-            Jblue_lu,
-            fill_value="extrapolate",  # type: ignore[arg-type]
-        )(r_middle_interpolated)
 
-        # Set negative values from the extrapolation to zero
-        att_S_ul_interpolated = att_S_ul_interpolated.clip(0.0)
-        Jblue_lu_interpolated = Jblue_lu_interpolated.clip(0.0)
-        Jred_lu_interpolated = Jred_lu_interpolated.clip(0.0)
+        # The line quantities are written in the flattened layout of the
+        # integrator, negative values from the extrapolation are set to zero
+        size = len(line_ids) * len(r_middle_interpolated)
+        att_S_ul_interpolated = np.empty(size, dtype=dtype)
+        Jred_lu_interpolated = np.empty(size, dtype=dtype)
+        Jblue_lu_interpolated = np.empty(size, dtype=dtype)
+        for values, interpolated in (
+            (source_function_state.att_S_ul, att_S_ul_interpolated),
+            (source_function_state.Jred_lu, Jred_lu_interpolated),
+            (source_function_state.Jblue_lu, Jblue_lu_interpolated),
+        ):
+            interpolate_line_quantity(
+                values,
+                line_ids,
+                lower_shell_ids,
+                upper_shell_ids,
+                shell_widths,
+                shell_offsets,
+                interpolated,
+            )
         return (
             att_S_ul_interpolated,
             Jred_lu_interpolated,
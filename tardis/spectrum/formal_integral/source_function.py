@@ -12,6 +12,119 @@ from tardis.transport.montecarlo.macro_atom import MacroAtomTransitionType
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class SourceFunctionIndexMaps:
+    """
+    Integer maps between the lines, the macro atom levels and the macro atom
+    transitions, used to reduce and scatter the source function quantities
+    without pandas alignment.
+
+    Attributes
+    ----------
+    line_order : np.ndarray
+        Line indices sorted by the macro atom level of their upper level.
+    upper_level_starts : np.ndarray
+        Start of the lines of every upper level in `line_order`.
+    upper_level_idx : np.ndarray
+        Macro atom level of every upper level.
+    upper_level_index : pd.MultiIndex
+        (atomic_number, ion_number, source_level_number) of every upper level.
+    emission_transition_idx : np.ndarray
+        Macro atom transitions of type BB_EMISSION.
+    emission_line_idx : np.ndarray
+        Line of every emission transition.
+    emission_source_idx : np.ndarray
+        Macro atom level of the source of every emission transition.
+    internal_transition_idx : np.ndarray
+        Internal macro atom transitions.
+    internal_source_idx : np.ndarray
+        Macro atom level of the source of every internal transition.
+    internal_destination_idx : np.ndarray
+        Macro atom level of the destination of every internal transition.
+    no_lvls : int
+        Number of macro atom levels.
+    """
+
+    line_order: np.ndarray
+    upper_level_starts: np.ndarray
+    upper_level_idx: np.ndarray
+    upper_level_index: pd.MultiIndex
+    emission_transition_idx: np.ndarray
+    emission_line_idx: np.ndarray
+    emission_source_idx: np.ndarray
+    internal_transition_idx: np.ndarray
+    internal_source_idx: np.ndarray
+    internal_destination_idx: np.ndarray
+    no_lvls: int
+
+    @classmethod
+    def from_macro_atom_state(cls, macro_atom_state, lines):
+        """
+        Create the index maps from the macro atom transition metadata.
+
+        Parameters
+        ----------
+        macro_atom_state : tardis.opacities.macro_atom.macroatom_state.MacroAtomState
+        lines : pd.DataFrame
+            Atomic data lines, in the order of the opacity state.
+
+        Returns
+        -------
+        SourceFunctionIndexMaps
+        """
+        metadata = macro_atom_state.transition_metadata
+        transition_type = metadata.transition_type.to_numpy()
+        source_level_idx = metadata.source_level_idx.to_numpy()
+        destination_level_idx = metadata.destination_level_idx.to_numpy()
+
+        line_upper_level_idx = np.asarray(
+            macro_atom_state.line2macro_level_upper, dtype=np.int64
+        )
+        line_order = np.argsort(line_upper_level_idx, kind="stable")
+        sorted_upper_level_idx = line_upper_level_idx[line_order]
+        upper_level_starts = np.flatnonzero(
+            np.diff(sorted_upper_level_idx, prepend=-1)
+        )
+        upper_level_index = lines.index.droplevel("level_number_lower")[
+            line_order[upper_level_starts]
+        ]
+        upper_level_index.names = [
+            "atomic_number",
+            "ion_number",
+            "source_level_number",
+        ]
+
+        emission_transition_idx = np.flatnonzero(
+            transition_type == MacroAtomTransitionType.BB_EMISSION
+        )
+        internal_transition_idx = np.flatnonzero(transition_type >= 0)
+
+        return cls(
+            line_order=line_order,
+            upper_level_starts=upper_level_starts,
+            upper_level_idx=sorted_upper_level_idx[upper_level_starts],
+            upper_level_index=upper_level_index,
+            emission_transition_idx=emission_transition_idx,
+            emission_line_idx=metadata.transition_line_idx.to_numpy()[
+                emission_transition_idx
+            ],
+            emission_source_idx=source_level_idx[emission_transition_idx],
+            internal_transition_idx=internal_transition_idx,
+            internal_source_idx=source_level_idx[internal_transition_idx],
+            internal_destination_idx=destination_level_idx[
+                internal_transition_idx
+            ],
+            no_lvls=int(
+                max(
+                    source_level_idx.max(),
+                    destination_level_idx.max(),
+                    line_upper_level_idx.max(),
+                )
+            )
+            + 1,
+        )
+
+
 class SourceFunctionSolver:
     def __init__(self, line_interaction_type: str) -> None:
         """
@@ -23,6 +136,37 @@ class SourceFunctionSolver:
             The type of line interaction (e.g. "downbranch", "macroatom").
         """
         self.line_interaction_type = line_interaction_type
+        self._index_maps = None
+        self._index_maps_metadata = None
+        self._index_maps_line_interaction_type = None
+
+    def get_index_maps(self, macro_atom_state, lines) -> SourceFunctionIndexMaps:
+        """
+        Index maps of the macro atom state, reused as long as the transition
+        metadata is the same object and the line interaction type is
+        unchanged.
+
+        Parameters
+        ----------
+        macro_atom_state : tardis.opacities.macro_atom.macroatom_state.MacroAtomState
+        lines : pd.DataFrame
+            Atomic data lines
+
+        Returns
+        -------
+        SourceFunctionIndexMaps
+        """
+        if (
+            self._index_maps_metadata is not macro_atom_state.transition_metadata
+            or self._index_maps_line_interaction_type
+            != self.line_interaction_type
+        ):
+            self._index_maps = SourceFunctionIndexMaps.from_macro_atom_state(
+                macro_atom_state, lines
+            )
+            self._index_maps_metadata = macro_atom_state.transition_metadata
+            self._index_maps_line_interaction_type = self.line_interaction_type
+        return self._index_maps
 
     def solve(
         self,
@@ -59,8 +203,6 @@ class SourceFunctionSolver:
         # Parse states for required values
         v_inner_boundary_index = sim_state.geometry.v_inner_boundary_index
         v_outer_boundary_index = sim_state.geometry.v_outer_boundary_index
-        no_of_shells = sim_state.no_of_shells
-        dilution_factor = sim_state.dilution_factor
         time_explosion = sim_state.time_explosion
         volume = sim_state.volume
 
@@ -83,54 +225,25 @@ class SourceFunctionSolver:
         transition_probabilities = transition_probabilities[:, local_slice]
         tau_sobolevs = tau_sobolev[:, local_slice]
 
-        macroatom_references = macro_atom_state.references_index
-        macroatom_transition_metadata = macro_atom_state.transition_metadata
-
-        no_lvls = len(macroatom_references)
-        no_shells = len(dilution_factor)
+        index_maps = self.get_index_maps(macro_atom_state, atomic_data.lines)
 
-        # Calculate e_dot_u
-        upper_level_index = atomic_data.lines.index.droplevel(
-            "level_number_lower"
-        )
-        e_dot_u = self.calculate_e_dot_u(
+        # Calculate e_dot_u, for all macro atom levels
+        e_dot_u_levels = self.calculate_e_dot_u(
             time_of_simulation,
             volume,
             tau_sobolevs,
             e_dot_lu_estimator,
             transition_probabilities,
-            upper_level_index,
-            no_shells,
-            no_lvls,
+            index_maps,
             line_interaction_type=self.line_interaction_type,
-            macro_data=macroatom_transition_metadata,
-            macro_ref=macroatom_references,
         )
 
         # Calculate att_S_ul
-        transition_type = macroatom_transition_metadata.transition_type
-        emitting_transitions = macroatom_transition_metadata[
-            transition_type == MacroAtomTransitionType.BB_EMISSION
-        ].copy()
-        transitions_index = pd.MultiIndex.from_tuples(
-            emitting_transitions.source.values,
-            names=["atomic_number", "ion_number", "source_level_number"],
-        )
-        emission_transition_line_id = (
-            emitting_transitions.transition_line_id.values
-        )
-        lines = atomic_data.lines.set_index("line_id")
-        lines_idx = lines.index.values
-
         att_S_ul = self.calculate_att_S_ul(
-            lines,
+            atomic_data.lines.wavelength_cm.to_numpy(),
             transition_probabilities,
-            no_of_shells,
-            emission_transition_line_id,
-            lines_idx,
-            transitions_index,
-            transition_type,
-            e_dot_u,
+            index_maps,
+            e_dot_u_levels,
             time_explosion,
         )
         # Calculate Jred_lu and Jblue_lu
@@ -139,6 +252,12 @@ class SourceFunctionSolver:
         )
         Jred_lu = self.calculate_Jred_lu(Jblue_lu, tau_sobolevs, att_S_ul)
 
+        e_dot_u = pd.DataFrame(
+            e_dot_u_levels[index_maps.upper_level_idx],
+            index=index_maps.upper_level_index,
+            columns=range(e_dot_u_levels.shape[1]),
+        )
+
         return SourceFunctionState(att_S_ul, Jred_lu, Jblue_lu, e_dot_u)
 
     def calculate_e_dot_u(
@@ -148,16 +267,16 @@ class SourceFunctionSolver:
         tau_sobolevs: np.ndarray,
         e_dot_lu_estimator: np.ndarray,
         transition_probabilities: np.ndarray,
-        upper_level_idx: pd.Index,
-        no_of_shells: int,
-        no_lvls: int,
+        index_maps: SourceFunctionIndexMaps,
         line_interaction_type: str,
-        macro_data: pd.DataFrame,
-        macro_ref: pd.DataFrame,
-    ) -> pd.DataFrame:
+    ) -> np.ndarray:
         """
         Calculate e_dot_u, the rate energy density is added to the upper level of transitions excited to it
 
+        The line rates are summed per upper level with a segment sum. For
+        the macroatom the internal transitions of all shells are solved at
+        once, as one block diagonal sparse system.
+
         Parameters
         ----------
         time_of_simulation : astropy.units.Quantity
@@ -168,77 +287,63 @@ class SourceFunctionSolver:
         e_dot_lu_estimator : np.ndarray
             The line estimator for the rate of energy absorption of a transition from lower to upper level
         transition_probabilities : np.ndarray
-        upper_level_idx : pd.Index
-            Index of the upper levels in the atomic data
-        no_of_shells : int
-            Number of shells in the simulation
-        no_lvls : int
-            Number of levels in the atomic data
+        index_maps : SourceFunctionIndexMaps
+            Index maps of the macro atom state
         line_interaction_type : str
             Type of line interaction (e.g. "macroatom", "downbranch")
-        macro_data : pd.DataFrame
-            DataFrame containing macro atom data
-        macro_ref : pd.DataFrame
-            DataFrame containing macro atom references, see http://tardis.readthedocs.io/en/latest/physics/plasma/macroatom.html
 
         Returns
         -------
-        pd.DataFrame
-            The rate energy density is added to the upper level of transitions excited to it
+        np.ndarray
+            e_dot_u of every macro atom level, of shape
+            (number of macro atom levels, number of shells)
         """
         e_dot_lu_norm_factor = 1 / (time_of_simulation * volume)
         exptau = 1 - np.exp(-tau_sobolevs)
-        e_dot_lu = e_dot_lu_norm_factor * exptau * e_dot_lu_estimator
-
-        columns = range(no_of_shells)
-        e_dot_lu = pd.DataFrame(
-            e_dot_lu.value, index=upper_level_idx, columns=columns
+        e_dot_lu = (e_dot_lu_norm_factor * exptau * e_dot_lu_estimator).value
+
+        no_lvls = index_maps.no_lvls
+        no_of_shells = e_dot_lu.shape[1]
+        e_dot_u = np.zeros((no_lvls, no_of_shells))
+        e_dot_u[index_maps.upper_level_idx] = np.add.reduceat(
+            e_dot_lu[index_maps.line_order],
+            index_maps.upper_level_starts,
+            axis=0,
         )
-        e_dot_u = e_dot_lu.groupby(level=[0, 1, 2]).sum()
 
         if line_interaction_type == "macroatom":
-            e_dot_u_src_idx = macro_ref.loc[e_dot_u.index].to_numpy()
-
-            internal_jump_mask = (macro_data.transition_type >= 0).to_numpy()
-            ma_int_data = macro_data[internal_jump_mask]
-            internal = transition_probabilities[internal_jump_mask]
-
-            source_level_idx = ma_int_data.source_level_idx.values
-            destination_level_idx = ma_int_data.destination_level_idx.values
-
-            C_frame = pd.DataFrame(columns=columns, index=macro_ref.index)
-            q_indices = (source_level_idx, destination_level_idx)
-            for shell in columns:
-                Q = sp.coo_matrix(
-                    (internal[:, shell], q_indices), shape=(no_lvls, no_lvls)
-                )
-                inv_N = sp.identity(no_lvls) - Q
-                e_dot_u_vec = np.zeros(no_lvls)
-                e_dot_u_vec[e_dot_u_src_idx] = e_dot_u[shell].to_numpy()
-                C_frame[shell] = linalg.spsolve(inv_N.T, e_dot_u_vec)
-
-            e_dot_u = C_frame.loc[e_dot_u.index]
-
-        # needed for att_S_ul calculation
-        e_dot_u.index.names = [
-            "atomic_number",
-            "ion_number",
-            "source_level_number",
-        ]
+            # (1 - Q)^T of every shell on the diagonal, shell-major
+            shell_offsets = np.arange(no_of_shells) * no_lvls
+            internal = transition_probabilities[
+                index_maps.internal_transition_idx
+            ]
+            rows = (
+                index_maps.internal_destination_idx[:, np.newaxis]
+                + shell_offsets
+            )
+            columns = (
+                index_maps.internal_source_idx[:, np.newaxis] + shell_offsets
+            )
+            size = no_lvls * no_of_shells
+            inv_N_T = sp.identity(size, format="csc") - sp.csc_matrix(
+                (internal.ravel(), (rows.ravel(), columns.ravel())),
+                shape=(size, size),
+            )
+            e_dot_u = (
+                linalg.spsolve(inv_N_T, e_dot_u.ravel(order="F"))
+                .reshape(no_of_shells, no_lvls)
+                .T
+            )
 
-        return e_dot_u
+        return np.ascontiguousarray(e_dot_u)
 
     def calculate_att_S_ul(
         self,
-        lines: pd.DataFrame,
+        wavelength_cm: np.ndarray,
         transition_probabilities: np.ndarray,
-        no_of_shells: int,
-        transition_line_id: np.ndarray,
-        line_idx: np.ndarray,
-        transitions_index: pd.Index,
-        transition_type: np.ndarray,
-        e_dot_u: pd.DataFrame,
-        time_explosion: float,
+        index_maps: SourceFunctionIndexMaps,
+        e_dot_u: np.ndarray,
+        time_explosion: u.Quantity,
     ) -> np.ndarray:
         """
         Calculates the source function using the line absorption rate estimator `e_dot_lu_estimator`
@@ -248,45 +353,32 @@ class SourceFunctionSolver:
 
         Parameters
         ----------
-        lines : pd.DataFrame
-            atomic line data
+        wavelength_cm : np.ndarray
+            Wavelengths of the lines in cm
         transition_probabilities : np.ndarray
-        no_of_shells : int
-            Number of shells in the simulation
-        transition_line_id : np.ndarray
-            Line ids for the transitions
-        line_idx : np.ndarray
-            Indices of the lines in the atomic data
-        transitions_index : pd.Index
-            Index of the transitions in the macro atom data
-        transition_type : np.ndarray
-            transition types, see https://tardis-sn.github.io/tardis/physics/setup/plasma/macroatom.html#macroatom for flag definitions
-        e_dot_u : pd.DataFrame
-            the rate energy density is add to the upper level of transitions excited to it
-        time_explosion : float
+        index_maps : SourceFunctionIndexMaps
+            Index maps of the macro atom state
+        e_dot_u : np.ndarray
+            the rate energy density is add to the upper level of transitions
+            excited to it, for every macro atom level
+        time_explosion : astropy.units.Quantity
             geometrical explosion time
 
         Returns
         -------
         np.ndarray
-            The attenuated source function
+            The attenuated source function, in the order of the lines
         """
-        q_ul = pd.DataFrame(
-            transition_probabilities[
-                (transition_type == MacroAtomTransitionType.BB_EMISSION).values
-            ],
-            index=transitions_index,
-        )
-        wave = lines.wavelength_cm.loc[transition_line_id].values.reshape(-1, 1)
-        att_S_ul = wave * (q_ul * e_dot_u) * time_explosion / (4 * np.pi)
-        columns = range(no_of_shells)
-
-        result = pd.DataFrame(
-            att_S_ul.values,
-            index=transition_line_id,
-            columns=columns,
+        q_ul = transition_probabilities[index_maps.emission_transition_idx]
+        wave = wavelength_cm[index_maps.emission_line_idx].reshape(-1, 1)
+
+        att_S_ul = np.zeros((len(wavelength_cm), e_dot_u.shape[1]))
+        att_S_ul[index_maps.emission_line_idx] = (
+            wave
+            * (q_ul * e_dot_u[index_maps.emission_source_idx])
+            * time_explosion.to_value(u.s)
+            / (4 * np.pi)
         )
-        att_S_ul = result.loc[line_idx].values
 
         return att_S_ul
 
@@ -1,7 +1,12 @@
+from types import SimpleNamespace
+
 import numpy as np
 import numpy.testing as ntest
+import pandas as pd
 import pytest
+from astropy import units as u
 
+from tardis.opacities.opacity_state_numba import OpacityStateNumba
 
 from tardis.spectrum.formal_integral.base import (
     check_formal_integral_requirements,
@@ -16,6 +21,9 @@ from tardis.spectrum.formal_integral.formal_integral_cuda import (
     calculate_impact_parameters as calculate_impact_parameters_cuda,
     intensity_black_body_cuda,
 )
+from tardis.spectrum.formal_integral.formal_integral_solver import (
+    FormalIntegralSolver,
+)
 
 
 @pytest.mark.parametrize(
@@ -86,3 +94,88 @@ def test_calculate_p_values(N):
     # actual_cuda = np.zeros_like(expected, dtype=np.float64)
     # actual_cuda[::] = calculate_impact_parameters_cuda(r, N)
     # ntest.assert_allclose(actual_cuda, expected)
+
+
+def test_solve_epochs_unequal_frequency_grids():
+    formal_integrator = FormalIntegralSolver(10, 20, "numba")
+    frequencies = [
+        np.linspace(1e14, 1e15, 100) * u.Hz,
+        np.linspace(1e14, 1e15, 101) * u.Hz,
+    ]
+    with pytest.raises(ValueError, match="same length"):
+        formal_integrator.solve_epochs(
+            frequencies,
+            [None, None],
+            [None, None],
+            [None, None],
+            None,
+            [None, None],
+            [None, None],
+        )
+
+
+def test_epoch_opacity_state_numba():
+    rng = np.random.default_rng(49)
+    no_of_lines, no_of_transitions, no_of_shells = 5, 8, 3
+    empty = np.zeros(0)
+    empty_2d = np.zeros((0, 0))
+    empty_int = np.zeros(0, dtype=np.int64)
+    shared = OpacityStateNumba(
+        rng.uniform(size=no_of_shells),
+        rng.uniform(size=no_of_shells),
+        np.sort(rng.uniform(size=no_of_lines))[::-1].copy(),
+        rng.uniform(size=(no_of_lines, no_of_shells)),
+        rng.uniform(size=(no_of_transitions, no_of_shells)),
+        np.arange(no_of_lines, dtype=np.int64),
+        np.arange(no_of_lines + 1, dtype=np.int64),
+        np.full(no_of_transitions, -1, dtype=np.int64),
+        np.arange(no_of_transitions, dtype=np.int64),
+        np.arange(no_of_transitions, dtype=np.int64),
+        empty,
+        empty_2d,
+        empty,
+        empty,
+        empty_int,
+        empty_2d,
+        empty,
+        empty,
+        empty,
+        empty_2d,
+        empty_int,
+        -1,
+    )
+    opacity_state = SimpleNamespace(
+        electron_density=pd.Series(rng.uniform(size=no_of_shells)),
+        t_electrons=rng.uniform(size=no_of_shells),
+        tau_sobolev=pd.DataFrame(
+            rng.uniform(size=(no_of_lines, no_of_shells))
+        ),
+    )
+    macro_atom_state = SimpleNamespace(
+        transition_probabilities=pd.DataFrame(
+            rng.uniform(size=(no_of_transitions, no_of_shells))
+        )
+    )
+
+    epoch = FormalIntegralSolver.epoch_opacity_state_numba(
+        shared, opacity_state, macro_atom_state
+    )
+
+    ntest.assert_array_equal(
+        epoch.electron_density, opacity_state.electron_density
+    )
+    ntest.assert_array_equal(epoch.t_electrons, opacity_state.t_electrons)
+    ntest.assert_array_equal(epoch.tau_sobolev, opacity_state.tau_sobolev)
+    ntest.assert_array_equal(
+        epoch.transition_probabilities,
+        macro_atom_state.transition_probabilities,
+    )
+    for name in (
+        "line_list_nu",
+        "line2macro_level_upper",
+        "macro_block_references",
+        "transition_type",
+        "destination_level_id",
+        "transition_line_id",
+    ):
+        assert np.shares_memory(getattr(epoch, name), getattr(shared, name))
@@ -1,10 +1,14 @@
 import numpy as np
 import numpy.testing as ntest
 import pytest
+from scipy.interpolate import interp1d
 
 from tardis import constants as c
 from tardis.model.geometry.radial1d import NumbaRadial1DGeometry
-from tardis.spectrum.formal_integral.base import C_INV
+from tardis.spectrum.formal_integral.base import (
+    C_INV,
+    calculate_shell_interpolation_indices,
+)
 import tardis.spectrum.formal_integral.formal_integral_numba as formal_integral_numba
 
 
@@ -121,3 +125,199 @@ def test_populate_z_shells(formal_integral_geometry, time_explosion, p):
     ntest.assert_allclose(oshell_id, expected_oshell_id)
 
     ntest.assert_allclose(oz, expected_oz, atol=1e-5)
+
+
+def test_refine_luminosity_densities():
+    """
+    Refining every interval with one point integrates on the grid with
+    twice the impact parameter resolution.
+    """
+    rng = np.random.default_rng(1999)
+    n_shells, n_lines, n_impact_parameters = 5, 400, 41
+    time_explosion = 13 * 86400.0
+    velocities = np.linspace(1.1e9, 2e9, n_shells + 1)
+    geometry = NumbaRadial1DGeometry(
+        velocities[:-1] * time_explosion,
+        velocities[1:] * time_explosion,
+        velocities[:-1],
+        velocities[1:],
+    )
+    plasma = formal_integral_numba.NumbaLineList(
+        np.sort(rng.uniform(3e14, 1.5e15, n_lines))[::-1].copy()
+    )
+    line_quantities = [
+        rng.uniform(0, 1e-5, n_lines * n_shells) for _ in range(3)
+    ]
+    args = (
+        geometry,
+        time_explosion,
+        plasma,
+        10000.0,
+        np.linspace(4e14, 1.2e15, 6),
+        *line_quantities,
+        10 ** rng.uniform(-3, 1.5, (n_lines, n_shells)),
+        rng.uniform(1e7, 1e9, n_shells),
+    )
+
+    refined_luminosity_densities, intensities_nu_p = (
+        formal_integral_numba.numba_formal_integral(
+            *args, n_impact_parameters, 1, -1.0
+        )
+    )
+    _, fine_intensities_nu_p = formal_integral_numba.numba_formal_integral(
+        *args, 2 * n_impact_parameters - 1
+    )
+
+    ntest.assert_array_equal(intensities_nu_p, fine_intensities_nu_p[:, ::2])
+    dx = geometry.r_outer[-1] / n_impact_parameters / 2
+    ntest.assert_allclose(
+        refined_luminosity_densities,
+        8 * np.pi * np.pi * np.trapezoid(fine_intensities_nu_p, dx=dx, axis=1),
+        rtol=1e-12,
+    )
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_line_start_idx(descending):
+    rng = np.random.default_rng(711)
+    n_shells, n_impact_parameters = 4, 25
+    time_explosion = 13 * 86400.0
+    velocities = np.linspace(1.1e9, 2e9, n_shells + 1)
+    geometry = NumbaRadial1DGeometry(
+        velocities[:-1] * time_explosion,
+        velocities[1:] * time_explosion,
+        velocities[:-1],
+        velocities[1:],
+    )
+    line_list_nu = np.sort(rng.uniform(3e14, 1.5e15, 300))[::-1].copy()
+    frequencies = np.linspace(4e14, 1.2e15, 50)
+    if descending:
+        frequencies = frequencies[::-1].copy()
+
+    inputs = formal_integral_numba.initialize_formal_integral_inputs(
+        frequencies,
+        10000.0,
+        n_impact_parameters,
+        geometry,
+        time_explosion,
+        np.ones((len(line_list_nu), n_shells)),
+        line_list_nu,
+    )
+    intersection_points, line_start_idx = inputs[2], inputs[-1]
+
+    for nu_idx, nu in enumerate(frequencies):
+        for impact_parameter_idx in range(1, n_impact_parameters):
+            assert line_start_idx[
+                nu_idx, impact_parameter_idx
+            ] == formal_integral_numba.line_search(
+                line_list_nu,
+                nu * intersection_points[impact_parameter_idx, 0],
+                len(line_list_nu),
+            )
+
+
+def test_numba_formal_integral_epochs():
+    rng = np.random.default_rng(2011)
+    n_epochs, n_shells, n_lines, n_impact_parameters = 3, 4, 300, 30
+    line_list_nu = np.sort(rng.uniform(3e14, 1.5e15, n_lines))[::-1].copy()
+    time_explosions = np.array([10.0, 13.0, 20.0]) * 86400.0
+    velocities = np.linspace(1.1e9, 2e9, n_shells + 1)
+    r_inner = np.outer(time_explosions, velocities[:-1])
+    r_outer = np.outer(time_explosions, velocities[1:])
+    inner_temperatures = np.array([12000.0, 10000.0, 8000.0])
+    frequencies = np.array(
+        [np.linspace(4e14, 1.2e15, 20) * (1 + 0.1 * i) for i in range(n_epochs)]
+    )
+    line_quantities = [
+        rng.uniform(0, 1e-5, (n_epochs, n_lines * n_shells)) for _ in range(3)
+    ]
+    tau_sobolev = 10 ** rng.uniform(-3, 1.5, (n_epochs, n_lines, n_shells))
+    electron_densities = rng.uniform(1e7, 1e9, (n_epochs, n_shells))
+
+    luminosity_densities, intensities_nu_p = (
+        formal_integral_numba.numba_formal_integral_epochs(
+            r_inner,
+            r_outer,
+            time_explosions,
+            line_list_nu,
+            inner_temperatures,
+            frequencies,
+            *line_quantities,
+            tau_sobolev,
+            electron_densities,
+            n_impact_parameters,
+        )
+    )
+
+    for epoch_idx in range(n_epochs):
+        geometry = NumbaRadial1DGeometry(
+            r_inner[epoch_idx],
+            r_outer[epoch_idx],
+            r_inner[epoch_idx] / time_explosions[epoch_idx],
+            r_outer[epoch_idx] / time_explosions[epoch_idx],
+        )
+        expected = formal_integral_numba.numba_formal_integral(
+            geometry,
+            time_explosions[epoch_idx],
+            formal_integral_numba.NumbaLineList(line_list_nu),
+            inner_temperatures[epoch_idx],
+            frequencies[epoch_idx],
+            *[quantity[epoch_idx] for quantity in line_quantities],
+            tau_sobolev[epoch_idx],
+            electron_densities[epoch_idx],
+            n_impact_parameters,
+        )
+        ntest.assert_allclose(
+            luminosity_densities[epoch_idx], expected[0], rtol=1e-14
+        )
+        ntest.assert_allclose(
+            intensities_nu_p[epoch_idx], expected[1], rtol=1e-14
+        )
+
+
+@pytest.mark.parametrize("n_interpolated", [5, 40])
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_interpolate_line_quantity(n_interpolated, dtype):
+    """
+    The interpolation kernels reproduce interp1d in the integrator layout.
+    """
+    rng = np.random.default_rng(2112)
+    n_lines, n_shells = 200, 9
+    r_middle = np.sort(rng.uniform(1e14, 2e15, n_shells))
+    r_middle_interpolated = np.linspace(0.5e14, 2.5e15, n_interpolated)
+    values = rng.normal(0.0, 1.0, (n_lines, n_shells))
+    line_ids = np.flatnonzero(rng.uniform(size=n_lines) < 0.4)
+
+    (
+        lower_shell_ids,
+        upper_shell_ids,
+        shell_widths,
+        shell_offsets,
+        nearest_shell_ids,
+    ) = calculate_shell_interpolation_indices(r_middle, r_middle_interpolated)
+
+    interpolated = np.empty(len(line_ids) * n_interpolated, dtype=dtype)
+    formal_integral_numba.interpolate_line_quantity(
+        values,
+        line_ids,
+        lower_shell_ids,
+        upper_shell_ids,
+        shell_widths,
+        shell_offsets,
+        interpolated,
+    )
+    expected = interp1d(r_middle, values, fill_value="extrapolate")(
+        r_middle_interpolated
+    ).clip(0.0)
+    ntest.assert_array_equal(
+        interpolated, expected[line_ids].flatten(order="F").astype(dtype)
+    )
+
+    selected = np.empty((len(line_ids), n_interpolated), dtype=dtype)
+    formal_integral_numba.select_nearest_shells(
+        values, line_ids, nearest_shell_ids, selected
+    )
+    expected = interp1d(
+        r_middle, values, fill_value="extrapolate", kind="nearest"
+    )(r_middle_interpolated)
+    ntest.assert_array_equal(selected, expected[line_ids].astype(dtype))
@@ -1,13 +1,19 @@
 from copy import deepcopy
+from types import SimpleNamespace
 
+import astropy.units as u
+import numpy as np
 import numpy.testing as npt
+import pandas as pd
 import pytest
 
 from tardis.simulation import Simulation
 from tardis.spectrum.formal_integral.formal_integral_solver import (
     FormalIntegralSolver,
 )
+from tardis import constants as const
 from tardis.spectrum.formal_integral.source_function import SourceFunctionSolver
+from tardis.transport.montecarlo.macro_atom import MacroAtomTransitionType
 
 SOURCE_FUNCTION_FORMAL_INTEGRAL_RTOL = 1e-14
 
@@ -132,3 +138,220 @@ def test_e_dot_u(source_function_verysimple, regression_data):
         rtol=SOURCE_FUNCTION_FORMAL_INTEGRAL_RTOL,
         atol=0,
     )
+
+
+def random_macro_atom_problem(no_of_levels=6, no_of_shells=3, seed=45):
+    """
+    Random lines and macro atom transitions of a single ion, with the states
+    the source function solver reads.
+    """
+    rng = np.random.default_rng(seed)
+    line_levels = [
+        (lower, upper)
+        for upper in range(1, no_of_levels)
+        for lower in range(upper)
+        if rng.uniform() < 0.7 or lower == upper - 1
+    ]
+    line_levels = [line_levels[i] for i in rng.permutation(len(line_levels))]
+    no_of_lines = len(line_levels)
+    lines = pd.DataFrame(
+        {"wavelength_cm": rng.uniform(1e-5, 1e-4, no_of_lines)},
+        index=pd.MultiIndex.from_tuples(
+            [(1, 0, lower, upper) for lower, upper in line_levels],
+            names=[
+                "atomic_number",
+                "ion_number",
+                "level_number_lower",
+                "level_number_upper",
+            ],
+        ),
+    )
+
+    # emission of every line from its upper level, internal jumps down and
+    # up the lines
+    transitions = []
+    for line_idx, (lower, upper) in enumerate(line_levels):
+        transitions.append(
+            (MacroAtomTransitionType.BB_EMISSION, upper, lower, line_idx)
+        )
+        transitions.append(
+            (MacroAtomTransitionType.INTERNAL_DOWN, upper, lower, line_idx)
+        )
+        transitions.append(
+            (MacroAtomTransitionType.INTERNAL_UP, lower, upper, line_idx)
+        )
+    transition_metadata = pd.DataFrame(
+        transitions,
+        columns=[
+            "transition_type",
+            "source_level_idx",
+            "destination_level_idx",
+            "transition_line_idx",
+        ],
+    )
+
+    # probabilities normalised over the transitions of every source level
+    transition_probabilities = rng.uniform(
+        0.1, 1.0, (len(transitions), no_of_shells)
+    )
+    source_level_idx = transition_metadata.source_level_idx.to_numpy()
+    norm = np.zeros((no_of_levels, no_of_shells))
+    np.add.at(norm, source_level_idx, transition_probabilities)
+    transition_probabilities /= norm[source_level_idx]
+
+    sim_state = SimpleNamespace(
+        geometry=SimpleNamespace(
+            v_inner_boundary_index=0, v_outer_boundary_index=no_of_shells
+        ),
+        time_explosion=13 * u.day,
+        volume=rng.uniform(1e40, 2e40, no_of_shells) * u.cm**3,
+    )
+    opacity_state = SimpleNamespace(
+        tau_sobolev=rng.uniform(0.0, 5.0, (no_of_lines, no_of_shells)),
+        transition_probabilities=transition_probabilities,
+    )
+    transport_state = SimpleNamespace(
+        radfield_mc_estimators=SimpleNamespace(
+            j_blue_estimator=rng.uniform(0, 1e10, (no_of_lines, no_of_shells)),
+            Edotlu_estimator=rng.uniform(0, 1e40, (no_of_lines, no_of_shells)),
+        ),
+        packet_collection=SimpleNamespace(time_of_simulation=2.5),
+    )
+    macro_atom_state = SimpleNamespace(
+        transition_metadata=transition_metadata,
+        line2macro_level_upper=np.array([upper for _, upper in line_levels]),
+    )
+    atomic_data = SimpleNamespace(lines=lines)
+    return (
+        sim_state,
+        opacity_state,
+        transport_state,
+        atomic_data,
+        macro_atom_state,
+    )
+
+
+def dense_source_function(
+    line_interaction_type,
+    sim_state,
+    opacity_state,
+    transport_state,
+    atomic_data,
+    macro_atom_state,
+):
+    """
+    att_S_ul, Jred_lu and Jblue_lu from a dense solve of every shell.
+    """
+    lines = atomic_data.lines
+    metadata = macro_atom_state.transition_metadata
+    upper_level = macro_atom_state.line2macro_level_upper
+    tau_sobolev = opacity_state.tau_sobolev
+    probabilities = opacity_state.transition_probabilities
+    time_of_simulation = (
+        transport_state.packet_collection.time_of_simulation * u.s
+    )
+    time_explosion = sim_state.time_explosion
+    volume = sim_state.volume
+    estimators = transport_state.radfield_mc_estimators
+    no_of_levels = upper_level.max() + 1
+    no_of_lines, no_of_shells = tau_sobolev.shape
+
+    e_dot_lu = (
+        (1 - np.exp(-tau_sobolev))
+        * estimators.Edotlu_estimator
+        / (time_of_simulation * volume)
+    ).value
+    is_internal = (metadata.transition_type >= 0).to_numpy()
+    is_emission = (
+        metadata.transition_type == MacroAtomTransitionType.BB_EMISSION
+    ).to_numpy()
+
+    att_S_ul = np.zeros((no_of_lines, no_of_shells))
+    for shell in range(no_of_shells):
+        e_dot_u = np.zeros(no_of_levels)
+        for line in range(no_of_lines):
+            e_dot_u[upper_level[line]] += e_dot_lu[line, shell]
+        if line_interaction_type == "macroatom":
+            internal_jumps = np.zeros((no_of_levels, no_of_levels))
+            for source, destination, probability in zip(
+                metadata.source_level_idx[is_internal],
+                metadata.destination_level_idx[is_internal],
+                probabilities[is_internal, shell],
+            ):
+                internal_jumps[source, destination] += probability
+            e_dot_u = np.linalg.solve(
+                (np.identity(no_of_levels) - internal_jumps).T, e_dot_u
+            )
+        for source, line, probability in zip(
+            metadata.source_level_idx[is_emission],
+            metadata.transition_line_idx[is_emission],
+            probabilities[is_emission, shell],
+        ):
+            att_S_ul[line, shell] = (
+                lines.wavelength_cm.iloc[line]
+                * probability
+                * e_dot_u[source]
+                * time_explosion.to_value(u.s)
+                / (4 * np.pi)
+            )
+
+    Jblue_lu = (
+        estimators.j_blue_estimator
+        * (
+            const.c.cgs
+            * time_explosion
+            / (4 * np.pi * time_of_simulation * volume)
+        )
+        .to("1/(cm^2 s)")
+        .value
+    )
+    Jred_lu = Jblue_lu * np.exp(-tau_sobolev) + att_S_ul
+    return att_S_ul, Jred_lu, Jblue_lu
+
+
+@pytest.mark.parametrize("line_interaction_type", config_line_modes)
+def test_source_function_matches_dense_solve(line_interaction_type):
+    problem = random_macro_atom_problem()
+    source_function_solver = SourceFunctionSolver(line_interaction_type)
+
+    source_function_state = source_function_solver.solve(*problem)
+    expected_att_S_ul, expected_Jred_lu, expected_Jblue_lu = (
+        dense_source_function(line_interaction_type, *problem)
+    )
+
+    npt.assert_allclose(
+        source_function_state.att_S_ul, expected_att_S_ul, rtol=1e-12
+    )
+    npt.assert_allclose(
+        source_function_state.Jred_lu, expected_Jred_lu, rtol=1e-12
+    )
+    npt.assert_allclose(
+        source_function_state.Jblue_lu, expected_Jblue_lu, rtol=1e-12
+    )
+
+
+def test_source_function_index_maps_cache():
+    problem = random_macro_atom_problem()
+    atomic_data, macro_atom_state = problem[3], problem[4]
+    source_function_solver = SourceFunctionSolver("macroatom")
+
+    source_function_solver.solve(*problem)
+    index_maps = source_function_solver.get_index_maps(
+        macro_atom_state, atomic_data.lines
+    )
+    source_function_solver.solve(*problem)
+    assert (
+        source_function_solver.get_index_maps(
+            macro_atom_state, atomic_data.lines
+        )
+        is index_maps
+    )
+
+    source_function_solver.line_interaction_type = "downbranch"
+    downbranch_index_maps = source_function_solver.get_index_maps(
+        macro_atom_state, atomic_data.lines
+    )
+    assert downbranch_index_maps is not index_maps
+    npt.assert_array_equal(
+        downbranch_index_maps.line_order, index_maps.line_order
+    )
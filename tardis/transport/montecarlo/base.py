@@ -1,7 +1,7 @@
 import logging
 
 from astropy import units as u
-from numba import cuda, set_num_threads
+from numba import cuda, get_num_threads, set_num_threads
 
 import tardis.transport.montecarlo.configuration.constants as constants
 from tardis import constants as const
@@ -23,16 +23,27 @@ from tardis.transport.montecarlo.montecarlo_main_loop import (
 from tardis.transport.montecarlo.montecarlo_transport_state import (
     MonteCarloTransportState,
 )
+from tardis.transport.montecarlo.packets.packet_collections import (
+    initialize_compact_vpacket_storage,
+    initialize_vpacket_storage,
+)
 from tardis.transport.montecarlo.packets.packet_trackers import (
+    RPacketTrackingFilter,
+    generate_compact_rpacket_event_log_list,
+    generate_rpacket_event_log_list,
     generate_rpacket_last_interaction_tracker_list,
-    generate_rpacket_tracker_list,
-    rpacket_trackers_to_dataframe,
+    rpacket_event_logs_to_dataframe,
+    rpacket_tracking_filter_from_config,
 )
 from tardis.transport.montecarlo.progress_bars import (
     refresh_packet_pbar,
     reset_packet_pbar,
     update_iterations_pbar,
 )
+from tardis.transport.montecarlo.transport_profile import (
+    initialize_transport_profiles,
+    transport_profiles_to_dataframe,
+)
 from tardis.util.base import (
     quantity_linspace,
 )
@@ -62,6 +73,9 @@ class MonteCarloTransportSolver(HDFWriterMixin):
         packet_source,
         enable_virtual_packet_logging=False,
         enable_rpacket_tracking=False,
+        compact_storage=False,
+        rpacket_tracking_filter_config=None,
+        enable_transport_profiling=False,
         nthreads=1,
         debug_packets=False,
         logger_buffer=1,
@@ -80,11 +94,15 @@ class MonteCarloTransportSolver(HDFWriterMixin):
 
         self.enable_vpacket_tracking = enable_virtual_packet_logging
         self.enable_rpacket_tracking = enable_rpacket_tracking
+        self.compact_storage = compact_storage
+        self.rpacket_tracking_filter_config = rpacket_tracking_filter_config
+        self.rpacket_tracking_filter = RPacketTrackingFilter()
+        self.enable_transport_profiling = enable_transport_profiling
         self.montecarlo_configuration = montecarlo_configuration
 
         self.packet_source = packet_source
 
-        # Setting up the Tracking array for storing all the RPacketTracker instances
+        # Setting up the Tracking array for storing all the RPacketEventLog instances
         self.rpacket_tracker = None
 
         # Set number of threads
@@ -142,6 +160,14 @@ class MonteCarloTransportSolver(HDFWriterMixin):
             self.montecarlo_configuration, self, no_of_virtual_packets
         )
 
+        if (
+            self.enable_rpacket_tracking
+            and self.rpacket_tracking_filter_config is not None
+        ):
+            self.rpacket_tracking_filter = rpacket_tracking_filter_from_config(
+                self.rpacket_tracking_filter_config, plasma.atomic_data.lines
+            )
+
         return transport_state
 
     def run(
@@ -171,9 +197,19 @@ class MonteCarloTransportSolver(HDFWriterMixin):
         number_of_rpackets = len(transport_state.packet_collection.initial_nus)
 
         if self.enable_rpacket_tracking:
-            transport_state.rpacket_tracker = generate_rpacket_tracker_list(
-                number_of_rpackets,
+            if self.compact_storage:
+                generate_event_log_list = (
+                    generate_compact_rpacket_event_log_list
+                )
+            else:
+                generate_event_log_list = generate_rpacket_event_log_list
+            # one event log per thread, the logs grow their chunks while
+            # events are recorded
+            number_of_threads = get_num_threads()
+            transport_state.rpacket_tracker = generate_event_log_list(
+                number_of_threads,
                 self.montecarlo_configuration.INITIAL_TRACKING_ARRAY_LENGTH,
+                self.rpacket_tracking_filter,
             )
         else:
             transport_state.rpacket_tracker = (
@@ -182,6 +218,26 @@ class MonteCarloTransportSolver(HDFWriterMixin):
                 )
             )
 
+        if self.compact_storage:
+            initialize_storage = initialize_compact_vpacket_storage
+        else:
+            initialize_storage = initialize_vpacket_storage
+        vpacket_storage = initialize_storage(
+            number_of_rpackets,
+            self.spectrum_frequency_grid.value,
+            self.montecarlo_configuration.VPACKET_SPAWN_START_FREQUENCY,
+            self.montecarlo_configuration.VPACKET_SPAWN_END_FREQUENCY,
+            number_of_vpackets,
+            self.montecarlo_configuration.TEMPORARY_V_PACKET_BINS,
+        )
+
+        if self.enable_transport_profiling:
+            transport_profiles = initialize_transport_profiles(
+                get_num_threads()
+            )
+        else:
+            transport_profiles = None
+
         # Reset packet progress bar for this iteration
         if show_progress_bars:
             reset_packet_pbar(number_of_rpackets)
@@ -201,6 +257,8 @@ class MonteCarloTransportSolver(HDFWriterMixin):
             transport_state.rpacket_tracker,
             number_of_vpackets,
             show_progress_bars=show_progress_bars,
+            transport_profiles=transport_profiles,
+            vpacket_storage=vpacket_storage,
         )
 
         transport_state.last_interaction_type = last_interaction_tracker.types
@@ -221,15 +279,19 @@ class MonteCarloTransportSolver(HDFWriterMixin):
         ):
             transport_state.vpacket_tracker = vpacket_tracker
 
+        if transport_profiles is not None:
+            transport_state.transport_profile = (
+                transport_profiles_to_dataframe(
+                    transport_profiles, number_of_rpackets
+                )
+            )
+
         update_iterations_pbar(1)
         refresh_packet_pbar()
 
-        # Need to change the implementation of rpacket_trackers_to_dataframe
-        # Such that it also takes of the case of
-        # RPacketLastInteractionTracker
         if self.enable_rpacket_tracking:
             self.transport_state.rpacket_tracker_df = (
-                rpacket_trackers_to_dataframe(
+                rpacket_event_logs_to_dataframe(
                     self.transport_state.rpacket_tracker
                 )
             )
@@ -324,6 +386,9 @@ class MonteCarloTransportSolver(HDFWriterMixin):
                 | enable_virtual_packet_logging
             ),
             enable_rpacket_tracking=config.montecarlo.tracking.track_rpacket,
+            compact_storage=config.montecarlo.tracking.compact_storage,
+            rpacket_tracking_filter_config=config.montecarlo.tracking.filter,
+            enable_transport_profiling=config.montecarlo.enable_transport_profiling,
             nthreads=config.montecarlo.nthreads,
             use_gpu=use_gpu,
             montecarlo_configuration=montecarlo_configuration,
@@ -7,6 +7,8 @@ from astropy import units as u
 import tardis.constants as const
 from tardis.io.atom_data import AtomData
 from tardis.transport.montecarlo.estimators.radfield_mc_estimators import (
+    PHOTO_ION_FIELD,
+    STIM_RECOMB_FIELD,
     RadiationFieldMCEstimators,
 )
 from tardis.transport.montecarlo.estimators.util import (
@@ -49,14 +51,16 @@ class MCContinuumPropertiesSolver:
         photo_ion_norm_factor = (time_simulation * volume * H) ** -1
 
         photo_ionization_rate_coefficient = bound_free_estimator_array2frame(
-            radfield_mc_estimators.photo_ion_estimator,
+            radfield_mc_estimators.bound_free_estimator,
             self.atom_data.level2continuum_edge_idx,
+            field=PHOTO_ION_FIELD,
         )
         photo_ionization_rate_coefficient *= photo_ion_norm_factor
 
         stimulated_recomb_rate_factor = bound_free_estimator_array2frame(
-            radfield_mc_estimators.stim_recomb_estimator,
+            radfield_mc_estimators.bound_free_estimator,
             self.atom_data.level2continuum_edge_idx,
+            field=STIM_RECOMB_FIELD,
         )
         stimulated_recomb_rate_factor *= photo_ion_norm_factor
 
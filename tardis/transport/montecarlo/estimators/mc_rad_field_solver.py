@@ -1,5 +1,6 @@
 import numpy as np
 from astropy import units as u
+from numba import njit, prange
 from scipy.special import zeta
 
 from tardis import constants as const
@@ -19,6 +20,110 @@ DILUTION_FACTOR_ESTIMATOR_CONSTANT = (
 T_RADIATIVE_ESTIMATOR_CONSTANT = (
     (np.pi**4 / (15 * 24 * zeta(5, 1))) * (const.h / const.k_B)
 ).cgs.value
+H_CGS = const.h.cgs.value
+K_B_CGS = const.k_B.cgs.value
+C_CGS = const.c.cgs.value
+
+# The j_blues kernels are compiled without fastmath, so that they agree
+# bitwise with the plasma initialisation from intensity_black_body.
+
+
+@njit(error_model="numpy")
+def intensity_black_body(nu, temperature):
+    """
+    Intensity of a black body, as `tardis.util.base.intensity_black_body`.
+
+    Parameters
+    ----------
+    nu : float
+        Frequency in Hz
+    temperature : float
+        Temperature in K
+
+    Returns
+    -------
+    float
+        Intensity in erg / (s cm2 Hz sr)
+    """
+    beta_rad = 1 / (K_B_CGS * temperature)
+    coefficient = 2 * H_CGS / C_CGS**2
+    return coefficient * nu**3 / (np.exp(H_CGS * nu * beta_rad) - 1)
+
+
+@njit(parallel=True, error_model="numpy")
+def calculate_planck_j_blues(line_nus, temperature, dilution_factor, j_blues):
+    """
+    Fill the mean intensities at the blue wings of the lines with those of a
+    dilute planckian radiation field.
+
+    Parameters
+    ----------
+    line_nus : numpy.ndarray
+        Line frequencies in Hz
+    temperature : numpy.ndarray
+        Radiative temperature of every shell in K
+    dilution_factor : numpy.ndarray
+        Dilution factor of every shell
+    j_blues : numpy.ndarray
+        Output of shape (number of lines, number of shells), filled in place
+    """
+    for line_id in prange(len(line_nus)):
+        nu = line_nus[line_id]
+        for shell_id in range(len(temperature)):
+            j_blues[line_id, shell_id] = dilution_factor[
+                shell_id
+            ] * intensity_black_body(nu, temperature[shell_id])
+
+
+@njit(parallel=True, error_model="numpy")
+def calculate_estimated_j_blues(
+    j_blue_estimator,
+    j_blues_norm_factor,
+    line_nus,
+    temperature,
+    dilution_factor,
+    w_epsilon,
+    shell_ids,
+    j_blues,
+):
+    """
+    Fill the mean intensities at the blue wings of the lines from the
+    Monte Carlo estimators.
+
+    Lines without estimator contribution in a shell fall back to
+    `w_epsilon` times the mean intensity of the estimated dilute planckian
+    radiation field.
+
+    Parameters
+    ----------
+    j_blue_estimator : numpy.ndarray
+        Estimator of shape (number of lines, number of estimated shells)
+    j_blues_norm_factor : numpy.ndarray
+        Normalisation of the estimator in every estimated shell
+    line_nus : numpy.ndarray
+        Line frequencies in Hz
+    temperature : numpy.ndarray
+        Estimated radiative temperature of every estimated shell in K
+    dilution_factor : numpy.ndarray
+        Estimated dilution factor of every estimated shell
+    w_epsilon : float
+        Dilution of the fallback radiation field
+    shell_ids : numpy.ndarray
+        Column of `j_blues` of every estimated shell
+    j_blues : numpy.ndarray
+        Output of shape (number of lines, number of shells), filled in place
+        at the columns `shell_ids`
+    """
+    for line_id in prange(len(line_nus)):
+        nu = line_nus[line_id]
+        for i in range(len(shell_ids)):
+            j_blue = j_blue_estimator[line_id, i] * j_blues_norm_factor[i]
+            if j_blue == 0.0:
+                j_blue = w_epsilon * (
+                    dilution_factor[i]
+                    * intensity_black_body(nu, temperature[i])
+                )
+            j_blues[line_id, shell_ids[i]] = j_blue
 
 
 class MCRadiationFieldPropertiesSolver:
@@ -95,17 +200,57 @@ class MCRadiationFieldPropertiesSolver:
         time_of_simulation,
         volume,
         line_list_nu,
+        j_blues=None,
+        shell_ids=None,
     ):
+        """
+        Calculate the mean intensities at the blue wings of the lines from
+        the Monte Carlo estimators.
+
+        Parameters
+        ----------
+        j_blue_estimator : numpy.ndarray
+            Estimator of shape (number of lines, number of estimated shells)
+        estimated_radfield_state : DilutePlanckianRadiationField
+            Estimated radiation field of the estimated shells
+        time_explosion : astropy.units.Quantity
+        time_of_simulation : astropy.units.Quantity
+        volume : numpy.ndarray
+            Volume of the estimated shells in cm3
+        line_list_nu : numpy.ndarray
+            Line frequencies in Hz
+        j_blues : numpy.ndarray, optional
+            Array of shape (number of lines, number of shells) filled in
+            place, by default a new array of the shape of the estimator
+        shell_ids : numpy.ndarray, optional
+            Column of `j_blues` of every estimated shell, by default all
+            columns in order
+
+        Returns
+        -------
+        numpy.ndarray
+            j_blues
+        """
         j_blues_norm_factor = (
             const.c.cgs
             * time_explosion
             / (4 * np.pi * time_of_simulation * volume)
         )
-        j_blues = j_blue_estimator * j_blues_norm_factor.cgs.value
-        planck_j_blues = estimated_radfield_state.calculate_mean_intensity(
-            line_list_nu
+        if j_blues is None:
+            j_blues = np.empty_like(j_blue_estimator)
+        if shell_ids is None:
+            shell_ids = np.arange(j_blue_estimator.shape[1])
+        calculate_estimated_j_blues(
+            j_blue_estimator,
+            np.broadcast_to(
+                j_blues_norm_factor.cgs.value, j_blue_estimator.shape[1:]
+            ),
+            np.asarray(line_list_nu, dtype=np.float64),
+            estimated_radfield_state.temperature_kelvin,
+            np.asarray(estimated_radfield_state.dilution_factor),
+            self.w_epsilon,
+            shell_ids,
+            j_blues,
         )
-        zero_j_blues = j_blues == 0.0
-        j_blues[zero_j_blues] = self.w_epsilon * planck_j_blues[zero_j_blues]
 
         return j_blues
@@ -10,6 +10,13 @@ from tardis.transport.montecarlo import (
     njit_dict_no_parallel,
 )
 from tardis.transport.montecarlo.configuration.constants import KB, H
+from tardis.transport.montecarlo.estimators.radfield_mc_estimators import (
+    BF_HEATING_FIELD,
+    PHOTO_ION_FIELD,
+    PHOTO_ION_STATISTICS_FIELD,
+    STIM_RECOMB_COOLING_FIELD,
+    STIM_RECOMB_FIELD,
+)
 
 
 @njit(**njit_dict_no_parallel)
@@ -48,7 +55,7 @@ def update_bound_free_estimators(
     comov_energy : float
     shell_id : int
     distance : float
-    numba_estimator : tardis.transport.montecarlo.numba_interface.Estimators
+    estimator_state : tardis.transport.montecarlo.estimators.radfield_mc_estimators.RadiationFieldMCEstimators
     t_electron : float
         Electron temperature in the current cell.
     x_sect_bfs : numpy.ndarray, dtype float
@@ -61,30 +68,27 @@ def update_bound_free_estimators(
     """
     # TODO: Add full relativity mode
     boltzmann_factor = exp(-(H * comov_nu) / (KB * t_electron))
+    # the records of all continua of the shell are contiguous
+    shell_estimators = estimator_state.bound_free_estimator[shell_id]
     for i, current_continuum in enumerate(current_continua):
         photo_ion_rate_estimator_increment = (
             comov_energy * distance * x_sect_bfs[i] / comov_nu
         )
-        estimator_state.photo_ion_estimator[
-            current_continuum, shell_id
-        ] += photo_ion_rate_estimator_increment
-        estimator_state.stim_recomb_estimator[current_continuum, shell_id] += (
-            photo_ion_rate_estimator_increment * boltzmann_factor
-        )
-        estimator_state.photo_ion_estimator_statistics[
-            current_continuum, shell_id
-        ] += 1
-
         nu_th = bf_threshold_list_nu[current_continuum]
         bf_heating_estimator_increment = (
             comov_energy * distance * x_sect_bfs[i] * (1 - nu_th / comov_nu)
         )
-        estimator_state.bf_heating_estimator[
-            current_continuum, shell_id
-        ] += bf_heating_estimator_increment
-        estimator_state.stim_recomb_cooling_estimator[
-            current_continuum, shell_id
-        ] += (bf_heating_estimator_increment * boltzmann_factor)
+
+        record = shell_estimators[current_continuum]
+        record[PHOTO_ION_FIELD] += photo_ion_rate_estimator_increment
+        record[STIM_RECOMB_FIELD] += (
+            photo_ion_rate_estimator_increment * boltzmann_factor
+        )
+        record[BF_HEATING_FIELD] += bf_heating_estimator_increment
+        record[STIM_RECOMB_COOLING_FIELD] += (
+            bf_heating_estimator_increment * boltzmann_factor
+        )
+        record[PHOTO_ION_STATISTICS_FIELD] += 1
 
 
 @njit(**njit_dict_no_parallel)
@@ -114,7 +118,7 @@ def update_line_estimators(
 
     radfield_mc_estimators.j_blue_estimator[
         cur_line_id, r_packet.current_shell_id
-    ] += (energy / r_packet.nu)
+    ] += energy / r_packet.nu
     radfield_mc_estimators.Edotlu_estimator[
         cur_line_id, r_packet.current_shell_id
     ] += energy
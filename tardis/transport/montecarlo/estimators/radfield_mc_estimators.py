@@ -1,9 +1,19 @@
 import numpy as np
-from numba import float64, int64
+from numba import float64
 from numba.experimental import jitclass
 from numba.typed import List
 
 
+# fields of a record of the interleaved bound-free estimator block, plain
+# integers so that numba can index with them
+PHOTO_ION_FIELD = 0
+STIM_RECOMB_FIELD = 1
+BF_HEATING_FIELD = 2
+STIM_RECOMB_COOLING_FIELD = 3
+PHOTO_ION_STATISTICS_FIELD = 4
+NUMBER_OF_BOUND_FREE_FIELDS = 5
+
+
 def initialize_estimator_statistics(tau_sobolev_shape, gamma_shape):
     """
     Initializes the estimators used in the Monte Carlo simulation.
@@ -13,7 +23,8 @@ def initialize_estimator_statistics(tau_sobolev_shape, gamma_shape):
     tau_sobolev_shape : tuple
         Shape of the array with the Sobolev optical depth.
     gamma_shape : tuple
-        Shape of the array with the photoionization rate coefficients.
+        Shape of the array with the photoionization rate coefficients,
+        (number of continua, number of shells).
 
     Returns
     -------
@@ -32,24 +43,16 @@ def initialize_estimator_statistics(tau_sobolev_shape, gamma_shape):
     j_blue_estimator = np.zeros(tau_sobolev_shape)
     Edotlu_estimator = np.zeros(tau_sobolev_shape)
 
-    photo_ion_estimator = np.zeros(gamma_shape, dtype=np.float64)
-    stim_recomb_estimator = np.zeros(gamma_shape, dtype=np.float64)
-    stim_recomb_cooling_estimator = np.zeros(gamma_shape, dtype=np.float64)
-    bf_heating_estimator = np.zeros(gamma_shape, dtype=np.float64)
-
-    stim_recomb_cooling_estimator = np.zeros(gamma_shape, dtype=np.float64)
-
-    photo_ion_estimator_statistics = np.zeros(gamma_shape, dtype=np.int64)
+    bound_free_estimator = np.zeros(
+        (gamma_shape[1], gamma_shape[0], NUMBER_OF_BOUND_FREE_FIELDS),
+        dtype=np.float64,
+    )
     return RadiationFieldMCEstimators(
         j_estimator,
         nu_bar_estimator,
         j_blue_estimator,
         Edotlu_estimator,
-        photo_ion_estimator,
-        stim_recomb_estimator,
-        bf_heating_estimator,
-        stim_recomb_cooling_estimator,
-        photo_ion_estimator_statistics,
+        bound_free_estimator,
     )
 
 
@@ -60,12 +63,10 @@ base_estimators_spec = [
     ("Edotlu_estimator", float64[:, :]),
 ]
 
+# one contiguous record of all bound-free estimators per shell and continuum,
+# indexed [shell, continuum, field]
 continuum_estimators_spec = [
-    ("photo_ion_estimator", float64[:, :]),
-    ("stim_recomb_estimator", float64[:, :]),
-    ("bf_heating_estimator", float64[:, :]),
-    ("stim_recomb_cooling_estimator", float64[:, :]),
-    ("photo_ion_estimator_statistics", int64[:, :]),
+    ("bound_free_estimator", float64[:, :, ::1]),
 ]
 
 
@@ -77,21 +78,37 @@ class RadiationFieldMCEstimators:
         nu_bar_estimator,
         j_blue_estimator,
         Edotlu_estimator,
-        photo_ion_estimator,
-        stim_recomb_estimator,
-        bf_heating_estimator,
-        stim_recomb_cooling_estimator,
-        photo_ion_estimator_statistics,
+        bound_free_estimator,
     ):
         self.j_estimator = j_estimator
         self.nu_bar_estimator = nu_bar_estimator
         self.j_blue_estimator = j_blue_estimator
         self.Edotlu_estimator = Edotlu_estimator
-        self.photo_ion_estimator = photo_ion_estimator
-        self.stim_recomb_estimator = stim_recomb_estimator
-        self.bf_heating_estimator = bf_heating_estimator
-        self.stim_recomb_cooling_estimator = stim_recomb_cooling_estimator
-        self.photo_ion_estimator_statistics = photo_ion_estimator_statistics
+        self.bound_free_estimator = bound_free_estimator
+
+    # the bound-free estimators in the [continuum, shell] layout of the plasma
+
+    @property
+    def photo_ion_estimator(self):
+        return self.bound_free_estimator[:, :, PHOTO_ION_FIELD].T
+
+    @property
+    def stim_recomb_estimator(self):
+        return self.bound_free_estimator[:, :, STIM_RECOMB_FIELD].T
+
+    @property
+    def bf_heating_estimator(self):
+        return self.bound_free_estimator[:, :, BF_HEATING_FIELD].T
+
+    @property
+    def stim_recomb_cooling_estimator(self):
+        return self.bound_free_estimator[:, :, STIM_RECOMB_COOLING_FIELD].T
+
+    @property
+    def photo_ion_estimator_statistics(self):
+        return self.bound_free_estimator[
+            :, :, PHOTO_ION_STATISTICS_FIELD
+        ].T.astype(np.int64)
 
     def increment(self, other):
         """
@@ -110,15 +127,7 @@ class RadiationFieldMCEstimators:
         self.nu_bar_estimator += other.nu_bar_estimator
         self.j_blue_estimator += other.j_blue_estimator
         self.Edotlu_estimator += other.Edotlu_estimator
-        self.photo_ion_estimator += other.photo_ion_estimator
-        self.stim_recomb_estimator += other.stim_recomb_estimator
-        self.bf_heating_estimator += other.bf_heating_estimator
-        self.stim_recomb_cooling_estimator += (
-            other.stim_recomb_cooling_estimator
-        )
-        self.photo_ion_estimator_statistics += (
-            other.photo_ion_estimator_statistics
-        )
+        self.bound_free_estimator += other.bound_free_estimator
 
     def create_estimator_list(self, number):
         estimator_list = List()
@@ -130,11 +139,7 @@ class RadiationFieldMCEstimators:
                     np.copy(self.nu_bar_estimator),
                     np.copy(self.j_blue_estimator),
                     np.copy(self.Edotlu_estimator),
-                    np.copy(self.photo_ion_estimator),
-                    np.copy(self.stim_recomb_estimator),
-                    np.copy(self.bf_heating_estimator),
-                    np.copy(self.stim_recomb_cooling_estimator),
-                    np.copy(self.photo_ion_estimator_statistics),
+                    np.copy(self.bound_free_estimator),
                 )
             )
         return estimator_list
@@ -0,0 +1,24 @@
+import numpy as np
+import numpy.testing as npt
+
+from tardis.transport.montecarlo.estimators.util import (
+    BlockIntegrationOperator,
+    integrate_array_by_blocks,
+)
+
+
+def test_integration_operator_matches_integrate_array_by_blocks():
+    rng = np.random.default_rng(2024)
+    block_sizes = rng.integers(1, 30, size=25)
+    block_references = np.pad(block_sizes.cumsum(), [1, 0])
+    x = np.concatenate(
+        [np.sort(rng.uniform(1.0, 10.0, size)) for size in block_sizes]
+    )
+    f = rng.uniform(size=(len(x), 6))
+
+    operator = BlockIntegrationOperator(x, block_references)
+    expected = integrate_array_by_blocks(f, x, block_references)
+
+    npt.assert_array_equal(operator.integrate(f), expected)
+    npt.assert_array_equal(operator @ f[:, 2], expected[:, 2])
+    npt.assert_allclose(operator.to_sparse() @ f, expected, rtol=1e-13)
@@ -0,0 +1,58 @@
+import astropy.units as u
+import numpy as np
+import numpy.testing as npt
+
+from tardis import constants as const
+from tardis.plasma.radiation_field import DilutePlanckianRadiationField
+from tardis.transport.montecarlo.estimators.mc_rad_field_solver import (
+    MCRadiationFieldPropertiesSolver,
+    calculate_planck_j_blues,
+)
+
+
+def test_estimate_jblues_in_place():
+    rng = np.random.default_rng(1054)
+    line_nus = 10 ** rng.uniform(13.5, 16.0, 500)
+    j_blue_estimator = rng.uniform(0.0, 1e-10, (len(line_nus), 6))
+    j_blue_estimator[rng.uniform(size=j_blue_estimator.shape) < 0.3] = 0.0
+    radiation_field = DilutePlanckianRadiationField(
+        rng.uniform(5000.0, 15000.0, 6) * u.K, rng.uniform(0.05, 0.5, 6)
+    )
+    volume = rng.uniform(1e40, 1e42, 6)
+    solver = MCRadiationFieldPropertiesSolver(w_epsilon=1e-10)
+
+    j_blues = solver.estimate_jblues(
+        j_blue_estimator, radiation_field, 1e6 * u.s, 1.0 * u.s, volume, line_nus
+    )
+
+    planck_j_blues = radiation_field.calculate_mean_intensity(line_nus)
+    expected = j_blue_estimator * (
+        const.c.cgs * 1e6 * u.s / (4 * np.pi * 1.0 * u.s * volume)
+    ).cgs.value
+    zero_j_blues = expected == 0.0
+    expected[zero_j_blues] = 1e-10 * planck_j_blues[zero_j_blues]
+    npt.assert_array_equal(j_blues, expected)
+
+    # the estimated shells are written to the given columns only
+    shell_ids = np.array([1, 2, 3, 5, 6, 7])
+    buffer = np.full((len(line_nus), 9), -1.0)
+    solver.estimate_jblues(
+        j_blue_estimator,
+        radiation_field,
+        1e6 * u.s,
+        1.0 * u.s,
+        volume,
+        line_nus,
+        j_blues=buffer,
+        shell_ids=shell_ids,
+    )
+    npt.assert_array_equal(buffer[:, shell_ids], expected)
+    npt.assert_array_equal(buffer[:, [0, 4, 8]], -1.0)
+
+    calculate_planck_j_blues(
+        line_nus,
+        radiation_field.temperature_kelvin,
+        radiation_field.dilution_factor,
+        j_blues,
+    )
+    npt.assert_array_equal(j_blues, planck_j_blues)
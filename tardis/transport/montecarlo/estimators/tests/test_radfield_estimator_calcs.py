@@ -0,0 +1,108 @@
+import numpy as np
+import numpy.testing as npt
+import pandas as pd
+import pandas.testing as pdt
+
+from tardis.transport.montecarlo.configuration.constants import KB, H
+from tardis.transport.montecarlo.estimators.radfield_estimator_calcs import (
+    update_bound_free_estimators,
+)
+from tardis.transport.montecarlo.estimators.radfield_mc_estimators import (
+    NUMBER_OF_BOUND_FREE_FIELDS,
+    PHOTO_ION_FIELD,
+    initialize_estimator_statistics,
+)
+from tardis.transport.montecarlo.estimators.util import (
+    bound_free_estimator_array2frame,
+)
+
+
+def test_update_bound_free_estimators():
+    rng = np.random.default_rng(4620)
+    no_of_continua, no_of_shells = 6, 3
+    bf_threshold_list_nu = np.sort(rng.uniform(1e14, 1e15, no_of_continua))[
+        ::-1
+    ]
+    estimators = initialize_estimator_statistics(
+        (10, no_of_shells), (no_of_continua, no_of_shells)
+    )
+
+    photo_ion = np.zeros((no_of_continua, no_of_shells))
+    bf_heating = np.zeros((no_of_continua, no_of_shells))
+    stim_factor = np.zeros((no_of_continua, no_of_shells))
+    statistics = np.zeros((no_of_continua, no_of_shells), dtype=np.int64)
+    for _ in range(20):
+        comov_nu = rng.uniform(1e15, 2e15)
+        comov_energy, distance = rng.uniform(0.5, 1.0), rng.uniform(1e12, 1e13)
+        shell_id = rng.integers(no_of_shells)
+        t_electron = rng.uniform(5000.0, 15000.0)
+        current_continua = np.sort(
+            rng.choice(
+                no_of_continua, rng.integers(1, no_of_continua), replace=False
+            )
+        )
+        x_sect_bfs = rng.uniform(1e-18, 1e-17, len(current_continua))
+        update_bound_free_estimators(
+            comov_nu,
+            comov_energy,
+            shell_id,
+            distance,
+            estimators,
+            t_electron,
+            x_sect_bfs,
+            current_continua,
+            bf_threshold_list_nu,
+        )
+
+        increment = comov_energy * distance * x_sect_bfs
+        boltzmann_factor = np.exp(-(H * comov_nu) / (KB * t_electron))
+        np.add.at(photo_ion[:, shell_id], current_continua, increment / comov_nu)
+        np.add.at(
+            bf_heating[:, shell_id],
+            current_continua,
+            increment * (1 - bf_threshold_list_nu[current_continua] / comov_nu),
+        )
+        np.add.at(stim_factor[:, shell_id], current_continua, boltzmann_factor)
+        np.add.at(statistics[:, shell_id], current_continua, 1)
+
+    assert estimators.bound_free_estimator.shape == (
+        no_of_shells,
+        no_of_continua,
+        NUMBER_OF_BOUND_FREE_FIELDS,
+    )
+    npt.assert_allclose(estimators.photo_ion_estimator, photo_ion, rtol=1e-14)
+    npt.assert_allclose(estimators.bf_heating_estimator, bf_heating, rtol=1e-14)
+    npt.assert_array_equal(estimators.photo_ion_estimator_statistics, statistics)
+    # a single increment per entry recovers the Boltzmann factor
+    single = statistics == 1
+    npt.assert_allclose(
+        estimators.stim_recomb_estimator[single],
+        photo_ion[single] * stim_factor[single],
+        rtol=1e-14,
+    )
+    npt.assert_allclose(
+        estimators.stim_recomb_cooling_estimator[single],
+        bf_heating[single] * stim_factor[single],
+        rtol=1e-14,
+    )
+
+    level2continuum_idx = pd.Series(
+        np.arange(no_of_continua),
+        index=pd.MultiIndex.from_arrays(
+            [
+                np.full(no_of_continua, 1),
+                np.zeros(no_of_continua, dtype=int),
+                np.arange(no_of_continua)[::-1],
+            ],
+            names=["atomic_number", "ion_number", "level_number"],
+        ),
+    )
+    pdt.assert_frame_equal(
+        bound_free_estimator_array2frame(
+            estimators.bound_free_estimator,
+            level2continuum_idx,
+            field=PHOTO_ION_FIELD,
+        ),
+        bound_free_estimator_array2frame(photo_ion, level2continuum_idx),
+        rtol=1e-14,
+    )
@@ -1,12 +1,13 @@
 import numpy as np
 import pandas as pd
 from numba import njit, prange
+from scipy.sparse import coo_matrix
 
 from tardis.transport.montecarlo import njit_dict
 from tardis.configuration.sorting_globals import SORTING_ALGORITHM
 
 def bound_free_estimator_array2frame(
-    bound_free_estimator_array, level2continuum_idx
+    bound_free_estimator_array, level2continuum_idx, field=None
 ):
     """
     Transform a bound-free estimator array to a DataFrame.
@@ -19,16 +20,22 @@ def bound_free_estimator_array2frame(
     bf_estimator_array : numpy.ndarray, dtype float
         Array of bound-free estimators (e.g., for the stimulated recombination rate)
         with entries sorted by the threshold frequency of the bound-free continuum.
+        Either indexed [continuum, shell], or the interleaved estimator block
+        indexed [shell, continuum, field] if `field` is given.
     level2continuum_idx : pandas.Series, dtype int
         Maps a level MultiIndex (atomic_number, ion_number, level_number) to
         the continuum_idx of the corresponding bound-free continuum (which are
         sorted by decreasing frequency).
+    field : int, optional
+        Field of the interleaved estimator block to transform.
 
     Returns
     -------
     pandas.DataFrame, dtype float
         Bound-free estimators indexed by (atomic_number, ion_number, level_number).
     """
+    if field is not None:
+        bound_free_estimator_array = bound_free_estimator_array[:, :, field].T
     bf_estimator_frame = pd.DataFrame(
         bound_free_estimator_array, index=level2continuum_idx.index
     ).sort_index(kind=SORTING_ALGORITHM)
@@ -65,3 +72,94 @@ def integrate_array_by_blocks(f, x, block_references):
             stop = block_references[j + 1]
             integrated[j, i] = np.trapz(f[start:stop, i], x[start:stop])
     return integrated
+
+
+class BlockIntegrationOperator:
+    """
+    Precomputed trapezoidal quadrature over blocks of sample points.
+
+    Applying the operator to an array `f` sampled at `x` gives the same
+    result as ``integrate_array_by_blocks(f, x, block_references)``. The
+    interval widths and the sparse matrix summing the intervals of every
+    block are computed once, so each integration reduces to elementwise
+    operations on the whole array and one sparse matrix product.
+
+    Parameters
+    ----------
+    x : numpy.ndarray, dtype float
+        1D array with the sample points.
+    block_references : numpy.ndarray, dtype int
+        1D array with the start indices of the blocks to be integrated.
+    """
+
+    def __init__(self, x, block_references):
+        x = np.asarray(x, dtype=np.float64)
+        block_references = np.asarray(block_references, dtype=np.int64)
+        number_of_blocks = len(block_references) - 1
+        left = np.arange(len(x) - 1)
+        # block of the left sample point of each interval, intervals
+        # crossing into the next block do not contribute
+        interval_block = (
+            np.searchsorted(block_references, left, side="right") - 1
+        )
+        valid = (interval_block >= 0) & (interval_block < number_of_blocks)
+        valid[valid] &= (
+            left[valid] + 1 < block_references[interval_block[valid] + 1]
+        )
+
+        # all intervals are evaluated with slices, the block sum only picks
+        # the ones inside a block
+        self.width = np.diff(x)
+        self.shape = (number_of_blocks, len(x))
+        self.block_sum = coo_matrix(
+            (
+                np.ones(valid.sum()),
+                (interval_block[valid], left[valid]),
+            ),
+            shape=(number_of_blocks, len(left)),
+        ).tocsr()
+
+    def integrate(self, f):
+        """
+        Integrate over each block.
+
+        Parameters
+        ----------
+        f : numpy.ndarray, dtype float
+            1D or 2D array sampled at `x` along the first axis.
+
+        Returns
+        -------
+        numpy.ndarray, dtype float
+            Integrated values, one row per block.
+        """
+        f = np.asarray(f)
+        width = self.width if f.ndim == 1 else self.width[:, np.newaxis]
+        interval_average = (f[1:] + f[:-1]) / 2.0
+        return self.block_sum @ (width * interval_average)
+
+    __matmul__ = integrate
+
+    def to_sparse(self):
+        """
+        Quadrature weights as a single sparse matrix.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            Matrix of shape (n_blocks, len(x)) whose product with `f` agrees
+            with `integrate` up to floating point round-off.
+        """
+        half_width = 0.5 * self.width
+        interval_index = np.arange(len(self.width))
+        interval_weights = coo_matrix(
+            (
+                np.concatenate((half_width, half_width)),
+                (
+                    np.concatenate((interval_index, interval_index)),
+                    np.concatenate((interval_index, interval_index + 1)),
+                ),
+            ),
+            shape=(len(self.width), self.shape[1]),
+        )
+        return (self.block_sum @ interval_weights).tocsr()
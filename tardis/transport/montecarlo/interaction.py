@@ -148,6 +148,7 @@ def continuum_event(
     chi_bf_contributions,
     current_continua,
     enable_full_relativity,
+    transport_profile=None,
 ):
     """
     continuum event handler - activate the macroatom and run the handler
@@ -158,6 +159,8 @@ def continuum_event(
     time_explosion : float
     opacity_state : tardis.transport.montecarlo.numba_interface.OpacityState
     continuum : tardis.transport.montecarlo.numba_interface.Continuum
+    transport_profile : numpy.ndarray, optional
+        Counters of the thread, compiled out if not given
     """
     old_doppler_factor = get_doppler_factor(
         r_packet.r, r_packet.mu, time_explosion, enable_full_relativity
@@ -189,6 +192,7 @@ def continuum_event(
         time_explosion,
         opacity_state,
         enable_full_relativity,
+        transport_profile,
     )
 
 
@@ -199,6 +203,7 @@ def macro_atom_event(
     time_explosion,
     opacity_state,
     enable_full_relativity,
+    transport_profile=None,
 ):
     """
     Macroatom event handler - run the macroatom and handle the result
@@ -209,9 +214,14 @@ def macro_atom_event(
     r_packet : tardis.transport.montecarlo.r_packet.RPacket
     time_explosion : float
     opacity_state : tardis.transport.montecarlo.numba_interface.OpacityState
+    transport_profile : numpy.ndarray, optional
+        Counters of the thread, compiled out if not given
     """
     transition_id, transition_type = macro_atom_interaction(
-        destination_level_idx, r_packet.current_shell_id, opacity_state
+        destination_level_idx,
+        r_packet.current_shell_id,
+        opacity_state,
+        transport_profile,
     )
 
     if (
@@ -431,6 +441,7 @@ def line_scatter(
     line_interaction_type,
     opacity_state,
     enable_full_relativity,
+    transport_profile=None,
 ):
     """
     Line scatter function that handles the scattering itself, including new angle drawn, and calculating nu out using macro atom
@@ -441,6 +452,8 @@ def line_scatter(
     time_explosion : float
     line_interaction_type : enum
     opacity_state : tardis.transport.montecarlo.numba_interface.OpacityState
+    transport_profile : numpy.ndarray, optional
+        Counters of the thread, compiled out if not given
     """
     old_doppler_factor = get_doppler_factor(
         r_packet.r, r_packet.mu, time_explosion, enable_full_relativity
@@ -474,6 +487,7 @@ def line_scatter(
             time_explosion,
             opacity_state,
             enable_full_relativity,
+            transport_profile,
         )
 
 
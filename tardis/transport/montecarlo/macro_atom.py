@@ -4,6 +4,9 @@ import numpy as np
 from numba import njit
 
 from tardis.transport.montecarlo import njit_dict_no_parallel
+from tardis.transport.montecarlo.transport_profile import (
+    MACRO_ATOM_JUMPS,
+)
 
 
 class MacroAtomError(ValueError):
@@ -22,7 +25,12 @@ class MacroAtomTransitionType(IntEnum):
 
 
 @njit(**njit_dict_no_parallel)
-def macro_atom_interaction(activation_level_id, current_shell_id, opacity_state):
+def macro_atom_interaction(
+    activation_level_id,
+    current_shell_id,
+    opacity_state,
+    transport_profile=None,
+):
     """
     Parameters
     ----------
@@ -30,12 +38,16 @@ def macro_atom_interaction(activation_level_id, current_shell_id, opacity_state)
         Activation level idx of the macro atom.
     current_shell_id : int
     opacity_state : tardis.transport.montecarlo.numba_interface.opacity_state.OpacityState
+    transport_profile : numpy.ndarray, optional
+        Counters of the thread, compiled out if not given
 
     Returns
     -------
     """
     current_transition_type = 0
     while current_transition_type >= 0:
+        if transport_profile is not None:
+            transport_profile[MACRO_ATOM_JUMPS] += 1
         probability = 0.0
         probability_event = np.random.random()
 
@@ -1,5 +1,6 @@
 import numpy as np
-from numba import njit, objmode, prange
+from numba import njit, objmode, prange, types
+from numba.extending import overload
 from numba.np.ufunc.parallel import get_num_threads, get_thread_id
 from numba.typed import List
 
@@ -15,9 +16,8 @@ from tardis.transport.montecarlo.estimators.radfield_mc_estimators import (
 )
 from tardis.transport.montecarlo.packets.packet_collections import (
     PacketCollection,
-    VPacketCollection,
-    consolidate_vpacket_tracker,
-    initialize_last_interaction_tracker,
+    consolidate_vpacket_storage,
+    initialize_vpacket_storage,
 )
 from tardis.transport.montecarlo.packets.radiative_packet import (
     PacketStatus,
@@ -29,6 +29,72 @@ from tardis.transport.montecarlo.single_packet_loop import (
 )
 
 
+def vpacket_storage_or_default(
+    vpacket_storage,
+    no_of_packets,
+    spectrum_frequency_grid,
+    montecarlo_configuration,
+    number_of_vpackets,
+):
+    """
+    Return the given virtual packet storage or allocate the default storage
+    of initialize_vpacket_storage if it is None.
+
+    The choice is made when numba types the call, the compact and default
+    storage types can not be unified in a branch of the main loop.
+    """
+    if vpacket_storage is not None:
+        return vpacket_storage
+    return initialize_vpacket_storage(
+        no_of_packets,
+        spectrum_frequency_grid,
+        montecarlo_configuration.VPACKET_SPAWN_START_FREQUENCY,
+        montecarlo_configuration.VPACKET_SPAWN_END_FREQUENCY,
+        number_of_vpackets,
+        montecarlo_configuration.TEMPORARY_V_PACKET_BINS,
+    )
+
+
+@overload(vpacket_storage_or_default)
+def ol_vpacket_storage_or_default(
+    vpacket_storage,
+    no_of_packets,
+    spectrum_frequency_grid,
+    montecarlo_configuration,
+    number_of_vpackets,
+):
+    if isinstance(vpacket_storage, (types.NoneType, types.Omitted)):
+
+        def default_storage_impl(
+            vpacket_storage,
+            no_of_packets,
+            spectrum_frequency_grid,
+            montecarlo_configuration,
+            number_of_vpackets,
+        ):
+            return initialize_vpacket_storage(
+                no_of_packets,
+                spectrum_frequency_grid,
+                montecarlo_configuration.VPACKET_SPAWN_START_FREQUENCY,
+                montecarlo_configuration.VPACKET_SPAWN_END_FREQUENCY,
+                number_of_vpackets,
+                montecarlo_configuration.TEMPORARY_V_PACKET_BINS,
+            )
+
+        return default_storage_impl
+
+    def given_storage_impl(
+        vpacket_storage,
+        no_of_packets,
+        spectrum_frequency_grid,
+        montecarlo_configuration,
+        number_of_vpackets,
+    ):
+        return vpacket_storage
+
+    return given_storage_impl
+
+
 @njit(**njit_dict)
 def montecarlo_main_loop(
     packet_collection: PacketCollection,
@@ -41,6 +107,8 @@ def montecarlo_main_loop(
     rpacket_trackers: List,
     number_of_vpackets: int,
     show_progress_bars: bool,
+    transport_profiles=None,
+    vpacket_storage=None,
 ):
     """
     Main loop of the Monte Carlo radiative transfer routine.
@@ -71,11 +139,23 @@ def montecarlo_main_loop(
     spectrum_frequency_grid : numpy.ndarray
         Frequency grid array for virtual packet spectrum calculation
     rpacket_trackers : numba.typed.List
-        List of packet trackers for detailed packet interaction logging
+        List of packet trackers for detailed packet interaction logging.
+        With montecarlo_globals.ENABLE_RPACKET_TRACKING set this holds one
+        RPacketEventLog per thread, otherwise one
+        RPacketLastInteractionTracker or RPacketTracker per packet
     number_of_vpackets : int
         Number of virtual packets to spawn per real packet interaction
     show_progress_bars : bool
         Flag to enable/disable progress bar updates during simulation
+    transport_profiles : numpy.ndarray, optional
+        Per-thread hot-path counters, see
+        tardis.transport.montecarlo.transport_profile. If None, the main
+        loop is compiled without the counters.
+    vpacket_storage : tuple, optional
+        Virtual packet collections, consolidated vpacket collection and last
+        interaction tracker from initialize_vpacket_storage or
+        initialize_compact_vpacket_storage, which set the storage types.
+        If None, the default storage of initialize_vpacket_storage is used.
 
     Returns
     -------
@@ -91,27 +171,21 @@ def montecarlo_main_loop(
     """
     no_of_packets = len(packet_collection.initial_nus)
 
-    last_interaction_tracker = initialize_last_interaction_tracker(
-        no_of_packets
+    (
+        vpacket_collections,
+        vpacket_tracker,
+        last_interaction_tracker,
+    ) = vpacket_storage_or_default(
+        vpacket_storage,
+        no_of_packets,
+        spectrum_frequency_grid,
+        montecarlo_configuration,
+        number_of_vpackets,
     )
 
     v_packets_energy_hist = np.zeros_like(spectrum_frequency_grid)
     delta_nu = spectrum_frequency_grid[1] - spectrum_frequency_grid[0]
 
-    # Pre-allocate a list of vpacket collections for later storage
-    vpacket_collections = List()
-    for i in range(no_of_packets):
-        vpacket_collections.append(
-            VPacketCollection(
-                i,
-                spectrum_frequency_grid,
-                montecarlo_configuration.VPACKET_SPAWN_START_FREQUENCY,
-                montecarlo_configuration.VPACKET_SPAWN_END_FREQUENCY,
-                number_of_vpackets,
-                montecarlo_configuration.TEMPORARY_V_PACKET_BINS,
-            )
-        )
-
     # Get the ID of the main thread and the number of threads
     main_thread_id = get_thread_id()
     n_threads = get_num_threads()
@@ -149,18 +223,37 @@ def montecarlo_main_loop(
         # Get the local v_packet_collection for this thread
         vpacket_collection = vpacket_collections[i]
         # RPacket Tracker for this thread
-        rpacket_tracker = rpacket_trackers[i]
-
-        loop = single_packet_loop(
-            r_packet,
-            geometry_state_numba,
-            time_explosion,
-            opacity_state_numba,
-            local_estimators,
-            vpacket_collection,
-            rpacket_tracker,
-            montecarlo_configuration,
-        )
+        if montecarlo_globals.ENABLE_RPACKET_TRACKING:
+            rpacket_tracker = rpacket_trackers[thread_id]
+        else:
+            rpacket_tracker = rpacket_trackers[i]
+
+        # Two calls, so that numba compiles the kernels without the
+        # counters if no transport profiles are given
+        if transport_profiles is None:
+            single_packet_loop(
+                r_packet,
+                geometry_state_numba,
+                time_explosion,
+                opacity_state_numba,
+                local_estimators,
+                vpacket_collection,
+                rpacket_tracker,
+                montecarlo_configuration,
+            )
+        else:
+            single_packet_loop(
+                r_packet,
+                geometry_state_numba,
+                time_explosion,
+                opacity_state_numba,
+                local_estimators,
+                vpacket_collection,
+                rpacket_tracker,
+                montecarlo_configuration,
+                transport_profiles[thread_id],
+            )
+        rpacket_tracker.end_packet(r_packet)
         packet_collection.output_nus[i] = r_packet.nu
 
         last_interaction_tracker.update_last_interaction(r_packet, i)
@@ -189,21 +282,7 @@ def montecarlo_main_loop(
         estimators.increment(sub_estimator)
 
     if montecarlo_configuration.ENABLE_VPACKET_TRACKING:
-        vpacket_tracker = consolidate_vpacket_tracker(
-            vpacket_collections,
-            spectrum_frequency_grid,
-            montecarlo_configuration.VPACKET_SPAWN_START_FREQUENCY,
-            montecarlo_configuration.VPACKET_SPAWN_END_FREQUENCY,
-        )
-    else:
-        vpacket_tracker = VPacketCollection(
-            -1,
-            spectrum_frequency_grid,
-            montecarlo_configuration.VPACKET_SPAWN_START_FREQUENCY,
-            montecarlo_configuration.VPACKET_SPAWN_END_FREQUENCY,
-            -1,
-            1,
-        )
+        consolidate_vpacket_storage(vpacket_collections, vpacket_tracker)
 
     if montecarlo_globals.ENABLE_RPACKET_TRACKING:
         for rpacket_tracker in rpacket_trackers:
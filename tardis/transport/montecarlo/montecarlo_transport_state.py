@@ -44,6 +44,7 @@ class MonteCarloTransportState(HDFWriterMixin):
     last_line_interaction_out_id = None
     last_line_interaction_in_id = None
     last_line_interaction_shell_id = None
+    transport_profile = None
 
     virt_logging = False
 
@@ -2,6 +2,7 @@ import numba as nb
 import numpy as np
 from numba import njit
 from numba.experimental import jitclass
+from numba.typed import List
 
 from tardis.transport.montecarlo import njit_dict_no_parallel
 from tardis.transport.montecarlo.packets.radiative_packet import InteractionType
@@ -369,6 +370,392 @@ class VPacketCollection:
         ]
 
 
+@njit(**njit_dict_no_parallel)
+def initialize_compact_last_interaction_tracker(no_of_packets):
+    last_line_interaction_in_ids = np.full(no_of_packets, -1, dtype=np.int32)
+    last_line_interaction_out_ids = np.full(no_of_packets, -1, dtype=np.int32)
+    last_line_interaction_shell_ids = np.full(no_of_packets, -1, dtype=np.int32)
+    last_interaction_types = np.full(
+        no_of_packets, NO_INTERACTION_INT, dtype=np.int8
+    )
+    last_interaction_in_nus = np.zeros(no_of_packets, dtype=np.float64)
+    last_interaction_in_rs = np.zeros(no_of_packets, dtype=np.float64)
+
+    return CompactLastInteractionTracker(
+        last_interaction_types,
+        last_interaction_in_nus,
+        last_interaction_in_rs,
+        last_line_interaction_in_ids,
+        last_line_interaction_out_ids,
+        last_line_interaction_shell_ids,
+    )
+
+
+@jitclass
+class CompactLastInteractionTracker:
+    """
+    LastInteractionTracker storing the interaction types as int8 and the
+    line and shell ids as int32.
+    """
+
+    types: nb.int8[:]  # type: ignore[misc]
+    in_nus: nb.float64[:]  # type: ignore[misc]
+    in_rs: nb.float64[:]  # type: ignore[misc]
+    in_ids: nb.int32[:]  # type: ignore[misc]
+    out_ids: nb.int32[:]  # type: ignore[misc]
+    shell_ids: nb.int32[:]  # type: ignore[misc]
+
+    def __init__(
+        self,
+        types: np.ndarray,
+        in_nus: np.ndarray,
+        in_rs: np.ndarray,
+        in_ids: np.ndarray,
+        out_ids: np.ndarray,
+        shell_ids: np.ndarray,
+    ) -> None:
+        """
+        Initialize compact last interaction tracker for Monte Carlo packets.
+
+        Parameters
+        ----------
+        types : numpy.ndarray
+            Types of last interactions (int8).
+        in_nus : numpy.ndarray
+            Incoming frequencies of last interactions [Hz].
+        in_rs : numpy.ndarray
+            Radii of last interactions [cm].
+        in_ids : numpy.ndarray
+            Input line IDs for last interactions (int32).
+        out_ids : numpy.ndarray
+            Output line IDs for last interactions (int32).
+        shell_ids : numpy.ndarray
+            Shell IDs where last interactions occurred (int32).
+        """
+        self.types = types
+        self.in_nus = in_nus
+        self.in_rs = in_rs
+        self.in_ids = in_ids
+        self.out_ids = out_ids
+        self.shell_ids = shell_ids
+
+    def update_last_interaction(self, r_packet, i: int) -> None:
+        """
+        Update the last interaction information for a packet.
+
+        Parameters
+        ----------
+        r_packet : RPacket
+            The R-packet with interaction information.
+        i : int
+            Index of the packet to update.
+        """
+        self.types[i] = r_packet.last_interaction_type
+        self.in_nus[i] = r_packet.last_interaction_in_nu
+        self.in_rs[i] = r_packet.last_interaction_in_r
+        self.in_ids[i] = r_packet.last_line_interaction_in_id
+        self.out_ids[i] = r_packet.last_line_interaction_out_id
+        self.shell_ids[i] = r_packet.last_line_interaction_shell_id
+
+
+@njit(**njit_dict_no_parallel)
+def _grow_array(array, length):
+    grown_array = np.empty(length, dtype=array.dtype)
+    grown_array[: len(array)] = array
+    return grown_array
+
+
+@jitclass
+class CompactVPacketCollection:
+    """
+    VPacketCollection storing the last interaction types as int8 and the
+    last interaction line and shell ids as int32.
+    """
+
+    source_rpacket_index: nb.int64  # type: ignore[misc]
+    spectrum_frequency_grid: nb.float64[:]  # type: ignore[misc]
+    v_packet_spawn_start_frequency: nb.float64  # type: ignore[misc]
+    v_packet_spawn_end_frequency: nb.float64  # type: ignore[misc]
+    nus: nb.float64[:]  # type: ignore[misc]
+    energies: nb.float64[:]  # type: ignore[misc]
+    initial_mus: nb.float64[:]  # type: ignore[misc]
+    initial_rs: nb.float64[:]  # type: ignore[misc]
+    idx: nb.int64  # type: ignore[misc]
+    number_of_vpackets: nb.int64  # type: ignore[misc]
+    length: nb.int64  # type: ignore[misc]
+    last_interaction_in_nu: nb.float64[:]  # type: ignore[misc]
+    last_interaction_in_r: nb.float64[:]  # type: ignore[misc]
+    last_interaction_type: nb.int8[:]  # type: ignore[misc]
+    last_interaction_in_id: nb.int32[:]  # type: ignore[misc]
+    last_interaction_out_id: nb.int32[:]  # type: ignore[misc]
+    last_interaction_shell_id: nb.int32[:]  # type: ignore[misc]
+
+    def __init__(
+        self,
+        source_rpacket_index: int,
+        spectrum_frequency_grid: np.ndarray,
+        v_packet_spawn_start_frequency: float,
+        v_packet_spawn_end_frequency: float,
+        number_of_vpackets: int,
+        temporary_v_packet_bins: int,
+    ) -> None:
+        """
+        Initialize compact virtual packet collection for Monte Carlo transport.
+
+        Parameters
+        ----------
+        source_rpacket_index : int
+            Index of the source R-packet.
+        spectrum_frequency_grid : numpy.ndarray
+            Frequency grid for spectrum calculation [Hz].
+        v_packet_spawn_start_frequency : float
+            Start frequency for virtual packet spawning [Hz].
+        v_packet_spawn_end_frequency : float
+            End frequency for virtual packet spawning [Hz].
+        number_of_vpackets : int
+            Number of virtual packets to generate.
+        temporary_v_packet_bins : int
+            Initial size of temporary storage arrays.
+        """
+        self.spectrum_frequency_grid = spectrum_frequency_grid
+        self.v_packet_spawn_start_frequency = v_packet_spawn_start_frequency
+        self.v_packet_spawn_end_frequency = v_packet_spawn_end_frequency
+        self.nus = np.empty(temporary_v_packet_bins, dtype=np.float64)
+        self.energies = np.empty(temporary_v_packet_bins, dtype=np.float64)
+        self.initial_mus = np.empty(temporary_v_packet_bins, dtype=np.float64)
+        self.initial_rs = np.empty(temporary_v_packet_bins, dtype=np.float64)
+        self.number_of_vpackets = number_of_vpackets
+        self.last_interaction_in_nu = np.zeros(
+            temporary_v_packet_bins, dtype=np.float64
+        )
+        self.last_interaction_in_r = np.zeros(
+            temporary_v_packet_bins, dtype=np.float64
+        )
+        self.last_interaction_type = np.full(
+            temporary_v_packet_bins, NO_INTERACTION_INT, dtype=np.int8
+        )
+        self.last_interaction_in_id = np.full(
+            temporary_v_packet_bins, -1, dtype=np.int32
+        )
+        self.last_interaction_out_id = np.full(
+            temporary_v_packet_bins, -1, dtype=np.int32
+        )
+        self.last_interaction_shell_id = np.full(
+            temporary_v_packet_bins, -1, dtype=np.int32
+        )
+        self.idx = 0
+        self.source_rpacket_index = source_rpacket_index
+        self.length = temporary_v_packet_bins
+
+    def add_packet(
+        self,
+        nu: float,
+        energy: float,
+        initial_mu: float,
+        initial_r: float,
+        last_interaction_in_nu: float,
+        last_interaction_in_r: float,
+        last_interaction_type: int,
+        last_interaction_in_id: int,
+        last_interaction_out_id: int,
+        last_interaction_shell_id: int,
+    ) -> None:
+        """
+        Add a packet to the vpacket collection and potentially resizing the arrays.
+
+        Parameters
+        ----------
+        nu : float
+            Frequency of the packet.
+        energy : float
+            Energy of the packet.
+        initial_mu : float
+            Initial mu of the packet.
+        initial_r : float
+            Initial r of the packet.
+        last_interaction_in_nu : float
+            Frequency of the last interaction of the packet.
+        last_interaction_in_r : float
+            Radius of the last interaction of the packet.
+        last_interaction_type : int
+            Type of the last interaction of the packet.
+        last_interaction_in_id : int
+            ID of the last interaction in the packet.
+        last_interaction_out_id : int
+            ID of the last interaction out of the packet.
+        last_interaction_shell_id : int
+            ID of the last interaction shell of the packet.
+
+        Returns
+        -------
+        None
+
+        """
+        if self.idx >= self.length:
+            temp_length = self.length * 2 + self.number_of_vpackets
+            self.nus = _grow_array(self.nus, temp_length)
+            self.energies = _grow_array(self.energies, temp_length)
+            self.initial_mus = _grow_array(self.initial_mus, temp_length)
+            self.initial_rs = _grow_array(self.initial_rs, temp_length)
+            self.last_interaction_in_nu = _grow_array(
+                self.last_interaction_in_nu, temp_length
+            )
+            self.last_interaction_in_r = _grow_array(
+                self.last_interaction_in_r, temp_length
+            )
+            self.last_interaction_type = _grow_array(
+                self.last_interaction_type, temp_length
+            )
+            self.last_interaction_in_id = _grow_array(
+                self.last_interaction_in_id, temp_length
+            )
+            self.last_interaction_out_id = _grow_array(
+                self.last_interaction_out_id, temp_length
+            )
+            self.last_interaction_shell_id = _grow_array(
+                self.last_interaction_shell_id, temp_length
+            )
+            self.length = temp_length
+
+        self.nus[self.idx] = nu
+        self.energies[self.idx] = energy
+        self.initial_mus[self.idx] = initial_mu
+        self.initial_rs[self.idx] = initial_r
+        self.last_interaction_in_nu[self.idx] = last_interaction_in_nu
+        self.last_interaction_in_r[self.idx] = last_interaction_in_r
+        self.last_interaction_type[self.idx] = last_interaction_type
+        self.last_interaction_in_id[self.idx] = last_interaction_in_id
+        self.last_interaction_out_id[self.idx] = last_interaction_out_id
+        self.last_interaction_shell_id[self.idx] = last_interaction_shell_id
+        self.idx += 1
+
+    def finalize_arrays(self) -> None:
+        """
+        Finalize the arrays by truncating them based on the current index.
+
+        Returns
+        -------
+        None
+
+        """
+        self.nus = self.nus[: self.idx]
+        self.energies = self.energies[: self.idx]
+        self.initial_mus = self.initial_mus[: self.idx]
+        self.initial_rs = self.initial_rs[: self.idx]
+        self.last_interaction_in_nu = self.last_interaction_in_nu[: self.idx]
+        self.last_interaction_in_r = self.last_interaction_in_r[: self.idx]
+        self.last_interaction_type = self.last_interaction_type[: self.idx]
+        self.last_interaction_in_id = self.last_interaction_in_id[: self.idx]
+        self.last_interaction_out_id = self.last_interaction_out_id[: self.idx]
+        self.last_interaction_shell_id = self.last_interaction_shell_id[
+            : self.idx
+        ]
+
+
+@njit(**njit_dict_no_parallel)
+def initialize_vpacket_storage(
+    no_of_packets,
+    spectrum_frequency_grid,
+    v_packet_spawn_start_frequency,
+    v_packet_spawn_end_frequency,
+    number_of_vpackets,
+    temporary_v_packet_bins,
+):
+    """
+    Parameters
+    ----------
+    no_of_packets : The count of RPackets that are sent in the ejecta
+    spectrum_frequency_grid : Frequency grid for spectrum calculation [Hz]
+    v_packet_spawn_start_frequency : Start frequency for virtual packet spawning [Hz]
+    v_packet_spawn_end_frequency : End frequency for virtual packet spawning [Hz]
+    number_of_vpackets : Number of virtual packets to generate
+    temporary_v_packet_bins : Initial size of the storage arrays
+
+    Returns
+    -------
+    A tuple of a list containing a VPacketCollection for each RPacket, an
+    empty VPacketCollection for the consolidated virtual packets and a
+    LastInteractionTracker for all RPackets
+    """
+    vpacket_collections = List()
+    for i in range(no_of_packets):
+        vpacket_collections.append(
+            VPacketCollection(
+                i,
+                spectrum_frequency_grid,
+                v_packet_spawn_start_frequency,
+                v_packet_spawn_end_frequency,
+                number_of_vpackets,
+                temporary_v_packet_bins,
+            )
+        )
+    vpacket_tracker = VPacketCollection(
+        -1,
+        spectrum_frequency_grid,
+        v_packet_spawn_start_frequency,
+        v_packet_spawn_end_frequency,
+        -1,
+        1,
+    )
+    return (
+        vpacket_collections,
+        vpacket_tracker,
+        initialize_last_interaction_tracker(no_of_packets),
+    )
+
+
+@njit(**njit_dict_no_parallel)
+def initialize_compact_vpacket_storage(
+    no_of_packets,
+    spectrum_frequency_grid,
+    v_packet_spawn_start_frequency,
+    v_packet_spawn_end_frequency,
+    number_of_vpackets,
+    temporary_v_packet_bins,
+):
+    """
+    Parameters
+    ----------
+    no_of_packets : The count of RPackets that are sent in the ejecta
+    spectrum_frequency_grid : Frequency grid for spectrum calculation [Hz]
+    v_packet_spawn_start_frequency : Start frequency for virtual packet spawning [Hz]
+    v_packet_spawn_end_frequency : End frequency for virtual packet spawning [Hz]
+    number_of_vpackets : Number of virtual packets to generate
+    temporary_v_packet_bins : Initial size of the storage arrays
+
+    Returns
+    -------
+    A tuple of a list containing a CompactVPacketCollection for each RPacket,
+    an empty CompactVPacketCollection for the consolidated virtual packets
+    and a CompactLastInteractionTracker for all RPackets
+    """
+    vpacket_collections = List()
+    for i in range(no_of_packets):
+        vpacket_collections.append(
+            CompactVPacketCollection(
+                i,
+                spectrum_frequency_grid,
+                v_packet_spawn_start_frequency,
+                v_packet_spawn_end_frequency,
+                number_of_vpackets,
+                temporary_v_packet_bins,
+            )
+        )
+    vpacket_tracker = CompactVPacketCollection(
+        -1,
+        spectrum_frequency_grid,
+        v_packet_spawn_start_frequency,
+        v_packet_spawn_end_frequency,
+        -1,
+        1,
+    )
+    return (
+        vpacket_collections,
+        vpacket_tracker,
+        initialize_compact_last_interaction_tracker(no_of_packets),
+    )
+
+
 @njit(**njit_dict_no_parallel)
 def consolidate_vpacket_tracker(
     vpacket_collections,
@@ -404,6 +791,79 @@ def consolidate_vpacket_tracker(
         -1,
         vpacket_tracker_length,
     )
+    _copy_vpacket_collections(vpacket_collections, vpacket_tracker)
+    return vpacket_tracker
+
+
+@njit(**njit_dict_no_parallel)
+def consolidate_vpacket_storage(vpacket_collections, vpacket_tracker):
+    """
+    Consolidate the vpacket collections into the vpacket tracker of a
+    storage from initialize_vpacket_storage or
+    initialize_compact_vpacket_storage.
+
+    Parameters
+    ----------
+    vpacket_collections : List[VPacketCollection]
+        List of vpacket collections to consolidate.
+    vpacket_tracker : VPacketCollection or CompactVPacketCollection
+        Collection of the same storage type receiving the virtual packets of
+        all collections. Its arrays are replaced.
+
+    Returns
+    -------
+    VPacketCollection or CompactVPacketCollection
+        Consolidated vpacket tracker.
+    """
+    vpacket_tracker_length = 0
+    for vpacket_collection in vpacket_collections:
+        vpacket_tracker_length += vpacket_collection.idx
+
+    vpacket_tracker.nus = np.empty(vpacket_tracker_length, dtype=np.float64)
+    vpacket_tracker.energies = np.empty(
+        vpacket_tracker_length, dtype=np.float64
+    )
+    vpacket_tracker.initial_mus = np.empty(
+        vpacket_tracker_length, dtype=np.float64
+    )
+    vpacket_tracker.initial_rs = np.empty(
+        vpacket_tracker_length, dtype=np.float64
+    )
+    vpacket_tracker.last_interaction_in_nu = np.empty(
+        vpacket_tracker_length, dtype=np.float64
+    )
+    vpacket_tracker.last_interaction_in_r = np.empty(
+        vpacket_tracker_length, dtype=np.float64
+    )
+    vpacket_tracker.last_interaction_type = np.empty(
+        vpacket_tracker_length,
+        dtype=vpacket_tracker.last_interaction_type.dtype,
+    )
+    vpacket_tracker.last_interaction_in_id = np.empty(
+        vpacket_tracker_length,
+        dtype=vpacket_tracker.last_interaction_in_id.dtype,
+    )
+    vpacket_tracker.last_interaction_out_id = np.empty(
+        vpacket_tracker_length,
+        dtype=vpacket_tracker.last_interaction_out_id.dtype,
+    )
+    vpacket_tracker.last_interaction_shell_id = np.empty(
+        vpacket_tracker_length,
+        dtype=vpacket_tracker.last_interaction_shell_id.dtype,
+    )
+    vpacket_tracker.idx = 0
+    vpacket_tracker.length = vpacket_tracker_length
+
+    _copy_vpacket_collections(vpacket_collections, vpacket_tracker)
+    return vpacket_tracker
+
+
+@njit(**njit_dict_no_parallel)
+def _copy_vpacket_collections(vpacket_collections, vpacket_tracker):
+    """
+    Copy the virtual packets of all collections one after the other into the
+    arrays of the vpacket tracker, which hold all of them.
+    """
     current_start_vpacket_tracker_idx = 0
     for vpacket_collection in vpacket_collections:
         current_end_vpacket_tracker_idx = (
@@ -445,4 +905,3 @@ def consolidate_vpacket_tracker(
         ] = vpacket_collection.last_interaction_shell_id
 
         current_start_vpacket_tracker_idx = current_end_vpacket_tracker_idx
-    return vpacket_tracker
@@ -1,13 +1,28 @@
 import numba as nb
 import numpy as np
 import pandas as pd
+from astropy import units as u
 from numba import from_dtype, njit
 from numba.experimental import jitclass
 from numba.typed import List
 
-from tardis.transport.montecarlo.packets.radiative_packet import InteractionType
+from tardis.transport.montecarlo.packet_source.base import BasePacketSource
+from tardis.transport.montecarlo.packets.radiative_packet import (
+    InteractionType,
+    PacketStatus,
+)
+from tardis.util.base import species_string_to_tuple
 
 NO_INTERACTION_INT = int(InteractionType.NO_INTERACTION)
+BOUNDARY_INT = int(InteractionType.BOUNDARY)
+EMITTED_INT = int(PacketStatus.EMITTED)
+ALL_INTERACTION_TYPES_MASK = (
+    InteractionType.BOUNDARY
+    | InteractionType.LINE
+    | InteractionType.ESCATTERING
+    | InteractionType.CONTINUUM_PROCESS
+)
+MAX_SEED_VAL = BasePacketSource.MAX_SEED_VAL
 
 boundary_interaction_dtype = np.dtype(
     [
@@ -18,157 +33,203 @@ boundary_interaction_dtype = np.dtype(
 )
 
 
-@jitclass
-class RPacketTracker:
-    seed: nb.int64  # type: ignore[misc]
-    index: nb.int64  # type: ignore[misc]
-    status: nb.int64[:]  # type: ignore[misc]
-    r: nb.float64[:]  # type: ignore[misc]
-    nu: nb.float64[:]  # type: ignore[misc]
-    mu: nb.float64[:]  # type: ignore[misc]
-    energy: nb.float64[:]  # type: ignore[misc]
-    shell_id: nb.int64[:]  # type: ignore[misc]
-    interaction_type: nb.int64[:]  # type: ignore[misc]
-    boundary_interaction: from_dtype(boundary_interaction_dtype)[:]  # type: ignore[misc]
-    num_interactions: nb.int64  # type: ignore[misc]
-    boundary_interactions_index: nb.int64  # type: ignore[misc]
-    event_id: nb.int64  # type: ignore[misc]
-    extend_factor: nb.int64  # type: ignore[misc]
+def _create_rpacket_tracker_class(mu_dtype, status_dtype, shell_id_dtype):
     """
-    Numba JITCLASS for storing the information for each interaction a RPacket instance undergoes.
+    Create a RPacketTracker jitclass storing the direction cosines, the
+    statuses and interaction types and the shell ids with the given types.
 
     Parameters
     ----------
-        length : int
-            Length of the initial array that is instantiated
-        seed : int
-            Seed for each RPacket
-        index : int
-            Index position of each RPacket
-        status : int
-            Current status of the RPacket as per interactions
-        r : float
-            Radius of the shell where the RPacket is present
-        nu : float
-            Frequency of the RPacket
-        mu : float
-            Cosine of the angle made by the direction of movement of the RPacket from its original direction
-        energy : float
-            Energy possessed by the RPacket at a particular shell
-        shell_id : int
-            Current Shell No in which the RPacket is present
-        interaction_type: int
-            Type of interaction the rpacket undergoes
-        num_interactions : int
-            Internal counter for the interactions that a particular RPacket undergoes
-        extend_factor : int
-            The factor by which to extend the properties array when the size limit is reached
+    mu_dtype : numpy.dtype
+        dtype of the tracked direction cosines (float64 or float32)
+    status_dtype : numpy.dtype
+        dtype of the tracked statuses and interaction types (int64 or int8)
+    shell_id_dtype : numpy.dtype
+        dtype of the tracked shell ids (int64 or int32)
+
+    Returns
+    -------
+    numba.experimental.jitclass
     """
+    mu_type = from_dtype(np.dtype(mu_dtype))
+    status_type = from_dtype(np.dtype(status_dtype))
+    shell_id_type = from_dtype(np.dtype(shell_id_dtype))
 
-    def __init__(self, length: int) -> None:
-        """
-        Initialize the variables with default value
+    @jitclass
+    class RPacketTracker:
+        seed: nb.int64  # type: ignore[misc]
+        index: nb.int64  # type: ignore[misc]
+        status: status_type[:]  # type: ignore[misc]
+        r: nb.float64[:]  # type: ignore[misc]
+        nu: nb.float64[:]  # type: ignore[misc]
+        mu: mu_type[:]  # type: ignore[misc]
+        energy: nb.float64[:]  # type: ignore[misc]
+        shell_id: shell_id_type[:]  # type: ignore[misc]
+        interaction_type: status_type[:]  # type: ignore[misc]
+        boundary_interaction: from_dtype(boundary_interaction_dtype)[:]  # type: ignore[misc]
+        num_interactions: nb.int64  # type: ignore[misc]
+        boundary_interactions_index: nb.int64  # type: ignore[misc]
+        event_id: nb.int64  # type: ignore[misc]
+        extend_factor: nb.int64  # type: ignore[misc]
         """
-        self.seed = np.int64(0)
-        self.index = np.int64(0)
-        self.status = np.empty(length, dtype=np.int64)
-        self.r = np.empty(length, dtype=np.float64)
-        self.nu = np.empty(length, dtype=np.float64)
-        self.mu = np.empty(length, dtype=np.float64)
-        self.energy = np.empty(length, dtype=np.float64)
-        self.shell_id = np.empty(length, dtype=np.int64)
-        self.interaction_type = np.full(length, NO_INTERACTION_INT, dtype=np.int64)
-        self.boundary_interaction = np.empty(
-            length,
-            dtype=boundary_interaction_dtype,
-        )
-        self.num_interactions = 0
-        self.boundary_interactions_index = 0
-        self.event_id = 1
-        self.extend_factor = 2
-
-    def extend_array(self, array, array_length):
-        temp_array = np.empty(
-            array_length * self.extend_factor, dtype=array.dtype
-        )
-        temp_array[:array_length] = array
-        return temp_array
+        Numba JITCLASS for storing the information for each interaction a RPacket instance undergoes.
 
-    def extend_interaction_type_array(self, array, array_length):
-        temp_array = np.full(
-            array_length * self.extend_factor, NO_INTERACTION_INT, dtype=array.dtype
-        )
-        temp_array[:array_length] = array
-        return temp_array
+        montecarlo_main_loop only takes a list of one RPacketTracker per
+        packet while montecarlo_globals.ENABLE_RPACKET_TRACKING is False.
+        With the flag set it indexes the list by thread and expects one
+        RPacketEventLog per thread.
 
-    def track(self, r_packet):
-        """
-        Track important properties of RPacket
+        Parameters
+        ----------
+            length : int
+                Length of the initial array that is instantiated
+            seed : int
+                Seed for each RPacket
+            index : int
+                Index position of each RPacket
+            status : int
+                Current status of the RPacket as per interactions.
+                Stored with the type given by ``status_dtype``
+            r : float
+                Radius of the shell where the RPacket is present
+            nu : float
+                Frequency of the RPacket
+            mu : float
+                Cosine of the angle made by the direction of movement of the RPacket from its original direction.
+                Stored with the precision given by ``mu_dtype``
+            energy : float
+                Energy possessed by the RPacket at a particular shell
+            shell_id : int
+                Current Shell No in which the RPacket is present.
+                Stored with the type given by ``shell_id_dtype``
+            interaction_type: int
+                Type of interaction the rpacket undergoes.
+                Stored with the type given by ``status_dtype``
+            num_interactions : int
+                Internal counter for the interactions that a particular RPacket undergoes
+            extend_factor : int
+                The factor by which to extend the properties array when the size limit is reached
         """
-        if self.num_interactions >= self.status.size:
-            self.status = self.extend_array(self.status, self.status.size)
-            self.r = self.extend_array(self.r, self.r.size)
-            self.nu = self.extend_array(self.nu, self.nu.size)
-            self.mu = self.extend_array(self.mu, self.mu.size)
-            self.energy = self.extend_array(self.energy, self.energy.size)
-            self.shell_id = self.extend_array(self.shell_id, self.shell_id.size)
-            self.interaction_type = self.extend_interaction_type_array(
-                self.interaction_type, self.interaction_type.size
+
+        def __init__(self, length: int) -> None:
+            """
+            Initialize the variables with default value
+            """
+            self.seed = np.int64(0)
+            self.index = np.int64(0)
+            self.status = np.empty(length, dtype=status_dtype)
+            self.r = np.empty(length, dtype=np.float64)
+            self.nu = np.empty(length, dtype=np.float64)
+            self.mu = np.empty(length, dtype=mu_dtype)
+            self.energy = np.empty(length, dtype=np.float64)
+            self.shell_id = np.empty(length, dtype=shell_id_dtype)
+            self.interaction_type = np.full(
+                length, NO_INTERACTION_INT, dtype=status_dtype
             )
+            self.boundary_interaction = np.empty(
+                length,
+                dtype=boundary_interaction_dtype,
+            )
+            self.num_interactions = 0
+            self.boundary_interactions_index = 0
+            self.event_id = 1
+            self.extend_factor = 2
 
-        self.index = r_packet.index
-        self.seed = r_packet.seed
-        self.status[self.num_interactions] = r_packet.status
-        self.r[self.num_interactions] = r_packet.r
-        self.nu[self.num_interactions] = r_packet.nu
-        self.mu[self.num_interactions] = r_packet.mu
-        self.energy[self.num_interactions] = r_packet.energy
-        self.shell_id[self.num_interactions] = r_packet.current_shell_id
-        self.interaction_type[
-            self.num_interactions
-        ] = r_packet.last_interaction_type
-        self.num_interactions += 1
+        def extend_array(self, array, array_length):
+            temp_array = np.empty(
+                array_length * self.extend_factor, dtype=array.dtype
+            )
+            temp_array[:array_length] = array
+            return temp_array
 
-    def track_boundary_interaction(self, current_shell_id, next_shell_id):
-        """
-        Track boundary interaction properties
-        """
-        if self.boundary_interactions_index >= self.boundary_interaction.size:
-            self.boundary_interaction = self.extend_array(
-                self.boundary_interaction,
-                self.boundary_interaction.size,
+        def extend_interaction_type_array(self, array, array_length):
+            temp_array = np.full(
+                array_length * self.extend_factor, NO_INTERACTION_INT, dtype=array.dtype
             )
+            temp_array[:array_length] = array
+            return temp_array
 
-        self.boundary_interaction[self.boundary_interactions_index][
-            "event_id"
-        ] = self.event_id
-        self.event_id += 1
+        def track(self, r_packet):
+            """
+            Track important properties of RPacket
+            """
+            if self.num_interactions >= self.status.size:
+                self.status = self.extend_array(self.status, self.status.size)
+                self.r = self.extend_array(self.r, self.r.size)
+                self.nu = self.extend_array(self.nu, self.nu.size)
+                self.mu = self.extend_array(self.mu, self.mu.size)
+                self.energy = self.extend_array(self.energy, self.energy.size)
+                self.shell_id = self.extend_array(self.shell_id, self.shell_id.size)
+                self.interaction_type = self.extend_interaction_type_array(
+                    self.interaction_type, self.interaction_type.size
+                )
 
-        self.boundary_interaction[self.boundary_interactions_index][
-            "current_shell_id"
-        ] = current_shell_id
+            self.index = r_packet.index
+            self.seed = r_packet.seed
+            self.status[self.num_interactions] = r_packet.status
+            self.r[self.num_interactions] = r_packet.r
+            self.nu[self.num_interactions] = r_packet.nu
+            self.mu[self.num_interactions] = r_packet.mu
+            self.energy[self.num_interactions] = r_packet.energy
+            self.shell_id[self.num_interactions] = r_packet.current_shell_id
+            self.interaction_type[
+                self.num_interactions
+            ] = r_packet.last_interaction_type
+            self.num_interactions += 1
 
-        self.boundary_interaction[self.boundary_interactions_index][
-            "next_shell_id"
-        ] = next_shell_id
+        def track_boundary_interaction(self, current_shell_id, next_shell_id):
+            """
+            Track boundary interaction properties
+            """
+            if self.boundary_interactions_index >= self.boundary_interaction.size:
+                self.boundary_interaction = self.extend_array(
+                    self.boundary_interaction,
+                    self.boundary_interaction.size,
+                )
 
-        self.boundary_interactions_index += 1
+            self.boundary_interaction[self.boundary_interactions_index][
+                "event_id"
+            ] = self.event_id
+            self.event_id += 1
 
-    def finalize_array(self):
-        """
-        Change the size of the array from length ( or multiple of length ) to
-        the actual number of interactions
-        """
-        self.status = self.status[: self.num_interactions]
-        self.r = self.r[: self.num_interactions]
-        self.nu = self.nu[: self.num_interactions]
-        self.mu = self.mu[: self.num_interactions]
-        self.energy = self.energy[: self.num_interactions]
-        self.shell_id = self.shell_id[: self.num_interactions]
-        self.interaction_type = self.interaction_type[: self.num_interactions]
-        self.boundary_interaction = self.boundary_interaction[
-            : self.boundary_interactions_index
-        ]
+            self.boundary_interaction[self.boundary_interactions_index][
+                "current_shell_id"
+            ] = current_shell_id
+
+            self.boundary_interaction[self.boundary_interactions_index][
+                "next_shell_id"
+            ] = next_shell_id
+
+            self.boundary_interactions_index += 1
+
+        def end_packet(self, r_packet):
+            """
+            Added to make RPacketTracker compatible with RPacketEventLog
+            """
+
+        def finalize_array(self):
+            """
+            Change the size of the array from length ( or multiple of length ) to
+            the actual number of interactions
+            """
+            self.status = self.status[: self.num_interactions]
+            self.r = self.r[: self.num_interactions]
+            self.nu = self.nu[: self.num_interactions]
+            self.mu = self.mu[: self.num_interactions]
+            self.energy = self.energy[: self.num_interactions]
+            self.shell_id = self.shell_id[: self.num_interactions]
+            self.interaction_type = self.interaction_type[: self.num_interactions]
+            self.boundary_interaction = self.boundary_interaction[
+                : self.boundary_interactions_index
+            ]
+
+    return RPacketTracker
+
+
+RPacketTracker = _create_rpacket_tracker_class(np.float64, np.int64, np.int64)
+CompactRPacketTracker = _create_rpacket_tracker_class(
+    np.float32, np.int8, np.int32
+)
 
 
 def rpacket_trackers_to_dataframe(rpacket_trackers):
@@ -297,6 +358,11 @@ class RPacketLastInteractionTracker:
         Added to make RPacketLastInteractionTracker compatible with RPacketTracker
         """
 
+    def end_packet(self, r_packet):
+        """
+        Added to make RPacketLastInteractionTracker compatible with RPacketEventLog
+        """
+
 
 @njit
 def generate_rpacket_tracker_list(no_of_packets, length):
@@ -316,6 +382,25 @@ def generate_rpacket_tracker_list(no_of_packets, length):
     return rpacket_trackers
 
 
+@njit
+def generate_compact_rpacket_tracker_list(no_of_packets, length):
+    """
+    Parameters
+    ----------
+    no_of_packets : The count of RPackets that are sent in the ejecta
+    length : initial length of the tracking array
+
+    Returns
+    -------
+    A list containing CompactRPacketTracker (float32 mu, int8 statuses and
+    int32 shell ids) for each RPacket
+    """
+    rpacket_trackers = List()
+    for i in range(no_of_packets):
+        rpacket_trackers.append(CompactRPacketTracker(length))
+    return rpacket_trackers
+
+
 @njit
 def generate_rpacket_last_interaction_tracker_list(no_of_packets):
     """
@@ -331,3 +416,615 @@ def generate_rpacket_last_interaction_tracker_list(no_of_packets):
     for i in range(no_of_packets):
         rpacket_trackers.append(RPacketLastInteractionTracker())
     return rpacket_trackers
+
+
+@jitclass
+class RPacketTrackingFilter:
+    packet_stride: nb.int64  # type: ignore[misc]
+    seed_threshold: nb.float64  # type: ignore[misc]
+    interaction_type_mask: nb.int64  # type: ignore[misc]
+    shell_start: nb.int64  # type: ignore[misc]
+    shell_end: nb.int64  # type: ignore[misc]
+    emitted_only: nb.boolean  # type: ignore[misc]
+    escape_nu_start: nb.float64  # type: ignore[misc]
+    escape_nu_end: nb.float64  # type: ignore[misc]
+    line_mask: nb.boolean[:]  # type: ignore[misc]
+    """
+    Numba JITCLASS deciding which RPackets and events are kept by the
+    RPacketEventLog.
+
+    Packets are selected when they start, events while they are tracked
+    and the finished packet is checked once more when it leaves the
+    simulation. The selection never draws random numbers so that tracking
+    does not change the transport.
+
+    Parameters
+    ----------
+        packet_stride : int
+            Only packets whose index is a multiple of packet_stride are tracked
+        sample_fraction : float
+            Fraction of packets that are tracked, selected through the
+            packet seeds which are uniformly distributed
+        interaction_type_mask : int
+            Bitwise or of the InteractionType values of the events that are
+            kept. Events without interaction (start and end of a packet)
+            are not subject to the mask
+        shell_start : int
+            First shell in which events are kept
+        shell_end : int
+            Shell after the last one in which events are kept
+        emitted_only : bool
+            Only keep packets that escape the ejecta
+        escape_nu_start : float
+            Lower frequency limit of the escaping packets that are kept
+        escape_nu_end : float
+            Upper frequency limit of the escaping packets that are kept
+        line_mask : numpy.ndarray
+            Boolean mask over the lines, only packets whose last line
+            interaction (out) was with a selected line are kept.
+            An empty mask keeps all packets
+    """
+
+    def __init__(
+        self,
+        packet_stride=1,
+        sample_fraction=1.0,
+        interaction_type_mask=ALL_INTERACTION_TYPES_MASK,
+        shell_start=0,
+        shell_end=np.iinfo(np.int64).max,
+        emitted_only=False,
+        escape_nu_start=0.0,
+        escape_nu_end=np.inf,
+        line_mask=np.empty(0, dtype=np.bool_),
+    ):
+        self.packet_stride = packet_stride
+        self.seed_threshold = sample_fraction * MAX_SEED_VAL
+        self.interaction_type_mask = interaction_type_mask
+        self.shell_start = shell_start
+        self.shell_end = shell_end
+        self.emitted_only = emitted_only
+        self.escape_nu_start = escape_nu_start
+        self.escape_nu_end = escape_nu_end
+        self.line_mask = line_mask
+
+    def select_packet(self, r_packet):
+        """
+        Decide whether a starting RPacket is tracked
+        """
+        if r_packet.index % self.packet_stride != 0:
+            return False
+        return r_packet.seed < self.seed_threshold
+
+    def select_event(self, r_packet):
+        """
+        Decide whether the current state of a tracked RPacket is kept
+        """
+        if r_packet.current_shell_id < self.shell_start or (
+            r_packet.current_shell_id >= self.shell_end
+        ):
+            return False
+        if r_packet.last_interaction_type == NO_INTERACTION_INT:
+            return True
+        return (r_packet.last_interaction_type & self.interaction_type_mask) != 0
+
+    def select_boundary_interaction(self, current_shell_id):
+        """
+        Decide whether a boundary crossing of a tracked RPacket is kept
+        """
+        if current_shell_id < self.shell_start or (
+            current_shell_id >= self.shell_end
+        ):
+            return False
+        return (BOUNDARY_INT & self.interaction_type_mask) != 0
+
+    def select_finished_packet(self, r_packet):
+        """
+        Decide whether the events of a finished RPacket are kept
+        """
+        if self.emitted_only and (
+            r_packet.status != EMITTED_INT
+            or r_packet.nu < self.escape_nu_start
+            or r_packet.nu > self.escape_nu_end
+        ):
+            return False
+        if self.line_mask.size > 0:
+            line_id = r_packet.last_line_interaction_out_id
+            if line_id < 0 or not self.line_mask[line_id]:
+                return False
+        return True
+
+
+def rpacket_tracking_filter_from_config(filter_config, lines):
+    """
+    Create a RPacketTrackingFilter from the tracking filter configuration.
+
+    Parameters
+    ----------
+    filter_config : tardis.io.configuration.config_reader.Configuration
+        The ``montecarlo.tracking.filter`` section of the configuration
+    lines : pandas.DataFrame
+        Lines of the atomic data in the order used by the transport
+
+    Returns
+    -------
+    RPacketTrackingFilter
+    """
+    interaction_type_mask = 0
+    for interaction_type in filter_config.interaction_types:
+        interaction_type_mask |= InteractionType[interaction_type.upper()]
+
+    shell_end = int(filter_config.shell_end)
+    if shell_end < 0:
+        shell_end = np.iinfo(np.int64).max
+
+    escape_nu_start = filter_config.escape_wavelength_range.end.to(
+        u.Hz, equivalencies=u.spectral()
+    ).value
+    escape_nu_end = filter_config.escape_wavelength_range.start.to(
+        u.Hz, equivalencies=u.spectral()
+    ).value
+
+    if filter_config.last_line_interaction_species:
+        species = [
+            species_string_to_tuple(species_string)
+            for species_string in filter_config.last_line_interaction_species
+        ]
+        line_mask = lines.index.droplevel(
+            ["level_number_lower", "level_number_upper"]
+        ).isin(species)
+    else:
+        line_mask = np.empty(0, dtype=np.bool_)
+
+    return RPacketTrackingFilter(
+        int(filter_config.packet_stride),
+        float(filter_config.sample_fraction),
+        int(interaction_type_mask),
+        int(filter_config.shell_start),
+        shell_end,
+        bool(filter_config.escaping_only),
+        escape_nu_start,
+        escape_nu_end,
+        np.ascontiguousarray(line_mask, dtype=np.bool_),
+    )
+
+
+rpacket_event_dtype = np.dtype(
+    [
+        ("index", np.int64),
+        ("step", np.int64),
+        ("seed", np.int64),
+        ("r", np.float64),
+        ("nu", np.float64),
+        ("mu", np.float64),
+        ("energy", np.float64),
+        ("shell_id", np.int64),
+        ("status", np.int64),
+        ("interaction_type", np.int64),
+    ],
+    align=True,
+)
+
+compact_rpacket_event_dtype = np.dtype(
+    [
+        ("index", np.int64),
+        ("seed", np.int64),
+        ("r", np.float64),
+        ("nu", np.float64),
+        ("energy", np.float64),
+        ("step", np.int32),
+        ("mu", np.float32),
+        ("shell_id", np.int32),
+        ("status", np.int8),
+        ("interaction_type", np.int8),
+    ],
+    align=True,
+)
+
+boundary_event_dtype = np.dtype(
+    [
+        ("index", np.int64),
+        ("event_id", np.int64),
+        ("current_shell_id", np.int64),
+        ("next_shell_id", np.int64),
+    ]
+)
+
+RPACKET_TRACKER_COLUMNS = [
+    "status",
+    "seed",
+    "r",
+    "nu",
+    "mu",
+    "energy",
+    "shell_id",
+    "interaction_type",
+]
+
+
+def _create_rpacket_event_log_class(event_dtype):
+    """
+    Create a RPacketEventLog jitclass storing events with the given
+    record dtype.
+
+    Parameters
+    ----------
+    event_dtype : numpy.dtype
+        Structured dtype of a single event (rpacket_event_dtype or
+        compact_rpacket_event_dtype)
+
+    Returns
+    -------
+    numba.experimental.jitclass
+    """
+    event_array_type = nb.types.Array(from_dtype(event_dtype), 1, "C")
+    boundary_array_type = nb.types.Array(
+        from_dtype(boundary_event_dtype), 1, "C"
+    )
+    tracking_filter_type = RPacketTrackingFilter.class_type.instance_type
+
+    @jitclass
+    class RPacketEventLog:
+        chunk_length: nb.int64  # type: ignore[misc]
+        chunks: nb.types.ListType(event_array_type)  # type: ignore[misc]
+        current_chunk: event_array_type  # type: ignore[misc]
+        position: nb.int64  # type: ignore[misc]
+        boundary_chunks: nb.types.ListType(boundary_array_type)  # type: ignore[misc]
+        current_boundary_chunk: boundary_array_type  # type: ignore[misc]
+        boundary_position: nb.int64  # type: ignore[misc]
+        events: event_array_type  # type: ignore[misc]
+        boundary_interactions: boundary_array_type  # type: ignore[misc]
+        packet_index: nb.int64  # type: ignore[misc]
+        step: nb.int64  # type: ignore[misc]
+        event_id: nb.int64  # type: ignore[misc]
+        tracking_filter: tracking_filter_type  # type: ignore[misc]
+        packet_selected: nb.boolean  # type: ignore[misc]
+        packet_start_chunks: nb.int64  # type: ignore[misc]
+        packet_start_position: nb.int64  # type: ignore[misc]
+        packet_start_boundary_chunks: nb.int64  # type: ignore[misc]
+        packet_start_boundary_position: nb.int64  # type: ignore[misc]
+        """
+        Numba JITCLASS for an append-only log of the interactions of all
+        RPackets transported by one thread.
+
+        Events are written into chunks, a new chunk of twice the length of
+        the current one is allocated when it is full. Memory is only
+        allocated for events that are recorded and already recorded events
+        are never copied during transport.
+
+        Parameters
+        ----------
+            chunk_length : int
+                Number of events of the first allocated chunk
+            events : numpy.ndarray
+                Structured array of all tracked events, available after
+                finalize_array. Each event holds the packet index, the step
+                within the packet and the RPacket properties
+            boundary_interactions : numpy.ndarray
+                Structured array of all boundary crossings, available after
+                finalize_array
+            packet_index : int
+                Index of the RPacket currently being tracked
+            step : int
+                Number of events tracked for the current RPacket
+            event_id : int
+                Counter of the boundary interactions of the current RPacket
+            tracking_filter : RPacketTrackingFilter
+                Selection of the packets and events that are kept
+            packet_selected : bool
+                Whether the current RPacket is tracked
+        """
+
+        def __init__(
+            self, chunk_length: int, tracking_filter: RPacketTrackingFilter
+        ) -> None:
+            """
+            Initialize the log with a single empty chunk of chunk_length
+            events
+            """
+            self.chunk_length = chunk_length
+            self.tracking_filter = tracking_filter
+            self.current_chunk = np.empty(chunk_length, dtype=event_dtype)
+            self.chunks = List.empty_list(event_array_type)
+            self.chunks.append(self.current_chunk)
+            self.position = 0
+            self.current_boundary_chunk = np.empty(
+                chunk_length, dtype=boundary_event_dtype
+            )
+            self.boundary_chunks = List.empty_list(boundary_array_type)
+            self.boundary_chunks.append(self.current_boundary_chunk)
+            self.boundary_position = 0
+            self.events = self.current_chunk[:0]
+            self.boundary_interactions = self.current_boundary_chunk[:0]
+            self.packet_index = -1
+            self.step = 0
+            self.event_id = 1
+            self.packet_selected = False
+            self.packet_start_chunks = 1
+            self.packet_start_position = 0
+            self.packet_start_boundary_chunks = 1
+            self.packet_start_boundary_position = 0
+
+        def start_packet(self, r_packet):
+            """
+            Reset the per-packet counters and remember where the events of
+            the new RPacket start
+            """
+            self.packet_index = r_packet.index
+            self.step = 0
+            self.event_id = 1
+            self.packet_selected = self.tracking_filter.select_packet(r_packet)
+            self.packet_start_chunks = len(self.chunks)
+            self.packet_start_position = self.position
+            self.packet_start_boundary_chunks = len(self.boundary_chunks)
+            self.packet_start_boundary_position = self.boundary_position
+
+        def track(self, r_packet):
+            """
+            Append the current properties of the RPacket to the log
+            """
+            if r_packet.index != self.packet_index:
+                self.start_packet(r_packet)
+
+            if not self.packet_selected:
+                return
+            if not self.tracking_filter.select_event(r_packet):
+                self.step += 1
+                return
+
+            if self.position == len(self.current_chunk):
+                self.current_chunk = np.empty(
+                    2 * len(self.current_chunk), dtype=event_dtype
+                )
+                self.chunks.append(self.current_chunk)
+                self.position = 0
+
+            event = self.current_chunk[self.position]
+            event["index"] = r_packet.index
+            event["step"] = self.step
+            event["seed"] = r_packet.seed
+            event["status"] = r_packet.status
+            event["r"] = r_packet.r
+            event["nu"] = r_packet.nu
+            event["mu"] = r_packet.mu
+            event["energy"] = r_packet.energy
+            event["shell_id"] = r_packet.current_shell_id
+            event["interaction_type"] = r_packet.last_interaction_type
+            self.position += 1
+            self.step += 1
+
+        def track_boundary_interaction(self, current_shell_id, next_shell_id):
+            """
+            Append a boundary crossing of the current RPacket to the log
+            """
+            if not self.packet_selected:
+                return
+            if not self.tracking_filter.select_boundary_interaction(
+                current_shell_id
+            ):
+                self.event_id += 1
+                return
+
+            if self.boundary_position == len(self.current_boundary_chunk):
+                self.current_boundary_chunk = np.empty(
+                    2 * len(self.current_boundary_chunk),
+                    dtype=boundary_event_dtype,
+                )
+                self.boundary_chunks.append(self.current_boundary_chunk)
+                self.boundary_position = 0
+
+            event = self.current_boundary_chunk[self.boundary_position]
+            event["index"] = self.packet_index
+            event["event_id"] = self.event_id
+            event["current_shell_id"] = current_shell_id
+            event["next_shell_id"] = next_shell_id
+            self.boundary_position += 1
+            self.event_id += 1
+
+        def end_packet(self, r_packet):
+            """
+            Discard the events of the finished RPacket if it is not selected
+            by the tracking filter
+            """
+            if not self.packet_selected or (
+                self.tracking_filter.select_finished_packet(r_packet)
+            ):
+                return
+
+            while len(self.chunks) > self.packet_start_chunks:
+                self.chunks.pop()
+            self.current_chunk = self.chunks[-1]
+            self.position = self.packet_start_position
+
+            while len(self.boundary_chunks) > self.packet_start_boundary_chunks:
+                self.boundary_chunks.pop()
+            self.current_boundary_chunk = self.boundary_chunks[-1]
+            self.boundary_position = self.packet_start_boundary_position
+
+        def finalize_array(self):
+            """
+            Join the chunks into the contiguous events and
+            boundary_interactions arrays
+            """
+            if len(self.chunks) == 1:
+                self.events = self.current_chunk[: self.position]
+            else:
+                # the full chunks hold chunk_length * (2 ** n - 1) events
+                self.events = np.empty(
+                    self.chunk_length * (2 ** (len(self.chunks) - 1) - 1)
+                    + self.position,
+                    dtype=event_dtype,
+                )
+                offset = 0
+                for chunk in self.chunks[:-1]:
+                    self.events[offset : offset + len(chunk)] = chunk
+                    offset += len(chunk)
+                self.events[offset:] = self.current_chunk[: self.position]
+
+            if len(self.boundary_chunks) == 1:
+                self.boundary_interactions = self.current_boundary_chunk[
+                    : self.boundary_position
+                ]
+            else:
+                self.boundary_interactions = np.empty(
+                    self.chunk_length
+                    * (2 ** (len(self.boundary_chunks) - 1) - 1)
+                    + self.boundary_position,
+                    dtype=boundary_event_dtype,
+                )
+                offset = 0
+                for chunk in self.boundary_chunks[:-1]:
+                    self.boundary_interactions[offset : offset + len(chunk)] = (
+                        chunk
+                    )
+                    offset += len(chunk)
+                self.boundary_interactions[offset:] = (
+                    self.current_boundary_chunk[: self.boundary_position]
+                )
+
+    return RPacketEventLog
+
+
+RPacketEventLog = _create_rpacket_event_log_class(rpacket_event_dtype)
+CompactRPacketEventLog = _create_rpacket_event_log_class(
+    compact_rpacket_event_dtype
+)
+
+
+def generate_rpacket_event_log_list(
+    no_of_threads, chunk_length, tracking_filter
+):
+    """
+    Parameters
+    ----------
+    no_of_threads : The number of threads transporting RPackets
+    chunk_length : number of events of the first chunk of each log
+    tracking_filter : RPacketTrackingFilter shared by all logs
+
+    Returns
+    -------
+    A list containing a RPacketEventLog for each thread
+
+    Notes
+    -----
+    The list is built from Python: numba cannot box a typed list returned
+    from compiled code when its items hold another jitclass instance.
+    """
+    rpacket_event_logs = List()
+    for i in range(no_of_threads):
+        rpacket_event_logs.append(
+            RPacketEventLog(chunk_length, tracking_filter)
+        )
+    return rpacket_event_logs
+
+
+def generate_compact_rpacket_event_log_list(
+    no_of_threads, chunk_length, tracking_filter
+):
+    """
+    Parameters
+    ----------
+    no_of_threads : The number of threads transporting RPackets
+    chunk_length : number of events of the first chunk of each log
+    tracking_filter : RPacketTrackingFilter shared by all logs
+
+    Returns
+    -------
+    A list containing a CompactRPacketEventLog (float32 mu) for each thread
+    """
+    rpacket_event_logs = List()
+    for i in range(no_of_threads):
+        rpacket_event_logs.append(
+            CompactRPacketEventLog(chunk_length, tracking_filter)
+        )
+    return rpacket_event_logs
+
+
+def rpacket_event_logs_to_dataframe(rpacket_event_logs, sort=True):
+    """Generates a dataframe from the per-thread RPacketEventLog objects.
+
+    The events of all threads are copied once into a single structured
+    array, the columns of the dataframe are views of this array. The events
+    of a single log are used without copying if they are not sorted.
+
+    Parameters
+    ----------
+    rpacket_event_logs : numba.typed.typedlist.List
+        list of finalized RPacketEventLog objects
+    sort : bool, optional
+        Order the events by packet index and step. Otherwise the events are
+        grouped by thread, the events of one packet are still contiguous
+        and ordered by step. Default is True.
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame
+        Dataframe containing properties of RPackets as columns like status, seed, r, nu, mu, energy, shell_id, interaction_type
+        indexed by the packet index and step
+    """
+    thread_events = [log.events for log in rpacket_event_logs]
+    if not sort:
+        if len(thread_events) == 1:
+            events = thread_events[0]
+        else:
+            events = np.concatenate(thread_events)
+    else:
+        # events of one packet are contiguous and ordered within a thread,
+        # only the packet indices are joined to find the position of every
+        # event, which is then written once to its sorted position
+        order = np.argsort(
+            np.concatenate([events["index"] for events in thread_events]),
+            kind="stable",
+        )
+        sorted_position = np.empty_like(order)
+        sorted_position[order] = np.arange(len(order))
+        events = np.empty(len(order), dtype=thread_events[0].dtype)
+        offset = 0
+        for log_events in thread_events:
+            events[sorted_position[offset : offset + len(log_events)]] = (
+                log_events
+            )
+            offset += len(log_events)
+
+    multi_index = pd.MultiIndex.from_arrays(
+        [events["index"], events["step"]], names=["index", "step"]
+    )
+    return pd.DataFrame(
+        {column: events[column] for column in RPACKET_TRACKER_COLUMNS},
+        index=multi_index,
+        copy=False,
+    )
+
+
+def rpacket_event_logs_to_boundary_dataframe(rpacket_event_logs):
+    """Generates a dataframe of the boundary interactions from the per-thread RPacketEventLog objects.
+
+    Parameters
+    ----------
+    rpacket_event_logs : numba.typed.typedlist.List
+        list of finalized RPacketEventLog objects
+
+    Returns
+    -------
+    pandas.core.frame.DataFrame
+        Dataframe containing current_shell_id and next_shell_id of every
+        boundary crossing indexed by the packet index and event_id
+    """
+    boundary_interactions = np.concatenate(
+        [log.boundary_interactions for log in rpacket_event_logs]
+    )
+    boundary_interactions = boundary_interactions[
+        np.argsort(boundary_interactions["index"], kind="stable")
+    ]
+
+    multi_index = pd.MultiIndex.from_arrays(
+        [boundary_interactions["index"], boundary_interactions["event_id"]],
+        names=["index", "event_id"],
+    )
+    return pd.DataFrame(
+        {
+            "current_shell_id": boundary_interactions["current_shell_id"],
+            "next_shell_id": boundary_interactions["next_shell_id"],
+        },
+        index=multi_index,
+        copy=False,
+    )
@@ -51,11 +51,7 @@ def estimators():
         Edotlu_estimator=np.array(
             [[0.0, 0.0, 1.0], [0.0, 0.0, 1.0]], dtype=np.float64
         ),
-        photo_ion_estimator=np.empty((0, 0), dtype=np.float64),
-        stim_recomb_estimator=np.empty((0, 0), dtype=np.float64),
-        bf_heating_estimator=np.empty((0, 0), dtype=np.float64),
-        stim_recomb_cooling_estimator=np.empty((0, 0), dtype=np.float64),
-        photo_ion_estimator_statistics=np.empty((0, 0), dtype=np.int64),
+        bound_free_estimator=np.empty((0, 0, 5), dtype=np.float64),
     )
 
 
@@ -4,7 +4,9 @@ import pytest
 
 from tardis.transport.montecarlo.packets.packet_trackers import (
     RPacketTracker,
-    rpacket_trackers_to_dataframe,
+    boundary_interaction_dtype,
+    rpacket_event_logs_to_boundary_dataframe,
+    rpacket_event_logs_to_dataframe,
 )
 from tardis.transport.montecarlo.packets.radiative_packet import InteractionType
 
@@ -52,7 +54,7 @@ def nu_from_packet_collection(
 
 @pytest.fixture(scope="module")
 def rpacket_tracker(simulation_rpacket_tracking):
-    "RPacketTracker object from the simulation" ""
+    "RPacketEventLog objects from the simulation" ""
     rpacket_tracker = (
         simulation_rpacket_tracking.transport.transport_state.rpacket_tracker
     )
@@ -60,31 +62,35 @@ def rpacket_tracker(simulation_rpacket_tracking):
 
 
 @pytest.fixture(scope="module")
-def last_interaction_type_rpacket_tracker(rpacket_tracker):
-    """Last interaction types of rpacket from RPacketTracker class"""
-    no_of_packets = len(rpacket_tracker)
-    interaction_type = np.empty(no_of_packets, dtype=np.int64)
+def rpacket_tracker_df(simulation_rpacket_tracking):
+    """Dataframe of all tracked rpacket events"""
+    return (
+        simulation_rpacket_tracking.transport.transport_state.rpacket_tracker_df
+    )
 
-    for i in range(no_of_packets):
-        # the last interaction is the second last element since the last element
-        # correspond to reabsorbed/emission of the packet
-        interaction_type[i] = rpacket_tracker[i].interaction_type[-2]
 
-    return interaction_type
+@pytest.fixture(scope="module")
+def last_interaction_type_rpacket_tracker(rpacket_tracker_df):
+    """Last interaction types of rpacket from RPacketEventLog class"""
+    # the last interaction is the second last element since the last element
+    # correspond to reabsorbed/emission of the packet
+    return (
+        rpacket_tracker_df.groupby(level="index")["interaction_type"]
+        .nth(-2)
+        .to_numpy()
+    )
 
 
 @pytest.fixture
 def shell_id_rpacket_tracker(
-    rpacket_tracker, last_interaction_type_rpacket_tracker
+    rpacket_tracker_df, last_interaction_type_rpacket_tracker
 ):
     """
-    shell_id when last interaction is line from RPacketTracker class
+    shell_id when last interaction is line from RPacketEventLog class
     """
-    no_of_packets = len(rpacket_tracker)
-    shell_id = np.empty(no_of_packets, dtype=np.int64)
-
-    for i in range(no_of_packets):
-        shell_id[i] = rpacket_tracker[i].shell_id[-2]
+    shell_id = (
+        rpacket_tracker_df.groupby(level="index")["shell_id"].nth(-2).to_numpy()
+    )
 
     mask = last_interaction_type_rpacket_tracker == InteractionType.LINE
     last_line_interaction_shell_id = shell_id[mask]
@@ -93,15 +99,9 @@ def shell_id_rpacket_tracker(
 
 
 @pytest.fixture
-def nu_rpacket_tracker(rpacket_tracker):
-    """Output nu of rpacket from RPacketTracker class"""
-    no_of_packets = len(rpacket_tracker)
-    nu = np.empty(no_of_packets, dtype=np.float64)
-
-    for i in range(no_of_packets):
-        nu[i] = rpacket_tracker[i].nu[-2]
-
-    return nu
+def nu_rpacket_tracker(rpacket_tracker_df):
+    """Output nu of rpacket from RPacketEventLog class"""
+    return rpacket_tracker_df.groupby(level="index")["nu"].nth(-2).to_numpy()
 
 
 def test_extend_array():
@@ -132,20 +132,31 @@ def test_rpacket_tracker_properties(expected, obtained, request):
     npt.assert_allclose(expected, obtained)
 
 
-def test_boundary_interactions(rpacket_tracker, regression_data):
-    no_of_packets = len(rpacket_tracker)
+def test_boundary_interactions(
+    simulation_rpacket_tracking, rpacket_tracker, regression_data
+):
+    transport_state = simulation_rpacket_tracking.transport.transport_state
+    no_of_packets = len(transport_state.packet_collection.initial_nus)
+
+    boundary_df = rpacket_event_logs_to_boundary_dataframe(rpacket_tracker)
+    packet_index = boundary_df.index.get_level_values("index").to_numpy()
+    event_id = boundary_df.index.get_level_values("event_id").to_numpy()
 
-    max_boundary_interaction_size = max([tracker.boundary_interaction.size for tracker in rpacket_tracker])
+    max_boundary_interaction_size = event_id.max()
     obtained_boundary_interaction = np.full(
         (no_of_packets, max_boundary_interaction_size),
         [-1],
-        dtype=rpacket_tracker[0].boundary_interaction.dtype,
+        dtype=boundary_interaction_dtype,
     )
-
-    for i, tracker in enumerate(rpacket_tracker):
-        obtained_boundary_interaction[
-            i, : tracker.boundary_interaction.size
-        ] = tracker.boundary_interaction
+    obtained_boundary_interaction["event_id"][
+        packet_index, event_id - 1
+    ] = event_id
+    obtained_boundary_interaction["current_shell_id"][
+        packet_index, event_id - 1
+    ] = boundary_df["current_shell_id"].to_numpy()
+    obtained_boundary_interaction["next_shell_id"][
+        packet_index, event_id - 1
+    ] = boundary_df["next_shell_id"].to_numpy()
 
     expected_boundary_interaction = regression_data.sync_ndarray(
         obtained_boundary_interaction
@@ -155,13 +166,15 @@ def test_boundary_interactions(rpacket_tracker, regression_data):
     )
 
 
-def test_rpacket_trackers_to_dataframe(simulation_rpacket_tracking):
+def test_rpacket_event_logs_to_dataframe(simulation_rpacket_tracking):
     transport_state = simulation_rpacket_tracking.transport.transport_state
-    rtracker_df = rpacket_trackers_to_dataframe(transport_state.rpacket_tracker)
+    rtracker_df = rpacket_event_logs_to_dataframe(
+        transport_state.rpacket_tracker
+    )
 
     # check df shape and column names
     assert rtracker_df.shape == (
-        sum([len(tracker.r) for tracker in transport_state.rpacket_tracker]),
+        sum([len(log.events) for log in transport_state.rpacket_tracker]),
         8,
     )
     npt.assert_array_equal(
@@ -180,20 +193,16 @@ def test_rpacket_trackers_to_dataframe(simulation_rpacket_tracking):
         ),
     )
 
-    # check all data with rpacket_tracker
-    expected_rtrackers = []
-    for rpacket in transport_state.rpacket_tracker:
-        for rpacket_step_no in range(len(rpacket.r)):
-            expected_rtrackers.append(
-                [
-                    rpacket.status[rpacket_step_no],
-                    rpacket.seed,
-                    rpacket.r[rpacket_step_no],
-                    rpacket.nu[rpacket_step_no],
-                    rpacket.mu[rpacket_step_no],
-                    rpacket.energy[rpacket_step_no],
-                    rpacket.shell_id[rpacket_step_no],
-                    rpacket.interaction_type[rpacket_step_no],
-                ]
-            )
-    npt.assert_array_equal(rtracker_df.to_numpy(), np.array(expected_rtrackers))
+    # check all data with the event logs
+    events = np.concatenate(
+        [log.events for log in transport_state.rpacket_tracker]
+    )
+    events = np.sort(events, order=["index", "step"])
+    npt.assert_array_equal(
+        rtracker_df.index.get_level_values("index"), events["index"]
+    )
+    npt.assert_array_equal(
+        rtracker_df.index.get_level_values("step"), events["step"]
+    )
+    for column in rtracker_df.columns:
+        npt.assert_array_equal(rtracker_df[column].to_numpy(), events[column])
@@ -25,6 +25,11 @@ from tardis.transport.montecarlo.packets.radiative_packet import PacketStatus
 from tardis.transport.montecarlo.r_packet_transport import (
     move_packet_across_shell_boundary,
 )
+from tardis.transport.montecarlo.transport_profile import (
+    VPACKET_LINES_TRAVERSED,
+    VPACKET_SHELL_STEPS,
+    VPACKETS,
+)
 
 @jitclass
 class VPacket:
@@ -181,6 +186,7 @@ def trace_vpacket(
     tau_russian,
     survival_probability,
     enable_full_relativity,
+    transport_profile=None,
 ):
     """
     Trace single vpacket.
@@ -190,6 +196,8 @@ def trace_vpacket(
     v_packet
     time_explosion
     opacity_state
+    transport_profile : numpy.ndarray, optional
+        Counters of the thread, compiled out if not given
 
     Returns
     -------
@@ -197,6 +205,7 @@ def trace_vpacket(
     """
     tau_trace_combined = 0.0
     while True:
+        start_line_id = v_packet.next_line_id
         (
             tau_trace_combined_shell,
             distance_boundary,
@@ -210,6 +219,12 @@ def trace_vpacket(
         )
         tau_trace_combined += tau_trace_combined_shell
 
+        if transport_profile is not None:
+            transport_profile[VPACKET_SHELL_STEPS] += 1
+            transport_profile[VPACKET_LINES_TRAVERSED] += (
+                v_packet.next_line_id - start_line_id
+            )
+
         move_packet_across_shell_boundary(
             v_packet, delta_shell, len(numba_radial_1d_geometry.r_inner)
         )
@@ -251,6 +266,7 @@ def trace_vpacket_volley(
     enable_full_relativity,
     tau_russian,
     survival_probability,
+    transport_profile=None,
 ):
     """
     Shoot a volley of vpackets (the vpacket collection specifies how many)
@@ -268,6 +284,8 @@ def trace_vpacket_volley(
         [description]
     opacity_state : [type]
         [description]
+    transport_profile : numpy.ndarray, optional
+        Counters of the thread, compiled out if not given
     """
     if (r_packet.nu < vpacket_collection.v_packet_spawn_start_frequency) or (
         r_packet.nu > vpacket_collection.v_packet_spawn_end_frequency
@@ -278,6 +296,9 @@ def trace_vpacket_volley(
     if no_of_vpackets == 0:
         return
 
+    if transport_profile is not None:
+        transport_profile[VPACKETS] += no_of_vpackets
+
     ### TODO theoretical check for r_packet nu within vpackets bins - is done somewhere else I think
     if (
         r_packet.r > numba_radial_1d_geometry.r_inner[0]
@@ -363,6 +384,7 @@ def trace_vpacket_volley(
             tau_russian,
             survival_probability,
             enable_full_relativity,
+            transport_profile,
         )
 
         v_packet.energy *= math.exp(-tau_vpacket)
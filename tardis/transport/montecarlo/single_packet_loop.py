@@ -29,6 +29,14 @@ from tardis.transport.montecarlo.r_packet_transport import (
     trace_packet,
 )
 from tardis.transport.montecarlo.packets.virtual_packet import trace_vpacket_volley
+from tardis.transport.montecarlo.transport_profile import (
+    BOUNDARY_CROSSINGS,
+    CONTINUUM_INTERACTIONS,
+    ESCATTERINGS,
+    LINE_INTERACTIONS,
+    LINES_TRAVERSED,
+    RPACKET_STEPS,
+)
 
 C_SPEED_OF_LIGHT = const.c.to("cm/s").value
 
@@ -43,6 +51,7 @@ def single_packet_loop(
     vpacket_collection,
     rpacket_tracker,
     montecarlo_configuration,
+    transport_profile=None,
 ):
     """
     Parameters
@@ -54,6 +63,10 @@ def single_packet_loop(
     estimators : tardis.transport.montecarlo.numba_interface.Estimators
     vpacket_collection : tardis.transport.montecarlo.numba_interface.VPacketCollection
     rpacket_collection : tardis.transport.montecarlo.numba_interface.RPacketCollection
+    transport_profile : numpy.ndarray, optional
+        Counters of the thread, see
+        tardis.transport.montecarlo.transport_profile. The counters are
+        compiled out if not given.
 
     Returns
     -------
@@ -82,6 +95,7 @@ def single_packet_loop(
         montecarlo_configuration.ENABLE_FULL_RELATIVITY,
         montecarlo_configuration.VPACKET_TAU_RUSSIAN,
         montecarlo_configuration.SURVIVAL_PROBABILITY,
+        transport_profile,
     )
 
     rpacket_tracker.track(r_packet)
@@ -98,6 +112,7 @@ def single_packet_loop(
         )
 
         comov_nu = r_packet.nu * doppler_factor
+        start_line_id = r_packet.next_line_id
         chi_e = chi_electron_calculator(
             opacity_state, comov_nu, r_packet.current_shell_id
         )
@@ -157,6 +172,13 @@ def single_packet_loop(
 
         # If continuum processes: update continuum estimators
 
+        if transport_profile is not None:
+            update_transport_profile(
+                transport_profile,
+                interaction_type,
+                r_packet.next_line_id - start_line_id,
+            )
+
         if interaction_type == InteractionType.BOUNDARY:
             rpacket_tracker.track_boundary_interaction(
                 r_packet.current_shell_id,
@@ -190,6 +212,7 @@ def single_packet_loop(
                 line_interaction_type,
                 opacity_state,
                 montecarlo_configuration.ENABLE_FULL_RELATIVITY,
+                transport_profile,
             )
             trace_vpacket_volley(
                 r_packet,
@@ -200,6 +223,7 @@ def single_packet_loop(
                 montecarlo_configuration.ENABLE_FULL_RELATIVITY,
                 montecarlo_configuration.VPACKET_TAU_RUSSIAN,
                 montecarlo_configuration.SURVIVAL_PROBABILITY,
+                transport_profile,
             )
 
         elif interaction_type == InteractionType.ESCATTERING:
@@ -227,6 +251,7 @@ def single_packet_loop(
                 montecarlo_configuration.ENABLE_FULL_RELATIVITY,
                 montecarlo_configuration.VPACKET_TAU_RUSSIAN,
                 montecarlo_configuration.SURVIVAL_PROBABILITY,
+                transport_profile,
             )
         elif (
             montecarlo_globals.CONTINUUM_PROCESSES_ENABLED
@@ -249,6 +274,7 @@ def single_packet_loop(
                 chi_bf_contributions,
                 current_continua,
                 montecarlo_configuration.ENABLE_FULL_RELATIVITY,
+                transport_profile,
             )
 
             trace_vpacket_volley(
@@ -260,6 +286,7 @@ def single_packet_loop(
                 montecarlo_configuration.ENABLE_FULL_RELATIVITY,
                 montecarlo_configuration.VPACKET_TAU_RUSSIAN,
                 montecarlo_configuration.SURVIVAL_PROBABILITY,
+                transport_profile,
             )
         else:
             pass
@@ -283,6 +310,33 @@ def single_packet_loop(
         rpacket_tracker.track(temp_r_packet)
 
 
+@njit
+def update_transport_profile(
+    transport_profile, interaction_type, lines_traversed
+):
+    """Count one step of the r-packet in the transport profile
+
+    Parameters
+    ----------
+    transport_profile : numpy.ndarray
+        Counters of the thread
+    interaction_type : int
+        Interaction that ended the step
+    lines_traversed : int
+        Number of lines the r-packet passed in the step
+    """
+    transport_profile[RPACKET_STEPS] += 1
+    transport_profile[LINES_TRAVERSED] += lines_traversed
+    if interaction_type == InteractionType.BOUNDARY:
+        transport_profile[BOUNDARY_CROSSINGS] += 1
+    elif interaction_type == InteractionType.LINE:
+        transport_profile[LINE_INTERACTIONS] += 1
+    elif interaction_type == InteractionType.ESCATTERING:
+        transport_profile[ESCATTERINGS] += 1
+    elif interaction_type == InteractionType.CONTINUUM_PROCESS:
+        transport_profile[CONTINUUM_INTERACTIONS] += 1
+
+
 @njit
 def set_packet_props_partial_relativity(r_packet, time_explosion):
     """Sets properties of the packets given partial relativity
@@ -70,11 +70,7 @@ def verysimple_estimators(nb_simulation_verysimple):
         transport.nu_bar_estimator,
         transport.j_blue_estimator,
         transport.Edotlu_estimator,
-        transport.photo_ion_estimator,
-        transport.stim_recomb_estimator,
-        transport.bf_heating_estimator,
-        transport.stim_recomb_cooling_estimator,
-        transport.photo_ion_estimator_statistics,
+        transport.bound_free_estimator,
     )
 
 
@@ -4,6 +4,9 @@ import numpy.testing as npt
 import pytest
 
 from tardis.simulation import Simulation
+from tardis.transport.montecarlo.packets.radiative_packet import (
+    InteractionType,
+)
 
 
 @pytest.mark.xfail(reason="To be implemented")
@@ -157,3 +160,50 @@ def test_montecarlo_main_loop_hydrogen_only(
     npt.assert_allclose(
         transport.j_estimator, expected_j_estimator, atol=0, rtol=1e-12
     )
+
+
+def test_montecarlo_main_loop_transport_profile(
+    config_verysimple, atomic_dataset
+):
+    config = deepcopy(config_verysimple)
+    config.montecarlo.no_of_virtual_packets = 2
+
+    transport_states = []
+    for enable_transport_profiling in (False, True):
+        config.montecarlo.enable_transport_profiling = (
+            enable_transport_profiling
+        )
+        simulation = Simulation.from_config(
+            config, atom_data=deepcopy(atomic_dataset)
+        )
+        simulation.iterate(1000, no_of_virtual_packets=2)
+        transport_states.append(simulation.transport.transport_state)
+
+    # the counters do not change the transport
+    npt.assert_array_equal(
+        transport_states[1].packet_collection.output_nus,
+        transport_states[0].packet_collection.output_nus,
+    )
+    npt.assert_array_equal(
+        transport_states[1].radfield_mc_estimators.j_estimator,
+        transport_states[0].radfield_mc_estimators.j_estimator,
+    )
+    assert transport_states[0].transport_profile is None
+
+    profile = transport_states[1].transport_profile["count"]
+    last_interaction_type = transport_states[1].last_interaction_type
+    assert profile["rpacket_steps"] == (
+        profile["boundary_crossings"]
+        + profile["line_interactions"]
+        + profile["escatterings"]
+        + profile["continuum_interactions"]
+    )
+    assert profile["line_interactions"] >= (
+        last_interaction_type == InteractionType.LINE
+    ).sum()
+    assert profile["macro_atom_jumps"] >= profile["line_interactions"]
+    # one volley at the start and after every interaction
+    assert profile["vpackets"] <= 2 * (
+        1000 + profile["rpacket_steps"] - profile["boundary_crossings"]
+    )
+    assert profile["vpacket_shell_steps"] >= profile["vpackets"]
@@ -1,11 +1,29 @@
 import numpy as np
+import pandas as pd
+import pytest
 from numba import typeof
 
+from tardis.transport.montecarlo.packets.packet_collections import (
+    consolidate_vpacket_storage,
+    initialize_compact_vpacket_storage,
+    initialize_vpacket_storage,
+)
 from tardis.transport.montecarlo.packets.packet_trackers import (
+    CompactRPacketTracker,
+    RPacketEventLog,
     RPacketLastInteractionTracker,
     RPacketTracker,
+    RPacketTrackingFilter,
+    generate_compact_rpacket_tracker_list,
+    generate_rpacket_event_log_list,
     generate_rpacket_last_interaction_tracker_list,
     generate_rpacket_tracker_list,
+    rpacket_event_logs_to_dataframe,
+)
+from tardis.transport.montecarlo.packets.radiative_packet import (
+    InteractionType,
+    PacketStatus,
+    RPacket,
 )
 
 
@@ -35,3 +53,180 @@ def test_generate_rpacket_last_interaction_tracker_list():
     assert typeof(
         rpacket_last_interaction_tracker_list[random_index]
     ) == typeof(RPacketLastInteractionTracker())
+
+
+def test_generate_compact_rpacket_tracker_list():
+    no_of_packets = 10
+    length = 10
+
+    rpacket_tracker_list = generate_compact_rpacket_tracker_list(
+        no_of_packets, length
+    )
+
+    assert len(rpacket_tracker_list) == no_of_packets
+    assert typeof(rpacket_tracker_list[0]) == typeof(
+        CompactRPacketTracker(length)
+    )
+    assert rpacket_tracker_list[0].mu.dtype == np.float32
+    assert rpacket_tracker_list[0].interaction_type.dtype == np.int8
+    assert rpacket_tracker_list[0].shell_id.dtype == np.int32
+
+    # the default trackers keep the full precision types
+    rpacket_tracker = RPacketTracker(length)
+    assert rpacket_tracker.mu.dtype == np.float64
+    assert rpacket_tracker.interaction_type.dtype == np.int64
+    assert rpacket_tracker.shell_id.dtype == np.int64
+
+
+@pytest.mark.parametrize(
+    ["initialize_storage", "type_dtype", "id_dtype"],
+    [
+        (initialize_vpacket_storage, np.int64, np.int64),
+        (initialize_compact_vpacket_storage, np.int8, np.int32),
+    ],
+)
+def test_vpacket_and_last_interaction_storage_types(
+    initialize_storage, type_dtype, id_dtype
+):
+    spectrum_frequency_grid = np.linspace(1e14, 1e16, 11)
+    (
+        vpacket_collections,
+        vpacket_tracker,
+        last_interaction_tracker,
+    ) = initialize_storage(3, spectrum_frequency_grid, 1e14, 1e16, 2, 1)
+    for index, vpacket_collection in enumerate(vpacket_collections):
+        for _ in range(index + 1):
+            vpacket_collection.add_packet(
+                1e15, 0.5, 0.1, 1e14, 2e15, 1e14, 2, 1000 + index, 5, index
+            )
+        vpacket_collection.finalize_arrays()
+
+    vpacket_tracker = consolidate_vpacket_storage(
+        vpacket_collections, vpacket_tracker
+    )
+    assert vpacket_tracker.last_interaction_type.dtype == type_dtype
+    assert vpacket_tracker.last_interaction_in_id.dtype == id_dtype
+    assert vpacket_tracker.last_interaction_shell_id.dtype == id_dtype
+    np.testing.assert_array_equal(
+        vpacket_tracker.last_interaction_in_id, [1000, 1001, 1001, 1002, 1002, 1002]
+    )
+
+    assert last_interaction_tracker.types.dtype == type_dtype
+    assert last_interaction_tracker.out_ids.dtype == id_dtype
+    np.testing.assert_array_equal(last_interaction_tracker.shell_ids, -1)
+
+
+def test_generate_rpacket_event_log_list():
+    no_of_threads = 4
+    chunk_length = 10
+
+    rpacket_event_logs = generate_rpacket_event_log_list(
+        no_of_threads, chunk_length, RPacketTrackingFilter()
+    )
+
+    assert len(rpacket_event_logs) == no_of_threads
+    assert rpacket_event_logs[0].chunk_length == chunk_length
+    assert typeof(rpacket_event_logs[0]) == typeof(
+        RPacketEventLog(chunk_length, RPacketTrackingFilter())
+    )
+
+
+def test_rpacket_event_log_chunks():
+    chunk_length = 3
+    rpacket_event_log = RPacketEventLog(chunk_length, RPacketTrackingFilter())
+    no_of_steps = [4, 1, 7]
+
+    for index, steps in enumerate(no_of_steps):
+        r_packet = RPacket(1e15, 0.5, 1e15, 1.0, 1963, index)
+        for step in range(steps):
+            r_packet.current_shell_id = step
+            rpacket_event_log.track(r_packet)
+            rpacket_event_log.track_boundary_interaction(step, step + 1)
+    rpacket_event_log.finalize_array()
+
+    # 12 events fill chunks of 3 and 6 events and start a chunk of 12
+    assert [len(chunk) for chunk in rpacket_event_log.chunks] == [3, 6, 12]
+    events = rpacket_event_log.events
+    np.testing.assert_array_equal(
+        events["index"], np.repeat(np.arange(3), no_of_steps)
+    )
+    np.testing.assert_array_equal(
+        events["step"], np.concatenate([np.arange(n) for n in no_of_steps])
+    )
+    np.testing.assert_array_equal(events["shell_id"], events["step"])
+    np.testing.assert_array_equal(
+        rpacket_event_log.boundary_interactions["event_id"], events["step"] + 1
+    )
+
+    rtracker_df = rpacket_event_logs_to_dataframe([rpacket_event_log])
+    assert rtracker_df.loc[2].shape == (7, 8)
+
+
+def test_rpacket_event_logs_to_dataframe_sort():
+    # packets are distributed over the threads in turn
+    rpacket_event_logs = [
+        RPacketEventLog(2, RPacketTrackingFilter()) for thread in range(2)
+    ]
+    no_of_steps = [3, 1, 2, 4]
+    for index, steps in enumerate(no_of_steps):
+        r_packet = RPacket(1e15, 0.5, 1e15, 1.0, 1963, index)
+        for step in range(steps):
+            r_packet.current_shell_id = step
+            rpacket_event_logs[index % 2].track(r_packet)
+    for rpacket_event_log in rpacket_event_logs:
+        rpacket_event_log.finalize_array()
+
+    rtracker_df = rpacket_event_logs_to_dataframe(rpacket_event_logs)
+    np.testing.assert_array_equal(
+        rtracker_df.index.get_level_values("index"),
+        np.repeat(np.arange(4), no_of_steps),
+    )
+    np.testing.assert_array_equal(
+        rtracker_df.index.get_level_values("step"), rtracker_df["shell_id"]
+    )
+
+    unsorted_df = rpacket_event_logs_to_dataframe(
+        rpacket_event_logs, sort=False
+    )
+    np.testing.assert_array_equal(
+        unsorted_df.index.get_level_values("index"),
+        np.repeat([0, 2, 1, 3], [3, 2, 1, 4]),
+    )
+    pd.testing.assert_frame_equal(unsorted_df.sort_index(), rtracker_df)
+
+
+def test_rpacket_event_log_filter():
+    tracking_filter = RPacketTrackingFilter(
+        packet_stride=2,
+        interaction_type_mask=int(InteractionType.LINE),
+        shell_start=1,
+        emitted_only=True,
+    )
+    rpacket_event_log = RPacketEventLog(2, tracking_filter)
+    interaction_types = [
+        InteractionType.NO_INTERACTION,
+        InteractionType.LINE,
+        InteractionType.ESCATTERING,
+        InteractionType.LINE,
+    ]
+
+    for index in range(6):
+        r_packet = RPacket(1e15, 0.5, 1e15, 1.0, 1963, index)
+        for step, interaction_type in enumerate(interaction_types):
+            r_packet.current_shell_id = step
+            r_packet.last_interaction_type = interaction_type
+            rpacket_event_log.track(r_packet)
+            rpacket_event_log.track_boundary_interaction(step, step + 1)
+        # only packet 2 escapes, packets 1, 3 and 5 are skipped by the stride
+        if index == 2:
+            r_packet.status = PacketStatus.EMITTED
+        else:
+            r_packet.status = PacketStatus.REABSORBED
+        rpacket_event_log.end_packet(r_packet)
+    rpacket_event_log.finalize_array()
+
+    events = rpacket_event_log.events
+    np.testing.assert_array_equal(events["index"], [2, 2])
+    # step 0 is outside the shell range and step 2 is an e-scattering
+    np.testing.assert_array_equal(events["step"], [1, 3])
+    assert len(rpacket_event_log.boundary_interactions) == 0
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+
+# Indices of the hot-path counters of the Monte Carlo transport kernels.
+# Plain integers, as numba does not index arrays with IntEnum members.
+RPACKET_STEPS = 0
+LINES_TRAVERSED = 1
+BOUNDARY_CROSSINGS = 2
+LINE_INTERACTIONS = 3
+ESCATTERINGS = 4
+CONTINUUM_INTERACTIONS = 5
+MACRO_ATOM_JUMPS = 6
+VPACKETS = 7
+VPACKET_SHELL_STEPS = 8
+VPACKET_LINES_TRAVERSED = 9
+
+TRANSPORT_PROFILE_COUNTERS = (
+    "rpacket_steps",
+    "lines_traversed",
+    "boundary_crossings",
+    "line_interactions",
+    "escatterings",
+    "continuum_interactions",
+    "macro_atom_jumps",
+    "vpackets",
+    "vpacket_shell_steps",
+    "vpacket_lines_traversed",
+)
+
+
+def initialize_transport_profiles(number_of_threads):
+    """
+    Initialize the per-thread counter arrays of the transport profile.
+
+    The kernels take the row of their thread as the optional
+    `transport_profile` argument. Kernels called without it are compiled
+    without the counters.
+
+    Parameters
+    ----------
+    number_of_threads : int
+        Number of threads of the Monte Carlo main loop
+
+    Returns
+    -------
+    numpy.ndarray
+        Zeroed counters of shape
+        (number_of_threads, len(TRANSPORT_PROFILE_COUNTERS))
+    """
+    return np.zeros(
+        (number_of_threads, len(TRANSPORT_PROFILE_COUNTERS)),
+        dtype=np.int64,
+    )
+
+
+def transport_profiles_to_dataframe(transport_profiles, number_of_packets):
+    """
+    Reduce the per-thread counters to the profile of one iteration.
+
+    Parameters
+    ----------
+    transport_profiles : numpy.ndarray
+        Per-thread counters filled by the Monte Carlo main loop
+    number_of_packets : int
+        Number of r-packets of the iteration
+
+    Returns
+    -------
+    pandas.DataFrame
+        Total count and count per r-packet of every counter
+    """
+    counts = transport_profiles.sum(axis=0)
+    return pd.DataFrame(
+        {
+            "count": counts,
+            "per_packet": counts / max(number_of_packets, 1),
+        },
+        index=pd.Index(TRANSPORT_PROFILE_COUNTERS, name="counter"),
+    )
@@ -201,6 +201,10 @@ def process_line_interactions(packet_data, lines_df):
     - Atomic number of the last interaction (out).
     - Species ID (Z * 100 + ion number).
 
+    The integer species ID is computed once here so that the plotters can
+    histogram all species with a single `np.bincount` (see
+    `get_species_histograms`) instead of grouping the packets per species.
+
     Parameters
     ----------
     packet_data : dict
@@ -216,46 +220,90 @@ def process_line_interactions(packet_data, lines_df):
         line_mask = (packets_df["last_interaction_type"] > InteractionType.NO_INTERACTION) & (
             packets_df["last_line_interaction_in_id"] > -1
         )
-        packet_data["packets_df_line_interaction"] = packets_df.loc[
-            line_mask
-        ].copy()
+        packets_df_line_interaction = packets_df.loc[line_mask].copy()
+
+        line_out_ids = packets_df_line_interaction[
+            "last_line_interaction_out_id"
+        ].to_numpy()
+        atomic_numbers = lines_df["atomic_number"].to_numpy()[line_out_ids]
+        ion_numbers = lines_df["ion_number"].to_numpy()[line_out_ids]
 
         # Add columns for atomic number of last interaction out
-        packet_data["packets_df_line_interaction"][
-            "last_line_interaction_atom"
-        ] = list(
-            zip(
-                lines_df["atomic_number"]
-                .iloc[
-                    packet_data["packets_df_line_interaction"][
-                        "last_line_interaction_out_id"
-                    ]
-                ]
-                .to_numpy(),
-                [0] * len(packet_data["packets_df_line_interaction"]),
-            )
+        packets_df_line_interaction["last_line_interaction_atom"] = list(
+            zip(atomic_numbers, np.zeros_like(atomic_numbers))
         )
 
         # Add columns for the species ID of last interaction
-        packet_data["packets_df_line_interaction"][
-            "last_line_interaction_species"
-        ] = list(zip(
-            lines_df["atomic_number"]
-            .iloc[
-                packet_data["packets_df_line_interaction"][
-                    "last_line_interaction_out_id"
-                ]
-            ]
-            .to_numpy()
-            ,
-            + lines_df["ion_number"]
-            .iloc[
-                packet_data["packets_df_line_interaction"][
-                    "last_line_interaction_out_id"
-                ]
-            ]
-            .to_numpy()
-        ))
+        packets_df_line_interaction["last_line_interaction_species"] = list(
+            zip(atomic_numbers, ion_numbers)
+        )
+        packets_df_line_interaction["last_line_interaction_species_id"] = (
+            atomic_numbers.astype(np.int64) * 100 + ion_numbers
+        )
+
+        packet_data["packets_df_line_interaction"] = packets_df_line_interaction
+
+
+def get_species_histograms(species_ids, values, bin_edges, weights=None):
+    """
+    Histogram the values of every species at once.
+
+    Every value is assigned to a (species, bin) pair, with the same bin
+    convention as `np.histogram`: bins are half-open except for the last
+    one, which includes its right edge, and values outside the bin edges
+    are dropped. Counts are taken with a single `np.bincount`. Weighted
+    histograms are summed with `np.histogram` on the values of each species,
+    taken as contiguous slices after one stable sort by species, so that
+    they agree bit for bit with histogramming every species separately in
+    the original packet order.
+
+    Parameters
+    ----------
+    species_ids : np.ndarray
+        Integer species ID (Z * 100 + ion number) of every packet.
+    values : np.ndarray
+        Value to histogram of every packet.
+    bin_edges : np.ndarray
+        Monotonically increasing bin edges.
+    weights : np.ndarray, optional
+        Weight of every packet. If None, packets are counted.
+
+    Returns
+    -------
+    species : np.ndarray
+        Sorted unique species IDs.
+    histograms : np.ndarray
+        Histogram of every species, of shape (len(species), len(bin_edges) - 1).
+    """
+    number_of_bins = len(bin_edges) - 1
+
+    if weights is not None:
+        sorting_index = np.argsort(species_ids, kind="stable")
+        species, species_start = np.unique(
+            species_ids[sorting_index], return_index=True
+        )
+        species_stop = np.append(species_start[1:], len(sorting_index))
+        sorted_values = values[sorting_index]
+        sorted_weights = weights[sorting_index]
+        histograms = np.zeros((len(species), number_of_bins))
+        for i, (start, stop) in enumerate(zip(species_start, species_stop)):
+            histograms[i] = np.histogram(
+                sorted_values[start:stop],
+                bins=bin_edges,
+                weights=sorted_weights[start:stop],
+            )[0]
+        return species, histograms
+
+    species, species_index = np.unique(species_ids, return_inverse=True)
+    bin_index = np.searchsorted(bin_edges, values, side="right") - 1
+    bin_index[values == bin_edges[-1]] = number_of_bins - 1
+    in_range = (bin_index >= 0) & (bin_index < number_of_bins)
+
+    histograms = np.bincount(
+        species_index[in_range] * number_of_bins + bin_index[in_range],
+        minlength=len(species) * number_of_bins,
+    )
+    return species, histograms.reshape(len(species), number_of_bins)
 
 
 def extract_and_process_packet_data_hdf(hdf, packets_mode):
@@ -10,6 +10,7 @@ from tardis.visualization.plot_util import (
     expand_species_list,
     extract_and_process_packet_data,
     get_mid_point_idx,
+    get_species_histograms,
     get_spectrum_data,
     parse_species_list_util,
     to_rgb255_string,
@@ -155,6 +156,16 @@ class TestPlotUtil:
                 .to_numpy(),
             )
         )
+        expected_df_line_interaction["last_line_interaction_species_id"] = (
+            lines_df["atomic_number"]
+            .iloc[expected_df_line_interaction["last_line_interaction_out_id"]]
+            .to_numpy()
+            .astype(np.int64)
+            * 100
+            + lines_df["ion_number"]
+            .iloc[expected_df_line_interaction["last_line_interaction_out_id"]]
+            .to_numpy()
+        )
 
         pd.testing.assert_frame_equal(
             actual_data["packets_df"].reset_index(drop=True),
@@ -299,3 +310,26 @@ class TestPlotUtil:
         )
         actual = generate_masked_dataframe_hdf[mode].masked_df
         pd.testing.assert_frame_equal(actual, expected)
+
+    @pytest.mark.parametrize("weighted", [True, False])
+    def test_get_species_histograms(self, weighted):
+        rng = np.random.default_rng(2024)
+        species_ids = rng.choice([1400, 1401, 2000, 2601], size=1000)
+        values = rng.uniform(-1.0, 11.0, size=1000)
+        bin_edges = np.linspace(0.0, 10.0, 21)
+        values[:3] = bin_edges[[0, 5, -1]]
+        weights = rng.uniform(size=1000) if weighted else None
+
+        species, histograms = get_species_histograms(
+            species_ids, values, bin_edges, weights=weights
+        )
+
+        np.testing.assert_array_equal(species, [1400, 1401, 2000, 2601])
+        for species_id, histogram in zip(species, histograms):
+            species_mask = species_ids == species_id
+            expected, _ = np.histogram(
+                values[species_mask],
+                bins=bin_edges,
+                weights=None if weights is None else weights[species_mask],
+            )
+            np.testing.assert_array_equal(histogram, expected)
@@ -6,6 +6,7 @@ import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 
+from tardis.io.columnar_store import open_simulation_store
 from tardis.util.base import (
     atomic_number2element_symbol,
     int_to_roman,
@@ -70,14 +71,15 @@ class LIVPlotter:
         Parameters
         ----------
         hdf_fpath : str
-            Valid path to the HDF file where simulation is saved.
+            Valid path to the HDF file where simulation is saved, written
+            either by `to_hdf` or `to_columnar`.
 
         Returns
         -------
         LIVPlotter
         """
         plotter = cls()
-        with pd.HDFStore(hdf_fpath, "r") as hdf:
+        with open_simulation_store(hdf_fpath) as hdf:
             plotter.time_explosion = (
                 hdf["/simulation/plasma/scalars"]["time_explosion"] * u.s
             )
@@ -164,17 +166,20 @@ class LIVPlotter:
             self._keep_colour = None
 
         if nelements:
-            interaction_counts = self.packet_data[packets_mode][
-                "packets_df_line_interaction"
-            ]["last_line_interaction_species"].value_counts()
-            # interaction_counts.index = interaction_counts.index // 100
-            element_counts = interaction_counts.groupby(
-                interaction_counts.index
-            ).sum()
-            top_elements = element_counts.nlargest(nelements).index
+            species_ids, interaction_counts = np.unique(
+                self.packet_data[packets_mode]["packets_df_line_interaction"][
+                    "last_line_interaction_species_id"
+                ],
+                return_counts=True,
+            )
+            top_species_ids = (
+                pd.Series(interaction_counts, index=species_ids)
+                .nlargest(nelements)
+                .index
+            )
             top_species_list = [
-                atomic_number2element_symbol(element[0])
-                for element in top_elements
+                atomic_number2element_symbol(species_id // 100)
+                for species_id in top_species_ids
             ]
             self._parse_species_list(top_species_list, packets_mode)
 
@@ -229,46 +234,69 @@ class LIVPlotter:
 
     def _generate_plot_data(self, packets_mode):
         """
-        Generate plot data and colors for species in the model.
+        Generate plot data, histograms and colors for species in the model.
+
+        The last interaction velocities of all species are binned at once
+        with `plot_util.get_species_histograms`, using the species IDs
+        cached in the packet data.
 
         Parameters
         ----------
         packets_mode : str
             Packet mode, either 'virtual' or 'real'.
         """
-        groups = (
-            self.packet_data[packets_mode]["packets_df_line_interaction"]
-            .loc[self.packet_nu_line_range_mask]
-            .groupby(by="last_line_interaction_species")
+        line_interaction_df = self.packet_data[packets_mode][
+            "packets_df_line_interaction"
+        ].loc[self.packet_nu_line_range_mask]
+        species_ids = line_interaction_df[
+            "last_line_interaction_species_id"
+        ].to_numpy()
+        r_last_interaction = (
+            line_interaction_df["last_interaction_in_r"].to_numpy() * u.cm
+        )
+        v_last_interaction = (r_last_interaction / self.time_explosion).to(
+            "km/s"
+        )
+
+        # Sorting the packets by species makes the velocities of every
+        # species a contiguous slice, in the original packet order
+        sorting_index = np.argsort(species_ids, kind="stable")
+        sorted_species_ids = species_ids[sorting_index]
+        sorted_v_last_interaction = v_last_interaction[sorting_index]
+        species_in_range, species_histograms = pu.get_species_histograms(
+            species_ids,
+            v_last_interaction.value,
+            self.new_bin_edges.to_value("km/s"),
         )
 
         self.plot_colors = []
         self.plot_data = []
+        self.plot_histograms = []
         species_not_wvl_range = []
         species_counter = 0
 
-        time_explosion = self.time_explosion
-
         for species_list in self._species_mapped.values():
             full_v_last = []
+            histogram = np.zeros(len(self.new_bin_edges) - 1, dtype=np.int64)
             for species in species_list:
                 if species in self.species:
-                    if species not in groups.groups:
+                    species_id = species[0] * 100 + species[1]
+                    start, stop = np.searchsorted(
+                        sorted_species_ids, [species_id, species_id + 1]
+                    )
+                    if start == stop:
                         atomic_number, ion_number = species
                         ion_numeral = int_to_roman(ion_number + 1)
                         label = f"{atomic_number2element_symbol(atomic_number)} {ion_numeral}"
                         species_not_wvl_range.append(label)
                         continue
-                    g_df = groups.get_group(species)
-                    r_last_interaction = (
-                        g_df["last_interaction_in_r"].values * u.cm
-                    )
-                    v_last_interaction = (
-                        r_last_interaction / time_explosion
-                    ).to("km/s")
-                    full_v_last.extend(v_last_interaction)
+                    full_v_last.append(sorted_v_last_interaction[start:stop])
+                    histogram += species_histograms[
+                        np.searchsorted(species_in_range, species_id)
+                    ]
             if full_v_last:
-                self.plot_data.append(full_v_last)
+                self.plot_data.append(np.concatenate(full_v_last))
+                self.plot_histograms.append(histogram)
                 self.plot_colors.append(self._color_list[species_counter])
                 species_counter += 1
 
@@ -323,13 +351,14 @@ class LIVPlotter:
             found in the model.
         """
         # Extract all unique elements from the packets data
-        species_in_model = np.unique(
-            self.packet_data[packets_mode]["packets_df_line_interaction"][
-                "last_line_interaction_species"
-            ]
-            .apply(lambda x: (int(x[0]), int(x[1])))
-            .to_numpy()
-        )
+        species_in_model = [
+            (int(species_id // 100), int(species_id % 100))
+            for species_id in np.unique(
+                self.packet_data[packets_mode]["packets_df_line_interaction"][
+                    "last_line_interaction_species_id"
+                ]
+            )
+        ]
         if species_list is None:
             species_list = [
                 f"{atomic_number2element_symbol(species[0])}"
@@ -355,7 +384,6 @@ class LIVPlotter:
             column_name="nus",
         )
 
-        self._generate_plot_data(packets_mode)
         bin_edges = (self.velocity).to("km/s")
 
         if num_bins:
@@ -373,18 +401,19 @@ class LIVPlotter:
         else:
             self.new_bin_edges = bin_edges
 
-    def _get_step_plot_data(self, data, bin_edges):
+        self._generate_plot_data(packets_mode)
+
+    def _get_step_plot_data(self, hist, bin_edges):
         """
         Generate step plot data from histogram data.
 
         Parameters
         ----------
-        data : array-like
-            Data to be binned into a histogram.
+        hist : array-like
+            Packet counts of the bins.
         bin_edges : array-like
             Edges of the bins for the histogram.
         """
-        hist, _ = np.histogram(data, bins=bin_edges)
         self.step_x = np.repeat(bin_edges, 2)[1:-1]
         self.step_y = np.repeat(hist, 2)
 
@@ -461,10 +490,10 @@ class LIVPlotter:
         else:
             self.ax = ax
 
-        for data, color, name in zip(
-            self.plot_data, self.plot_colors, self._species_name
+        for hist, color, name in zip(
+            self.plot_histograms, self.plot_colors, self._species_name
         ):
-            self._get_step_plot_data(data, bin_edges)
+            self._get_step_plot_data(hist, bin_edges)
             self.ax.plot(
                 self.step_x,
                 self.step_y,
@@ -563,10 +592,10 @@ class LIVPlotter:
         else:
             self.fig = fig
 
-        for data, color, name in zip(
-            self.plot_data, self.plot_colors, self._species_name
+        for hist, color, name in zip(
+            self.plot_histograms, self.plot_colors, self._species_name
         ):
-            self._get_step_plot_data(data, bin_edges)
+            self._get_step_plot_data(hist, bin_edges)
             self.fig.add_trace(
                 go.Scatter(
                     x=self.step_x,
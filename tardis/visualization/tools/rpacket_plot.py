@@ -228,7 +228,11 @@ class RPacketPlotter:
             "#How-to-Setup-the-Tracking-for-the-RPackets?"
         )
 
-    def generate_plot(self, theme: str = "light") -> go.Figure:
+    def generate_plot(
+        self,
+        theme: str = "light",
+        max_steps_per_packet: Optional[int] = None,
+    ) -> go.Figure:
         """
         Create an animated plotly plot showing Monte Carlo packet trajectories.
 
@@ -241,6 +245,10 @@ class RPacketPlotter:
         theme : str, optional
             Visual theme for the plot, by default "light".
             Must be either "light" or "dark".
+        max_steps_per_packet : int, optional
+            If given, trajectories with more steps are decimated to this
+            number of steps, which keeps plots and animations of many or
+            long-lived packets interactive. By default all steps are shown.
 
         Returns
         -------
@@ -251,36 +259,52 @@ class RPacketPlotter:
         Raises
         ------
         ValueError
-            If theme is not "light" or "dark".
+            If theme is not "light" or "dark", or if max_steps_per_packet
+            is smaller than 2.
         """
         if theme not in ("light", "dark"):
             msg = f"Theme must be 'light' or 'dark', got '{theme}'"
             raise ValueError(msg)
+        if max_steps_per_packet is not None and max_steps_per_packet < 2:
+            msg = "max_steps_per_packet must be at least 2"
+            raise ValueError(msg)
         self.fig = go.Figure()
 
         # getting velocity of different shells
         v_shells = self.sim.simulation_state.velocity.to_value(u.km / u.s)
 
-        # getting coordinates and interactions of all packets
-        (
-            rpacket_x,
-            rpacket_y,
-            rpacket_interactions,
-        ) = self.get_coordinates_multiple_packets(
-            self.sim.transport.transport_state.rpacket_tracker_df.loc[
-                0 : (self.no_of_packets)
-            ],
+        # getting coordinates and interactions of all packets, padded to
+        # the length of the longest trajectory
+        r, mu, interaction_type, packet_offsets = self.get_tracker_arrays(
+            self.sim.transport.transport_state.rpacket_tracker_df
         )
-
-        # making the coordinate arrays of all packets equal
         (
             rpacket_x,
             rpacket_y,
             rpacket_interactions,
-            rpacket_array_max_size,
-        ) = self.get_equal_array_size(
-            rpacket_x, rpacket_y, rpacket_interactions
+            rpacket_lengths,
+        ) = self.get_trajectory_coordinates(
+            r,
+            mu,
+            interaction_type,
+            packet_offsets,
+            self.sim.simulation_state.time_explosion.value,
+            np.linspace(0, 2 * np.pi, self.no_of_packets + 1)[:-1],
         )
+        if max_steps_per_packet is not None:
+            (
+                rpacket_x,
+                rpacket_y,
+                rpacket_interactions,
+                rpacket_lengths,
+            ) = self.decimate_trajectories(
+                rpacket_x,
+                rpacket_y,
+                rpacket_interactions,
+                rpacket_lengths,
+                max_steps_per_packet,
+            )
+        rpacket_array_max_size = rpacket_x.shape[1]
 
         axis_props = dict(
             range=[-1.1 * v_shells[-1], 1.1 * v_shells[-1]],
@@ -447,6 +471,212 @@ class RPacketPlotter:
 
         return self.fig
 
+    def get_tracker_arrays(
+        self, r_packet_tracker: pd.DataFrame
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Extract the flat tracker columns of the plotted packets.
+
+        The plotted packets are the no_of_packets tracked packets with the
+        lowest packet index. The packet indices need not be contiguous, for
+        example when only every n-th packet is tracked.
+
+        Parameters
+        ----------
+        r_packet_tracker : pd.DataFrame
+            DataFrame containing packet tracking data, indexed by packet
+            index and step, with columns for radius, direction cosine and
+            interaction types.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+            Four-element tuple containing:
+            - Radius of all steps of the plotted packets (cm)
+            - Direction cosine of all steps
+            - Interaction type of all steps
+            - Offsets of the steps of every packet, of length no_of_packets + 1
+
+        Raises
+        ------
+        ValueError
+            If fewer than no_of_packets packets are tracked.
+        """
+        packet_index = r_packet_tracker.index.get_level_values(0).to_numpy()
+        # steps of a packet are contiguous, ordered by step number
+        sorting_index = np.argsort(packet_index, kind="stable")
+        packet_ids, packet_starts = np.unique(
+            packet_index[sorting_index], return_index=True
+        )
+        if len(packet_ids) < self.no_of_packets:
+            msg = (
+                f"Only {len(packet_ids)} packets are tracked, "
+                f"{self.no_of_packets} were requested"
+            )
+            raise ValueError(msg)
+        packet_offsets = np.append(packet_starts, len(sorting_index))
+        packet_offsets = packet_offsets[: self.no_of_packets + 1]
+        steps = sorting_index[: packet_offsets[-1]]
+
+        return (
+            r_packet_tracker["r"].to_numpy()[steps],
+            r_packet_tracker["mu"].to_numpy()[steps],
+            r_packet_tracker["interaction_type"].to_numpy()[steps],
+            packet_offsets,
+        )
+
+    def get_trajectory_coordinates(
+        self,
+        r: np.ndarray,
+        mu: np.ndarray,
+        interaction_type: np.ndarray,
+        packet_offsets: np.ndarray,
+        time: float,
+        theta_initial: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Generate 2D coordinates for many packet trajectories at once.
+
+        The steps of all packets are gathered into arrays of shape
+        (number of packets, longest trajectory), padded with the last step
+        of every packet. The change of the polar angle between consecutive
+        steps is computed for all steps at once and accumulated with a
+        cumulative sum along every trajectory.
+
+        Parameters
+        ----------
+        r : np.ndarray
+            Radial position of the packets at every step (in cm), with the
+            steps of every packet stored contiguously.
+        mu : np.ndarray
+            Cosine of radial angle of the packets at every step.
+        interaction_type : np.ndarray
+            Interaction type of the packets at every step.
+        packet_offsets : np.ndarray
+            Index of the first step of every packet in the flat arrays,
+            followed by the total number of steps.
+        time : float
+            Time since explosion occurrence (in seconds).
+        theta_initial : np.ndarray
+            Launch angle from x-axis at photosphere of every packet.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+            Four-element tuple containing:
+            - x coordinates of the packets at different steps (km/s)
+            - y coordinates of the packets at different steps (km/s)
+            - interaction types occurring at different points
+            - number of steps of every packet
+
+        Raises
+        ------
+        ValueError
+            If a packet has no steps.
+
+        Notes
+        -----
+        The padding repeats the final position and interaction type of every
+        packet, as done by `get_equal_array_size`. The trajectory calculation
+        follows the spherical geometry described in the TARDIS documentation.
+        """
+        packet_offsets = np.asarray(packet_offsets)
+        rpacket_lengths = np.diff(packet_offsets)
+        if np.any(rpacket_lengths < 1):
+            msg = "Every plotted packet needs at least one tracked step"
+            raise ValueError(msg)
+        step_no = np.arange(rpacket_lengths.max())
+        steps = packet_offsets[:-1, None] + np.minimum(
+            step_no, rpacket_lengths[:, None] - 1
+        )
+
+        r_track = r[steps]
+        prev_r = r_track[:, :-1]
+        curr_r = r_track[:, 1:]
+        acos_mu = np.arccos(mu[steps][:, :-1])
+        sin_term = prev_r * np.sin(acos_mu) / curr_r
+
+        # change of theta between steps with the formula derived in the documentation
+        # https://tardis-sn.github.io/tardis/analyzing_tardis/visualization/tutorial_montecarlo_packet_visualization.html#Getting-packet-coordinates
+        delta_theta = np.where(
+            curr_r < prev_r,
+            acos_mu - np.pi + np.arcsin(sin_term),
+            acos_mu + np.arcsin(-1 * sin_term),
+        )
+        delta_theta[step_no[1:] >= rpacket_lengths[:, None]] = 0
+        theta = np.cumsum(
+            np.column_stack((theta_initial, delta_theta)), axis=1
+        )
+
+        # converting the thetas into x and y coordinates using radius as radius*cos(theta) and radius*sin(theta) respectively
+        rpacket_x = r_track * np.cos(theta) * 1e-5 / time
+        rpacket_y = r_track * np.sin(theta) * 1e-5 / time
+
+        # when packet is at its starting and ending point in its trajectory, we consider it as no interaction
+        rpacket_interactions = interaction_type[steps].astype(np.int64)
+        rpacket_interactions[:, 0] = int(InteractionType.NO_INTERACTION)
+        rpacket_interactions[step_no >= rpacket_lengths[:, None] - 1] = int(
+            InteractionType.NO_INTERACTION
+        )
+
+        return rpacket_x, rpacket_y, rpacket_interactions, rpacket_lengths
+
+    def decimate_trajectories(
+        self,
+        rpacket_x: np.ndarray,
+        rpacket_y: np.ndarray,
+        interactions: np.ndarray,
+        rpacket_lengths: np.ndarray,
+        max_steps_per_packet: int,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Reduce trajectories to at most max_steps_per_packet steps.
+
+        Steps of longer trajectories are sampled evenly, always keeping the
+        first and the last step. Shorter trajectories are kept as they are.
+
+        Parameters
+        ----------
+        rpacket_x : np.ndarray
+            Padded x coordinates of the packets, as returned by
+            `get_trajectory_coordinates`.
+        rpacket_y : np.ndarray
+            Padded y coordinates of the packets.
+        interactions : np.ndarray
+            Padded interaction types of the packets.
+        rpacket_lengths : np.ndarray
+            Number of steps of every packet.
+        max_steps_per_packet : int
+            Maximum number of steps of a trajectory, at least 2.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+            Decimated x coordinates, y coordinates, interaction types and
+            number of steps of every packet.
+        """
+        if rpacket_x.shape[1] <= max_steps_per_packet:
+            return rpacket_x, rpacket_y, interactions, rpacket_lengths
+
+        step_no = np.arange(max_steps_per_packet)
+        decimated_steps = np.rint(
+            np.linspace(0, 1, max_steps_per_packet)
+            * (rpacket_lengths[:, None] - 1)
+        ).astype(np.int64)
+        is_decimated = rpacket_lengths > max_steps_per_packet
+        steps = np.where(
+            is_decimated[:, None],
+            decimated_steps,
+            np.minimum(step_no, rpacket_lengths[:, None] - 1),
+        )
+
+        return (
+            np.take_along_axis(rpacket_x, steps, axis=1),
+            np.take_along_axis(rpacket_y, steps, axis=1),
+            np.take_along_axis(interactions, steps, axis=1),
+            np.minimum(rpacket_lengths, max_steps_per_packet),
+        )
+
     def get_coordinates_with_theta_init(
         self,
         r_track: pd.Series,
@@ -485,50 +715,24 @@ class RPacketPlotter:
         Notes
         -----
         Coordinates are converted to velocity units (km/s) by dividing by time
-        and applying unit conversion. The trajectory calculation follows the
-        spherical geometry described in the TARDIS documentation.
+        and applying unit conversion. This is `get_trajectory_coordinates`
+        applied to a single packet.
         """
-        theta, rpacket_interactions = [], []
-
-        # getting thetas at different steps of the packet movement
-
-        for step_no in range(len(r_track)):
-            # for the first step the packet is at photosphere, so theta will be equal to the intial angle we are launching the packet from
-            if step_no == 0:
-                theta.append(theta_initial)
-            # for further steps we calculate thetas with the formula derived in the documentation
-            # https://tardis-sn.github.io/tardis/analyzing_tardis/visualization/tutorial_montecarlo_packet_visualization.html#Getting-packet-coordinates
-            else:
-                curr_r = r_track[step_no]
-                prev_r = r_track[step_no - 1]
-                prev_mu = mu_track[step_no - 1]
-
-                acos_mu = np.acos(prev_mu)
-                sin_term = prev_r * np.sin(acos_mu) / curr_r
-                new_theta = theta[-1] + acos_mu
-
-                if curr_r < prev_r:
-                    new_theta = new_theta - np.pi + np.asin(sin_term)
-                else:
-                    new_theta += np.asin(-1 * sin_term)
-                theta.append(new_theta)
-
-        # converting the thetas into x and y coordinates using radius as radius*cos(theta) and radius*sin(theta) respectively
-        rpacket_x = (np.array(r_track)) * np.cos(np.array(theta)) * 1e-5 / time
-        rpacket_y = (np.array(r_track)) * np.sin(np.array(theta)) * 1e-5 / time
-
-        # adding interactions at different steps
-        # using the change of slope of the trajectory line at different steps, we determine if an interactions happened or not.
-
-        for step_no in range(len(r_track)):
-            # when packet is at its starting and ending point in its trajectory, we consider it as no interaction
-            if step_no == 0 or step_no == len(r_track) - 1:
-                rpacket_interactions.append(int(InteractionType.NO_INTERACTION))
-            else:
-                # current slope is the slope of line from previous position of the packet to the current position
-                rpacket_interactions.append(last_interaction_type[step_no])
+        (
+            rpacket_x,
+            rpacket_y,
+            rpacket_interactions,
+            _,
+        ) = self.get_trajectory_coordinates(
+            np.asarray(r_track),
+            np.asarray(mu_track),
+            np.asarray(last_interaction_type),
+            np.array([0, len(r_track)]),
+            time,
+            np.array([theta_initial]),
+        )
 
-        return rpacket_x, rpacket_y, rpacket_interactions
+        return rpacket_x[0], rpacket_y[0], rpacket_interactions[0].tolist()
 
     def get_coordinates_multiple_packets(
         self, r_packet_tracker: pd.DataFrame
@@ -560,32 +764,38 @@ class RPacketPlotter:
         """
         # for plotting packets at equal intervals throught the circle, we choose thetas distributed uniformly
         thetas = np.linspace(0, 2 * np.pi, self.no_of_packets + 1)
-        all_rpackets_x_coords = []
-        all_rpackets_y_coords = []
-        all_rpackets_interactions_coords = []
-
-        # getting coordinates and interaction arrays for all packets
-        for packet_no in range(self.no_of_packets):
-            interaction_types = r_packet_tracker.loc[packet_no]["interaction_type"]
-            
-            (
-                rpacket_x,
-                rpacket_y,
-                rpacket_interactions,
-            ) = self.get_coordinates_with_theta_init(
-                r_packet_tracker.loc[packet_no]["r"],
-                r_packet_tracker.loc[packet_no]["mu"],
-                self.sim.simulation_state.time_explosion.value,
-                interaction_types,
-                thetas[packet_no],
+        r, mu, interaction_type, packet_offsets = self.get_tracker_arrays(
+            r_packet_tracker
+        )
+        (
+            rpacket_x,
+            rpacket_y,
+            rpacket_interactions,
+            rpacket_lengths,
+        ) = self.get_trajectory_coordinates(
+            r,
+            mu,
+            interaction_type,
+            packet_offsets,
+            self.sim.simulation_state.time_explosion.value,
+            thetas[:-1],
+        )
+
+        all_rpackets_x_coords = np.empty(self.no_of_packets, dtype="object")
+        all_rpackets_y_coords = np.empty(self.no_of_packets, dtype="object")
+        all_rpackets_interactions_coords = np.empty(
+            self.no_of_packets, dtype="object"
+        )
+        for packet_no, length in enumerate(rpacket_lengths):
+            all_rpackets_x_coords[packet_no] = rpacket_x[packet_no, :length]
+            all_rpackets_y_coords[packet_no] = rpacket_y[packet_no, :length]
+            all_rpackets_interactions_coords[packet_no] = (
+                rpacket_interactions[packet_no, :length]
             )
-            all_rpackets_x_coords.append(rpacket_x)
-            all_rpackets_y_coords.append(rpacket_y)
-            all_rpackets_interactions_coords.append(rpacket_interactions)
         return (
-            np.array(all_rpackets_x_coords, dtype="object"),
-            np.array(all_rpackets_y_coords, dtype="object"),
-            np.array(all_rpackets_interactions_coords, dtype="object"),
+            all_rpackets_x_coords,
+            all_rpackets_y_coords,
+            all_rpackets_interactions_coords,
         )
 
     def get_equal_array_size(
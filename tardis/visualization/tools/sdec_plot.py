@@ -16,6 +16,7 @@ import pandas as pd
 import plotly.graph_objects as go
 from astropy.modeling.models import BlackBody
 
+from tardis.io.columnar_store import open_simulation_store
 from tardis.transport.montecarlo.packets.radiative_packet import InteractionType
 from tardis.util.base import (
     atomic_number2element_symbol,
@@ -112,7 +113,8 @@ class SDECPlotter:
         Parameters
         ----------
         hdf_fpath : str
-            Valid path to the HDF file where simulation is saved
+            Valid path to the HDF file where simulation is saved, written
+            either by `to_hdf` or `to_columnar`
         packets_mode : {'virtual', 'real'}, optional
             Mode of packets to be considered (default: 'virtual')
 
@@ -121,7 +123,7 @@ class SDECPlotter:
         SDECPlotter
         """
         plotter = cls()
-        with pd.HDFStore(hdf_fpath, "r") as hdf:
+        with open_simulation_store(hdf_fpath) as hdf:
             plotter.r_inner = u.Quantity(
                 hdf["/simulation/simulation_state/r_inner"].to_numpy(), "cm"
             )
@@ -465,32 +467,35 @@ class SDECPlotter:
         tuple
             (updated luminosities_df, array of species identifiers)
         """
+        line_interaction_df = self.packet_data[packets_mode][
+            "packets_df_line_interaction"
+        ].loc[mask]
         # Group packets_df by atomic number of elements with which packets
         # had their last emission (interaction out)
         # or if species_list is requested then group by species id
-        groupby_column = (
-            "last_line_interaction_atom"
-            if self._species_list is None
-            else "last_line_interaction_species"
-        )
-        grouped = (
-            self.packet_data[packets_mode]["packets_df_line_interaction"]
-            .loc[mask]
-            .groupby(by=groupby_column)
+        species_ids = line_interaction_df[
+            "last_line_interaction_species_id"
+        ].to_numpy()
+        if self._species_list is None:
+            species_ids = species_ids - species_ids % 100
+
+        weights = u.Quantity(
+            line_interaction_df["energies"].to_numpy()
+            / self.lum_to_flux
+            / self.time_of_simulation
+        ).value
+        species, histograms = pu.get_species_histograms(
+            species_ids,
+            line_interaction_df[nu_column].to_numpy(),
+            self.plot_frequency_bins.value,
+            weights=weights,
         )
-        for identifier, group in grouped:
-            weights = (
-                group["energies"] / self.lum_to_flux / self.time_of_simulation
-            )
-            hist = np.histogram(
-                group[nu_column],
-                bins=self.plot_frequency_bins.value,
-                weights=weights,
-                density=False,
-            )
 
+        identifiers = []
+        for species_id, hist in zip(species, histograms):
+            identifier = (int(species_id // 100), int(species_id % 100))
             L_nu = (
-                hist[0]
+                hist
                 * u.erg
                 / u.s
                 / self.spectrum[packets_mode]["spectrum_delta_frequency"]
@@ -498,8 +503,9 @@ class SDECPlotter:
             luminosities_df[identifier] = (
                 L_nu * self.plot_frequency / self.plot_wavelength
             ).value
+            identifiers.append(identifier)
 
-        return luminosities_df, np.array(list(grouped.groups.keys()))
+        return luminosities_df, np.array(identifiers)
 
     def _calculate_luminosity_contribution(
         self, packets_mode, mask, contribution_name, luminosities_df
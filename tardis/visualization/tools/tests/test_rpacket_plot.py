@@ -5,6 +5,7 @@ import math
 import astropy.units as u
 import numpy as np
 import numpy.testing as npt
+import pandas as pd
 import pytest
 
 from tardis.visualization import RPacketPlotter
@@ -238,6 +239,64 @@ class TestRPacketPlotter:
                 npt.assert_allclose(expected_x, packet_frame.x)
                 npt.assert_allclose(expected_y, packet_frame.y)
 
+    @pytest.mark.parametrize("max_steps_per_packet", [2, 5])
+    def test_decimate_trajectories(
+        self, simulation_rpacket_tracking, rpacket_plotter, max_steps_per_packet
+    ):
+        """
+        Test for the decimate_trajectories method.
+
+        Parameters
+        ----------
+        simulation_rpacket_tracking : tardis.simulation.base.Simulation
+            Simulation object.
+        rpacket_plotter : tardis.visualization.RPacketPlotter
+            Plotter object used to generate the r-packet visualization.
+        max_steps_per_packet : int
+            Maximum number of steps of the decimated trajectories.
+        """
+        no_of_packets = rpacket_plotter.no_of_packets
+        multiple_packet_df = simulation_rpacket_tracking.transport.transport_state.rpacket_tracker_df.loc[
+            0 : (no_of_packets - 1)
+        ]
+        (
+            rpackets_x,
+            rpackets_y,
+            rpackets_interactions,
+            rpacket_lengths,
+        ) = rpacket_plotter.get_trajectory_coordinates(
+            *rpacket_plotter.get_tracker_arrays(multiple_packet_df),
+            simulation_rpacket_tracking.simulation_state.time_explosion.value,
+            np.zeros(no_of_packets),
+        )
+        (
+            decimated_x,
+            decimated_y,
+            decimated_interactions,
+            decimated_lengths,
+        ) = rpacket_plotter.decimate_trajectories(
+            rpackets_x,
+            rpackets_y,
+            rpackets_interactions,
+            rpacket_lengths,
+            max_steps_per_packet,
+        )
+
+        assert decimated_x.shape[1] == min(
+            max_steps_per_packet, rpackets_x.shape[1]
+        )
+        npt.assert_array_equal(
+            decimated_lengths, np.minimum(rpacket_lengths, max_steps_per_packet)
+        )
+        # the first and last steps of every trajectory are kept
+        for coordinates, decimated in (
+            (rpackets_x, decimated_x),
+            (rpackets_y, decimated_y),
+            (rpackets_interactions, decimated_interactions),
+        ):
+            npt.assert_array_equal(decimated[:, 0], coordinates[:, 0])
+            npt.assert_array_equal(decimated[:, -1], coordinates[:, -1])
+
     @pytest.mark.parametrize("max_step_size", [10, 30, 50])
     def test_get_slider_steps(self, rpacket_plotter, max_step_size):
         slider_steps = rpacket_plotter.get_slider_steps(max_step_size)
@@ -390,3 +449,44 @@ class TestRPacketPlotter:
                 rpacket_plotter.interaction_from_num[int(interaction)]["color"]
                 for interaction in multiple_packet_interaction[packet_no][:frame]
             ]
+
+
+def test_get_tracker_arrays_sparse_packet_ids():
+    # every other packet tracked, steps stored out of packet order
+    packet_ids = [4, 0, 0, 2, 2, 2, 4, 0]
+    steps = [0, 0, 1, 0, 1, 2, 1, 2]
+    r_packet_tracker = pd.DataFrame(
+        {
+            "r": np.arange(8, dtype=np.float64),
+            "mu": np.zeros(8),
+            "interaction_type": np.zeros(8, dtype=np.int64),
+        },
+        index=pd.MultiIndex.from_arrays(
+            [packet_ids, steps], names=["index", "step"]
+        ),
+    )
+    rpacket_plotter = RPacketPlotter(None, no_of_packets=2)
+
+    r, _, _, packet_offsets = rpacket_plotter.get_tracker_arrays(
+        r_packet_tracker
+    )
+
+    npt.assert_array_equal(packet_offsets, [0, 3, 6])
+    npt.assert_array_equal(r, [1.0, 2.0, 7.0, 3.0, 4.0, 5.0])
+
+    rpacket_plotter.no_of_packets = 4
+    with pytest.raises(ValueError):
+        rpacket_plotter.get_tracker_arrays(r_packet_tracker)
+
+
+def test_get_trajectory_coordinates_empty_trajectory():
+    rpacket_plotter = RPacketPlotter(None, no_of_packets=2)
+    with pytest.raises(ValueError):
+        rpacket_plotter.get_trajectory_coordinates(
+            np.ones(2),
+            np.zeros(2),
+            np.zeros(2, dtype=np.int64),
+            np.array([0, 2, 2]),
+            1.0,
+            np.zeros(2),
+        )
@@ -1,6 +1,7 @@
 import pandas as pd
 import panel as pn
 
+from tardis.io.columnar_store import open_simulation_store
 from tardis.util.base import (
     atomic_number2element_symbol,
     species_tuple_to_string,
@@ -208,7 +209,7 @@ class HDFShellInfo(BaseShellInfo):
             from a TARDIS Simulation object using :code:`to_hdf` method with
             default arguments)
         """
-        with pd.HDFStore(hdf_fpath, "r") as sim_data:
+        with open_simulation_store(hdf_fpath) as sim_data:
             super().__init__(
                 sim_data["/simulation/simulation_state/t_radiative"],
                 sim_data["/simulation/simulation_state/dilution_factor"],
@@ -13,7 +13,12 @@ from tardis.opacities.macro_atom.macroatom_solver import (
 from tardis.opacities.opacity_solver import OpacitySolver
 from tardis.plasma.assembly import PlasmaSolverFactory
 from tardis.plasma.radiation_field import DilutePlanckianRadiationField
-from tardis.simulation.convergence import ConvergenceSolver
+from tardis.simulation.checkpoint import read_checkpoint, write_checkpoint
+from tardis.simulation.convergence import (
+    AdaptivePacketSchedule,
+    ConvergenceSolver,
+    estimate_monte_carlo_noise,
+)
 from tardis.spectrum.base import SpectrumSolver
 from tardis.spectrum.formal_integral.formal_integral_solver import (
     FormalIntegralSolver,
@@ -22,6 +27,9 @@ from tardis.spectrum.luminosity import (
     calculate_filtered_luminosity,
 )
 from tardis.transport.montecarlo.base import MonteCarloTransportSolver
+from tardis.transport.montecarlo.estimators.mc_rad_field_solver import (
+    calculate_planck_j_blues,
+)
 from tardis.transport.montecarlo.progress_bars import initialize_iterations_pbar
 from tardis.util.environment import Environment
 from tardis.workflows.workflow_logging import WorkflowLogging
@@ -36,7 +44,9 @@ class SimpleTARDISWorkflow(WorkflowLogging):
     log_level = None
     specific_log_level = None
 
-    def __init__(self, configuration, csvy=False):
+    def __init__(
+        self, configuration, csvy=False, checkpoint_path=None, resume_from=None
+    ):
         """A simple TARDIS workflow that runs a simulation to convergence
 
         Parameters
@@ -45,6 +55,10 @@ class SimpleTARDISWorkflow(WorkflowLogging):
             Configuration object for the simulation
         csvy : bool, optional
             Set true if the configuration uses CSVY, by default False
+        checkpoint_path : str, optional
+            File the state is checkpointed to after every iteration, by default None
+        resume_from : str, optional
+            Checkpoint of an interrupted run to continue from, by default None
         """
         super().__init__(configuration, self.log_level, self.specific_log_level)
         atom_data = parse_atom_data(configuration)
@@ -87,6 +101,16 @@ class SimpleTARDISWorkflow(WorkflowLogging):
             self.simulation_state._electron_densities,
         )
 
+        # (lines x shells) j_blues handed to the plasma, filled in place
+        # every iteration
+        lines = self.plasma_solver.atomic_data.lines
+        self.j_blues_buffer = np.zeros(
+            (len(lines), self.simulation_state.no_of_shells)
+        )
+        self.j_blues = pd.DataFrame(
+            self.j_blues_buffer, index=lines.index, copy=False
+        )
+
         line_interaction_type = configuration.plasma.line_interaction_type
 
         self.opacity_solver = OpacitySolver(
@@ -175,6 +199,56 @@ class SimpleTARDISWorkflow(WorkflowLogging):
             self.convergence_strategy.t_inner
         )
 
+        self.packet_schedule = AdaptivePacketSchedule.from_config(
+            configuration.montecarlo
+        )
+        if self.packet_schedule is not None:
+            self.real_packet_count = self.packet_schedule.no_of_packets
+
+        self.checkpoint_path = checkpoint_path
+        if resume_from is not None:
+            self.resume_from_checkpoint(resume_from)
+
+    def resume_from_checkpoint(self, checkpoint_path):
+        """Restore the state of an interrupted run so that `run` continues
+        with the next iteration
+
+        Parameters
+        ----------
+        checkpoint_path : str or pathlib.Path
+            Checkpoint written by a run with `checkpoint_path` set
+
+        Returns
+        -------
+        IterationCheckpoint
+            The restored checkpoint
+        """
+        checkpoint = read_checkpoint(checkpoint_path)
+        if checkpoint.completed_iterations >= self.total_iterations:
+            raise ValueError(
+                f"Checkpoint has {checkpoint.completed_iterations:d} completed "
+                f"iterations, the workflow only runs {self.total_iterations:d}"
+            )
+        checkpoint.restore_simulation_state(self.simulation_state)
+        checkpoint.restore_plasma(self.plasma_solver)
+        self.completed_iterations = checkpoint.completed_iterations
+        self.consecutive_converges_count = (
+            checkpoint.consecutive_converges_count
+        )
+        self.converged = checkpoint.converged
+        return checkpoint
+
+    def write_checkpoint(self):
+        """Checkpoint the state after the last completed iteration"""
+        write_checkpoint(
+            self.checkpoint_path,
+            self.completed_iterations,
+            self.consecutive_converges_count,
+            self.converged,
+            self.simulation_state,
+            self.plasma_solver,
+        )
+
     def get_convergence_estimates(self):
         """Compute convergence estimates from the transport state
 
@@ -263,6 +337,41 @@ class SimpleTARDISWorkflow(WorkflowLogging):
         self.consecutive_converges_count = 0
         return False
 
+    def update_packet_count(self, estimated_values):
+        """Adapt the number of packets of the next iteration to the
+        convergence statistics of the last one
+
+        Parameters
+        ----------
+        estimated_values : dict
+            Estimates of the last iteration
+
+        Returns
+        -------
+        int
+            Number of packets of the next iteration
+        """
+        fractional_changes = {}
+        for key, solver in self.convergence_solvers.items():
+            fractional_changes[key] = u.Quantity(
+                solver.get_fractional_change(
+                    getattr(self.simulation_state, key), estimated_values[key]
+                )
+            ).to_value(u.dimensionless_unscaled)
+
+        noise = estimate_monte_carlo_noise(self.transport_state)
+        self.real_packet_count = self.packet_schedule.update(
+            fractional_changes, noise
+        )
+        logger.info(
+            "\n\tMonte Carlo noise (largest of the shells): "
+            f"t_rad {np.max(noise['t_radiative']):.2e}, "
+            f"w {np.max(noise['dilution_factor']):.2e}, "
+            f"t_inner {noise['t_inner']:.2e}"
+            f"\n\tPackets in the next iteration: {self.real_packet_count:d}"
+        )
+        return self.real_packet_count
+
     def solve_simulation_state(
         self,
         estimated_values,
@@ -316,41 +425,37 @@ class SimpleTARDISWorkflow(WorkflowLogging):
             dilution_factor=self.simulation_state.dilution_factor,
         )
         update_properties = dict(
-            dilute_planckian_radiation_field=radiation_field
+            dilute_planckian_radiation_field=radiation_field,
+            j_blues=self.j_blues,
         )
+        line_nus = self.plasma_solver.atomic_data.lines.nu.values
         # A check to see if the plasma is set with JBluesDetailed, in which
         # case it needs some extra kwargs.
         if (
             self.plasma_solver.plasma_solver_settings.RADIATIVE_RATES_TYPE
             == "blackbody"
         ):
-            planckian_radiation_field = (
-                radiation_field.to_planckian_radiation_field()
-            )
-            j_blues = planckian_radiation_field.calculate_mean_intensity(
-                self.plasma_solver.atomic_data.lines.nu.values
-            )
-            update_properties["j_blues"] = pd.DataFrame(
-                j_blues, index=self.plasma_solver.atomic_data.lines.index
+            calculate_planck_j_blues(
+                line_nus,
+                radiation_field.temperature_kelvin,
+                np.ones_like(radiation_field.dilution_factor),
+                self.j_blues_buffer,
             )
         elif (
             self.plasma_solver.plasma_solver_settings.RADIATIVE_RATES_TYPE
             == "dilute-blackbody"
         ):
-            j_blues = radiation_field.calculate_mean_intensity(
-                self.plasma_solver.atomic_data.lines.nu.values
-            )
-            update_properties["j_blues"] = pd.DataFrame(
-                j_blues, index=self.plasma_solver.atomic_data.lines.index
+            calculate_planck_j_blues(
+                line_nus,
+                radiation_field.temperature_kelvin,
+                radiation_field.dilution_factor,
+                self.j_blues_buffer,
             )
         elif (
             self.plasma_solver.plasma_solver_settings.RADIATIVE_RATES_TYPE
             == "detailed"
         ):
-            update_properties["j_blues"] = pd.DataFrame(
-                estimated_radfield_properties.j_blues,
-                index=self.plasma_solver.atomic_data.lines.index,
-            )
+            self.j_blues_buffer[:] = estimated_radfield_properties.j_blues
         else:
             raise ValueError(
                 f"radiative_rates_type type unknown - {self.plasma.plasma_solver_settings.RADIATIVE_RATES_TYPE}"
@@ -460,6 +565,10 @@ class SimpleTARDISWorkflow(WorkflowLogging):
                 integrator_settings.points,
                 integrator_settings.interpolate_shells,
                 getattr(integrator_settings, "method", None),
+                getattr(integrator_settings, "refinement_points", 0),
+                getattr(integrator_settings, "refinement_tolerance", 1e-2),
+                getattr(integrator_settings, "tau_threshold", 0.0),
+                getattr(integrator_settings, "single_precision", False),
             )
             self.spectrum_solver.setup_optional_spectra(
                 self.transport_state,
@@ -478,8 +587,9 @@ class SimpleTARDISWorkflow(WorkflowLogging):
         if self.show_progress_bars:
             initialize_iterations_pbar(self.total_iterations)
 
-        self.converged = False
-        while self.completed_iterations < self.total_iterations - 1:
+        while self.completed_iterations < self.total_iterations - 1 and not (
+            self.converged and self.convergence_strategy.stop_if_converged
+        ):
             logger.info(
                 f"\n\tStarting iteration {(self.completed_iterations + 1):d} of {self.total_iterations:d}"
             )
@@ -495,12 +605,16 @@ class SimpleTARDISWorkflow(WorkflowLogging):
                 estimated_radfield_properties,
             ) = self.get_convergence_estimates()
 
+            if self.packet_schedule is not None:
+                self.update_packet_count(estimated_values)
+
             self.solve_simulation_state(estimated_values)
 
             self.solve_plasma(estimated_radfield_properties)
 
             self.converged = self.check_convergence(estimated_values)
             self.completed_iterations += 1
+            self.write_checkpoint()
 
             if self.converged and self.convergence_strategy.stop_if_converged:
                 break
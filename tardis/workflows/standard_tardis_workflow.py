@@ -2,6 +2,7 @@ import logging
 
 from tardis.io.hdf_writer_mixin import HDFWriterMixin
 from tardis.simulation.base import PlasmaStateStorerMixin
+from tardis.simulation.checkpoint import write_checkpoint
 from tardis.spectrum.luminosity import (
     calculate_filtered_luminosity,
 )
@@ -40,6 +41,8 @@ class StandardTARDISWorkflow(
         show_convergence_plots=False,
         convergence_plots_kwargs=None,
         csvy=False,
+        checkpoint_path=None,
+        resume_from=None,
     ):
         if convergence_plots_kwargs is None:
             convergence_plots_kwargs = {}
@@ -49,7 +52,9 @@ class StandardTARDISWorkflow(
         self.enable_virtual_packet_logging = enable_virtual_packet_logging
         self.convergence_plots_kwargs = convergence_plots_kwargs
 
-        SimpleTARDISWorkflow.__init__(self, configuration, csvy)
+        SimpleTARDISWorkflow.__init__(
+            self, configuration, csvy, checkpoint_path=checkpoint_path
+        )
 
         # set up plasma storage
         PlasmaStateStorerMixin.__init__(
@@ -58,6 +63,9 @@ class StandardTARDISWorkflow(
             no_of_shells=self.simulation_state.no_of_shells,
         )
 
+        if resume_from is not None:
+            self.resume_from_checkpoint(resume_from)
+
         # Convergence plots
         if show_convergence_plots:
             (
@@ -65,6 +73,37 @@ class StandardTARDISWorkflow(
                 self.export_convergence_plots,
             ) = self.initialize_convergence_plots()
 
+    def resume_from_checkpoint(self, checkpoint_path):
+        """Restore the state of an interrupted run, including the stored
+        plasma state of the completed iterations
+
+        Parameters
+        ----------
+        checkpoint_path : str or pathlib.Path
+            Checkpoint written by a run with `checkpoint_path` set
+
+        Returns
+        -------
+        IterationCheckpoint
+            The restored checkpoint
+        """
+        checkpoint = super().resume_from_checkpoint(checkpoint_path)
+        checkpoint.restore_plasma_state_history(self)
+        return checkpoint
+
+    def write_checkpoint(self):
+        """Checkpoint the state and the stored plasma state after the last
+        completed iteration"""
+        write_checkpoint(
+            self.checkpoint_path,
+            self.completed_iterations,
+            self.consecutive_converges_count,
+            self.converged,
+            self.simulation_state,
+            self.plasma_solver,
+            plasma_state_storer=self,
+        )
+
     def initialize_convergence_plots(self):
         """Initialize the convergence plot attributes
 
@@ -204,8 +243,9 @@ class StandardTARDISWorkflow(
 
     def run(self):
         """Run the TARDIS simulation until convergence is reached"""
-        self.converged = False
-        while self.completed_iterations < self.total_iterations - 1:
+        while self.completed_iterations < self.total_iterations - 1 and not (
+            self.converged and self.convergence_strategy.stop_if_converged
+        ):
             logger.info(
                 f"\n\tStarting iteration {(self.completed_iterations + 1):d} of {self.total_iterations:d}"
             )
@@ -231,12 +271,16 @@ class StandardTARDISWorkflow(
             if self.convergence_plots is not None:
                 self.convergence_plots.update()
 
+            if self.packet_schedule is not None:
+                self.update_packet_count(estimated_values)
+
             self.solve_simulation_state(estimated_values)
 
             self.solve_plasma(estimated_radfield_properties)
 
             self.converged = self.check_convergence(estimated_values)
             self.completed_iterations += 1
+            self.write_checkpoint()
 
             if self.converged and self.convergence_strategy.stop_if_converged:
                 break
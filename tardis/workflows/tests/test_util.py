@@ -0,0 +1,51 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from tardis.workflows.util import (
+    calculate_binned_line_extinction,
+    get_line_frequency_bins,
+)
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_calculate_binned_line_extinction(descending):
+    rng = np.random.default_rng(1987)
+    line_nus = rng.uniform(1e14, 1e16, 1003)
+    if descending:
+        line_nus = np.sort(line_nus)[::-1]
+    tau_sobolev = 10 ** rng.uniform(-3, 3, (len(line_nus), 4))
+
+    line_frequency_bins = get_line_frequency_bins(line_nus, bin_size=10)
+    binned_extinction = calculate_binned_line_extinction(
+        tau_sobolev,
+        line_frequency_bins.line_order,
+        line_frequency_bins.number_of_padding_lines,
+        line_frequency_bins.bin_size,
+        len(line_frequency_bins.delta_nu),
+    )
+
+    # sorted lines preceded by lines without opacity, as in the binning
+    order = np.argsort(line_nus, kind="stable")
+    padded_nus = np.hstack(
+        (
+            np.arange(line_frequency_bins.number_of_padding_lines) + 1.0,
+            line_nus[order],
+        )
+    )
+    padded_taus = np.vstack(
+        (
+            np.zeros((line_frequency_bins.number_of_padding_lines, 4)),
+            tau_sobolev[order],
+        )
+    )
+    bin_size = line_frequency_bins.bin_size
+    number_of_bins = len(line_frequency_bins.delta_nu)
+    expected = (
+        1 - np.exp(-padded_taus[1 : number_of_bins * bin_size + 1])
+    ).reshape(number_of_bins, bin_size, -1).sum(axis=1)
+
+    npt.assert_allclose(binned_extinction, expected, rtol=1e-12)
+    npt.assert_array_equal(
+        line_frequency_bins.bins_low, padded_nus[:-bin_size:bin_size]
+    )
@@ -1,95 +1,215 @@
+from dataclasses import dataclass
+
 import numpy as np
 from astropy import constants as const
 from astropy import units as u
+from numba import njit, prange
+
 from tardis.configuration.sorting_globals import SORTING_ALGORITHM
+from tardis.transport.montecarlo import njit_dict
 
+H_CGS = const.h.cgs.value
+K_B_CGS = const.k_B.cgs.value
+C_CGS = const.c.cgs.value
+SIGMA_T_CGS = const.sigma_T.cgs.value
 
-def get_tau_integ(plasma, opacity_state, simulation_state, bin_size=10):
-    """Estimate the integrated mean optical depth at each velocity bin
+
+@dataclass
+class LineFrequencyBins:
+    """
+    Binning of the lines by frequency for the mean opacities.
+
+    The lines, in increasing frequency, are preceded by
+    `number_of_padding_lines` lines without opacity, such that bin k holds
+    the sorted positions 1 + k * bin_size to (k + 1) * bin_size.
+
+    Attributes
+    ----------
+    line_order : np.ndarray
+        Line indices sorted by increasing frequency.
+    number_of_padding_lines : int
+        Number of lines without opacity preceding the sorted lines.
+    bin_size : int
+        Number of lines in a bin.
+    bins_low : np.ndarray
+        Lower frequency of the bins in Hz.
+    delta_nu : np.ndarray
+        Frequency width of the bins in Hz.
+    """
+
+    line_order: np.ndarray
+    number_of_padding_lines: int
+    bin_size: int
+    bins_low: np.ndarray
+    delta_nu: np.ndarray
+
+
+def get_line_frequency_bins(line_nus, bin_size=10):
+    """
+    Bin the lines by frequency, increasing the bin size until no bin is empty.
+
+    The atomic data lines are prepared in order of increasing wavelength, so
+    the frequency order is usually their reverse and no sorting is needed.
 
     Parameters
     ----------
-    plasma : tardis.plasma.BasePlasma
-        The tardis legacy plasma
-    simulation_state : tardis.model.base.SimulationState
-        the current simulation state
+    line_nus : np.ndarray
+        Line frequencies in Hz, in the order of the atomic data lines.
     bin_size : int, optional.  Default : 10
         bin size for the aggregation of line opacities
 
     Returns
     -------
-    dict
-        rosseland : np.ndarray
-            Roassland Mean Optical Depth
-        planck : np.ndarray
-            Planck Mean Optical Depth
+    LineFrequencyBins
     """
-    index = plasma.atomic_data.lines.nu.index
-    freqs = plasma.atomic_data.lines.nu.values * u.Hz
-    order = np.argsort(freqs, kind=SORTING_ALGORITHM)
-    freqs = freqs[order]
-    taus = opacity_state.tau_sobolev.values[order]
+    if np.all(line_nus[1:] <= line_nus[:-1]):
+        line_order = np.arange(len(line_nus) - 1, -1, -1)
+        freqs = line_nus[::-1]
+    else:
+        line_order = np.argsort(line_nus, kind=SORTING_ALGORITHM)
+        freqs = line_nus[line_order]
 
+    number_of_padding_lines = 0
     check_bin_size = True
     while check_bin_size:
         extra = bin_size - len(freqs) % bin_size
-        extra_freqs = (np.arange(extra + 1) + 1) * u.Hz
-        extra_taus = np.zeros((extra + 1, taus.shape[1]))
+        extra_freqs = (np.arange(extra + 1) + 1).astype(np.float64)
         freqs = np.hstack((extra_freqs, freqs))
-        taus = np.vstack((extra_taus, taus))
+        number_of_padding_lines += extra + 1
 
         bins_low = freqs[:-bin_size:bin_size]
         bins_high = freqs[bin_size::bin_size]
         delta_nu = bins_high - bins_low
-        n_bins = len(delta_nu)
 
         if np.any(delta_nu == 0):
             bin_size += 2
         else:
             check_bin_size = False
 
-    taus = taus[1 : n_bins * bin_size + 1]
-    freqs = freqs[1 : n_bins * bin_size + 1]
+    return LineFrequencyBins(
+        line_order=line_order,
+        number_of_padding_lines=number_of_padding_lines,
+        bin_size=bin_size,
+        bins_low=bins_low,
+        delta_nu=delta_nu,
+    )
+
+
+@njit(**njit_dict)
+def calculate_binned_line_extinction(
+    tau_sobolev, line_order, number_of_padding_lines, bin_size, number_of_bins
+):
+    """
+    Sum 1 - exp(-tau) of the lines in every frequency bin and shell.
 
-    ct = simulation_state.time_explosion * const.c
-    t_rad = simulation_state.radiation_field_state.temperature
+    Parameters
+    ----------
+    tau_sobolev : np.ndarray
+        Sobolev optical depths of shape (number of lines, number of shells).
+    line_order : np.ndarray
+        Line indices sorted by increasing frequency.
+    number_of_padding_lines : int
+        Number of lines without opacity preceding the sorted lines.
+    bin_size : int
+        Number of lines in a bin.
+    number_of_bins : int
+        Number of frequency bins.
+
+    Returns
+    -------
+    np.ndarray
+        Binned line extinction of shape (number of bins, number of shells).
+    """
+    number_of_shells = tau_sobolev.shape[1]
+    binned_extinction = np.zeros((number_of_bins, number_of_shells))
+    for bin_id in prange(number_of_bins):
+        first_position = 1 + bin_id * bin_size - number_of_padding_lines
+        for position in range(
+            max(first_position, 0), first_position + bin_size
+        ):
+            line_id = line_order[position]
+            for shell_id in range(number_of_shells):
+                binned_extinction[bin_id, shell_id] += 1.0 - np.exp(
+                    -tau_sobolev[line_id, shell_id]
+                )
+    return binned_extinction
+
+
+def get_tau_integ(
+    plasma,
+    opacity_state,
+    simulation_state,
+    bin_size=10,
+    line_frequency_bins=None,
+):
+    """Estimate the integrated mean optical depth at each velocity bin
+
+    Parameters
+    ----------
+    plasma : tardis.plasma.BasePlasma
+        The tardis legacy plasma
+    simulation_state : tardis.model.base.SimulationState
+        the current simulation state
+    bin_size : int, optional.  Default : 10
+        bin size for the aggregation of line opacities
+    line_frequency_bins : LineFrequencyBins, optional
+        Binning of the lines from `get_line_frequency_bins`, computed from
+        the plasma lines if not given.
+
+    Returns
+    -------
+    dict
+        rosseland : np.ndarray
+            Roassland Mean Optical Depth
+        planck : np.ndarray
+            Planck Mean Optical Depth
+    """
+    if line_frequency_bins is None:
+        line_frequency_bins = get_line_frequency_bins(
+            plasma.atomic_data.lines.nu.values, bin_size
+        )
+    bins_low = line_frequency_bins.bins_low[:, np.newaxis]
+    delta_nu = line_frequency_bins.delta_nu[:, np.newaxis]
+
+    binned_extinction = calculate_binned_line_extinction(
+        np.ascontiguousarray(opacity_state.tau_sobolev.values),
+        line_frequency_bins.line_order,
+        line_frequency_bins.number_of_padding_lines,
+        line_frequency_bins.bin_size,
+        len(line_frequency_bins.delta_nu),
+    )
+
+    ct = simulation_state.time_explosion.to_value(u.s) * C_CGS
+    t_rad = simulation_state.radiation_field_state.temperature.to_value(u.K)
 
     def B(nu, T):
         return (
             2
-            * const.h
+            * H_CGS
             * nu**3
-            / const.c**2
-            / (np.exp(const.h * nu / (const.k_B * T)) - 1)
+            / C_CGS**2
+            / (np.exp(H_CGS * nu / (K_B_CGS * T)) - 1)
         )
 
     def U(nu, T):
-        return (
-            B(nu, T) ** 2 * (const.c / nu) ** 2 * (2 * const.k_B * T**2) ** -1
-        )
+        return B(nu, T) ** 2 * (C_CGS / nu) ** 2 * (2 * K_B_CGS * T**2) ** -1
 
-    kappa_exp = (
-        (bins_low / delta_nu).reshape(-1, 1)
-        / ct
-        * (1 - np.exp(-taus.reshape(n_bins, bin_size, -1))).sum(axis=1)
-    )
-    kappa_thom = plasma.electron_densities.values * u.cm ** (-3) * const.sigma_T
-    Bdnu = B(bins_low.reshape(-1, 1), t_rad.reshape(1, -1)) * delta_nu.reshape(
-        -1, 1
-    )
+    kappa_exp = bins_low / delta_nu / ct * binned_extinction
+    kappa_thom = np.asarray(plasma.electron_densities.values) * SIGMA_T_CGS
+    Bdnu = B(bins_low, t_rad) * delta_nu
     kappa_planck = kappa_thom + (Bdnu * kappa_exp).sum(axis=0) / (
         Bdnu.sum(axis=0)
     )
 
-    udnu = U(bins_low.reshape(-1, 1), t_rad.reshape(1, -1)) * delta_nu.reshape(
-        -1, 1
-    )
+    udnu = U(bins_low, t_rad) * delta_nu
     kappa_tot = kappa_thom + kappa_exp
     kappa_rosseland = (
         (udnu * kappa_tot**-1).sum(axis=0) / (udnu.sum(axis=0))
     ) ** -1
 
-    dr = simulation_state.geometry.r_outer - simulation_state.geometry.r_inner
+    dr = (
+        simulation_state.geometry.r_outer - simulation_state.geometry.r_inner
+    ).to_value(u.cm)
     dtau = kappa_planck * dr
     planck_integ_tau = np.cumsum(dtau[::-1])[::-1]
     rosseland_integ_tau = np.cumsum((kappa_rosseland * dr)[::-1])[::-1]
@@ -1,14 +1,16 @@
 import logging
 
 import numpy as np
-import pandas as pd
 from astropy import units as u
 from scipy.interpolate import interp1d
 
 from tardis.plasma.radiation_field import DilutePlanckianRadiationField
 from tardis.simulation.convergence import ConvergenceSolver
+from tardis.transport.montecarlo.estimators.mc_rad_field_solver import (
+    calculate_planck_j_blues,
+)
 from tardis.workflows.standard_tardis_workflow import StandardTARDISWorkflow
-from tardis.workflows.util import get_tau_integ
+from tardis.workflows.util import get_line_frequency_bins, get_tau_integ
 
 # logging support
 logger = logging.getLogger(__name__)
@@ -44,6 +46,11 @@ class InnerVelocitySolverWorkflow(StandardTARDISWorkflow):
         # Need to compute the opacity state on init to get the optical depths
         # for the first inner boundary calculation.
         self.opacity_states = self.solve_opacity()
+        # The lines do not change, so their frequency binning for the mean
+        # opacities is computed once.
+        self.line_frequency_bins = get_line_frequency_bins(
+            self.plasma_solver.atomic_data.lines.nu.values
+        )
 
         if tau is not None:
             self.LOG_TAU_TARGET = np.log(tau)
@@ -158,6 +165,7 @@ class InnerVelocitySolverWorkflow(StandardTARDISWorkflow):
                 self.plasma_solver,
                 self.opacity_states["opacity_state"],
                 self.simulation_state,
+                line_frequency_bins=self.line_frequency_bins,
             )[self.mean_optical_depth]
         )
 
@@ -358,41 +366,43 @@ class InnerVelocitySolverWorkflow(StandardTARDISWorkflow):
             temperature=self.simulation_state.radiation_field_state.temperature,
             dilution_factor=self.simulation_state.radiation_field_state.dilution_factor,
         )
-        update_properties = dict(dilute_planckian_radiation_field=radiation_field)
+        update_properties = dict(
+            dilute_planckian_radiation_field=radiation_field,
+            j_blues=self.j_blues,
+        )
+        line_nus = self.plasma_solver.atomic_data.lines.nu.values
         # A check to see if the plasma is set with JBluesDetailed, in which
         # case it needs some extra kwargs.
         if (
             self.plasma_solver.plasma_solver_settings.RADIATIVE_RATES_TYPE
             == "blackbody"
         ):
-            planckian_radiation_field = radiation_field.to_planckian_radiation_field()
-            j_blues = planckian_radiation_field.calculate_mean_intensity(
-                self.plasma_solver.atomic_data.lines.nu.values
-            )
-            update_properties["j_blues"] = pd.DataFrame(
-                j_blues, index=self.plasma_solver.atomic_data.lines.index
+            calculate_planck_j_blues(
+                line_nus,
+                radiation_field.temperature_kelvin,
+                np.ones_like(radiation_field.dilution_factor),
+                self.j_blues_buffer,
             )
         elif (
             self.plasma_solver.plasma_solver_settings.RADIATIVE_RATES_TYPE
             == "dilute-blackbody"
         ):
-            j_blues = radiation_field.calculate_mean_intensity(
-                self.plasma_solver.atomic_data.lines.nu.values
-            )
-            update_properties["j_blues"] = pd.DataFrame(
-                j_blues, index=self.plasma_solver.atomic_data.lines.index
+            calculate_planck_j_blues(
+                line_nus,
+                radiation_field.temperature_kelvin,
+                radiation_field.dilution_factor,
+                self.j_blues_buffer,
             )
         elif (
             self.plasma_solver.plasma_solver_settings.RADIATIVE_RATES_TYPE == "detailed"
         ):
-            j_blues = radiation_field.calculate_mean_intensity(
-                self.plasma_solver.atomic_data.lines.nu.values
-            )
-            j_blues[:, mask] = estimated_radfield_properties.j_blues
-            update_properties["j_blues"] = pd.DataFrame(
-                j_blues,
-                index=self.plasma_solver.atomic_data.lines.index,
+            calculate_planck_j_blues(
+                line_nus,
+                radiation_field.temperature_kelvin,
+                radiation_field.dilution_factor,
+                self.j_blues_buffer,
             )
+            self.j_blues_buffer[:, mask] = estimated_radfield_properties.j_blues
         else:
             raise ValueError(
                 f"radiative_rates_type type unknown - {self.plasma.plasma_solver_settings.RADIATIVE_RATES_TYPE}"